@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Encoded-size estimates for Firestore documents.
+Sizes follow Firestore's storage size rules, so they can be checked against the
+per-document limit and used to keep commit requests under the request-size limit.
+"""
+
+import datetime
+from typing import Any, Dict
+
+# Firestore's maximum size of a single document
+MAX_DOCUMENT_BYTES = 1024 * 1024
+
+# Firestore allows at most 500 writes per batch
+MAX_BATCH_OPERATIONS = 500
+
+# Commit requests are limited to 10 MiB; leave headroom for request encoding overhead
+MAX_BATCH_BYTES = 9 * 1024 * 1024
+
+def estimate_value_size(value: Any) -> int:
+    """
+    Estimate the stored size of a field value.
+    
+    Args:
+        value: Field value as it would be passed to the Firestore client
+    
+    Returns:
+        Size in bytes
+    """
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime.datetime)):
+        return 8
+    if isinstance(value, str):
+        return len(value.encode('utf-8')) + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(key).encode('utf-8')) + 1 + estimate_value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_value_size(item) for item in value)
+    # Sentinels such as DELETE_FIELD carry no stored data
+    return 0
+
+def estimate_document_name_size(collection_name: str, document_id: str) -> int:
+    """Estimate the stored size of a document name."""
+    path = f"{collection_name}/{document_id}"
+    return sum(len(segment.encode('utf-8')) + 1 for segment in path.split('/')) + 16
+
+def estimate_document_size(collection_name: str, document_id: str, data: Dict[str, Any]) -> int:
+    """
+    Estimate the stored size of a document.
+    
+    Args:
+        collection_name: Name of the Firestore collection
+        document_id: Document ID
+        data: Document fields
+    
+    Returns:
+        Size in bytes
+    """
+    return estimate_document_name_size(collection_name, document_id) + estimate_value_size(data) + 32
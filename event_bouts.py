@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Per-bout documents for WEBEventData.
+WEBEventData.csv stores each event as one wide row with a column group per
+bout (fight0WINNER, fight0METHOD, ... fight14bLink). At ingest the groups are
+split out into webEventData/{eventId}/bouts/{order} documents that can be
+queried across events with a collection group query, and the event document
+keeps a small summary instead of every bout.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Subcollection of each webEventData document holding its bouts
+BOUTS_SUBCOLLECTION = 'bouts'
+
+# Column suffix of a fightN* group -> bout document field
+BOUT_FIELDS = {
+    'WINNER': 'winner',
+    'LOSER': 'loser',
+    'METHOD': 'method',
+    'ROUND': 'round',
+    'TIME': 'time',
+    'WC': 'weightClass',
+    'aLink': 'winnerLink',
+    'bLink': 'loserLink',
+}
+
+_BOUT_COLUMN = re.compile(r'fight(\d+)(' + '|'.join(BOUT_FIELDS) + r')')
+_ISO_DATE = re.compile(r'\((\d{4})-(\d{2})-(\d{2})\)')
+_CLOCK = re.compile(r'(\d{1,2}):(\d{2})')
+
+def _event_key(name: str) -> str:
+    """Event name reduced to lowercase letters and digits, for matching across files."""
+    return re.sub(r'[^0-9a-z]', '', name.lower())
+
+def parse_event_date(value: Any) -> Optional[datetime.datetime]:
+    """Parse the ISO date in a display date such as 'April 22, 2023 (2023-04-22)'."""
+    match = _ISO_DATE.search(str(value))
+    if match is None:
+        return None
+    year, month, day = (int(group) for group in match.groups())
+    return datetime.datetime(year, month, day, tzinfo=datetime.timezone.utc)
+
+def clock_seconds(value: Any) -> Optional[int]:
+    """Seconds elapsed for a m:ss round clock, or None if the value is not a clock."""
+    match = _CLOCK.fullmatch(str(value))
+    if match is None:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+def load_event_codes(events_csv_path: str) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Index Events.csv event codes by event name and by date.
+    
+    Args:
+        events_csv_path: Path to Events.csv
+    
+    Returns:
+        Dictionary with 'names' (name key -> code) and 'dates' (ISO date -> code, only for
+        dates with a single event), or None if the file does not exist
+    """
+    if not os.path.exists(events_csv_path):
+        return None
+    
+    names = {}
+    dates = {}
+    with open(events_csv_path, 'r', encoding='utf-8-sig', newline='') as csvfile:
+        for row in csv.DictReader(csvfile):
+            code = (row.get('EventCode') or '').strip()
+            if not code:
+                continue
+            names.setdefault(_event_key(row.get('EventName') or ''), code)
+            try:
+                date = datetime.datetime.strptime((row.get('Date') or '').strip(), '%m/%d/%Y').date().isoformat()
+            except ValueError:
+                continue
+            dates[date] = code if date not in dates else None
+    
+    return {'names': names, 'dates': {date: code for date, code in dates.items() if code}}
+
+def split_bouts(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Remove the fightN* columns from an event document and return its bouts.
+    
+    Args:
+        data: Event document; the fightN* fields are removed in place
+    
+    Returns:
+        Bout dictionaries ordered by N (0 is the main event), each with its 'order'
+    """
+    groups = {}
+    for key in [key for key in data if key.startswith('fight')]:
+        match = _BOUT_COLUMN.fullmatch(key)
+        if match is None:
+            continue
+        value = data.pop(key)
+        groups.setdefault(int(match.group(1)), {})[BOUT_FIELDS[match.group(2)]] = value
+    
+    bouts = []
+    for order in sorted(groups):
+        bout = groups[order]
+        if not bout.get('winner') and not bout.get('loser'):
+            continue
+        bout['order'] = order
+        bout['fighters'] = [name for name in (bout.get('winner'), bout.get('loser')) if name]
+        seconds = clock_seconds(bout.get('time', ''))
+        if seconds is not None:
+            bout['timeSeconds'] = seconds
+        bouts.append(bout)
+    return bouts
+
+def bout_summary(bouts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summary kept on the event document: bout count, main event and finishes by method."""
+    methods = {}
+    for bout in bouts:
+        if bout.get('method'):
+            methods[bout['method']] = methods.get(bout['method'], 0) + 1
+    
+    summary = {'boutCount': len(bouts), 'methodCounts': methods}
+    if bouts:
+        main_event = bouts[0]
+        summary['mainEvent'] = {key: main_event[key] for key in ('winner', 'loser', 'method', 'weightClass')
+                                if key in main_event}
+    return summary
+
+def make_event_bouts_fan_out(event_codes: Optional[Dict[str, Dict[str, str]]] = None
+                             ) -> Callable[[str, Dict[str, Any]], List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Build the fan-out that splits an event document into bout documents.
+    
+    Args:
+        event_codes: Output of load_event_codes, used to add eventCode (omitted if None)
+    
+    Returns:
+        Callable turning (document_id, data) into [(bout_document_id, bout), ...]; the
+        event document is trimmed to its summary fields in place
+    """
+    names = event_codes['names'] if event_codes else {}
+    dates = event_codes['dates'] if event_codes else {}
+    
+    def fan_out(document_id: str, data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+        event_date = parse_event_date(data.get('date', ''))
+        event_code = names.get(_event_key(str(data.get('eventName', ''))))
+        if event_code is None and event_date is not None:
+            event_code = dates.get(event_date.date().isoformat())
+        
+        bouts = split_bouts(data)
+        data.update(bout_summary(bouts))
+        event_fields = {'eventId': document_id}
+        if event_code:
+            data['eventCode'] = event_fields['eventCode'] = event_code
+        if event_date is not None:
+            data['eventDate'] = event_fields['eventDate'] = event_date
+        if data.get('eventName'):
+            event_fields['eventName'] = data['eventName']
+        
+        return [(f"{document_id}/{BOUTS_SUBCOLLECTION}/{bout['order']:02d}", {**event_fields, **bout})
+                for bout in bouts]
+    
+    return fan_out
+
+def event_bouts_fan_out(data_dir: str, log: Callable[[str], None] = print
+                        ) -> Callable[[str, Dict[str, Any]], List[Tuple[str, Dict[str, Any]]]]:
+    """Return the WEBEventData fan-out, resolving event codes from Events.csv when it is present."""
+    event_codes = load_event_codes(os.path.join(data_dir, 'Events.csv'))
+    if event_codes is None:
+        log(f"⚠️  Events.csv not found in {data_dir}; bouts are written without eventCode")
+    return make_event_bouts_fan_out(event_codes)
+
+def main():
+    """Show how WEBEventData rows split into bout documents."""
+    from document_size import estimate_document_size
+    from upload_fighter_data_batch import plan_csv
+    
+    parser = argparse.ArgumentParser(description='Split WEBEventData.csv rows into per-bout documents')
+    parser.add_argument('csv_file_path', nargs='?', default='oldData/WEBEventData.csv', help='Path to WEBEventData.csv')
+    parser.add_argument('--events', help='Path to Events.csv (defaults to the one next to the CSV file)')
+    parser.add_argument('--show', type=int, default=0, metavar='N', help='Print the documents of the first N events')
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.csv_file_path):
+        print(f"❌ CSV file not found: {args.csv_file_path}")
+        sys.exit(1)
+    
+    events_path = args.events or os.path.join(os.path.dirname(args.csv_file_path), 'Events.csv')
+    fan_out = make_event_bouts_fan_out(load_event_codes(events_path))
+    
+    plan, records = plan_csv(args.csv_file_path, categorize=False)
+    events = bouts = coded = wide_bytes = event_bytes = 0
+    for _, values, _ in records:
+        data = plan.transform(values)
+        document_id = str(data.pop('_id', ''))
+        wide_bytes += estimate_document_size('webEventData', document_id, data)
+        children = fan_out(document_id, data)
+        event_bytes += estimate_document_size('webEventData', document_id, data)
+        events += 1
+        bouts += len(children)
+        coded += 'eventCode' in data
+        if events <= args.show:
+            print(json.dumps({'event': data, 'bouts': [bout for _, bout in children]}, indent=2, default=str))
+    
+    print(f"🗓️  {events} events -> {bouts} bouts ({coded} events matched to an eventCode)")
+    if events:
+        print(f"📏 Event documents: {wide_bytes / events:.0f} bytes on average as wide rows, "
+              f"{event_bytes / events:.0f} bytes with bouts split out")
+
+if __name__ == "__main__":
+    main()
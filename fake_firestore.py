@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+In-memory stand-in for the Firestore client used by the upload scripts.
+It implements the small part of the API the uploaders call (collections,
+document references, batches and single-document writes) and can simulate
+commit latency, a backend that throttles writes above a fixed capacity and
+randomly failing commits, so pacing, retry behavior and throughput can be
+exercised without a real project.
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from firestore_client import delete_field
+
+class FakeDocumentReference:
+    """Reference to a document in a FakeFirestore."""
+    
+    def __init__(self, client: 'FakeFirestore', path: str):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+    
+    def set(self, document_data: Dict[str, Any], merge=False):
+        """Write a single document."""
+        self._client._commit([('set', self.path, document_data, merge)])
+    
+    def delete(self):
+        """Delete a single document."""
+        self._client._commit([('delete', self.path, None, False)])
+    
+    def get_data(self) -> Optional[Dict[str, Any]]:
+        """Return the stored fields, or None if the document does not exist."""
+        with self._client._lock:
+            data = self._client.documents.get(self.path)
+            return dict(data) if data is not None else None
+
+class FakeCollectionReference:
+    """Reference to a collection in a FakeFirestore."""
+    
+    def __init__(self, client: 'FakeFirestore', path: str):
+        self._client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+    
+    def document(self, document_id: str) -> FakeDocumentReference:
+        """Return a reference to a document; IDs may contain '/' to address subcollections."""
+        return FakeDocumentReference(self._client, f"{self.path}/{document_id}")
+
+class FakeWriteBatch:
+    """Batch of writes committed atomically."""
+    
+    def __init__(self, client: 'FakeFirestore'):
+        self._client = client
+        self._writes = []
+    
+    def set(self, reference: FakeDocumentReference, document_data: Dict[str, Any], merge=False):
+        self._writes.append(('set', reference.path, document_data, merge))
+    
+    def delete(self, reference: FakeDocumentReference):
+        self._writes.append(('delete', reference.path, None, False))
+    
+    def commit(self):
+        self._client._commit(self._writes)
+
+class FakeFirestore:
+    """
+    In-memory Firestore client.
+    
+    With capacity set, the backend admits at most capacity writes per second
+    (measured over a one-second token bucket) and rejects commits beyond it
+    with ResourceExhausted, the error Firestore returns when a client writes
+    faster than the database can absorb. With failure_rate set, that share
+    of commits fails with ServiceUnavailable and writes nothing.
+    """
+    
+    def __init__(self, latency: float = 0.0, capacity: Optional[float] = None, burst_seconds: float = 1.0,
+                 jitter: float = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Create a fake client.
+        
+        Args:
+            latency: Seconds each commit takes
+            capacity: Writes per second the backend accepts (unlimited if None)
+            burst_seconds: Backend burst allowance, in seconds of writes at capacity
+            jitter: Extra seconds added to each commit, uniformly between 0 and jitter
+            failure_rate: Fraction of commits that fail with a transient error
+            seed: Seed for the jitter and failure draws, for repeatable runs
+        """
+        self.latency = latency
+        self.capacity = capacity
+        self.burst_seconds = burst_seconds
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.documents = {}
+        self.commits = 0
+        self.writes = 0
+        self.throttled_commits = 0
+        self.failed_commits = 0
+        self.active_commits = 0
+        self.peak_commits = 0
+        self._lock = threading.Lock()
+        self._tokens = capacity * burst_seconds if capacity else 0.0
+        self._updated = time.monotonic()
+        self._random = random.Random(seed)
+    
+    def collection(self, collection_path: str) -> FakeCollectionReference:
+        """Return a reference to a collection."""
+        return FakeCollectionReference(self, collection_path)
+    
+    def batch(self) -> FakeWriteBatch:
+        """Return a new write batch."""
+        return FakeWriteBatch(self)
+    
+    def _admit(self, write_count: int) -> bool:
+        """Take write_count tokens from the backend bucket. Caller holds the lock."""
+        if not self.capacity:
+            return True
+        now = time.monotonic()
+        self._tokens = min(self.capacity * self.burst_seconds, self._tokens + (now - self._updated) * self.capacity)
+        self._updated = now
+        if self._tokens < write_count:
+            return False
+        self._tokens -= write_count
+        return True
+    
+    def _commit(self, writes: List[Tuple[str, str, Optional[Dict[str, Any]], Any]]):
+        """Apply a list of writes atomically, or raise if the backend is throttling."""
+        with self._lock:
+            self.active_commits += 1
+            self.peak_commits = max(self.peak_commits, self.active_commits)
+        
+        try:
+            with self._lock:
+                delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+                fail = self.failure_rate and self._random.random() < self.failure_rate
+            if delay:
+                time.sleep(delay)
+            
+            with self._lock:
+                self.commits += 1
+                if fail:
+                    self.failed_commits += 1
+                    from google.api_core import exceptions as api_exceptions
+                    raise api_exceptions.ServiceUnavailable("Injected commit failure")
+                if not self._admit(len(writes)):
+                    self.throttled_commits += 1
+                    from google.api_core import exceptions as api_exceptions
+                    raise api_exceptions.ResourceExhausted("Too much write traffic; slow down")
+                
+                for operation, path, data, merge in writes:
+                    if operation == 'delete':
+                        self.documents.pop(path, None)
+                    elif merge:
+                        self._merge(path, data, merge)
+                    else:
+                        self.documents[path] = dict(data)
+                    self.writes += 1
+        finally:
+            with self._lock:
+                self.active_commits -= 1
+    
+    def _merge(self, path: str, data: Dict[str, Any], merge):
+        """Apply a merge write to the top-level fields named by merge. Caller holds the lock."""
+        document = self.documents.setdefault(path, {})
+        fields = list(data) if merge is True else [getattr(field, 'parts', (field,))[0] for field in merge]
+        deleted = delete_field() if merge is not True else None
+        for field in fields:
+            value = data.get(field)
+            if deleted is not None and value is deleted:
+                document.pop(field, None)
+            else:
+                document[field] = value
+    
+    def collection_documents(self, collection_path: str) -> Dict[str, Dict[str, Any]]:
+        """Return {document_id: fields} for the documents directly inside a collection."""
+        prefix = f"{collection_path}/"
+        with self._lock:
+            return {
+                path[len(prefix):]: dict(data)
+                for path, data in self.documents.items()
+                if path.startswith(prefix) and '/' not in path[len(prefix):]
+            }
+
+def main():
+    """Upload a CSV into a throttling fake backend and report how the write scheduler adapted."""
+    from upload_fighter_data_batch import upload_csv_batch
+    from write_scheduler import WriteScheduler
+    
+    parser = argparse.ArgumentParser(description="Exercise the write scheduler against a throttling in-memory Firestore.")
+    parser.add_argument('csv_file_path', nargs='?', default="oldData/WEBFighterNoData.csv", help="CSV file to upload")
+    parser.add_argument('--capacity', type=float, default=1000.0, help="Writes per second the fake backend accepts")
+    parser.add_argument('--write-rate', type=float, default=2000.0, help="Initial scheduler rate in writes per second")
+    parser.add_argument('--ramp-interval', type=float, default=2.0, help="Seconds between scheduler ramp steps")
+    parser.add_argument('--latency', type=float, default=0.02, help="Seconds each fake commit takes")
+    parser.add_argument('--batch-size', type=int, default=100, help="Maximum documents per batch")
+    args = parser.parse_args()
+    
+    db = FakeFirestore(latency=args.latency, capacity=args.capacity)
+    scheduler = WriteScheduler(args.write_rate, ramp_interval=args.ramp_interval)
+    started = time.perf_counter()
+    summary = upload_csv_batch(
+        db,
+        args.csv_file_path,
+        'fakeCollection',
+        lambda processed_data, row_number: (str(processed_data.pop('_id', f"row_{row_number}")), processed_data),
+        categorize=False,
+        batch_size=args.batch_size,
+        scheduler=scheduler,
+    )
+    elapsed = time.perf_counter() - started
+    
+    print("=" * 60)
+    print(f"📦 {summary.success_count} documents in {elapsed:.2f}s ({summary.success_count / elapsed:.0f} writes/s)")
+    print(f"🚦 Scheduler: {scheduler.describe()}, {scheduler.throttles} throttling errors reported")
+    print(f"🧪 Backend: {db.commits} commits, {db.throttled_commits} throttled, peak {db.peak_commits} concurrent")
+
+if __name__ == "__main__":
+    main()
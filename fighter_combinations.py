@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Sparse strike combinations.
+Combinations.csv has one column per strike combination (~1,190 of them, such
+as ABS__LeftBodyKick_LeftJabHi_RightHookHi) and most cells are empty for any
+given fighter. This module parses the column names into a shared combo
+vocabulary once, stores each fighter's combinations as (combo id, count)
+arrays sorted by frequency, and precomputes the top combinations the
+website shows, so a fighter's combinations document holds only what the
+fighter actually threw or absorbed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fighter_totals import SNAPSHOT_COLLECTION
+
+# Document the vocabulary is published to, in the snapshots collection
+COMBO_VOCABULARY_DOCUMENT = 'comboVocabulary'
+
+# Bump when the combinations layout changes so readers can detect old documents
+COMBINATIONS_VERSION = 1
+
+# Column prefix of combinations absorbed from opponents; other combo columns are thrown
+ABSORBED_PREFIX = 'ABS__'
+COMBO_KINDS = ('thrown', 'absorbed')
+
+# Top combinations precomputed per fighter and kind
+TOP_COMBOS = 10
+
+# useCombinations only shows combos of at least this many strikes that happened more than once
+MIN_DISPLAY_STRIKES = 2
+MIN_DISPLAY_COUNT = 2
+
+# Readable strike names, as in convertToReadable (useCombinations.ts)
+STRIKE_NAMES = {
+    'LeftBodyKick': 'Left Body Kick', 'RightBodyKick': 'Right Body Kick',
+    'LeftHighKick': 'Left High Kick', 'RightHighKick': 'Right High Kick',
+    'LeftHookHi': 'Left Hook To The Head', 'RightHookHi': 'Right Hook To The Head',
+    'LeftHookLo': 'Left Hook To The Body', 'RightHookLo': 'Right Hook To The Body',
+    'LeftStraightHi': 'Left Straight To The Head', 'RightStraightHi': 'Right Straight To The Head',
+    'LeftStraightLo': 'Left Straight To The Body', 'RightStraightLo': 'Right Straight To The Body',
+    'LeftUppercutHi': 'Left Uppercut To The Head', 'RightUppercutHi': 'Right Uppercut To The Head',
+    'LeftUppercutLo': 'Left Uppercut To The Body', 'RightUppercutLo': 'Right Uppercut To The Body',
+    'LeftOverhand': 'Left Overhand', 'RightOverhand': 'Right Overhand',
+    'LeftSpinBackFist': 'Left Spinning Backfist To The Head', 'RightSpinBackFist': 'Right Spinning Backfist To The Head',
+    'LeftElbow': 'Left Elbow', 'RightElbow': 'Right Elbow',
+    'LeftKnee': 'Left Knee', 'RightKnee': 'Right Knee',
+    'LeftHeadKick': 'Left Head Kick', 'RightHeadKick': 'Right Head Kick',
+    'LeftLegKick': 'Left Leg Kick', 'RightLegKick': 'Right Leg Kick',
+    'LeftJabHi': 'Left Jab To The Head', 'RightJabHi': 'Right Jab To The Head',
+    'LeftJabLo': 'Left Jab To The Body', 'RightJabLo': 'Right Jab To The Body',
+    'LeftCross': 'Left Cross', 'RightCross': 'Right Cross',
+    'LeftJab': 'Left Jab', 'RightJab': 'Right Jab',
+    'LeftStraight': 'Left Straight', 'RightStraight': 'Right Straight',
+    'LeftHook': 'Left Hook', 'RightHook': 'Right Hook',
+    'LeftUppercut': 'Left Uppercut', 'RightUppercut': 'Right Uppercut',
+}
+
+def parse_combo_column(column: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Parse a Combinations.csv column name.
+    
+    Args:
+        column: Column name, e.g. "ABS__LeftJabHi_RightHookHi" or "_LeftJabHi_RightHookHi"
+    
+    Returns:
+        Tuple of (kind, strikes), or None for columns that are not combinations (_id, fighterCode)
+    """
+    if column.startswith(ABSORBED_PREFIX):
+        kind, body = 'absorbed', column[len(ABSORBED_PREFIX):]
+    elif column.startswith('_') and column != '_id':
+        kind, body = 'thrown', column
+    else:
+        return None
+    strikes = [strike for strike in body.split('_') if strike.strip()]
+    return (kind, strikes) if strikes else None
+
+def readable_combo(strikes: Sequence[str]) -> str:
+    """Return the display name of a combination, e.g. "Double Left Jab To The Head to Right Overhand"."""
+    groups = []
+    for strike in (STRIKE_NAMES.get(strike, strike) for strike in strikes):
+        if groups and groups[-1][0] == strike:
+            groups[-1][1] += 1
+        else:
+            groups.append([strike, 1])
+    
+    repeat = {2: 'Double', 3: 'Triple'}
+    return ' to '.join(strike if count == 1 else f"{repeat.get(count, f'{count}x')} {strike}" for strike, count in groups)
+
+class ComboVocabulary:
+    """
+    Combination columns of Combinations.csv, numbered in header order.
+    
+    A combo id is the position of its column among the combination
+    columns, so ids stay stable as long as the export's columns do.
+    """
+    
+    def __init__(self, header: Sequence[str]):
+        """
+        Parse the combination columns of a header.
+        
+        Args:
+            header: Combinations.csv header row
+        """
+        self.columns = []
+        self.kinds = []
+        self.lengths = []
+        self.labels = []
+        for column in header:
+            parsed = parse_combo_column(column)
+            if parsed is None:
+                continue
+            kind, strikes = parsed
+            self.columns.append(column)
+            self.kinds.append(kind)
+            self.lengths.append(len(strikes))
+            self.labels.append(readable_combo(strikes))
+        self.ids = {column: combo_id for combo_id, column in enumerate(self.columns)}
+        self.content_hash = hashlib.blake2b(json.dumps(self.columns).encode('utf-8'), digest_size=8).hexdigest()
+    
+    def sparse_document(self, processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace the combination columns of a row with sparse arrays.
+        
+        Args:
+            processed_data: Row with one field per non-empty combination column
+        
+        Returns:
+            Row with the other fields kept and, per kind, comboIds and counts
+            sorted by count (highest first, then by id) and top, the positions
+            in those arrays of the combos the website displays, most frequent first
+        """
+        document = {}
+        combos = {kind: [] for kind in COMBO_KINDS}
+        for field, value in processed_data.items():
+            combo_id = self.ids.get(field)
+            if combo_id is None:
+                document[field] = value
+            elif isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+                combos[self.kinds[combo_id]].append((combo_id, value))
+        
+        for kind, pairs in combos.items():
+            pairs.sort(key=lambda pair: (-pair[1], pair[0]))
+            top = [position for position, (combo_id, count) in enumerate(pairs)
+                   if self.lengths[combo_id] >= MIN_DISPLAY_STRIKES and count >= MIN_DISPLAY_COUNT][:TOP_COMBOS]
+            document[kind] = {'comboIds': [combo_id for combo_id, _ in pairs], 'counts': [count for _, count in pairs],
+                              'top': top}
+        document['comboVocabulary'] = self.content_hash
+        document['comboVersion'] = COMBINATIONS_VERSION
+        return document
+    
+    def unpack(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the combination columns of a sparse document as {column: count} (the inverse of sparse_document)."""
+        return {self.columns[combo_id]: count for kind in COMBO_KINDS
+                for combo_id, count in zip(document.get(kind, {}).get('comboIds', ()), document.get(kind, {}).get('counts', ()))}
+
+def load_combo_vocabulary(csv_file_path: str) -> Optional[ComboVocabulary]:
+    """Read the vocabulary from the header of a Combinations CSV file, or None if the file does not exist."""
+    from upload_fighter_data_batch import iter_csv_records
+    
+    if not os.path.exists(csv_file_path):
+        return None
+    for _, header, _ in iter_csv_records(csv_file_path):
+        return ComboVocabulary(header)
+    return None
+
+def sparse_combinations_enricher(data_dir: str, log: Callable[[str], None] = print) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """Return a transform storing Combinations.csv rows sparsely, or None if the file is missing."""
+    vocabulary = load_combo_vocabulary(os.path.join(data_dir, 'Combinations.csv'))
+    if vocabulary is None:
+        return None
+    log(f"🥊 Parsed {len(vocabulary.columns)} combination columns into the combo vocabulary")
+    return vocabulary.sparse_document
+
+class ComboVocabularyAggregator:
+    """
+    Publish the combo vocabulary with per-combo usage across fighters.
+    
+    The vocabulary is written once per full upload instead of repeating
+    every column name in every fighter's document. It is published before
+    the first sparse document refers to it, and again with the usage
+    counts once every row has been seen.
+    """
+    
+    def __init__(self, vocabulary: ComboVocabulary, collection_name: str = SNAPSHOT_COLLECTION,
+                 document_id: str = COMBO_VOCABULARY_DOCUMENT):
+        """
+        Create an aggregator.
+        
+        Args:
+            vocabulary: Vocabulary the sparse documents were built with
+            collection_name: Collection the vocabulary is published to
+            document_id: ID of the vocabulary document
+        """
+        self.vocabulary = vocabulary
+        self.collection_name = collection_name
+        self.document_id = document_id
+        self.fighters = [0] * len(vocabulary.columns)
+        self.totals = [0] * len(vocabulary.columns)
+        self.documents_seen = 0
+    
+    def add(self, document_id: str, data: Dict[str, Any]):
+        """Count the combinations of one sparse document."""
+        self.documents_seen += 1
+        for kind in COMBO_KINDS:
+            combos = data.get(kind) or {}
+            for combo_id, count in zip(combos.get('comboIds', ()), combos.get('counts', ())):
+                self.fighters[combo_id] += 1
+                self.totals[combo_id] += count
+    
+    def vocabulary_document(self) -> Dict[str, Any]:
+        """Return the vocabulary fields the sparse documents are read with."""
+        vocabulary = self.vocabulary
+        return {
+            'version': COMBINATIONS_VERSION,
+            'contentHash': vocabulary.content_hash,
+            'count': len(vocabulary.columns),
+            'columns': vocabulary.columns,
+            'labels': vocabulary.labels,
+            'kinds': [COMBO_KINDS.index(kind) for kind in vocabulary.kinds],
+            'kindNames': list(COMBO_KINDS),
+            'lengths': vocabulary.lengths,
+        }
+    
+    def leading_documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return the vocabulary document to publish before any sparse document refers to it."""
+        return [(self.collection_name, self.document_id, self.vocabulary_document())]
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return the vocabulary document with usage counts (nothing if no rows were uploaded)."""
+        if not self.documents_seen:
+            return []
+        return [(self.collection_name, self.document_id, {
+            **self.vocabulary_document(),
+            'fighterCounts': self.fighters,
+            'totalCounts': self.totals,
+            'fighters': self.documents_seen,
+        })]
+
+def combo_vocabulary_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                                state_prefix: str = '') -> Optional[ComboVocabularyAggregator]:
+    """Return the vocabulary aggregator for the Combinations.csv in data_dir, or None if it is missing (it keeps no state)."""
+    vocabulary = load_combo_vocabulary(os.path.join(data_dir, 'Combinations.csv'))
+    return ComboVocabularyAggregator(vocabulary) if vocabulary is not None else None
+
+def main():
+    """Compare the flat and sparse combination documents for a Combinations CSV file."""
+    from document_size import estimate_document_size
+    from upload_fighter_data_batch import plan_csv
+    
+    parser = argparse.ArgumentParser(description="Show the size of sparse combination documents.")
+    parser.add_argument('csv_file_path', nargs='?', default="oldData/Combinations.csv", help="Combinations CSV file")
+    args = parser.parse_args()
+    
+    vocabulary = load_combo_vocabulary(args.csv_file_path)
+    if vocabulary is None:
+        print(f"❌ CSV file not found: {args.csv_file_path}")
+        sys.exit(1)
+    
+    plan, records = plan_csv(args.csv_file_path, categorize=False)
+    flat_bytes = sparse_bytes = rows = 0
+    for _, values, _ in records:
+        flat = plan.transform(values)
+        sparse = vocabulary.sparse_document(dict(flat))
+        if vocabulary.unpack(sparse) != {column: value for column, value in flat.items()
+                                         if column in vocabulary.ids and value}:
+            print(f"❌ Sparse document does not round-trip for {flat.get('fighterCode')}")
+            sys.exit(1)
+        flat_bytes += estimate_document_size('fighterData', 'fighter/combinations/combo', flat)
+        sparse_bytes += estimate_document_size('fighterData', 'fighter/combinations/combo', sparse)
+        rows += 1
+    
+    vocabulary_document = ComboVocabularyAggregator(vocabulary)
+    vocabulary_document.documents_seen = rows
+    _, document_id, data = vocabulary_document.documents()[0]
+    print(f"🥊 {len(vocabulary.columns)} combinations, vocabulary document {estimate_document_size(SNAPSHOT_COLLECTION, document_id, data)} bytes")
+    print(f"📦 {rows} fighters: {flat_bytes} bytes flat, {sparse_bytes} bytes sparse "
+          f"({sparse_bytes / flat_bytes:.0%})" if flat_bytes else f"📦 {rows} fighters")
+
+if __name__ == "__main__":
+    main()
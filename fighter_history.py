@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Precomputed per-fighter fight history index.
+The fighter page lists a fighter's bouts by querying fights twice (as
+fighterA and as fighterB), then reading every event and every opponent for
+names, dates and links. The aggregator here joins Fights.csv with Events.csv,
+WEBFightData.csv and the fighter names once at ingest and publishes
+fighterHistory/{fighterCode}: the fighter's bouts newest first, each with its
+opponent, event, date, result, method, round and headline stats, so the
+history renders from one document read.
+
+The index is rebuilt in memory on every run (it is a few hundred bytes per
+bout), but only the fighter documents whose content changed are written;
+adding an event rewrites the histories of the fighters on its card.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from incremental_aggregates import default_state_path, load_state, save_state
+from value_formats import VALUE_FORMATS
+
+# Collection the per-fighter histories are published to
+HISTORY_COLLECTION = 'fighterHistory'
+
+# Bump when the history document layout changes so readers can detect old documents
+HISTORY_VERSION = 1
+
+# Methods that end a fight without a winner; every other result is a fighterA win
+NO_WINNER_RESULTS = {
+    'No Contest': 'nc',
+    'Split Draw': 'draw',
+    'Maj Draw': 'draw',
+    'Draw': 'draw',
+}
+
+# Headline stat -> WEBFightData column suffix, read per corner ('a'/'b' prefix)
+HEADLINE_SIDE_FIELDS = {
+    'knockdowns': 'numofknockdowns',
+    'stuns': 'numofstuns',
+    'takedowns': 'tdmake',
+    'takedownAttempts': 'tdattempt',
+    'submissionAttempts': 'subattempt',
+}
+
+# Rounds of per-round strike columns in WEBFightData (Around1StrikesLanded ... Bround5StrikesLanded)
+STRIKE_ROUNDS = 5
+
+def _number(value: Any) -> Optional[float]:
+    """Return value if it is a number (not a bool), else None."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+def _iso_date(value: Any) -> Optional[str]:
+    """YYYY-MM-DD for an M/D/YYYY string or a datetime, None otherwise."""
+    if hasattr(value, 'date'):
+        return value.date().isoformat()
+    date_format = VALUE_FORMATS['date']
+    match = date_format.pattern.fullmatch(str(value or '').strip())
+    if match is None:
+        return None
+    try:
+        return date_format.parse(match).date().isoformat()
+    except ValueError:
+        return None
+
+def _is_yes(value: Any) -> bool:
+    return value is True or str(value).lower() in ('yes', 'true')
+
+def load_events(csv_file_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the events the history entries link to.
+    
+    Args:
+        csv_file_path: Path to the Events CSV file
+    
+    Returns:
+        Dictionary mapping EventCode to {'eventId', 'eventName', 'date'}; empty if the file is missing
+    """
+    from upload_fighter_data_batch import iter_processed_rows
+    
+    if not os.path.exists(csv_file_path):
+        return {}
+    events = {}
+    for _, data in iter_processed_rows(csv_file_path, categorize=False):
+        code = data.get('EventCode')
+        if code:
+            events[str(code)] = {'eventId': str(data.get('_id') or code), 'eventName': data.get('EventName'),
+                                 'date': _iso_date(data.get('Date'))}
+    return events
+
+def side_stats(data: Dict[str, Any], corner: str) -> Dict[str, float]:
+    """
+    Headline stats of one corner of a WEBFightData row.
+    
+    Args:
+        data: WEBFightData row
+        corner: 'A' or 'B'
+    
+    Returns:
+        Dictionary with strikesLanded, highImpact and the HEADLINE_SIDE_FIELDS stats
+    """
+    prefix = corner.lower()
+    stats = {
+        'strikesLanded': sum(_number(data.get(f"{corner}round{round_number}StrikesLanded")) or 0
+                             for round_number in range(1, STRIKE_ROUNDS + 1)),
+        'highImpact': _number(data.get(f"{corner}HighImpact")) or 0,
+    }
+    for field, suffix in HEADLINE_SIDE_FIELDS.items():
+        stats[field] = _number(data.get(f"{prefix}{suffix}")) or 0
+    return stats
+
+def load_fight_stats(csv_file_path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the headline stats of every tracked fight.
+    
+    WEBFightData's A corner is the fights document's fighterA.
+    
+    Args:
+        csv_file_path: Path to the WEBFightData CSV file
+    
+    Returns:
+        Dictionary mapping fightCode to {'A': stats, 'B': stats, 'names': (A, B), 'date'};
+        empty if the file is missing
+    """
+    from upload_fighter_data_batch import iter_processed_rows
+    
+    if not os.path.exists(csv_file_path):
+        return {}
+    fights = {}
+    for _, data in iter_processed_rows(csv_file_path, categorize=False):
+        code = data.get('fightCode')
+        if code:
+            fights[str(code)] = {'A': side_stats(data, 'A'), 'B': side_stats(data, 'B'),
+                                 'names': (data.get('fighterAName'), data.get('fighterBName')),
+                                 'date': _iso_date(data.get('fightDate'))}
+    return fights
+
+def load_fighters(data_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the fighterData document ID and name of every fighter.
+    
+    Args:
+        data_dir: Directory holding FighterData.csv and FighterNames.csv
+    
+    Returns:
+        Dictionary mapping fighterCode to {'id', 'name'} (either may be missing)
+    """
+    from upload_fighter_data_batch import iter_processed_rows, load_fighter_names
+    
+    fighters = {}
+    names_path = os.path.join(data_dir, 'FighterNames.csv')
+    if os.path.exists(names_path):
+        for code, name in load_fighter_names(names_path).items():
+            fighters[code] = {'name': name}
+    fighters_path = os.path.join(data_dir, 'FighterData.csv')
+    if os.path.exists(fighters_path):
+        for _, data in iter_processed_rows(fighters_path, categorize=False):
+            code = data.get('fighterCode')
+            if code:
+                fighter = fighters.setdefault(str(code), {})
+                fighter['id'] = str(data.get('_id') or code)
+                if data.get('fighterName') and 'name' not in fighter:
+                    fighter['name'] = data['fighterName']
+    return fighters
+
+def history_document_id(fighter_code: str) -> str:
+    """Document ID of a fighter's history (fighterCodes may contain spaces, never slashes)."""
+    return fighter_code.replace('/', '-')
+
+def _document_hash(document: Dict[str, Any]) -> str:
+    encoded = json.dumps(document, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).hexdigest()
+
+class FighterHistoryAggregator:
+    """
+    Collect fights documents during an upload and build the per-fighter histories.
+    
+    Each fight adds one entry to the history of each of its fighters,
+    oriented from that fighter's side: result, opponent, and the fighter's
+    and opponent's headline stats. documents() returns only the histories
+    that differ from the last published version (tracked in a local state
+    file); a fighter whose fights all disappeared is published once with an
+    empty list, then forgotten.
+    """
+    
+    def __init__(self, events: Dict[str, Dict[str, Any]], fight_stats: Dict[str, Dict[str, Any]],
+                 fighters: Dict[str, Dict[str, Any]], collection_name: str = HISTORY_COLLECTION,
+                 state_path: Optional[str] = None, log: Callable[[str], None] = print):
+        """
+        Create an aggregator.
+        
+        Args:
+            events: Output of load_events
+            fight_stats: Output of load_fight_stats
+            fighters: Output of load_fighters
+            collection_name: Collection the histories are published to
+            state_path: State file of published digests (defaults to one for this index)
+            log: Function used to print progress messages
+        """
+        self.events = events
+        self.fight_stats = fight_stats
+        self.fighters = fighters
+        self.collection_name = collection_name
+        self.state_path = state_path or default_state_path(HISTORY_COLLECTION)
+        self.log = log
+        self.state = load_state(self.state_path)
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.names: Dict[str, str] = {}
+        self.fights = 0
+        self.pending: Dict[str, str] = {}
+    
+    def _name(self, fighter_code: str, tracked_name: Any) -> str:
+        return self.fighters.get(fighter_code, {}).get('name') or tracked_name or fighter_code
+    
+    def add(self, document_id: str, data: Dict[str, Any]):
+        """Add a fights document to the histories of both of its fighters."""
+        fighter_a, fighter_b = data.get('fighterA'), data.get('fighterB')
+        if not fighter_a or not fighter_b:
+            return
+        fighter_a, fighter_b = str(fighter_a), str(fighter_b)
+        fight_code = str(data.get('fightCode') or document_id)
+        event_code = str(data.get('eventCode') or '')
+        event = self.events.get(event_code, {})
+        tracked = self.fight_stats.get(fight_code)
+        names = tracked['names'] if tracked else (None, None)
+        no_winner = NO_WINNER_RESULTS.get(str(data.get('methodOfFinish', '')))
+        
+        bout = {
+            'fightId': document_id,
+            'fightCode': fight_code,
+            'eventCode': event_code,
+            'eventId': event.get('eventId'),
+            'eventName': event.get('eventName') or event_code,
+            'date': event.get('date') or (tracked['date'] if tracked else None),
+            'weightClass': data.get('weightClass'),
+            'method': data.get('methodOfFinish'),
+            'round': data.get('actualRounds'),
+            'time': data.get('finalRoundTime'),
+            'scheduledRounds': data.get('scheduledRounds'),
+            'isTitleFight': _is_yes(data.get('isTitleFight')),
+        }
+        sides = ((fighter_a, 'A', fighter_b, 'B', names[1], 'win'), (fighter_b, 'B', fighter_a, 'A', names[0], 'loss'))
+        for fighter_code, corner, opponent_code, opponent_corner, opponent_name, result in sides:
+            entry = dict(bout)
+            entry.update({
+                'corner': corner,
+                'result': no_winner or result,
+                'opponentCode': opponent_code,
+                'opponentId': self.fighters.get(opponent_code, {}).get('id'),
+                'opponentName': self._name(opponent_code, opponent_name),
+                'difficulty': data.get(f"fighter{corner}Difficulty"),
+                'fighterStats': tracked[corner] if tracked else None,
+                'opponentStats': tracked[opponent_corner] if tracked else None,
+            })
+            self.entries.setdefault(fighter_code, []).append(entry)
+        
+        self.names.setdefault(fighter_a, self._name(fighter_a, names[0]))
+        self.names.setdefault(fighter_b, self._name(fighter_b, names[1]))
+        self.fights += 1
+    
+    def history(self, fighter_code: str) -> Dict[str, Any]:
+        """History document of one fighter, bouts newest first (undated bouts last)."""
+        entries = sorted(self.entries.get(fighter_code, []), key=lambda entry: entry['fightCode'])
+        entries.sort(key=lambda entry: entry['date'] or '', reverse=True)
+        record = {'wins': 0, 'losses': 0, 'draws': 0, 'noContests': 0}
+        result_fields = {'win': 'wins', 'loss': 'losses', 'draw': 'draws', 'nc': 'noContests'}
+        for entry in entries:
+            record[result_fields[entry['result']]] += 1
+        return {
+            'version': HISTORY_VERSION,
+            'fighterCode': fighter_code,
+            'fighterName': self.names.get(fighter_code, fighter_code),
+            'fightCount': len(entries),
+            'record': record,
+            'fights': entries,
+        }
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return the (collection, document_id, data) of every history that changed since it was last published."""
+        published = self.state['published']
+        self.pending = {}
+        documents = []
+        for fighter_code in sorted(set(self.entries) | set(published)):
+            document = self.history(fighter_code)
+            digest = _document_hash(document)
+            if published.get(fighter_code) != digest:
+                self.pending[fighter_code] = digest
+                documents.append((self.collection_name, history_document_id(fighter_code), document))
+        
+        self.log(f"📜 {self.collection_name}: {self.fights} fights, {len(documents)} of {len(self.entries)} "
+                 f"fighter histories changed")
+        return documents
+    
+    def published(self, failed: Set[Tuple[str, str]]):
+        """Record the histories that were written and save the state."""
+        published = self.state['published']
+        for fighter_code, digest in self.pending.items():
+            if (self.collection_name, history_document_id(fighter_code)) in failed:
+                continue
+            if fighter_code in self.entries:
+                published[fighter_code] = digest
+            else:
+                # Emptied histories are published once, then forgotten
+                published.pop(fighter_code, None)
+        self.pending = {}
+        save_state(self.state_path, self.state)
+
+def fighter_history_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                               state_prefix: str = '') -> FighterHistoryAggregator:
+    """Return a history aggregator for the fights spec, joined with the events, fight stats and fighters in data_dir."""
+    return FighterHistoryAggregator(load_events(os.path.join(data_dir, 'Events.csv')),
+                                    load_fight_stats(os.path.join(data_dir, 'WEBFightData.csv')),
+                                    load_fighters(data_dir), state_path=default_state_path(state_prefix + HISTORY_COLLECTION),
+                                    log=log)
+
+def build_fighter_history_from_csv(data_dir: str, state_path: Optional[str] = None,
+                                   log: Callable[[str], None] = print) -> FighterHistoryAggregator:
+    """
+    Build the histories directly from the CSV files in data_dir.
+    
+    Args:
+        data_dir: Directory holding Fights.csv and the joined files
+        state_path: State file of published digests
+        log: Function used to print progress messages
+    
+    Returns:
+        Aggregator holding every fight in Fights.csv
+    """
+    from upload_fighter_data_batch import build_fighter_document, iter_processed_rows
+    
+    aggregator = FighterHistoryAggregator(load_events(os.path.join(data_dir, 'Events.csv')),
+                                          load_fight_stats(os.path.join(data_dir, 'WEBFightData.csv')),
+                                          load_fighters(data_dir), state_path=state_path, log=log)
+    for row_number, processed_data in iter_processed_rows(os.path.join(data_dir, 'Fights.csv'), categorize=False):
+        document_id = str(processed_data.get('fightCode') or processed_data.get('_id') or row_number)
+        _, data = build_fighter_document(processed_data, row_number, {})
+        aggregator.add(document_id, data)
+    return aggregator
+
+def main():
+    """Build the history documents from the CSV files and publish the changed ones (or summarize with --dry-run)."""
+    from document_size import estimate_document_size
+    from firestore_client import firestore_client
+    from upload_fighter_data_batch import publish_derived_documents
+    
+    parser = argparse.ArgumentParser(description="Publish the precomputed per-fighter fight history index.")
+    parser.add_argument('--data-dir', default='oldData', help="Directory holding Fights.csv, Events.csv and WEBFightData.csv")
+    parser.add_argument('--dry-run', action='store_true', help="Print what would be written without writing or saving state")
+    parser.add_argument('--show', metavar='FIGHTER_CODE', help="Print one fighter's history")
+    args = parser.parse_args()
+    
+    if not os.path.exists(os.path.join(args.data_dir, 'Fights.csv')):
+        print(f"❌ CSV file not found: {os.path.join(args.data_dir, 'Fights.csv')}")
+        sys.exit(1)
+    
+    aggregator = build_fighter_history_from_csv(args.data_dir)
+    documents = aggregator.documents()
+    histories = [aggregator.history(fighter_code) for fighter_code in aggregator.entries]
+    sizes = [estimate_document_size(HISTORY_COLLECTION, history_document_id(history['fighterCode']), history)
+             for history in histories]
+    untracked = sum(1 for history in histories for entry in history['fights'] if entry['fighterStats'] is None)
+    undated = sum(1 for history in histories for entry in history['fights'] if entry['date'] is None)
+    print(f"🥊 {aggregator.fights} fights, {len(histories)} fighters, largest history {max(sizes, default=0) / 1024:.1f} KiB")
+    print(f"📊 {untracked} bout entries without WEBFightData stats, {undated} without a date")
+    
+    if args.show:
+        if args.show not in aggregator.entries:
+            print(f"❌ No fights for {args.show}")
+            sys.exit(1)
+        history = aggregator.history(args.show)
+        record = history['record']
+        print(f"📜 {history['fighterName']} ({record['wins']}-{record['losses']}-{record['draws']}, "
+              f"{record['noContests']} NC)")
+        for entry in history['fights']:
+            stats = entry['fighterStats'] or {}
+            opponent_stats = entry['opponentStats'] or {}
+            print(f"   {entry['date'] or '????-??-??'} {entry['result']:<4} vs {entry['opponentName']:<28} "
+                  f"{entry['method']} R{entry['round']} {entry['time']}  {entry['eventName']}"
+                  + (f"  strikes {stats['strikesLanded']:g}-{opponent_stats['strikesLanded']:g}" if stats else ''))
+    
+    if args.dry_run:
+        return
+    
+    published, errors = publish_derived_documents(firestore_client(), [aggregator])
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Precomputed all-pairs fighter matchups per weight class.
+WEBFighterMatchup.csv holds a single hand-built comparison; every other one
+is assembled on the client from two full fighter documents. This module
+builds one stat matrix per weight class and computes every same-division
+pairing at once with NumPy broadcasting (stat deltas, grade differential,
+stance edge and advantage count), then publishes one compact document per
+fighter holding its row of the matchup matrix as packed int16 values, plus
+one roster document per weight class giving the opponent order. Only the
+documents that changed since they were last published are written again.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from document_size import estimate_document_size
+from incremental_aggregates import default_state_path, load_state, save_state
+
+# Collections of the per-fighter matchup rows and of the per-weight-class rosters
+MATCHUPS_COLLECTION = 'fighterMatchups'
+DIVISIONS_COLLECTION = 'fighterMatchupDivisions'
+
+# Bump when the document layout changes so readers can detect old documents
+MATCHUPS_VERSION = 1
+
+# Packed values are little-endian int16 holding value * MATCHUP_SCALE; MISSING_VALUE marks no data
+MATCHUP_SCALE = 10
+MISSING_VALUE = -32768
+
+# Compared stats: (name used in WEBFighterMatchup.csv, webFighterData field, higher is better)
+MATCHUP_STATS = [
+    ('FighterGrade', 'FighterGrade', True),
+    ('StrikingGrade', 'StrikingGrade', True),
+    ('GrapplingGrade', 'GrapplingGrade', True),
+    ('DefensiveGrade', 'DefensiveGrade', True),
+    ('PunchRate', 'PunchLandRate', True),
+    ('KickRate', 'KickLandRate', True),
+    ('TDRate', 'TakedownRate', True),
+    ('SUBRate', 'SubAttemptsPer25', True),
+    ('KnockdownRate', 'KnockdownsPer25', True),
+    ('StunRate', 'StunsPer25', True),
+    ('TimesKnockedDownRate', 'TimesKnockedDownPer25', False),
+    ('TimesStunnedRate', 'TimesStunnedPer25', False),
+    ('Height', 'height', True),
+    ('Reach', 'reach', True),
+]
+
+# Stats averaged into the grade differential
+GRADE_STATS = ('FighterGrade', 'StrikingGrade', 'GrapplingGrade', 'DefensiveGrade')
+
+# Stances with a RecordAgainst<Stance> column, in matrix order
+STANCES = ('Orthodox', 'Southpaw', 'Switch')
+
+# Values stored per opponent: the stat deltas (A - B) followed by these summaries
+SUMMARY_FIELDS = ('gradeEdge', 'stanceEdge', 'advantages')
+MATCHUP_FIELDS = [name for name, _, _ in MATCHUP_STATS] + list(SUMMARY_FIELDS)
+
+# Fighters per block of the pairwise computation, bounding memory for large divisions
+BLOCK_ROWS = 256
+
+def _stat(value: Any) -> float:
+    """Return a numeric field as a float, or NaN when it is missing or not a number."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return np.nan
+    return float(value)
+
+def _win_rate(record: Any) -> float:
+    """Win share of a 'W-L' record string, or NaN when there are no fights."""
+    try:
+        wins, losses = (int(part) for part in str(record).split('-'))
+    except ValueError:
+        return np.nan
+    return wins / (wins + losses) if wins + losses else np.nan
+
+class WeightClassMatrix:
+    """Stat matrix of one weight class."""
+    
+    def __init__(self, weight_class: str, fighters: List[Dict[str, Any]]):
+        """
+        Build the matrices for a division.
+        
+        Args:
+            weight_class: Weight class name
+            fighters: Fighter documents of the division, sorted by fighterCode
+        """
+        self.weight_class = weight_class
+        self.codes = [fighter['fighterCode'] for fighter in fighters]
+        self.names = [fighter.get('fighterName', '') for fighter in fighters]
+        self.stats = np.array([[_stat(fighter.get(field)) for _, field, _ in MATCHUP_STATS] for fighter in fighters],
+                              dtype=np.float32).reshape(len(fighters), len(MATCHUP_STATS))
+        self.win_rates = np.array([[_win_rate(fighter.get(f"RecordAgainst{stance}")) for stance in STANCES]
+                                   for fighter in fighters], dtype=np.float32).reshape(len(fighters), len(STANCES))
+        self.stances = np.array([STANCES.index(fighter.get('1Stance')) if fighter.get('1Stance') in STANCES else -1
+                                 for fighter in fighters], dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.codes)
+    
+    def block(self, start: int, stop: int) -> np.ndarray:
+        """
+        Matchup values of fighters start..stop against every fighter of the division.
+        
+        Args:
+            start: First row (fighter A)
+            stop: Row after the last one
+        
+        Returns:
+            Array of shape (stop - start, n, len(MATCHUP_FIELDS)): stat deltas A - B, then
+            the grade differential, the stance edge and A's advantage count; NaN where
+            either side is missing a value
+        """
+        stats = self.stats
+        deltas = stats[start:stop, None, :] - stats[None, :, :]
+        
+        # Positive when A is better, whichever direction the stat counts in
+        direction = np.array([1.0 if higher else -1.0 for _, _, higher in MATCHUP_STATS], dtype=np.float32)
+        oriented = deltas * direction
+        # NaN compares False both ways, so missing stats count for neither side
+        advantages = (oriented > 0).sum(axis=2) - (oriented < 0).sum(axis=2)
+        
+        grade_columns = [index for index, (name, _, _) in enumerate(MATCHUP_STATS) if name in GRADE_STATS]
+        grades = deltas[:, :, grade_columns]
+        known = ~np.isnan(grades)
+        grade_counts = known.sum(axis=2)
+        grade_edge = np.full(grade_counts.shape, np.nan, dtype=np.float32)
+        np.divide(np.where(known, grades, 0.0).sum(axis=2), grade_counts, out=grade_edge, where=grade_counts > 0)
+        
+        # A's win rate against B's stance minus B's win rate against A's stance, in points
+        stances = self.stances
+        stance_index = np.where(stances >= 0, stances, 0)
+        a_against_b = self.win_rates[start:stop, :][:, stance_index]
+        a_against_b[:, stances < 0] = np.nan
+        b_against_a = self.win_rates[:, stance_index[start:stop]].T
+        b_against_a[stances[start:stop] < 0, :] = np.nan
+        stance_edge = (a_against_b - b_against_a) * 100
+        
+        return np.concatenate([deltas, grade_edge[:, :, None], stance_edge[:, :, None],
+                               advantages[:, :, None].astype(np.float32)], axis=2)
+    
+    def packed_rows(self) -> Iterator[Tuple[int, bytes]]:
+        """
+        Yield each fighter's row of the matchup matrix as packed bytes.
+        
+        Yields:
+            Tuple of (fighter_index, values) where values holds len(self) x len(MATCHUP_FIELDS)
+            little-endian int16 numbers (value * MATCHUP_SCALE, MISSING_VALUE where
+            a side has no data), in roster order; the fighter's own row is all missing
+        """
+        count = len(self)
+        for start in range(0, count, BLOCK_ROWS):
+            stop = min(start + BLOCK_ROWS, count)
+            values = self.block(start, stop) * MATCHUP_SCALE
+            missing = np.isnan(values)
+            values[missing] = 0
+            packed = np.clip(np.floor(values + 0.5), MISSING_VALUE + 1, 32767).astype('<i2')
+            packed[missing] = MISSING_VALUE
+            packed[np.arange(stop - start), np.arange(start, stop), :] = MISSING_VALUE
+            for offset in range(stop - start):
+                yield start + offset, packed[offset].tobytes()
+
+def matchup_document_id(name: str) -> str:
+    """Document ID of a fighter's matchup row or a division's roster (names may contain slashes)."""
+    return name.replace('/', '-')
+
+def _document_hash(document: Dict[str, Any]) -> str:
+    encoded = json.dumps(document, sort_keys=True, separators=(',', ':'),
+                         default=lambda value: value.hex() if isinstance(value, bytes) else str(value))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).hexdigest()
+
+def unpack_matchup(values: bytes, position: int) -> Dict[str, Optional[float]]:
+    """
+    Decode one opponent's matchup from a packed row.
+    
+    Args:
+        values: The 'values' field of a fighterMatchups document
+        position: The opponent's index in its division's fighterCodes
+    
+    Returns:
+        Dictionary mapping MATCHUP_FIELDS to values (None where a side has no data)
+    """
+    row = np.frombuffer(values, dtype='<i2').reshape(-1, len(MATCHUP_FIELDS))[position]
+    return {field: None if value == MISSING_VALUE else value / MATCHUP_SCALE
+            for field, value in zip(MATCHUP_FIELDS, row.tolist())}
+
+class FighterMatchupsAggregator:
+    """
+    Collect fighter documents during an upload and build the matchup documents.
+    
+    Each weight class gets fighterMatchupDivisions/{weightClass} listing its
+    fighterCodes (the opponent order), the value fields and the scale. Each
+    fighter gets fighterMatchups/{fighterCode} whose 'values' bytes hold its
+    row of the division's matchup matrix, so a comparison costs one read of
+    the fighter's document plus the (cacheable) roster. B against A is the
+    same row negated. documents() returns only the documents that differ
+    from the last published version (tracked in a local state file); a
+    change to one fighter rewrites its division, not every division.
+    """
+    
+    def __init__(self, collection_name: str = MATCHUPS_COLLECTION, divisions_collection: str = DIVISIONS_COLLECTION,
+                 weight_field: str = 'weight', state_path: Optional[str] = None, log: Callable[[str], None] = print):
+        """
+        Create an aggregator.
+        
+        Args:
+            collection_name: Collection the per-fighter rows are published to
+            divisions_collection: Collection the weight class rosters are published to
+            weight_field: Fighter field holding the weight class
+            state_path: State file of published digests (defaults to one for the matchups)
+            log: Function used to print progress messages
+        """
+        self.collection_name = collection_name
+        self.divisions_collection = divisions_collection
+        self.weight_field = weight_field
+        self.state_path = state_path or default_state_path(MATCHUPS_COLLECTION)
+        self.log = log
+        self.state = load_state(self.state_path)
+        self.fighters: Dict[str, Dict[str, Any]] = {}
+        self.pending: Dict[str, Optional[str]] = {}
+    
+    def add(self, document_id: str, data: Dict[str, Any]):
+        """Record the fields a fighter document contributes to its matchups."""
+        code = data.get('fighterCode') or document_id
+        weight_class = data.get(self.weight_field)
+        if not weight_class:
+            return
+        fields = {field: data.get(field) for _, field, _ in MATCHUP_STATS}
+        fields.update({f"RecordAgainst{stance}": data.get(f"RecordAgainst{stance}") for stance in STANCES})
+        fields.update({'fighterCode': str(code), 'fighterName': data.get('fighterName', ''),
+                       '1Stance': data.get('1Stance'), 'weightClass': str(weight_class)})
+        self.fighters[str(code)] = fields
+    
+    def matrices(self) -> List[WeightClassMatrix]:
+        """Return one stat matrix per weight class, in name order."""
+        divisions = {}
+        for code in sorted(self.fighters):
+            fighter = self.fighters[code]
+            divisions.setdefault(fighter['weightClass'], []).append(fighter)
+        return [WeightClassMatrix(weight_class, fighters) for weight_class, fighters in sorted(divisions.items())]
+    
+    def all_documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Return every roster and matchup document, changed or not.
+        
+        Returns:
+            List of (collection, document_id, data) tuples
+        """
+        documents = []
+        for matrix in self.matrices():
+            documents.append((self.divisions_collection, matchup_document_id(matrix.weight_class), {
+                'version': MATCHUPS_VERSION,
+                'weightClass': matrix.weight_class,
+                'fighterCodes': matrix.codes,
+                'fighterNames': matrix.names,
+                'fields': MATCHUP_FIELDS,
+                'scale': MATCHUP_SCALE,
+                'missing': MISSING_VALUE,
+            }))
+            for index, values in matrix.packed_rows():
+                documents.append((self.collection_name, matchup_document_id(matrix.codes[index]), {
+                    'version': MATCHUPS_VERSION,
+                    'fighterCode': matrix.codes[index],
+                    'fighterName': matrix.names[index],
+                    'weightClass': matrix.weight_class,
+                    'position': index,
+                    'values': values,
+                }))
+        return documents
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return the (collection, document_id, data) of every document that changed since it was last published."""
+        published = self.state['published']
+        self.pending = {}
+        documents = []
+        all_documents = self.all_documents()
+        for collection_name, document_id, data in all_documents:
+            key = f"{collection_name}/{document_id}"
+            digest = _document_hash(data)
+            if published.get(key) != digest:
+                self.pending[key] = digest
+                documents.append((collection_name, document_id, data))
+        # Fighters and divisions that are gone are forgotten, so they are written again if they return
+        current = {f"{collection_name}/{document_id}" for collection_name, document_id, _ in all_documents}
+        self.pending.update((key, None) for key in published if key not in current)
+        
+        self.log(f"🥊 {self.collection_name}: {len(documents)} of {len(all_documents)} matchup documents changed")
+        return documents
+    
+    def published(self, failed: Set[Tuple[str, str]]):
+        """Record the documents that were written and save the state."""
+        published = self.state['published']
+        for key, digest in self.pending.items():
+            if tuple(key.split('/', 1)) in failed:
+                continue
+            if digest is None:
+                published.pop(key, None)
+            else:
+                published[key] = digest
+        self.pending = {}
+        save_state(self.state_path, self.state)
+
+def fighter_matchups_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                                state_prefix: str = '') -> FighterMatchupsAggregator:
+    """Return a matchups aggregator for an ingest spec, keeping its published digests under the run prefix."""
+    return FighterMatchupsAggregator(state_path=default_state_path(state_prefix + MATCHUPS_COLLECTION), log=log)
+
+def build_fighter_matchups_from_csv(csv_file_path: str, state_path: Optional[str] = None) -> FighterMatchupsAggregator:
+    """
+    Build the matchups directly from WEBFighterData.csv.
+    
+    Rows are normalized with the display formats the webFighterData spec
+    uses, so percentages and heights compare as numbers.
+    
+    Args:
+        csv_file_path: Path to the WEBFighterData CSV file
+        state_path: State file of published digests
+    
+    Returns:
+        Aggregator holding every fighter in the file
+    """
+    from upload_fighter_data_batch import build_fighter_document, plan_csv
+    from value_formats import DISPLAY_FORMATS, resolve_formats
+    
+    aggregator = FighterMatchupsAggregator(state_path=state_path)
+    plan, records = plan_csv(csv_file_path, categorize=False, formats=resolve_formats(DISPLAY_FORMATS))
+    for row_number, values, _ in records:
+        document_id, data = build_fighter_document(plan.transform(values), row_number, {})
+        aggregator.add(document_id, data)
+    return aggregator
+
+def synthetic_aggregator(fighter_count: int, weight_classes: int = 1, seed: int = 0) -> FighterMatchupsAggregator:
+    """Return an aggregator holding random fighters, for timing large rosters."""
+    rng = np.random.default_rng(seed)
+    aggregator = FighterMatchupsAggregator()
+    for number in range(fighter_count):
+        data = {field: float(rng.uniform(0, 100)) for _, field, _ in MATCHUP_STATS}
+        data.update({f"RecordAgainst{stance}": f"{rng.integers(0, 6)}-{rng.integers(0, 6)}" for stance in STANCES})
+        data.update({'fighterCode': f"Fighter{number:06d}", '1Stance': STANCES[number % len(STANCES)],
+                     'weight': f"Division{number % weight_classes}"})
+        aggregator.add(data['fighterCode'], data)
+    return aggregator
+
+def main():
+    """Build the matchup documents from the CSV and publish the changed ones (or print a summary with --dry-run)."""
+    from firestore_client import firestore_client
+    from upload_fighter_data_batch import publish_derived_documents
+    
+    parser = argparse.ArgumentParser(description="Publish precomputed all-pairs fighter matchups per weight class.")
+    parser.add_argument('csv_file_path', nargs='?', default="oldData/WEBFighterData.csv", help="WEBFighterData CSV file")
+    parser.add_argument('--dry-run', action='store_true', help="Print a summary without writing or saving state")
+    parser.add_argument('--show', nargs=2, metavar=('FIGHTER_A', 'FIGHTER_B'), help="Print one matchup by fighterCode")
+    parser.add_argument('--synthetic', type=int, metavar='N', help="Time a random roster of N fighters instead of the CSV")
+    parser.add_argument('--weight-classes', type=int, default=1, help="Divisions of the synthetic roster")
+    args = parser.parse_args()
+    
+    started = time.perf_counter()
+    if args.synthetic:
+        aggregator = synthetic_aggregator(args.synthetic, args.weight_classes)
+    elif not os.path.exists(args.csv_file_path):
+        print(f"❌ CSV file not found: {args.csv_file_path}")
+        sys.exit(1)
+    else:
+        aggregator = build_fighter_matchups_from_csv(args.csv_file_path)
+    loaded = time.perf_counter()
+    documents = aggregator.all_documents()
+    computed = time.perf_counter()
+    
+    rosters = [data for collection, _, data in documents if collection == DIVISIONS_COLLECTION]
+    pairs = sum(len(roster['fighterCodes']) * (len(roster['fighterCodes']) - 1) // 2 for roster in rosters)
+    total_bytes = sum(estimate_document_size(collection, document_id, data) for collection, document_id, data in documents)
+    largest = max((estimate_document_size(collection, document_id, data) for collection, document_id, data in documents), default=0)
+    print(f"🥊 {len(aggregator.fighters)} fighters, {pairs} matchups in {len(rosters)} weight classes")
+    print(f"📄 {len(documents)} documents, {total_bytes / 1024:.0f} KiB, largest {largest / 1024:.0f} KiB "
+          f"(load {loaded - started:.2f}s, compute {computed - loaded:.2f}s)")
+    
+    if args.show:
+        fighter_a, fighter_b = args.show
+        rows = {document_id: data for collection, document_id, data in documents if collection == MATCHUPS_COLLECTION}
+        row_a, row_b = rows.get(matchup_document_id(fighter_a)), rows.get(matchup_document_id(fighter_b))
+        if row_a is None or row_b is None or row_a['weightClass'] != row_b['weightClass']:
+            print(f"❌ No matchup for {fighter_a} vs {fighter_b} (different weight classes or unknown codes)")
+            sys.exit(1)
+        for field, value in unpack_matchup(row_a['values'], row_b['position']).items():
+            print(f"   {field}: {value}")
+    
+    if args.synthetic:
+        return
+    if args.dry_run:
+        aggregator.documents()
+        return
+    
+    published, errors = publish_derived_documents(firestore_client(), [aggregator])
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
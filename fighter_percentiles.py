@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Per-weight-class stat distributions and fighter percentile ranks.
+The stat search downloads the whole fighterData collection to filter and
+rank fighters, and the ratings compare fighters only against weight-class
+means. This module computes, in one vectorized pass per weight class, a
+quantile sketch (every 1%) of every numeric fighter stat and each fighter's
+percentile rank within their division. The ranks are written into the
+uploaded fighterData documents as a 'percentiles' map, and the sketches are
+published as one compact document per weight class, so filters and "top X%
+in division" badges need no full-collection read. Only declared stats are
+ranked (percentile_fields()): the categorized fighterData stats, the
+weight-class totals and the top-level grades, never identifiers or the
+ratings and ranks added at ingest.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from incremental_aggregates import FIGHTER_TOTAL_FIELDS, fighter_stat_values, group_code
+
+# Collection the per-weight-class distribution tables are published to
+DISTRIBUTIONS_COLLECTION = 'fighterStatDistributions'
+
+# Bump when the distribution document layout or the rank definition changes
+PERCENTILES_VERSION = 1
+
+# Quantile levels of the sketch, in percent (0 = minimum, 100 = maximum)
+QUANTILE_STEP = 1
+QUANTILE_LEVELS = np.arange(0, 100 + QUANTILE_STEP, QUANTILE_STEP, dtype=np.float64)
+
+# Decimal places of the percentile ranks stored on fighter documents
+RANK_DECIMALS = 1
+
+# Fighter field holding the division
+WEIGHT_FIELD = 'weightClass'
+
+# Top-level fighterData stats ranked besides the category maps and FIGHTER_TOTAL_FIELDS
+# (the numeric fields of the website's Fighter type)
+FIGHTER_SCORE_FIELDS = (
+    'AdjustedAge', 'CardioGrade', 'CenterOctagon', 'ChinGrade', 'ClutchGrade', 'DamageTaken', 'DefensiveGrade',
+    'FighterConsistency', 'FighterGrade', 'FighterMomentum', 'FighterOutput', 'FightsTracked', 'GrapplingGrade',
+    'HiMagFightsTracked', 'HiMagLeftHook', 'HiMagLeftJab', 'HiMagLeftStraight', 'HiMagLeftUppercut', 'HiMagRightHook',
+    'HiMagRightJab', 'HiMagRightStraight', 'HiMagRightUppercut', 'KickingGrade', 'MinutesTracked', 'NumberOfKnockDowns',
+    'NumberOfStuns', 'OffensiveGrade', 'PunchingGrade', 'PushedBackToCage', 'PushingAgainstCage', 'RoundsTracked',
+    'StrengthOfSchedule', 'StrikerMatchup', 'StrikingGrade', 'SubmissionDefenseGrade', 'SubmissionGrade',
+    'TakedownDefenseGrade', 'TakedownEfficiency', 'TimesKnockedDownAA', 'Total23FightsTracked', 'TotalComboMinutes',
+    'TotalPositionPoints', 'WrestlerMatchup',
+)
+
+_PERCENTILES_CACHE = {}
+_PERCENTILES_LOCK = threading.Lock()
+
+def percentile_fields() -> Tuple[str, ...]:
+    """Stats ranked within each division: every categorized fighterData stat, FIGHTER_TOTAL_FIELDS and FIGHTER_SCORE_FIELDS."""
+    from upload_fighter_data_batch import FIELD_CATEGORY
+    
+    return tuple(sorted(set(FIELD_CATEGORY) | set(FIGHTER_TOTAL_FIELDS) | set(FIGHTER_SCORE_FIELDS)))
+
+class DivisionDistribution:
+    """Sorted stat matrix, quantile sketch and percentile ranks of one weight class."""
+    
+    def __init__(self, weight_class: str, codes: List[str], values: np.ndarray, fields: List[str]):
+        """
+        Compute the sketch and ranks.
+        
+        Args:
+            weight_class: Weight class name
+            codes: fighterCodes, one per row of values
+            values: (fighters, fields) matrix, NaN where a fighter lacks a stat
+            fields: Stat names, one per column of values
+        """
+        self.weight_class = weight_class
+        self.codes = codes
+        
+        # Stats nobody in the division has are left out of its table
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
+        present = counts > 0
+        self.fields = [field for field, keep in zip(fields, present) if keep]
+        self.counts = counts[present]
+        self.values = values[:, present]
+        
+        # NaN sorts last, so each column's first count entries are its values in order
+        self.sorted = np.sort(self.values, axis=0)
+        self.quantiles = self._sketch()
+        self.ranks = self._ranks()
+    
+    def _sketch(self) -> np.ndarray:
+        """Linearly interpolated quantiles (numpy's default method) of every column, shape (levels, fields)."""
+        if not self.fields:
+            return np.empty((len(QUANTILE_LEVELS), 0))
+        positions = QUANTILE_LEVELS[:, None] / 100 * (self.counts[None, :] - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, self.counts[None, :] - 1)
+        low_values = np.take_along_axis(self.sorted, lower, axis=0)
+        high_values = np.take_along_axis(self.sorted, upper, axis=0)
+        return low_values + (high_values - low_values) * (positions - lower)
+    
+    def _ranks(self) -> np.ndarray:
+        """
+        Percentile rank of every fighter in every stat: the share of the
+        division below the fighter, counting ties as half, in percent.
+        """
+        values = self.values
+        ranks = np.full(values.shape, np.nan)
+        for column, count in enumerate(self.counts):
+            column_values = self.sorted[:count, column]
+            present = ~np.isnan(values[:, column])
+            own = values[present, column]
+            below = np.searchsorted(column_values, own, side='left')
+            not_above = np.searchsorted(column_values, own, side='right')
+            ranks[present, column] = (below + not_above) / 2 / count * 100
+        return ranks
+    
+    def fighter_percentiles(self, row: int) -> Dict[str, float]:
+        """Rounded percentile ranks of one fighter, for the stats they have."""
+        ranks = self.ranks[row]
+        return {field: round(float(rank), RANK_DECIMALS) for field, rank in zip(self.fields, ranks) if rank == rank}
+    
+    def document(self) -> Dict[str, Any]:
+        """Distribution table: the sketch as little-endian float32 bytes, one row of levels per field."""
+        return {
+            'version': PERCENTILES_VERSION,
+            'weightClass': self.weight_class,
+            'fighterCount': len(self.codes),
+            'fields': self.fields,
+            'counts': [int(count) for count in self.counts],
+            'step': QUANTILE_STEP,
+            'levels': len(QUANTILE_LEVELS),
+            'quantiles': self.quantiles.T.astype('<f4').tobytes(),
+        }
+
+class FighterPercentiles:
+    """Distributions of every weight class, and a fighterCode lookup into them."""
+    
+    def __init__(self, fighters: Sequence[Dict[str, Any]], weight_field: str = WEIGHT_FIELD,
+                 fields: Optional[Sequence[str]] = None, stat_matrix: Optional[np.ndarray] = None):
+        """
+        Group fighters by weight class and compute each division's distributions.
+        
+        Args:
+            fighters: fighterData documents (category maps are flattened, as in the aggregates)
+            weight_field: Fighter field holding the weight class
+            fields: Stats to rank (defaults to percentile_fields())
+            stat_matrix: The fighters' stats already read from the parse cache
+                (see table_stat_matrix), instead of from the documents
+        """
+        ranked = sorted(set(percentile_fields() if fields is None else fields))
+        if stat_matrix is None:
+            column = {field: index for index, field in enumerate(ranked)}
+            stat_matrix = np.full((len(fighters), len(ranked)), np.nan)
+            for row, fighter in enumerate(fighters):
+                for field, value in fighter_stat_values(fighter, ranked).items():
+                    stat_matrix[row, column[field]] = value
+        
+        divisions: Dict[str, List[Tuple[str, int]]] = {}
+        for row, fighter in enumerate(fighters):
+            weight_class = fighter.get(weight_field)
+            code = fighter.get('fighterCode')
+            if weight_class in (None, '') or code in (None, ''):
+                continue
+            divisions.setdefault(str(weight_class), []).append((str(code), row))
+        
+        self.divisions: List[DivisionDistribution] = []
+        self.fighter_index: Dict[str, Tuple[int, int]] = {}
+        for weight_class, members in sorted(divisions.items()):
+            # A division ranks the stats at least one of its fighters has
+            values = stat_matrix[[row for _, row in members]]
+            columns = np.flatnonzero(~np.isnan(values).all(axis=0))
+            codes = [code for code, _ in members]
+            division_number = len(self.divisions)
+            self.divisions.append(DivisionDistribution(weight_class, codes, values[:, columns],
+                                                       [ranked[index] for index in columns]))
+            for row, code in enumerate(codes):
+                self.fighter_index[code] = (division_number, row)
+    
+    def fighter_fields(self, fighter_code: Any) -> Dict[str, Any]:
+        """Return the fields to store on a fighter document, or {} for a fighter without a weight class."""
+        position = self.fighter_index.get(str(fighter_code))
+        if position is None:
+            return {}
+        division_number, row = position
+        return {'percentiles': self.divisions[division_number].fighter_percentiles(row)}
+    
+    def documents(self, collection_name: str = DISTRIBUTIONS_COLLECTION) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return one (collection, document_id, data) distribution table per weight class."""
+        return [(collection_name, group_code(division.weight_class), division.document()) for division in self.divisions]
+
+def unpack_quantiles(document: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Decode a distribution table.
+    
+    Args:
+        document: fighterStatDistributions document
+    
+    Returns:
+        Dictionary mapping field to its quantile values, lowest level first
+    """
+    table = np.frombuffer(document['quantiles'], dtype='<f4').reshape(len(document['fields']), document['levels'])
+    return dict(zip(document['fields'], table))
+
+def estimate_percentiles(quantiles: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Percentiles of values read off a quantile sketch, as a client would.
+    
+    Args:
+        quantiles: One field's row of unpack_quantiles
+        values: Stat values
+    
+    Returns:
+        Estimated percent of the division below each value (ties counted half)
+    """
+    levels = np.arange(len(quantiles)) * (100 / (len(quantiles) - 1))
+    below = np.searchsorted(quantiles, values, side='left')
+    not_above = np.searchsorted(quantiles, values, side='right')
+    # Values on a flat stretch of the sketch (repeated values) take the middle of the stretch
+    flat = (levels[np.minimum(below, len(levels) - 1)] + levels[np.maximum(not_above - 1, 0)]) / 2
+    return np.where(below == not_above, np.interp(values, quantiles, levels), flat)
+
+def table_stat_matrix(table, plan, fields: Sequence[str]) -> np.ndarray:
+    """
+    Read fighter_stat_values of every row of a cached FighterData CSV file from its typed columns.
+    
+    Like fighter_stat_values, a stat is looked up at the top level and then
+    in the category maps, in the order the rows hold them.
+    
+    Args:
+        table: CachedTable of the CSV file
+        plan: ColumnPlan the documents are built with (categorize=True)
+        fields: Stat names, one matrix column each
+    
+    Returns:
+        float64 matrix with one row per CSV row, NaN where the fighter has no number for the stat
+    """
+    matrix = np.full((len(table), len(fields)), np.nan)
+    for column, field in enumerate(fields):
+        missing = np.ones(len(table), dtype=bool)
+        for category in [None] + [name for name in plan.category_order if name.endswith('_stats')]:
+            values, present = table.field_numbers(plan, field, category)
+            found = present & missing
+            matrix[found, column] = values[found]
+            missing &= ~present
+    return matrix
+
+def load_stat_matrix(fighters_csv_path: str, log: Callable[[str], None] = print) -> Optional[np.ndarray]:
+    """
+    Read the percentile_fields() of a FighterData CSV file from its parse cache entry.
+    
+    Returns:
+        The fighters' stat matrix (see table_stat_matrix), or None if the cache is unavailable
+    """
+    from parse_cache import load_table
+    
+    try:
+        table = load_table(fighters_csv_path)
+    except OSError as e:
+        log(f"⚠️  Parse cache unavailable for {fighters_csv_path} ({e}); reading the stats from the documents")
+        return None
+    return table_stat_matrix(table, table.plan(categorize=True), sorted(set(percentile_fields())))
+
+def load_fighter_percentiles(fighters_csv_path: str, log: Callable[[str], None] = print,
+                             weight_field: str = WEIGHT_FIELD) -> Optional[FighterPercentiles]:
+    """
+    Compute the distributions from a FighterData CSV file.
+    
+    Results are cached per file (path, size and modification time), so the
+    enricher and the aggregator of one ingest share one computation.
+    
+    Args:
+        fighters_csv_path: FighterData CSV file
+        log: Function used to print progress messages
+        weight_field: Fighter field holding the weight class
+    
+    Returns:
+        FighterPercentiles, or None if the file does not exist
+    """
+    from fighter_ratings import load_documents
+    
+    if not os.path.exists(fighters_csv_path):
+        log(f"⚠️  Skipping percentiles: {fighters_csv_path} not found")
+        return None
+    
+    stat = os.stat(fighters_csv_path)
+    key = (os.path.abspath(fighters_csv_path), stat.st_size, stat.st_mtime_ns, weight_field)
+    with _PERCENTILES_LOCK:
+        percentiles = _PERCENTILES_CACHE.get(key)
+        if percentiles is None:
+            fighters = [data for _, data in load_documents(fighters_csv_path, categorize=True)]
+            percentiles = _PERCENTILES_CACHE[key] = FighterPercentiles(fighters, weight_field,
+                                                                       stat_matrix=load_stat_matrix(fighters_csv_path, log))
+            log(f"📶 Ranked {len(percentiles.fighter_index)} fighters in {len(percentiles.divisions)} weight classes")
+    return percentiles
+
+def fighter_percentiles_enricher(data_dir: str, log: Callable[[str], None] = print) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """Return a transform adding the percentiles map to fighterData rows, or None without data."""
+    percentiles = load_fighter_percentiles(os.path.join(data_dir, 'FighterData.csv'), log)
+    if percentiles is None:
+        return None
+    
+    def add_percentiles(processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        processed_data.update(percentiles.fighter_fields(processed_data.get('fighterCode')))
+        return processed_data
+    
+    return add_percentiles
+
+class StatDistributionsAggregator:
+    """
+    Publish the distribution tables alongside a fighterData upload.
+    
+    The tables come from the same computation as the ranks the enricher
+    writes into each document, so the two always agree; the uploaded
+    documents themselves are not needed.
+    """
+    
+    def __init__(self, percentiles: FighterPercentiles, collection_name: str = DISTRIBUTIONS_COLLECTION):
+        self.percentiles = percentiles
+        self.collection_name = collection_name
+    
+    def add(self, document_id: str, data: Dict[str, Any]):
+        """Ignore uploaded documents (see the class docstring)."""
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return one distribution table per weight class."""
+        return self.percentiles.documents(self.collection_name)
+
+def stat_distributions_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                                  state_prefix: str = '') -> Optional[StatDistributionsAggregator]:
+    """Return the distribution tables aggregator for the FighterData.csv in data_dir, or None if it is missing (it keeps no state)."""
+    percentiles = load_fighter_percentiles(os.path.join(data_dir, 'FighterData.csv'), log)
+    return StatDistributionsAggregator(percentiles) if percentiles is not None else None
+
+def check_sketches(percentiles: FighterPercentiles) -> Tuple[int, float, float]:
+    """
+    Compare every exact percentile rank with the one a client would read off the published sketch.
+    
+    Args:
+        percentiles: Computed distributions
+    
+    Returns:
+        Tuple of (ranks compared, mean absolute difference, largest absolute difference) in percentile points
+    """
+    compared = 0
+    total = 0.0
+    largest = 0.0
+    for division in percentiles.divisions:
+        sketch = unpack_quantiles(division.document())
+        for column, field in enumerate(division.fields):
+            present = ~np.isnan(division.values[:, column])
+            estimates = estimate_percentiles(sketch[field].astype(np.float64),
+                                             division.values[present, column].astype(np.float32))
+            differences = np.abs(estimates - division.ranks[present, column])
+            compared += len(differences)
+            total += float(differences.sum())
+            largest = max(largest, float(differences.max()))
+    return compared, (total / compared if compared else 0.0), largest
+
+def synthetic_fighters(fighter_count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Return random fighter documents, for timing large datasets."""
+    from fighter_ratings import synthetic_dataset
+    
+    return synthetic_dataset(fighter_count, 0, seed).fighters
+
+def main():
+    """Compute the distributions from the CSV and publish the tables (or print a summary with --dry-run)."""
+    from document_size import estimate_document_size
+    from firestore_client import firestore_client
+    from upload_fighter_data_batch import publish_derived_documents
+    
+    parser = argparse.ArgumentParser(description="Compute per-weight-class stat distributions and fighter percentile ranks.")
+    parser.add_argument('csv_file_path', nargs='?', default="oldData/FighterData.csv", help="FighterData CSV file")
+    parser.add_argument('--weight-field', default=WEIGHT_FIELD, help="Fighter field holding the weight class")
+    parser.add_argument('--dry-run', action='store_true', help="Print a summary instead of writing to Firestore")
+    parser.add_argument('--show', metavar='FIGHTER_CODE', help="Print one fighter's highest and lowest percentiles")
+    parser.add_argument('--check', action='store_true', help="Compare the exact ranks with ranks read off the sketches")
+    parser.add_argument('--synthetic', type=int, metavar='N', help="Time N random fighters instead of the CSV")
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        fighters = synthetic_fighters(args.synthetic)
+        started = time.perf_counter()
+        percentiles = FighterPercentiles(fighters)
+    else:
+        started = time.perf_counter()
+        percentiles = load_fighter_percentiles(args.csv_file_path, weight_field=args.weight_field)
+        if percentiles is None:
+            sys.exit(1)
+    computed = time.perf_counter()
+    
+    documents = percentiles.documents()
+    sizes = [estimate_document_size(collection, document_id, data) for collection, document_id, data in documents]
+    fields = sum(len(division.fields) for division in percentiles.divisions)
+    print(f"📶 {len(percentiles.fighter_index)} fighters, {len(percentiles.divisions)} weight classes, "
+          f"{fields} stat distributions ({computed - started:.2f}s)")
+    print(f"📄 {len(documents)} tables, {sum(sizes) / 1024:.0f} KiB, largest {max(sizes, default=0) / 1024:.0f} KiB")
+    
+    if args.show:
+        fields = percentiles.fighter_fields(args.show).get('percentiles')
+        if fields is None:
+            print(f"❌ No weight class for {args.show}")
+            sys.exit(1)
+        ranked = sorted(fields.items(), key=lambda item: -item[1])
+        print(f"🏅 {args.show}: {len(ranked)} stats ranked")
+        for field, rank in ranked[:10] + [('...', None)] + ranked[-5:]:
+            print(f"   {field}" if rank is None else f"   {field}: {rank:g}")
+    
+    if args.check:
+        compared, mean, largest = check_sketches(percentiles)
+        print(f"🔍 {compared} ranks: sketch estimate off by {mean:.2f} points on average, at most {largest:.2f}")
+    
+    if args.dry_run or args.synthetic:
+        return
+    
+    published, errors = publish_derived_documents(firestore_client(), [StatDistributionsAggregator(percentiles)])
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
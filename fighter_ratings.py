@@ -0,0 +1,1441 @@
+#!/usr/bin/env python3
+"""
+Server-side overall ratings and fight difficulty scores.
+Computes what the website derives per render in hooks/stats/useOverallRating.ts,
+hooks/useDifficultyScore.ts and hooks/useFightDifficultyScores.ts for every
+fighter and every fight in one vectorized NumPy pass over the oldData tables,
+and writes the results into the uploaded fighterData and fights documents.
+
+The scalar reference_* functions are a line-by-line transliteration of the
+TypeScript hooks; check_parity() compares the vectorized engine against them.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from incremental_aggregates import WEIGHT_CLASS_FIGHTERS, group_code, recompute_groups, weight_class_document
+
+# Bump when the stored rating fields change meaning or layout
+RATINGS_VERSION = 2
+
+# Method of finish and round multipliers, as exported by useDifficultyScore.ts
+WIN_METHOD_MULTIPLIERS = {'KO': 1.8, 'TKO': 1.6, 'SUB': 1.4, 'DEC': 1.0, 'DQ': 0.4, 'NC': 0.2}
+LOSS_METHOD_MULTIPLIERS = {'KO': 0.3, 'TKO': 0.4, 'SUB': 0.5, 'DEC': 1.0, 'DQ': 1.2, 'NC': 1.5}
+WIN_ROUND_MULTIPLIERS = {'1': 2.0, '2': 1.7, '3': 1.3, '4': 1.0, '5': 0.8}
+LOSS_ROUND_MULTIPLIERS = {'1': 0.2, '2': 0.4, '3': 0.6, '4': 0.8, '5': 1.0}
+
+# Difficulty description thresholds, highest first
+DIFFICULTY_DESCRIPTIONS = ((85, 'Extreme'), (75, 'Very High'), (65, 'High'), (55, 'Moderate'), (45, 'Low'))
+LOWEST_DIFFICULTY_DESCRIPTION = 'Very Low'
+
+# Weight-class defaults used when a weight class document lacks a field (calculateWeightClassAverages)
+WEIGHT_CLASS_DEFAULTS = {
+    'strikingAccuracy': 50,
+    'finishPercentage': 40,
+    'clinchStrikingAccuracy': 40,
+    'groundStrikingAccuracy': 40,
+    'groundStrikesPerRound': 2.0,
+}
+
+# Fighter styles and their rating weights: (striking, defense, grappling, aggression, finishes, position)
+FIGHTER_STYLES = ('striker', 'grappler', 'knockout_artist', 'submission_specialist', 'mixed', 'balanced')
+STYLE_WEIGHTS = {
+    'striker': (0.35, 0.25, 0.10, 0.10, 0.05, 0.15),
+    'grappler': (0.15, 0.25, 0.35, 0.05, 0.05, 0.15),
+    'knockout_artist': (0.35, 0.20, 0.10, 0.15, 0.05, 0.15),
+    'submission_specialist': (0.10, 0.25, 0.35, 0.10, 0.05, 0.15),
+    'mixed': (0.30, 0.25, 0.25, 0.03, 0.02, 0.15),
+    'balanced': (0.30, 0.25, 0.25, 0.03, 0.02, 0.15),
+}
+
+# Archetype names by rating tier: (striker, grappler, knockout_artist, submission_specialist)
+ARCHETYPE_TIERS = (
+    (85, ('Elite Striker', 'Elite Grappler', 'Elite Knockout Artist', 'Elite Submission Specialist')),
+    (75, ('Striking Specialist', 'Grappling Specialist', 'Knockout Artist', 'Submission Specialist')),
+    (60, ('Striker', 'Grappler', 'Power Puncher', 'Submission Artist')),
+    (None, ('One-Dimensional Striker', 'One-Dimensional Grappler', 'Power Puncher', 'Submission Artist')),
+)
+
+# Striking types summed for accuracy and strikes per minute
+STRIKE_TYPES = ('BodyKicks', 'Elbows', 'HighKicks', 'Hooks', 'Jabs', 'LegKicks', 'Overhands',
+                'SpinBackFists', 'Straights', 'Uppercuts')
+
+# Absorbed strike fields and their weight in the defense rating, in the order the hook sums them
+DEFENSE_WEIGHTS = (
+    ('HeadKicksAbsorbed', 0.2), ('HooksAbsorbed', 0.15), ('OverhandsAbsorbed', 0.15), ('UppercutsAbsorbed', 0.15),
+    ('BodyKicksAbsorbed', 0.1), ('StraightsAbsorbed', 0.1), ('LegKicksAbsorbed', 0.1), ('JabsAbsorbed', 0.05),
+)
+
+TAKEDOWN_ATTEMPTS = ('BodyLockTakedownAttempts', 'DoubleLegTakedownAttempts', 'SingleLegTakedownAttempts',
+                     'TripTakedownAttempts', 'AttemptedAnklePickTD', 'AttemptedThrowTD', 'AttemptedImanariTD')
+TAKEDOWN_SUCCESSES = ('BodyLockTakedownSuccess', 'DoubleLegTakedownSuccess', 'SingleLegTakedownSuccess',
+                      'TripTakedownSuccess', 'SuccessfulAnklePickTD', 'SuccessfulThrowTD', 'SuccessfulImanariTD')
+WEIGHT_CLASS_TAKEDOWN_ATTEMPTS = ('BodyLockTakedownAttempts', 'DoubleLegTakedownAttempts',
+                                  'SingleLegTakedownAttempts', 'TripTakedownAttempts', 'AttemptedThrowTD')
+STRIKES_THROWN = ('TotalPunchesThrown', 'TotalKicksThrown', 'TotalElbowsThrown', 'TotalSpinBackFistsThrown')
+
+# Fighter document fields the ratings read: (category, field); category None is a top-level field
+FIGHTER_FIELDS = (
+    [(None, field) for field in ('MinutesTracked', 'FightsTracked', 'RoundsTracked', 'CenterOctagon',
+                                 'PushedBackToCage', 'PushingAgainstCage')]
+    + [('total_stats', f"Total{strike}{suffix}") for strike in STRIKE_TYPES for suffix in ('Missed', 'Made')]
+    + [('total_stats', field) for field in STRIKES_THROWN + ('TotalStrikesLanded', 'TotalStrikesThrown', 'StrikesPerMinute')]
+    + [('clinch_stats', field) for field in ('TotalClinchStrikesMade', 'TotalClinchStrikesThrown', 'BeingClinched', 'InClinch')]
+    + [('ground_stats', field) for field in ('TotalGroundStrikesMade', 'TotalGroundStrikesThrown', 'OnBottomGround', 'OnTopGround')]
+    + [('takedown_stats', field) for field in TAKEDOWN_ATTEMPTS + TAKEDOWN_SUCCESSES + ('TakedownsLanded', 'TakedownsAttempted')]
+    + [('submission_stats', field) for field in ('SubmissionsAttempted', 'SubmissionsSuccessful')]
+    + [('striking_stats', field) for field, _ in DEFENSE_WEIGHTS]
+    + [('fight_outcome_stats', field) for field in ('FighterWins', 'FighterKOWins', 'FighterTKOWins', 'FighterSUBWin',
+                                                     'FighterUDWins', 'FighterSplitDecWin', 'FighterMajDecWin')]
+)
+FIGHTER_CATEGORIES = ('total_stats', 'clinch_stats', 'ground_stats', 'takedown_stats', 'submission_stats')
+
+# Weight class document fields the ratings read (the weightClass collection is flat)
+WEIGHT_CLASS_FIELDS = (
+    [(None, field) for field in ('minutes', 'fights', 'TakedownsLanded', 'SubmissionsAttempted',
+                                 'SubmissionsSuccessful', 'InClinch', 'BeingClinched',
+                                 'TotalGroundStrikesMade', 'TotalClinchStrikesMade',
+                                 'TotalClinchStrikesThrown', 'TotalGroundStrikesThrown')]
+    + [(None, f"Total{strike}Made") for strike in STRIKE_TYPES]
+    + [(None, field) for field in STRIKES_THROWN + WEIGHT_CLASS_TAKEDOWN_ATTEMPTS + tuple(WEIGHT_CLASS_DEFAULTS)]
+    + [(None, field) for field, _ in DEFENSE_WEIGHTS]
+    + [('total_stats', 'StrikesPerMinute')]
+)
+
+_RATINGS_CACHE = {}
+_RATINGS_LOCK = threading.Lock()
+
+def _numeric(value: Any) -> float:
+    """Return value as a float; missing, non-numeric and NaN values read as 0 like the hooks' `|| 0`."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return 0.0
+    return float(value)
+
+def _field(document: Optional[Dict[str, Any]], category: Optional[str], field: str) -> float:
+    """Read a numeric field, optionally inside a category map, from a document."""
+    if not document:
+        return 0.0
+    source = document.get(category) if category else document
+    return _numeric(source.get(field)) if isinstance(source, dict) else 0.0
+
+def _raw_field(document: Optional[Dict[str, Any]], category: Optional[str], field: str) -> float:
+    """Read a field the way the hooks do without `|| 0`: missing and non-numeric values are NaN."""
+    source = (document or {}).get(category) if category else document
+    value = source.get(field) if isinstance(source, dict) else None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return math.nan
+    return float(value)
+
+def _js_key(value: Any) -> str:
+    """Return the property key JavaScript would use to index an object with value."""
+    if value is None:
+        return 'undefined'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _js_round(values):
+    """Round half up, like Math.round."""
+    return np.floor(values + 0.5)
+
+def _clamp(values, low: float, high: float):
+    """Math.min(high, Math.max(low, values))."""
+    return np.minimum(high, np.maximum(low, values))
+
+def _or(values: np.ndarray, default: float) -> np.ndarray:
+    """values || default for numeric columns (0 and NaN are falsy)."""
+    return np.where((values != 0) & ~np.isnan(values), values, default)
+
+def _normalize(fighter_values: np.ndarray, class_values, invert: bool = False) -> np.ndarray:
+    """The hooks' normalizeValue: 50 +/- 50 * tanh of the fighter / weight class ratio, 50 without a baseline."""
+    ratio = fighter_values / class_values
+    result = 50 + 50 * np.tanh(((1 - ratio) if invert else (ratio - 1)) * 2)
+    return np.where(class_values == 0, 50.0, result)
+
+def _plain(value: Any) -> Any:
+    """Convert a NumPy scalar to a plain int (whole numbers), float or None (NaN) for Firestore."""
+    value = float(value)
+    if value != value:
+        return None
+    return int(value) if value.is_integer() else value
+
+def _js_sort(items: Sequence[Any], key: Callable[[Any], float]) -> List[Any]:
+    """
+    Array.prototype.sort with the comparator (a, b) => key(a) - key(b), as V8 runs it.
+    
+    V8 sorts arrays shorter than 64 elements with one run plus a binary
+    insertion sort, and a comparator returning NaN counts as "equal", so the
+    order of NaN keys depends on the algorithm. Only short arrays are supported.
+    
+    Args:
+        items: Items to sort (fewer than 64)
+        key: Numeric sort key
+    
+    Returns:
+        Sorted list
+    """
+    def compare(a: Any, b: Any) -> float:
+        order = key(a) - key(b)
+        return 0.0 if order != order else order
+    
+    items = list(items)
+    if len(items) < 2:
+        return items
+    
+    # The leading run, reversed if strictly descending
+    run = 2
+    descending = compare(items[1], items[0]) < 0
+    while run < len(items):
+        order = compare(items[run], items[run - 1])
+        if (order >= 0) if descending else (order < 0):
+            break
+        run += 1
+    if descending:
+        items[:run] = items[:run][::-1]
+    
+    for start in range(run, len(items)):
+        left, right = 0, start
+        while left < right:
+            middle = left + ((right - left) >> 1)
+            if compare(items[start], items[middle]) < 0:
+                right = middle
+            else:
+                left = middle + 1
+        items.insert(left, items.pop(start))
+    return items
+
+def difficulty_description(score: float) -> str:
+    """Return the difficulty description for a score (getDifficultyDescription)."""
+    for threshold, description in DIFFICULTY_DESCRIPTIONS:
+        if score >= threshold:
+            return description
+    return LOWEST_DIFFICULTY_DESCRIPTION
+
+class _Columns:
+    """Numeric fields of a list of documents as a matrix, one column per (category, field)."""
+    
+    def __init__(self, documents: Sequence[Optional[Dict[str, Any]]], fields: Sequence[Tuple[Optional[str], str]],
+                 categories: Sequence[str] = (), raw_matrix: Optional[np.ndarray] = None):
+        self.index = {field: position for position, field in enumerate(fields)}
+        if raw_matrix is None:
+            raw_matrix = np.array([[_raw_field(document, category, field) for category, field in fields]
+                                   for document in documents], dtype=np.float64).reshape(len(documents), len(fields))
+        self.raw_matrix = raw_matrix
+        self.matrix = np.where(np.isnan(self.raw_matrix), 0.0, self.raw_matrix)
+        self.present = np.array([document is not None for document in documents], dtype=bool)
+        # A category map counts as present even when empty, like a truthy object in the hooks
+        self.categories = {
+            category: np.array([isinstance((document or {}).get(category), dict) for document in documents], dtype=bool)
+            for category in categories
+        }
+    
+    def take(self, rows: np.ndarray) -> '_Columns':
+        """Return the columns of the given rows."""
+        taken = _Columns.__new__(_Columns)
+        taken.index = self.index
+        taken.matrix = self.matrix[rows]
+        taken.raw_matrix = self.raw_matrix[rows]
+        taken.present = self.present[rows]
+        taken.categories = {category: flags[rows] for category, flags in self.categories.items()}
+        return taken
+    
+    def __call__(self, category: Optional[str], *fields: str) -> np.ndarray:
+        """Return the sum of fields, added left to right like the hooks do."""
+        total = self.matrix[:, self.index[(category, fields[0])]]
+        for field in fields[1:]:
+            total = total + self.matrix[:, self.index[(category, field)]]
+        return total
+    
+    def raw(self, category: Optional[str], field: str) -> np.ndarray:
+        """Return a field read without `|| 0`: NaN where it is missing, so arithmetic on it gives NaN like the hooks."""
+        return self.raw_matrix[:, self.index[(category, field)]]
+
+def table_matrix(table, plan, fields: Sequence[Tuple[Optional[str], str]]) -> np.ndarray:
+    """
+    Read the raw matrix _Columns builds from documents straight from a cached CSV file's typed columns.
+    
+    Args:
+        table: CachedTable of the CSV file
+        plan: ColumnPlan the documents are built with (its categories place the fields)
+        fields: (category, field) pairs, one matrix column each
+    
+    Returns:
+        float64 matrix with one row per CSV row, NaN where a field holds no number
+    """
+    matrix = np.full((len(table), len(fields)), np.nan)
+    for column, (category, field) in enumerate(fields):
+        values, present = table.field_numbers(plan, field, category)
+        matrix[present, column] = values[present]
+    return matrix
+
+def compute_overall_ratings(fighter: _Columns, weight_class: _Columns) -> Dict[str, np.ndarray]:
+    """
+    Vectorized useOverallRating for aligned rows of fighters and weight classes.
+    
+    Args:
+        fighter: Fighter columns, one row per rating to compute
+        weight_class: Weight class columns for the same rows (present=False where unknown)
+    
+    Returns:
+        Dictionary of arrays: the six component ratings (aggression is NaN with
+        fewer than 5 fights tracked; grappling and the rating are NaN where the
+        hook divides by a missing clinch or ground field), style, rating,
+        archetype, strengths and weakness
+    """
+    count = len(fighter.present)
+    has_class = weight_class.present
+    top = lambda *fields: fighter(None, *fields)
+    total_stats = lambda *fields: fighter('total_stats', *fields)
+    clinch = lambda *fields: fighter('clinch_stats', *fields)
+    ground = lambda *fields: fighter('ground_stats', *fields)
+    takedown = lambda *fields: fighter('takedown_stats', *fields)
+    submission = lambda *fields: fighter('submission_stats', *fields)
+    outcome = lambda *fields: fighter('fight_outcome_stats', *fields)
+    wc = lambda *fields: weight_class(None, *fields)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        minutes = top('MinutesTracked')
+        fights_tracked = top('FightsTracked')
+        center, pushed_back, pushing = top('CenterOctagon'), top('PushedBackToCage'), top('PushingAgainstCage')
+        being_clinched, in_clinch = clinch('BeingClinched'), clinch('InClinch')
+        on_bottom, on_top = ground('OnBottomGround'), ground('OnTopGround')
+        wc_defaults = {field: _or(wc(field), default) for field, default in WEIGHT_CLASS_DEFAULTS.items()}
+        
+        # Striking rating
+        landed = total_stats('TotalStrikesLanded')
+        attempts = landed + total_stats(*(f"Total{strike}Missed" for strike in STRIKE_TYPES))
+        accuracy = np.where(fighter.categories['total_stats'] & (attempts > 0), landed / attempts * 100, 0.0)
+        fighter_minutes = _or(minutes, 1)
+        fighter_spm = (total_stats(*(f"Total{strike}Made" for strike in STRIKE_TYPES)) / fighter_minutes
+                       + clinch('TotalClinchStrikesMade') / fighter_minutes
+                       + ground('TotalGroundStrikesMade') / fighter_minutes)
+        class_minutes = _or(wc('minutes'), 1)
+        class_spm = (wc(*(f"Total{strike}Made" for strike in STRIKE_TYPES)) / class_minutes
+                     + wc('TotalClinchStrikesMade') / class_minutes
+                     + wc('TotalGroundStrikesMade') / class_minutes)
+        class_accuracy = wc_defaults['strikingAccuracy']
+        combined = (accuracy / class_accuracy) * 0.7 + (fighter_spm / class_spm) * 0.3
+        striking = np.where((class_accuracy == 0) | (class_spm == 0), _clamp(accuracy, 1, 100),
+                            _clamp(_js_round(50 + 50 * np.tanh((combined - 1) * 2)), 1, 100))
+        
+        # Aggressiveness rating
+        fighter_minutes = _or(minutes, 0.001)
+        class_minutes = np.where(has_class, _or(wc('minutes'), 0.001), 0.001)
+        fighter_rate = (total_stats(*STRIKES_THROWN) + clinch('TotalClinchStrikesThrown')
+                        + ground('TotalGroundStrikesThrown')) / fighter_minutes
+        class_rate = np.where(has_class, wc(*STRIKES_THROWN, 'TotalClinchStrikesThrown', 'TotalGroundStrikesThrown')
+                              / class_minutes, 0.0)
+        strike_ratio = np.where(class_rate > 0, fighter_rate / class_rate, 1.0)
+        class_takedowns = np.where(has_class, wc('TakedownsLanded') / class_minutes, 0.0)
+        takedown_ratio = np.where(class_takedowns > 0, takedown('TakedownsLanded') / fighter_minutes / class_takedowns, 1.0)
+        class_subs = np.where(has_class, wc('SubmissionsAttempted') / class_minutes, 0.0)
+        sub_ratio = np.where(class_subs > 0, submission('SubmissionsAttempted') / fighter_minutes / class_subs, 1.0)
+        positions = center + pushed_back + pushing + being_clinched + in_clinch + on_bottom + on_top
+        position_ratio = np.where(positions == 0, 1.0, ((pushing + in_clinch + on_top) / positions * 100) / 50)
+        composite = (strike_ratio + takedown_ratio + sub_ratio + position_ratio) / 4
+        aggression = np.where(fights_tracked < 5, np.nan,
+                              _clamp(_js_round(50 + 49 * np.tanh(composite - 1)), 1, 99))
+        
+        # Grappling grade
+        takedown_attempts = takedown(*TAKEDOWN_ATTEMPTS)
+        takedown_successes = takedown(*TAKEDOWN_SUCCESSES)
+        fighter_fights = _or(fights_tracked, 1)
+        class_fights = _or(wc('fights'), 1)
+        success_rate = np.where(takedown_attempts > 0, takedown_successes / takedown_attempts, 0.0)
+        takedown_rating = (_normalize(success_rate, 0.38) * 0.6
+                           + _normalize(takedown_attempts / fighter_fights,
+                                        wc(*WEIGHT_CLASS_TAKEDOWN_ATTEMPTS) / class_fights) * 0.4)
+        
+        sub_attempts, sub_successes = submission('SubmissionsAttempted'), submission('SubmissionsSuccessful')
+        class_sub_attempts, class_sub_successes = wc('SubmissionsAttempted'), wc('SubmissionsSuccessful')
+        sub_rate = np.where(sub_attempts > 0, sub_successes / sub_attempts, 0.0)
+        class_sub_rate = np.where(class_sub_attempts > 0, class_sub_successes / class_sub_attempts, 0.0)
+        submission_rating = np.where(
+            fighter.categories['submission_stats'] & has_class,
+            _normalize(sub_rate, class_sub_rate) * 0.7
+            + _normalize(sub_attempts / fighter_fights, class_sub_attempts / class_fights) * 0.3,
+            50.0)
+        
+        clinch_time = in_clinch + being_clinched
+        class_in_clinch, class_being_clinched = wc('InClinch'), wc('BeingClinched')
+        class_clinch_time = class_in_clinch + class_being_clinched
+        clinch_ratio = np.where(clinch_time > 0, in_clinch / clinch_time, 0.5)
+        class_clinch_ratio = np.where(class_clinch_time > 0, class_in_clinch / class_clinch_time, 0.5)
+        clinch_thrown = clinch('TotalClinchStrikesThrown')
+        clinch_accuracy = np.where(clinch_thrown > 0,
+                                   fighter.raw('clinch_stats', 'TotalClinchStrikesMade') / clinch_thrown * 100, 0.0)
+        clinch_rating = np.where(
+            fighter.categories['clinch_stats'] & has_class,
+            _normalize(clinch_ratio, class_clinch_ratio) * 0.6
+            + _normalize(clinch_accuracy, wc_defaults['clinchStrikingAccuracy']) * 0.4,
+            50.0)
+        
+        ground_control = np.where((on_top != 0) & (on_bottom != 0), on_top / (on_top + on_bottom) * 100, 50.0)
+        ground_thrown = ground('TotalGroundStrikesThrown')
+        ground_accuracy = np.where(ground_thrown > 0,
+                                   fighter.raw('ground_stats', 'TotalGroundStrikesMade') / ground_thrown * 100, 0.0)
+        ground_per_round = fighter.raw('ground_stats', 'TotalGroundStrikesThrown') / _or(top('RoundsTracked'), 1)
+        ground_rating = np.where(
+            fighter.categories['ground_stats'] & has_class,
+            _clamp(_js_round(_normalize(ground_control, 50) * 0.4
+                             + _normalize(ground_accuracy, wc_defaults['groundStrikingAccuracy']) * 0.3
+                             + _normalize(ground_per_round, wc_defaults['groundStrikesPerRound']) * 0.3), 1, 100),
+            50.0)
+        
+        grappling = np.where(
+            fighter.categories['takedown_stats'] & has_class,
+            _clamp(_js_round(takedown_rating * 0.35 + submission_rating * 0.15 + clinch_rating * 0.2
+                             + ground_rating * 0.3), 1, 100),
+            50.0)
+        
+        # Defense rating
+        fighter_minutes = _or(minutes, 1)
+        class_minutes = _or(wc('minutes'), 1)
+        defense = 0.0
+        for field, weight in DEFENSE_WEIGHTS:
+            rating = _normalize(fighter('striking_stats', field) / fighter_minutes, wc(field) / class_minutes, invert=True)
+            defense = defense + rating * weight
+        defense = _js_round(defense) + np.zeros(count)
+        
+        # Finish rating
+        wins = outcome('FighterWins')
+        ko_wins, tko_wins, sub_wins = outcome('FighterKOWins'), outcome('FighterTKOWins'), outcome('FighterSUBWin')
+        finishes = ko_wins + tko_wins + sub_wins
+        finish_percentage = np.where(wins != 0, finishes / wins * 100, 0.0)
+        finish = _clamp(_js_round(50 + 50 * np.tanh((finish_percentage / wc_defaults['finishPercentage'] - 1) * 2)), 1, 100)
+        
+        # Positional rating
+        dominance = (center + pushing + in_clinch + on_top) / positions
+        position = np.where(positions == 0, 50.0, _clamp(_js_round(
+            np.where(dominance <= 0.5, 1 + 49 * (dominance / 0.5), 50 + 50 * ((dominance - 0.5) / 0.5))), 1, 100))
+        
+        # Fighter data used for the archetype, strengths and weaknesses
+        win_rate = np.where(fights_tracked > 0, wins / fights_tracked * 100, 0.0)
+        strikes_thrown = total_stats('TotalStrikesThrown')
+        striking_accuracy = np.where(strikes_thrown > 0, landed / strikes_thrown * 100, 0.0)
+        takedowns_landed = takedown('TakedownsLanded')
+        takedowns_attempted = takedown('TakedownsAttempted')
+        takedown_accuracy = np.where(takedowns_attempted > 0, takedowns_landed / takedowns_attempted * 100, 0.0)
+        decision_wins = outcome('FighterUDWins', 'FighterSplitDecWin', 'FighterMajDecWin')
+        finish_rate = np.where(wins > 0, finishes / wins * 100, 0.0)
+        dominant, defensive = center + on_top, pushed_back + on_bottom
+        dominance_ratio = np.where(dominant + defensive > 0, dominant / (dominant + defensive), 0.5)
+        class_strikes_per_minute = np.where(has_class, weight_class('total_stats', 'StrikesPerMinute'), 0.0)
+        aggression_ratio = np.where(class_strikes_per_minute > 0,
+                                    total_stats('StrikesPerMinute') / class_strikes_per_minute, 1.0)
+    
+    # Style
+    knockouts = ko_wins + tko_wins
+    striking_dominance = striking >= 65
+    grappling_dominance = (grappling >= 70) | (position >= 75)
+    finishing_dominance = finish >= 60
+    style = np.select(
+        [(grappling >= 80) & (position >= 80),
+         (striking >= 80) & (grappling <= 50),
+         (finish >= 75) & (knockouts > sub_wins),
+         (finish >= 75) & (sub_wins > knockouts),
+         grappling_dominance & ~striking_dominance,
+         striking_dominance & ~grappling_dominance,
+         finishing_dominance & (knockouts > sub_wins),
+         finishing_dominance & (sub_wins > knockouts),
+         striking_dominance & grappling_dominance],
+        [1, 0, 2, 3, 1, 0, 2, 3, 4], 5)
+    
+    # Weighted rating and specialist bonus
+    aggression_value = np.where(np.isnan(aggression), 50.0, aggression)
+    weights = np.array([STYLE_WEIGHTS[name] for name in FIGHTER_STYLES])[style]
+    weighted = (striking * weights[:, 0] + defense * weights[:, 1] + grappling * weights[:, 2]
+                + aggression_value * weights[:, 3] + finish * weights[:, 4] + position * weights[:, 5])
+    is_style = {name: style == index for index, name in enumerate(FIGHTER_STYLES)}
+    bonus = np.zeros(count)
+    bonus += is_style['striker'] * (8 * (striking >= 75) + 5 * (striking >= 80) + 3 * (defense >= 70))
+    bonus += is_style['grappler'] * (8 * (grappling >= 75) + 8 * (position >= 75)
+                                     + 5 * ((grappling >= 80) & (position >= 80)) + 3 * (defense >= 70))
+    bonus += is_style['knockout_artist'] * (8 * (finish >= 75) + 5 * (striking >= 70) + 3 * (aggression_value >= 70))
+    bonus += is_style['submission_specialist'] * (8 * (finish >= 75) + 5 * (grappling >= 70) + 3 * (position >= 70))
+    bonus += is_style['mixed'] * (8 * ((striking >= 70) & (grappling >= 70)) + 5 * (defense >= 70))
+    rating = np.minimum(99, _js_round(weighted + bonus))
+    
+    # Archetype: within each rating tier the style's specialist name comes first, then the tier's fallbacks
+    specialist = style < 4
+    tiers = [rating >= 85, rating >= 75, rating >= 60, np.ones(count, dtype=bool)]
+    specialist_names = [np.array(names)[np.minimum(style, 3)] for _, names in ARCHETYPE_TIERS]
+    archetype = np.select(
+        [tiers[0] & specialist, tiers[0],
+         tiers[1] & specialist, tiers[1] & (win_rate >= 75) & (decision_wins > finishes), tiers[1],
+         tiers[2] & specialist, tiers[2] & (aggression_ratio >= 1.2), tiers[2] & (dominance_ratio >= 0.6), tiers[2],
+         specialist, aggression_ratio >= 1.1, dominance_ratio <= 0.3],
+        [specialist_names[0], 'Elite Mixed Martial Artist',
+         specialist_names[1], 'Decision Machine', 'Well-Rounded Fighter',
+         specialist_names[2], 'Aggressive Fighter', 'Positional Fighter', 'Balanced Fighter',
+         specialist_names[3], 'Aggressive but Limited', 'Defensive Fighter'],
+        'Technical Fighter')
+    
+    # Strengths: up to two names, highest score first, ties in declaration order
+    candidates = [
+        ((striking_accuracy >= 55) | (landed > 100),
+         np.where(striking_accuracy >= 60, 'Technical Striking', 'Striking Volume'), striking_accuracy),
+        ((takedown_accuracy >= 40) | (takedowns_landed > 10),
+         np.where(takedown_accuracy >= 50, 'Technical Grappling', 'Grappling Control'), takedown_accuracy),
+        ((finish_rate >= 50) | (knockouts > 3),
+         np.where(knockouts > sub_wins, 'Knockout Power', 'Submission Game'), finish_rate),
+        (aggression_ratio >= 1.1, np.full(count, 'Fighting Aggression'), aggression_ratio * 50),
+        (dominance_ratio >= 0.6, np.full(count, 'Positional Control'), dominance_ratio * 100),
+        ((win_rate >= 70) & (fights_tracked >= 5), np.full(count, 'Fight IQ'), win_rate),
+    ]
+    eligible = np.column_stack([condition for condition, _, _ in candidates])
+    names = np.column_stack([name for _, name, _ in candidates])
+    scores = np.column_stack([score for _, _, score in candidates])
+    ranked = np.argsort(np.where(eligible, -scores, np.inf), axis=1, kind='stable')[:, :2]
+    rows = np.arange(count)[:, None]
+    strengths = np.where(eligible[rows, ranked], names[rows, ranked], '')
+    
+    # Weakness: the first failing fundamental, otherwise the lowest component rating
+    components = np.column_stack([striking, defense, grappling, aggression_value, finish, position])
+    component_names = np.array(['Striking', 'Defense', 'Grappling', 'Aggression', 'Finishes', 'Position'])
+    lowest = component_names[np.argmin(components, axis=1)]
+    for row in np.flatnonzero(np.isnan(components).any(axis=1)):
+        lowest[row] = component_names[_js_sort(range(6), key=lambda column: components[row, column])[0]]
+    weakness = np.select(
+        [(striking_accuracy < 40) & (landed < 50),
+         (takedown_accuracy < 30) & (takedowns_landed < 5),
+         (finish_rate < 30) & (fights_tracked >= 5),
+         aggression_ratio < 0.8,
+         dominance_ratio < 0.4,
+         (win_rate < 50) & (fights_tracked >= 5)],
+        ['Striking Fundamentals', 'Grappling Defense', 'Finishing Ability', 'Fighting Aggression',
+         'Positional Control', 'Fight Strategy'], lowest)
+    
+    return {
+        'striking': striking, 'aggression': aggression, 'grappling': grappling, 'defense': defense,
+        'finish': finish, 'position': position, 'style': style, 'rating': rating, 'archetype': archetype,
+        'strengths': strengths, 'weakness': weakness,
+        # Inputs of the simplified base rating used by useFightDifficultyScores
+        'fights_tracked': fights_tracked, 'wins': wins, 'finishes': finishes,
+    }
+
+def compute_difficulty_scores(base_ratings: np.ndarray, methods: Sequence[Any], rounds: Sequence[Any],
+                              is_winner: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized useDifficultyScore: scale opponent ratings by method and round multipliers.
+    
+    Args:
+        base_ratings: Opponent base rating per fight
+        methods: methodOfFinish per fight
+        rounds: actualRounds per fight
+        is_winner: Whether the viewing fighter won (fighterA) per fight
+    
+    Returns:
+        Tuple of (scores, method_multipliers, round_multipliers)
+    """
+    def multipliers(values: Sequence[Any], win_table: Dict[str, float], loss_table: Dict[str, float]):
+        keys, inverse = np.unique(np.array([_js_key(value) for value in values], dtype=object).astype(str),
+                                  return_inverse=True)
+        win = np.array([win_table.get(key, 1.0) for key in keys])[inverse]
+        loss = np.array([loss_table.get(key, 1.0) for key in keys])[inverse]
+        return np.where(is_winner, win, loss)
+    
+    if not len(base_ratings):
+        return np.zeros(0), np.zeros(0), np.zeros(0)
+    method_multipliers = multipliers(methods, WIN_METHOD_MULTIPLIERS, LOSS_METHOD_MULTIPLIERS)
+    round_multipliers = multipliers(rounds, WIN_ROUND_MULTIPLIERS, LOSS_ROUND_MULTIPLIERS)
+    scores = _clamp(_js_round(base_ratings * method_multipliers * round_multipliers), 1, 100)
+    return scores, method_multipliers, round_multipliers
+
+def describe_difficulty(scores: np.ndarray) -> np.ndarray:
+    """Vectorized getDifficultyDescription."""
+    return np.select([scores >= threshold for threshold, _ in DIFFICULTY_DESCRIPTIONS],
+                     [description for _, description in DIFFICULTY_DESCRIPTIONS], LOWEST_DIFFICULTY_DESCRIPTION)
+
+class FighterRatings:
+    """
+    Overall ratings and difficulty scores for every fighter and fight.
+    
+    Ratings follow the website: a fighter's own rating uses their weight
+    class; an opponent's rating in a fight history uses the viewing
+    fighter's weight class, so each fight gets one score per side.
+    Every (fighter, weight class) pair is rated once, in a single
+    vectorized pass.
+    """
+    
+    def __init__(self, fighters: Sequence[Dict[str, Any]], fights: Sequence[Dict[str, Any]],
+                 weight_classes: Sequence[Tuple[str, Dict[str, Any]]] = (), fighter_matrix: Optional[np.ndarray] = None):
+        """
+        Compute the ratings.
+        
+        Args:
+            fighters: fighterData documents (with category maps, as uploaded)
+            fights: fights documents
+            weight_classes: (document_id, data) pairs of weightClass documents
+            fighter_matrix: FIGHTER_FIELDS of the fighters already read from the
+                parse cache (see table_matrix), instead of from the documents
+        """
+        self.fighters = list(fighters)
+        self.fights = list(fights)
+        
+        # Like useWeightClass, a name matches the first document in ID order
+        self.weight_classes = []
+        class_index = {}
+        for document_id, data in sorted(weight_classes, key=lambda item: item[0]):
+            name = data.get('weightclassname')
+            if name is not None and str(name) not in class_index:
+                class_index[str(name)] = len(self.weight_classes)
+                self.weight_classes.append(data)
+        missing_class = len(self.weight_classes)
+        
+        self.fighter_index = {}
+        for index, fighter in enumerate(self.fighters):
+            code = fighter.get('fighterCode')
+            if code not in (None, ''):
+                self.fighter_index.setdefault(str(code), index)
+        own_class = np.array([class_index.get(str(fighter.get('weightClass') or 'Unknown'), missing_class)
+                              for fighter in self.fighters], dtype=np.int64)
+        
+        # One side per fight and viewer: fighterA views fighterB (a win), fighterB views fighterA
+        side_fight, side_viewer, side_opponent, side_winner = [], [], [], []
+        for fight_number, fight in enumerate(self.fights):
+            fighter_a, fighter_b = str(fight.get('fighterA')), str(fight.get('fighterB'))
+            for viewer, opponent, is_winner in ((fighter_a, fighter_b, True), (fighter_b, fighter_a, False)):
+                if not is_winner and fighter_a == fighter_b:
+                    continue
+                side_fight.append(fight_number)
+                side_viewer.append(self.fighter_index.get(viewer, -1))
+                side_opponent.append(self.fighter_index.get(opponent, -1))
+                side_winner.append(is_winner)
+        self.side_fight = np.array(side_fight, dtype=np.int64)
+        self.side_viewer = np.array(side_viewer, dtype=np.int64)
+        self.side_opponent = np.array(side_opponent, dtype=np.int64)
+        self.side_winner = np.array(side_winner, dtype=bool)
+        side_class = np.where(self.side_viewer >= 0, own_class[np.maximum(self.side_viewer, 0)], missing_class)
+        
+        # Rate each distinct (fighter, weight class) pair once
+        has_opponent = self.side_opponent >= 0
+        pair_fighter = np.concatenate([np.arange(len(self.fighters)), self.side_opponent[has_opponent]])
+        pair_class = np.concatenate([own_class, side_class[has_opponent]])
+        pairs, pair_inverse = np.unique(pair_fighter * (missing_class + 1) + pair_class, return_inverse=True)
+        pair_inverse = pair_inverse.reshape(-1)
+        fighter_columns = _Columns(self.fighters, FIGHTER_FIELDS, FIGHTER_CATEGORIES, fighter_matrix)
+        class_columns = _Columns(self.weight_classes + [None], WEIGHT_CLASS_FIELDS)
+        self.pair_ratings = compute_overall_ratings(fighter_columns.take(pairs // (missing_class + 1)),
+                                                    class_columns.take(pairs % (missing_class + 1)))
+        self.own_pair = pair_inverse[:len(self.fighters)]
+        self.side_pair = np.full(len(self.side_fight), -1, dtype=np.int64)
+        self.side_pair[has_opponent] = pair_inverse[len(self.fighters):]
+        self.side_has_class = side_class != missing_class
+        
+        # Difficulty per side with the full rating (useDifficultyScore) and the simplified one (useFightDifficultyScores)
+        pair = np.maximum(self.side_pair, 0)
+        methods = [self.fights[number].get('methodOfFinish') for number in side_fight]
+        rounds = [self.fights[number].get('actualRounds') for number in side_fight]
+        self.side_base = self.pair_ratings['rating'][pair]
+        self.side_score, self.side_method, self.side_round = compute_difficulty_scores(
+            self.side_base, methods, rounds, self.side_winner)
+        fights_tracked = self.pair_ratings['fights_tracked'][pair]
+        wins = self.pair_ratings['wins'][pair]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            win_rate = np.where(fights_tracked > 0, wins / fights_tracked * 100, 50.0)
+            finish_rate = np.where(wins > 0, self.pair_ratings['finishes'][pair] / wins * 100, 25.0)
+        history_base = _clamp(win_rate * 0.7 + finish_rate * 0.3, 1, 100)
+        self.side_history_score = _clamp(_js_round(history_base * self.side_method * self.side_round), 1, 100)
+        
+        # Combined difficulty per fighter (useFighterCombinedDifficultyScore, which reads a NaN rating as 0)
+        fighter_count = len(self.fighters)
+        viewed = self.side_viewer >= 0
+        counted = viewed & has_opponent
+        viewers = self.side_viewer[counted]
+        scores = compute_difficulty_scores(_or(self.side_base, 0), methods, rounds, self.side_winner)[0][counted]
+        won = self.side_winner[counted]
+        self.fight_count = np.bincount(self.side_viewer[viewed], minlength=fighter_count)
+        self.total_score = np.bincount(viewers, weights=scores, minlength=fighter_count)
+        self.win_count = np.bincount(viewers[won], minlength=fighter_count)
+        self.loss_count = np.bincount(viewers[~won], minlength=fighter_count)
+        self.win_score = np.bincount(viewers[won], weights=scores[won], minlength=fighter_count)
+        self.loss_score = np.bincount(viewers[~won], weights=scores[~won], minlength=fighter_count)
+        
+        self._fight_fields = {}
+        for number, fight in enumerate(self.fights):
+            self._fight_fields.setdefault(self.fight_key(fight), number)
+    
+    @staticmethod
+    def fight_key(fight: Dict[str, Any]) -> Tuple[str, str, str, str]:
+        """Return the fields a fight's difficulty scores depend on."""
+        return (str(fight.get('fighterA')), str(fight.get('fighterB')),
+                _js_key(fight.get('methodOfFinish')), _js_key(fight.get('actualRounds')))
+    
+    def overall_rating(self, fighter_number: int) -> Dict[str, Any]:
+        """Return the overallRating map for a fighter (useOverallRating with their own weight class)."""
+        pair = self.own_pair[fighter_number]
+        ratings = self.pair_ratings
+        return {
+            'rating': _plain(ratings['rating'][pair]),
+            'archetype': str(ratings['archetype'][pair]),
+            'style': FIGHTER_STYLES[ratings['style'][pair]],
+            'strengths': [str(name) for name in ratings['strengths'][pair] if name],
+            'weaknesses': [str(ratings['weakness'][pair])],
+            'striking': _plain(ratings['striking'][pair]),
+            'aggression': _plain(ratings['aggression'][pair]),
+            'grappling': _plain(ratings['grappling'][pair]),
+            'defense': _plain(ratings['defense'][pair]),
+            'finish': _plain(ratings['finish'][pair]),
+            'position': _plain(ratings['position'][pair]),
+            'version': RATINGS_VERSION,
+        }
+    
+    def combined_difficulty(self, fighter_number: int) -> Dict[str, Any]:
+        """Return the combinedDifficulty map for a fighter (useFighterCombinedDifficultyScore)."""
+        if not self.fight_count[fighter_number]:
+            return {'totalScore': 0, 'averageScore': 0, 'totalFights': 0, 'wins': 0, 'losses': 0, 'winRate': 0,
+                    'description': 'No fights',
+                    'breakdown': {'wins': {'count': 0, 'averageScore': 0}, 'losses': {'count': 0, 'averageScore': 0}}}
+        
+        wins, losses = int(self.win_count[fighter_number]), int(self.loss_count[fighter_number])
+        total_fights = wins + losses
+        total_score = _plain(self.total_score[fighter_number])
+        average_score = _plain(_js_round(total_score / total_fights)) if total_fights else 0
+        return {
+            'totalScore': total_score,
+            'averageScore': average_score,
+            'totalFights': total_fights,
+            'wins': wins,
+            'losses': losses,
+            'winRate': _plain(_js_round(wins / total_fights * 100)) if total_fights else 0,
+            'description': difficulty_description(average_score),
+            'breakdown': {
+                'wins': {'count': wins, 'averageScore': _plain(_js_round(self.win_score[fighter_number] / wins)) if wins else 0},
+                'losses': {'count': losses,
+                           'averageScore': _plain(_js_round(self.loss_score[fighter_number] / losses)) if losses else 0},
+            },
+        }
+    
+    def side_difficulty(self, side: int) -> Optional[Dict[str, Any]]:
+        """Return the difficulty map for one side of a fight, or None if the opponent is unknown."""
+        pair = self.side_pair[side]
+        if pair < 0:
+            return None
+        score = self.side_score[side]
+        return {
+            'score': _plain(score),
+            'description': difficulty_description(score),
+            'baseRating': _plain(self.side_base[side]),
+            'methodMultiplier': float(self.side_method[side]),
+            'roundMultiplier': float(self.side_round[side]),
+            'archetype': str(self.pair_ratings['archetype'][pair]),
+            'historyScore': _plain(self.side_history_score[side]) if self.side_has_class[side] else None,
+        }
+    
+    def fighter_fields(self, fighter_code: Any) -> Dict[str, Any]:
+        """Return the fields to store on a fighter document, or {} for an unknown fighter."""
+        fighter_number = self.fighter_index.get(str(fighter_code))
+        if fighter_number is None:
+            return {}
+        return {'overallRating': self.overall_rating(fighter_number),
+                'combinedDifficulty': self.combined_difficulty(fighter_number)}
+    
+    def fight_fields(self, fight: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the fields to store on a fight document, or {} for a fight not seen when computing."""
+        fight_number = self._fight_fields.get(self.fight_key(fight))
+        if fight_number is None:
+            return {}
+        
+        fields = {'fighterADifficulty': None, 'fighterBDifficulty': None}
+        for side in np.flatnonzero(self.side_fight == fight_number):
+            field = 'fighterADifficulty' if self.side_winner[side] else 'fighterBDifficulty'
+            fields[field] = self.side_difficulty(side)
+        return fields
+
+def load_documents(csv_file_path: str, categorize: bool = False) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Read a CSV file into (document_id, data) pairs the way the uploader builds them.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        categorize: Nest known stat fields into category maps (fighterData)
+    
+    Returns:
+        List of (document_id, data) pairs in file order
+    """
+    from upload_fighter_data_batch import build_fighter_document, iter_processed_rows
+    
+    return [build_fighter_document(processed_data, row_number, {})
+            for row_number, processed_data in iter_processed_rows(csv_file_path, categorize)]
+
+def load_fighter_matrix(fighters_csv_path: str, log: Callable[[str], None] = print) -> Optional[np.ndarray]:
+    """
+    Read the FIGHTER_FIELDS of a FighterData CSV file from its parse cache entry.
+    
+    Returns:
+        The fighters' raw matrix (see table_matrix), or None if the cache is unavailable
+    """
+    from parse_cache import load_table
+    
+    try:
+        table = load_table(fighters_csv_path)
+    except OSError as e:
+        log(f"⚠️  Parse cache unavailable for {fighters_csv_path} ({e}); reading the ratings fields from the documents")
+        return None
+    return table_matrix(table, table.plan(categorize=True), FIGHTER_FIELDS)
+
+def fighter_weight_classes(fighters: Sequence[Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Compute the weightClass documents the weightClassFighters aggregate publishes for these fighters.
+    
+    Each document is listed under every weightClass name the fighters use, so
+    'Light Heavyweight' and 'LightHeavyweight' both find their group, as the
+    website's lookup by group code does.
+    
+    Args:
+        fighters: fighterData documents
+    
+    Returns:
+        (weightclassname, document) pairs
+    """
+    groups = recompute_groups({str(index): WEIGHT_CLASS_FIGHTERS.contributions(fighter)
+                               for index, fighter in enumerate(fighters)})
+    names = sorted({str(fighter.get('weightClass')) for fighter in fighters
+                    if group_code(fighter.get('weightClass')) in groups})
+    return [(name, {**weight_class_document(group_code(name), groups[group_code(name)]), 'weightclassname': name})
+            for name in names]
+
+def load_fighter_ratings(fighters_csv_path: str, fights_csv_path: str, weight_classes_csv_path: str,
+                         log: Callable[[str], None] = print) -> Optional[FighterRatings]:
+    """
+    Compute the ratings from the fighter, fight and weight class CSV files.
+    
+    Results are cached per set of files (path, size and modification time),
+    so collections ingested concurrently share one computation.
+    
+    Args:
+        fighters_csv_path: FighterData CSV file
+        fights_csv_path: Fights CSV file
+        weight_classes_csv_path: WCAV CSV file (weight class totals); without it the
+            totals published to the weightClass collection are computed from the fighters
+        log: Function used to print progress messages
+    
+    Returns:
+        FighterRatings, or None if the fighter or fight file does not exist
+    """
+    for path in (fighters_csv_path, fights_csv_path):
+        if not os.path.exists(path):
+            log(f"⚠️  Skipping ratings: {path} not found")
+            return None
+    
+    paths = (fighters_csv_path, fights_csv_path, weight_classes_csv_path)
+    key = tuple((os.path.abspath(path), os.stat(path).st_size, os.stat(path).st_mtime_ns)
+                if os.path.exists(path) else (os.path.abspath(path), None, None) for path in paths)
+    with _RATINGS_LOCK:
+        ratings = _RATINGS_CACHE.get(key)
+        if ratings is None:
+            fighters = [data for _, data in load_documents(fighters_csv_path, categorize=True)]
+            fighter_matrix = load_fighter_matrix(fighters_csv_path, log)
+            fights = [data for _, data in load_documents(fights_csv_path)]
+            weight_classes = load_documents(weight_classes_csv_path) if os.path.exists(weight_classes_csv_path) else []
+            if not weight_classes:
+                weight_classes = fighter_weight_classes(fighters)
+                log(f"🧮 No {weight_classes_csv_path}; rating against the weightClass totals of the fighters")
+            ratings = _RATINGS_CACHE[key] = FighterRatings(fighters, fights, weight_classes, fighter_matrix)
+            log(f"🥋 Rated {len(fighters)} fighters and {len(fights)} fights")
+    return ratings
+
+def fighter_ratings_enricher(data_dir: str, log: Callable[[str], None] = print) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """Return a transform adding overallRating and combinedDifficulty to fighterData rows, or None without data."""
+    ratings = load_fighter_ratings(os.path.join(data_dir, 'FighterData.csv'), os.path.join(data_dir, 'Fights.csv'),
+                                   os.path.join(data_dir, 'WCAV.csv'), log)
+    if ratings is None:
+        return None
+    
+    def add_ratings(processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        processed_data.update(ratings.fighter_fields(processed_data.get('fighterCode')))
+        return processed_data
+    
+    return add_ratings
+
+def fight_difficulty_enricher(data_dir: str, log: Callable[[str], None] = print) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    """Return a transform adding fighterADifficulty and fighterBDifficulty to fights rows, or None without data."""
+    ratings = load_fighter_ratings(os.path.join(data_dir, 'FighterData.csv'), os.path.join(data_dir, 'Fights.csv'),
+                                   os.path.join(data_dir, 'WCAV.csv'), log)
+    if ratings is None:
+        return None
+    
+    def add_difficulty(processed_data: Dict[str, Any]) -> Dict[str, Any]:
+        processed_data.update(ratings.fight_fields(processed_data))
+        return processed_data
+    
+    return add_difficulty
+
+# Scalar reference implementation, transliterated from the TypeScript hooks
+
+def _get(document: Optional[Dict[str, Any]], category: Optional[str], field: str) -> float:
+    """`document?.category?.field || 0`."""
+    return _field(document, category, field)
+
+def _js_or(value: float, default: float) -> float:
+    return value if value and value == value else default
+
+def _js_math_round(value: float) -> float:
+    return value if value != value else float(math.floor(value + 0.5))
+
+def _js_min(*values: float) -> float:
+    """Math.min: NaN if any value is NaN."""
+    return math.nan if any(value != value for value in values) else min(values)
+
+def _js_max(*values: float) -> float:
+    """Math.max: NaN if any value is NaN."""
+    return math.nan if any(value != value for value in values) else max(values)
+
+def reference_overall_rating(fighter: Dict[str, Any], weight_class: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    useOverallRating(fighter, weightClassAvgData), one fighter at a time.
+    
+    Where the hook reads a field without `|| 0`, a missing value is NaN and
+    propagates through Math.min/Math.max, as it does in the hook.
+    
+    Args:
+        fighter: fighterData document
+        weight_class: weightClass document, or None
+    
+    Returns:
+        Dictionary with rating, archetype, strengths, weaknesses, style and the component ratings
+    """
+    f = lambda category, field: _get(fighter, category, field)
+    w = lambda field: _get(weight_class, None, field)
+    tanh = math.tanh
+    
+    # calculateStrikingRating
+    if isinstance(fighter.get('total_stats'), dict):
+        missed = sum((f('total_stats', f"Total{strike}Missed") for strike in STRIKE_TYPES), 0.0)
+        total_landed = f('total_stats', 'TotalStrikesLanded')
+        total_attempts = total_landed + missed
+        fighter_accuracy = (total_landed / total_attempts) * 100 if total_attempts > 0 else 0.0
+    else:
+        fighter_accuracy = 0.0
+    minutes_tracked = _js_or(f(None, 'MinutesTracked'), 1)
+    fighter_spm = (sum((f('total_stats', f"Total{strike}Made") for strike in STRIKE_TYPES), 0.0) / minutes_tracked
+                   + f('clinch_stats', 'TotalClinchStrikesMade') / minutes_tracked
+                   + f('ground_stats', 'TotalGroundStrikesMade') / minutes_tracked)
+    class_minutes = _js_or(w('minutes'), 1)
+    class_spm = (sum((w(f"Total{strike}Made") for strike in STRIKE_TYPES), 0.0) / class_minutes
+                 + w('TotalClinchStrikesMade') / class_minutes
+                 + w('TotalGroundStrikesMade') / class_minutes)
+    class_accuracy = _js_or(w('strikingAccuracy'), 50)
+    if class_accuracy == 0 or class_spm == 0:
+        striking = _js_min(100, _js_max(1, fighter_accuracy))
+    else:
+        combined_ratio = (fighter_accuracy / class_accuracy) * 0.7 + (fighter_spm / class_spm) * 0.3
+        striking = _js_min(100, _js_max(1, _js_math_round(50 + 50 * tanh((combined_ratio - 1) * 2))))
+    
+    # calculateAggressivenessRating
+    if not f(None, 'FightsTracked') or f(None, 'FightsTracked') < 5:
+        aggression = None
+    else:
+        fighter_minutes = _js_or(f(None, 'MinutesTracked'), 0.001)
+        class_minutes = _js_or(w('minutes'), 0.001) if weight_class else 0.001
+        fighter_rate = (sum((f('total_stats', field) for field in STRIKES_THROWN), 0.0)
+                        + f('clinch_stats', 'TotalClinchStrikesThrown')
+                        + f('ground_stats', 'TotalGroundStrikesThrown')) / fighter_minutes
+        class_rate = ((sum((w(field) for field in STRIKES_THROWN), 0.0) + w('TotalClinchStrikesThrown')
+                       + w('TotalGroundStrikesThrown')) / class_minutes) if weight_class else 0
+        strike_ratio = fighter_rate / class_rate if class_rate > 0 else 1.0
+        class_takedowns = w('TakedownsLanded') / class_minutes if weight_class else 0
+        takedown_ratio = (f('takedown_stats', 'TakedownsLanded') / fighter_minutes) / class_takedowns if class_takedowns > 0 else 1.0
+        class_subs = w('SubmissionsAttempted') / class_minutes if weight_class else 0
+        sub_ratio = (f('submission_stats', 'SubmissionsAttempted') / fighter_minutes) / class_subs if class_subs > 0 else 1.0
+        total_positions = (f(None, 'CenterOctagon') + f(None, 'PushedBackToCage') + f(None, 'PushingAgainstCage')
+                           + f('clinch_stats', 'BeingClinched') + f('clinch_stats', 'InClinch')
+                           + f('ground_stats', 'OnBottomGround') + f('ground_stats', 'OnTopGround'))
+        if total_positions == 0:
+            position_ratio = 1.0
+        else:
+            dominant_positions = f(None, 'PushingAgainstCage') + f('clinch_stats', 'InClinch') + f('ground_stats', 'OnTopGround')
+            position_ratio = ((dominant_positions / total_positions) * 100) / 50
+        composite_ratio = (strike_ratio + takedown_ratio + sub_ratio + position_ratio) / 4
+        aggression = _js_min(99, _js_max(1, _js_math_round(50 + 49 * tanh(composite_ratio - 1))))
+    
+    # calculateGrapplingGrade
+    def normalize_value(fighter_value, class_value):
+        if class_value == 0:
+            return 50
+        return 50 + (50 * tanh((fighter_value / class_value - 1) * 2))
+    
+    if not isinstance(fighter.get('takedown_stats'), dict) or not weight_class:
+        grappling = 50
+    else:
+        fighter_attempts = sum((f('takedown_stats', field) for field in TAKEDOWN_ATTEMPTS), 0.0)
+        fighter_successes = sum((f('takedown_stats', field) for field in TAKEDOWN_SUCCESSES), 0.0)
+        class_attempts = sum((w(field) for field in WEIGHT_CLASS_TAKEDOWN_ATTEMPTS), 0.0)
+        fighter_success_rate = fighter_successes / fighter_attempts if fighter_attempts > 0 else 0
+        fighter_fights = _js_or(f(None, 'FightsTracked'), 1)
+        class_fights = _js_or(w('fights'), 1)
+        takedown_rating = (normalize_value(fighter_success_rate, 0.38) * 0.6
+                           + normalize_value(fighter_attempts / fighter_fights, class_attempts / class_fights) * 0.4)
+        
+        submission_rating = 50
+        if isinstance(fighter.get('submission_stats'), dict):
+            sub_attempts = f('submission_stats', 'SubmissionsAttempted')
+            sub_successes = f('submission_stats', 'SubmissionsSuccessful')
+            class_sub_attempts, class_sub_successes = w('SubmissionsAttempted'), w('SubmissionsSuccessful')
+            sub_rate = sub_successes / sub_attempts if sub_attempts > 0 else 0
+            class_sub_rate = class_sub_successes / class_sub_attempts if class_sub_attempts > 0 else 0
+            submission_rating = (normalize_value(sub_rate, class_sub_rate) * 0.7
+                                 + normalize_value(sub_attempts / fighter_fights, class_sub_attempts / class_fights) * 0.3)
+        
+        clinch_rating = 50
+        if isinstance(fighter.get('clinch_stats'), dict):
+            in_clinch, being_clinched = f('clinch_stats', 'InClinch'), f('clinch_stats', 'BeingClinched')
+            class_in_clinch, class_being_clinched = w('InClinch'), w('BeingClinched')
+            clinch_ratio = in_clinch / (in_clinch + being_clinched) if (in_clinch + being_clinched) > 0 else 0.5
+            class_clinch_ratio = (class_in_clinch / (class_in_clinch + class_being_clinched)
+                                  if (class_in_clinch + class_being_clinched) > 0 else 0.5)
+            clinch_thrown = f('clinch_stats', 'TotalClinchStrikesThrown')
+            clinch_accuracy = ((_raw_field(fighter, 'clinch_stats', 'TotalClinchStrikesMade') / clinch_thrown) * 100
+                               if clinch_thrown > 0 else 0)
+            clinch_rating = (normalize_value(clinch_ratio, class_clinch_ratio) * 0.6
+                             + normalize_value(clinch_accuracy, _js_or(w('clinchStrikingAccuracy'), 40)) * 0.4)
+        
+        ground_rating = 50
+        if isinstance(fighter.get('ground_stats'), dict):
+            on_top, on_bottom = f('ground_stats', 'OnTopGround'), f('ground_stats', 'OnBottomGround')
+            ground_control = (on_top / (on_top + on_bottom)) * 100 if on_top and on_bottom else 50
+            ground_thrown = f('ground_stats', 'TotalGroundStrikesThrown')
+            ground_accuracy = ((_raw_field(fighter, 'ground_stats', 'TotalGroundStrikesMade') / ground_thrown) * 100
+                               if ground_thrown > 0 else 0)
+            ground_per_round = _raw_field(fighter, 'ground_stats', 'TotalGroundStrikesThrown') / _js_or(f(None, 'RoundsTracked'), 1)
+            ground_rating = (normalize_value(ground_control, 50) * 0.4
+                             + normalize_value(ground_accuracy, _js_or(w('groundStrikingAccuracy'), 40)) * 0.3
+                             + normalize_value(ground_per_round, _js_or(w('groundStrikesPerRound'), 2.0)) * 0.3)
+            ground_rating = _js_min(100, _js_max(1, _js_math_round(ground_rating)))
+        
+        combined_rating = takedown_rating * 0.35 + submission_rating * 0.15 + clinch_rating * 0.2 + ground_rating * 0.3
+        grappling = _js_min(100, _js_max(1, _js_math_round(combined_rating)))
+    
+    # calculateDefenseRating
+    fighter_minutes = _js_or(f(None, 'MinutesTracked'), 1)
+    class_minutes = _js_or(w('minutes'), 1)
+    defense = 0.0
+    for field, weight in DEFENSE_WEIGHTS:
+        class_value = w(field) / class_minutes
+        rating = 50 if class_value == 0 else 50 + (50 * tanh((1 - (f('striking_stats', field) / fighter_minutes) / class_value) * 2))
+        defense += rating * weight
+    defense = _js_math_round(defense)
+    
+    # calculateFinishRating
+    wins = f('fight_outcome_stats', 'FighterWins')
+    ko_wins, tko_wins = f('fight_outcome_stats', 'FighterKOWins'), f('fight_outcome_stats', 'FighterTKOWins')
+    sub_wins = f('fight_outcome_stats', 'FighterSUBWin')
+    finish_percentage = ((ko_wins + tko_wins + sub_wins) / wins) * 100 if wins else 0
+    class_finish_percentage = _js_or(w('finishPercentage'), 40)
+    finish = _js_min(100, _js_max(1, _js_math_round(50 + (50 * tanh((finish_percentage / class_finish_percentage - 1) * 2)))))
+    
+    # calculatePositionalRating
+    center, pushed_back, pushing = f(None, 'CenterOctagon'), f(None, 'PushedBackToCage'), f(None, 'PushingAgainstCage')
+    being_clinched, in_clinch = f('clinch_stats', 'BeingClinched'), f('clinch_stats', 'InClinch')
+    on_bottom, on_top = f('ground_stats', 'OnBottomGround'), f('ground_stats', 'OnTopGround')
+    total_events = center + pushed_back + pushing + being_clinched + in_clinch + on_bottom + on_top
+    if total_events == 0:
+        position = 50
+    else:
+        dominance = (center + pushing + in_clinch + on_top) / total_events
+        rating = 1 + (49 * (dominance / 0.5)) if dominance <= 0.5 else 50 + (50 * ((dominance - 0.5) / 0.5))
+        position = _js_min(100, _js_max(1, _js_math_round(rating)))
+    
+    # analyzeFighterData
+    total_fights = f(None, 'FightsTracked')
+    win_rate = (wins / total_fights) * 100 if total_fights > 0 else 0
+    total_strikes_landed = f('total_stats', 'TotalStrikesLanded')
+    total_strikes_thrown = f('total_stats', 'TotalStrikesThrown')
+    striking_accuracy = (total_strikes_landed / total_strikes_thrown) * 100 if total_strikes_thrown > 0 else 0
+    takedowns_landed = f('takedown_stats', 'TakedownsLanded')
+    takedowns_attempted = f('takedown_stats', 'TakedownsAttempted')
+    takedown_accuracy = (takedowns_landed / takedowns_attempted) * 100 if takedowns_attempted > 0 else 0
+    decision_wins = (f('fight_outcome_stats', 'FighterUDWins') + f('fight_outcome_stats', 'FighterSplitDecWin')
+                     + f('fight_outcome_stats', 'FighterMajDecWin'))
+    total_finishes = ko_wins + tko_wins + sub_wins
+    finish_rate = (total_finishes / wins) * 100 if wins > 0 else 0
+    dominant_positions, defensive_positions = center + on_top, pushed_back + on_bottom
+    total_positions = dominant_positions + defensive_positions
+    dominance_ratio = dominant_positions / total_positions if total_positions > 0 else 0.5
+    class_strikes_per_minute = _get(weight_class, 'total_stats', 'StrikesPerMinute')
+    aggression_ratio = (f('total_stats', 'StrikesPerMinute') / class_strikes_per_minute
+                        if class_strikes_per_minute > 0 else 1)
+    
+    # determineFighterStyle
+    striking_dominance = striking >= 65
+    grappling_dominance = grappling >= 70 or position >= 75
+    finishing_dominance = finish >= 60
+    if grappling >= 80 and position >= 80:
+        style = 'grappler'
+    elif striking >= 80 and grappling <= 50:
+        style = 'striker'
+    elif finish >= 75 and (ko_wins + tko_wins) > sub_wins:
+        style = 'knockout_artist'
+    elif finish >= 75 and sub_wins > (ko_wins + tko_wins):
+        style = 'submission_specialist'
+    elif grappling_dominance and not striking_dominance:
+        style = 'grappler'
+    elif striking_dominance and not grappling_dominance:
+        style = 'striker'
+    elif finishing_dominance and (ko_wins + tko_wins) > sub_wins:
+        style = 'knockout_artist'
+    elif finishing_dominance and sub_wins > (ko_wins + tko_wins):
+        style = 'submission_specialist'
+    elif striking_dominance and grappling_dominance:
+        style = 'mixed'
+    else:
+        style = 'balanced'
+    
+    aggression_value = aggression if aggression is not None else 50
+    w_striking, w_defense, w_grappling, w_aggression, w_finishes, w_position = STYLE_WEIGHTS[style]
+    weighted_rating = (striking * w_striking + defense * w_defense + grappling * w_grappling
+                       + aggression_value * w_aggression + finish * w_finishes + position * w_position)
+    
+    # calculateSpecialistBonus
+    bonus = 0
+    if style == 'striker':
+        bonus += (8 if striking >= 75 else 0) + (5 if striking >= 80 else 0) + (3 if defense >= 70 else 0)
+    elif style == 'grappler':
+        bonus += (8 if grappling >= 75 else 0) + (8 if position >= 75 else 0)
+        bonus += (5 if grappling >= 80 and position >= 80 else 0) + (3 if defense >= 70 else 0)
+    elif style == 'knockout_artist':
+        bonus += (8 if finish >= 75 else 0) + (5 if striking >= 70 else 0)
+        bonus += 3 if aggression is not None and aggression >= 70 else 0
+    elif style == 'submission_specialist':
+        bonus += (8 if finish >= 75 else 0) + (5 if grappling >= 70 else 0) + (3 if position >= 70 else 0)
+    elif style == 'mixed':
+        bonus += (8 if striking >= 70 and grappling >= 70 else 0) + (5 if defense >= 70 else 0)
+    overall_rating = _js_min(99, _js_math_round(weighted_rating + bonus))
+    
+    # determineArchetype
+    specialist_index = {'striker': 0, 'grappler': 1, 'knockout_artist': 2, 'submission_specialist': 3}.get(style)
+    if overall_rating >= 85:
+        archetype = ARCHETYPE_TIERS[0][1][specialist_index] if specialist_index is not None else 'Elite Mixed Martial Artist'
+    elif overall_rating >= 75:
+        if specialist_index is not None:
+            archetype = ARCHETYPE_TIERS[1][1][specialist_index]
+        elif win_rate >= 75 and decision_wins > total_finishes:
+            archetype = 'Decision Machine'
+        else:
+            archetype = 'Well-Rounded Fighter'
+    elif overall_rating >= 60:
+        if specialist_index is not None:
+            archetype = ARCHETYPE_TIERS[2][1][specialist_index]
+        elif aggression_ratio >= 1.2:
+            archetype = 'Aggressive Fighter'
+        elif dominance_ratio >= 0.6:
+            archetype = 'Positional Fighter'
+        else:
+            archetype = 'Balanced Fighter'
+    elif specialist_index is not None:
+        archetype = ARCHETYPE_TIERS[3][1][specialist_index]
+    elif aggression_ratio >= 1.1:
+        archetype = 'Aggressive but Limited'
+    elif dominance_ratio <= 0.3:
+        archetype = 'Defensive Fighter'
+    else:
+        archetype = 'Technical Fighter'
+    
+    # determineStrengths
+    strengths = []
+    if striking_accuracy >= 55 or total_strikes_landed > 100:
+        strengths.append(('Technical Striking' if striking_accuracy >= 60 else 'Striking Volume', striking_accuracy))
+    if takedown_accuracy >= 40 or takedowns_landed > 10:
+        strengths.append(('Technical Grappling' if takedown_accuracy >= 50 else 'Grappling Control', takedown_accuracy))
+    if finish_rate >= 50 or (ko_wins + tko_wins) > 3:
+        strengths.append(('Knockout Power' if (ko_wins + tko_wins) > sub_wins else 'Submission Game', finish_rate))
+    if aggression_ratio >= 1.1:
+        strengths.append(('Fighting Aggression', aggression_ratio * 50))
+    if dominance_ratio >= 0.6:
+        strengths.append(('Positional Control', dominance_ratio * 100))
+    if win_rate >= 70 and total_fights >= 5:
+        strengths.append(('Fight IQ', win_rate))
+    strengths.sort(key=lambda strength: -strength[1])
+    
+    # determineWeaknesses
+    if striking_accuracy < 40 and total_strikes_landed < 50:
+        weaknesses = ['Striking Fundamentals']
+    elif takedown_accuracy < 30 and takedowns_landed < 5:
+        weaknesses = ['Grappling Defense']
+    elif finish_rate < 30 and total_fights >= 5:
+        weaknesses = ['Finishing Ability']
+    elif aggression_ratio < 0.8:
+        weaknesses = ['Fighting Aggression']
+    elif dominance_ratio < 0.4:
+        weaknesses = ['Positional Control']
+    elif win_rate < 50 and total_fights >= 5:
+        weaknesses = ['Fight Strategy']
+    else:
+        rating_weaknesses = [('Striking', striking), ('Defense', defense), ('Grappling', grappling),
+                             ('Aggression', aggression_value), ('Finishes', finish), ('Position', position)]
+        rating_weaknesses = _js_sort(rating_weaknesses, key=lambda weakness: weakness[1])
+        weaknesses = [rating_weaknesses[0][0]]
+    
+    return {
+        'rating': overall_rating,
+        'archetype': archetype,
+        'style': style,
+        'strengths': [name for name, _ in strengths[:2]],
+        'weaknesses': weaknesses,
+        'striking': striking,
+        'aggression': aggression,
+        'grappling': grappling,
+        'defense': defense,
+        'finish': finish,
+        'position': position,
+    }
+
+def reference_difficulty_score(opponent: Dict[str, Any], weight_class: Optional[Dict[str, Any]], method_of_finish: Any,
+                               actual_rounds: Any, is_winner: bool) -> Dict[str, Any]:
+    """useDifficultyScore for one fight, one fight at a time."""
+    opponent_rating = reference_overall_rating(opponent, weight_class)
+    base_rating = opponent_rating['rating']
+    method_table = WIN_METHOD_MULTIPLIERS if is_winner else LOSS_METHOD_MULTIPLIERS
+    round_table = WIN_ROUND_MULTIPLIERS if is_winner else LOSS_ROUND_MULTIPLIERS
+    method_multiplier = method_table.get(_js_key(method_of_finish)) or 1.0
+    round_multiplier = round_table.get(_js_key(actual_rounds)) or 1.0
+    score = _js_min(100, _js_max(1, _js_math_round(base_rating * method_multiplier * round_multiplier)))
+    return {
+        'score': score,
+        'description': difficulty_description(score),
+        'baseRating': base_rating,
+        'methodMultiplier': method_multiplier,
+        'roundMultiplier': round_multiplier,
+        'archetype': opponent_rating['archetype'],
+    }
+
+def reference_history_score(opponent: Dict[str, Any], method_of_finish: Any, actual_rounds: Any, is_winner: bool) -> float:
+    """useFightDifficultyScores' simplified score for one fight."""
+    total_fights = _get(opponent, None, 'FightsTracked')
+    total_wins = _get(opponent, 'fight_outcome_stats', 'FighterWins')
+    win_rate = (total_wins / total_fights) * 100 if total_fights > 0 else 50
+    total_finishes = (_get(opponent, 'fight_outcome_stats', 'FighterKOWins')
+                      + _get(opponent, 'fight_outcome_stats', 'FighterTKOWins')
+                      + _get(opponent, 'fight_outcome_stats', 'FighterSUBWin'))
+    finish_rate = (total_finishes / total_wins) * 100 if total_wins > 0 else 25
+    base_rating = _js_min(100, _js_max(1, (win_rate * 0.7) + (finish_rate * 0.3)))
+    method_table = WIN_METHOD_MULTIPLIERS if is_winner else LOSS_METHOD_MULTIPLIERS
+    round_table = WIN_ROUND_MULTIPLIERS if is_winner else LOSS_ROUND_MULTIPLIERS
+    method_multiplier = method_table.get(_js_key(method_of_finish)) or 1.0
+    round_multiplier = round_table.get(_js_key(actual_rounds)) or 1.0
+    return _js_min(100, _js_max(1, _js_math_round(base_rating * method_multiplier * round_multiplier)))
+
+def reference_combined_difficulty(fights: Sequence[Dict[str, Any]], opponents: Dict[str, Dict[str, Any]],
+                                  fighter_code: str, weight_class: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """useFighterCombinedDifficultyScore for one fighter."""
+    if not fights:
+        return {'totalScore': 0, 'averageScore': 0, 'totalFights': 0, 'wins': 0, 'losses': 0, 'winRate': 0,
+                'description': 'No fights',
+                'breakdown': {'wins': {'count': 0, 'averageScore': 0}, 'losses': {'count': 0, 'averageScore': 0}}}
+    
+    total_score = wins = losses = win_scores = loss_scores = 0
+    for fight in fights:
+        is_winner = str(fight.get('fighterA')) == fighter_code
+        opponent = opponents.get(str(fight.get('fighterB') if is_winner else fight.get('fighterA')))
+        if opponent is None:
+            continue
+        # The opponent's rating is read with `|| 0`, so a NaN rating scores 1 here
+        difficulty = reference_difficulty_score(opponent, weight_class, fight.get('methodOfFinish'),
+                                                fight.get('actualRounds'), is_winner)
+        score = _js_min(100, _js_max(1, _js_math_round(_js_or(difficulty['baseRating'], 0)
+                                                       * difficulty['methodMultiplier'] * difficulty['roundMultiplier'])))
+        total_score += score
+        if is_winner:
+            wins += 1
+            win_scores += score
+        else:
+            losses += 1
+            loss_scores += score
+    
+    total_fights = wins + losses
+    average_score = _js_math_round(total_score / total_fights) if total_fights else 0
+    return {
+        'totalScore': total_score,
+        'averageScore': average_score,
+        'totalFights': total_fights,
+        'wins': wins,
+        'losses': losses,
+        'winRate': _js_math_round((wins / total_fights) * 100) if total_fights else 0,
+        'description': difficulty_description(average_score),
+        'breakdown': {
+            'wins': {'count': wins, 'averageScore': _js_math_round(win_scores / wins) if wins else 0},
+            'losses': {'count': losses, 'averageScore': _js_math_round(loss_scores / losses) if losses else 0},
+        },
+    }
+
+def _same(expected: Any, actual: Any) -> bool:
+    """Compare reference and engine values, allowing float rounding noise; the engine stores NaN as None."""
+    if isinstance(expected, float) and expected != expected:
+        return actual is None or (isinstance(actual, float) and actual != actual)
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(_same(value, actual.get(key)) for key, value in expected.items())
+    if isinstance(expected, (int, float)) and not isinstance(expected, bool) and isinstance(actual, (int, float)):
+        return math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9)
+    return expected == actual
+
+def check_parity(ratings: FighterRatings, limit: Optional[int] = None) -> List[str]:
+    """
+    Compare the vectorized engine with the scalar reference implementation.
+    
+    Args:
+        ratings: Computed ratings
+        limit: Check at most this many fighters and fights (all if None)
+    
+    Returns:
+        List of mismatch descriptions (empty when everything matches)
+    """
+    mismatches = []
+    class_by_name = {str(data.get('weightclassname')): data for data in ratings.weight_classes}
+    
+    def viewer_class(code: str) -> Optional[Dict[str, Any]]:
+        number = ratings.fighter_index.get(code)
+        fighter = ratings.fighters[number] if number is not None else {}
+        return class_by_name.get(str(fighter.get('weightClass') or 'Unknown'))
+    
+    fights_by_fighter = {}
+    for fight in ratings.fights:
+        codes = {str(fight.get('fighterA')), str(fight.get('fighterB'))}
+        for code in codes:
+            fights_by_fighter.setdefault(code, []).append(fight)
+    opponents = {code: ratings.fighters[number] for code, number in ratings.fighter_index.items()}
+    
+    for number, fighter in enumerate(ratings.fighters[:limit]):
+        code = str(fighter.get('fighterCode'))
+        weight_class = class_by_name.get(str(fighter.get('weightClass') or 'Unknown'))
+        expected = reference_overall_rating(fighter, weight_class)
+        if not _same(expected, ratings.overall_rating(number)):
+            mismatches.append(f"overallRating {code}: expected {expected}, got {ratings.overall_rating(number)}")
+        if ratings.fighter_index.get(code) == number:
+            expected = reference_combined_difficulty(fights_by_fighter.get(code, []), opponents, code, viewer_class(code))
+            if not _same(expected, ratings.combined_difficulty(number)):
+                mismatches.append(f"combinedDifficulty {code}: expected {expected}, got {ratings.combined_difficulty(number)}")
+    
+    for fight in ratings.fights[:limit]:
+        fields = ratings.fight_fields(fight)
+        for field, viewer, opponent_code, is_winner in (('fighterADifficulty', fight.get('fighterA'), fight.get('fighterB'), True),
+                                                        ('fighterBDifficulty', fight.get('fighterB'), fight.get('fighterA'), False)):
+            if not is_winner and str(viewer) == str(opponent_code):
+                continue
+            opponent = opponents.get(str(opponent_code))
+            if opponent is None:
+                expected = None
+            else:
+                weight_class = viewer_class(str(viewer))
+                expected = reference_difficulty_score(opponent, weight_class, fight.get('methodOfFinish'),
+                                                      fight.get('actualRounds'), is_winner)
+                expected['historyScore'] = (reference_history_score(opponent, fight.get('methodOfFinish'),
+                                                                    fight.get('actualRounds'), is_winner)
+                                            if weight_class else None)
+            if not _same(expected, fields.get(field)):
+                mismatches.append(f"{field} {fight.get('fightCode')}: expected {expected}, got {fields.get(field)}")
+    return mismatches
+
+def synthetic_dataset(fighter_count: int = 300, fight_count: int = 900, seed: int = 7) -> FighterRatings:
+    """
+    Build ratings for random fighters, fights and weight classes.
+    
+    Fields and whole category maps are dropped at random, and some fights
+    reference unknown fighters, so the parity check exercises the edge cases
+    (missing data, zero denominators, insufficient fights) as well as the
+    typical path.
+    
+    Args:
+        fighter_count: Number of fighters
+        fight_count: Number of fights
+        seed: Random seed
+    
+    Returns:
+        FighterRatings for the generated data
+    """
+    generator = random.Random(seed)
+    class_names = ['Flyweight', 'Bantamweight', 'Featherweight', 'Lightweight', 'Welterweight']
+    
+    def value(high: float) -> Any:
+        roll = generator.random()
+        if roll < 0.1:
+            return None
+        if roll < 0.2:
+            return 0
+        return generator.randint(1, int(high)) if roll < 0.9 else round(generator.uniform(0.1, high), 2)
+    
+    weight_classes = []
+    for index, name in enumerate(class_names):
+        data = {'weightclassname': name}
+        for category, field in WEIGHT_CLASS_FIELDS:
+            if category is None:
+                data[field] = value(4000)
+        data['minutes'] = generator.choice([0, generator.randint(50, 5000)])
+        weight_classes.append((f"wc{index:02d}", data))
+    
+    fighters = []
+    for index in range(fighter_count):
+        data = {'fighterCode': f"F{index:04d}", 'weightClass': generator.choice(class_names + ['Catchweight', None])}
+        for category, field in FIGHTER_FIELDS:
+            field_value = value(5 if field == 'FightsTracked' and generator.random() < 0.3 else 60)
+            if field_value is None:
+                continue
+            if category is None:
+                data[field] = field_value
+            else:
+                data.setdefault(category, {})[field] = field_value
+        for category in FIGHTER_CATEGORIES:
+            if generator.random() < 0.08:
+                data.pop(category, None)
+        fighters.append(data)
+    
+    fights = []
+    codes = [fighter['fighterCode'] for fighter in fighters] + ['Unknown1', 'Unknown2']
+    for index in range(fight_count):
+        fights.append({
+            'fightCode': f"FIGHT{index:05d}",
+            'fighterA': generator.choice(codes),
+            'fighterB': generator.choice(codes),
+            'methodOfFinish': generator.choice(['KO', 'TKO', 'SUB', 'DEC', 'DQ', 'NC', 'SD', 'UD', None]),
+            'actualRounds': generator.choice([1, 2, 3, 4, 5, 3.0, '2', 0, None]),
+        })
+    return FighterRatings(fighters, fights, weight_classes)
+
+def main():
+    """Compute ratings from the CSV files and check parity, print a summary, or publish them with --publish."""
+    parser = argparse.ArgumentParser(description="Compute fighter ratings and fight difficulty scores.")
+    parser.add_argument('--data-dir', default="oldData", help="Directory holding FighterData.csv, Fights.csv and WCAV.csv")
+    parser.add_argument('--check', action='store_true', help="Compare the vectorized engine with the reference implementation")
+    parser.add_argument('--synthetic', type=int, metavar='N', help="Use N random fighters instead of the CSV files")
+    parser.add_argument('--limit', type=int, help="With --check, check at most this many fighters and fights")
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        ratings = synthetic_dataset(args.synthetic, args.synthetic * 3)
+        print(f"🎲 Rated {len(ratings.fighters)} synthetic fighters and {len(ratings.fights)} fights")
+    else:
+        ratings = load_fighter_ratings(os.path.join(args.data_dir, 'FighterData.csv'),
+                                       os.path.join(args.data_dir, 'Fights.csv'),
+                                       os.path.join(args.data_dir, 'WCAV.csv'))
+        if ratings is None:
+            sys.exit(1)
+    
+    if args.check:
+        mismatches = check_parity(ratings, args.limit)
+        for mismatch in mismatches[:20]:
+            print(f"❌ {mismatch}")
+        if mismatches:
+            print(f"❌ {len(mismatches)} mismatches against the reference implementation")
+            sys.exit(1)
+        print("✅ Vectorized ratings match the reference implementation")
+        return
+    
+    archetypes = {}
+    for number in range(len(ratings.fighters)):
+        archetype = ratings.overall_rating(number)['archetype']
+        archetypes[archetype] = archetypes.get(archetype, 0) + 1
+    print("📊 Archetypes:")
+    for archetype, count in sorted(archetypes.items(), key=lambda item: -item[1]):
+        print(f"   {archetype}: {count}")
+
+if __name__ == "__main__":
+    main()
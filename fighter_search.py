@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Precomputed fighter search index.
+Builds a compact prefix/trigram index over fighter names at ingest time,
+covering the fighterData documents and the fighters listed without data in
+WEBNoDataDisplay.csv and WEBFighterNoData.csv, so the search bars can load
+one small document (or a static JSON asset) instead of the whole
+fighterData collection.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from document_size import estimate_document_size
+from fighter_totals import SNAPSHOT_COLLECTION, SNAPSHOT_SHARD_BYTES
+
+# Document the index is published to, in the snapshots collection
+FIGHTER_SEARCH_DOCUMENT = 'fighterSearch'
+
+# Bump when the index layout changes so readers can detect old indexes
+FIGHTER_SEARCH_VERSION = 1
+
+# Fighters without tracked data: (CSV file, collection the website reads it from)
+NO_DATA_SOURCES = (
+    ('WEBNoDataDisplay.csv', 'webNoDataDisplay'),
+    ('WEBFighterNoData.csv', 'webFighterNoData'),
+)
+
+# Queries shorter than this use the word-prefix postings instead of trigrams
+TRIGRAM_LENGTH = 3
+
+# Number of fighters listed for an empty query, like the search bars' top 10 by minutes tracked
+TOP_FIGHTERS = 10
+
+# Values the exports use for a missing field
+MISSING_VALUES = {'', 'N/A'}
+
+_NON_ALPHANUMERIC = re.compile(r'[^0-9a-z]+')
+
+def normalize_name(name: Any) -> str:
+    """
+    Normalize a name for searching.
+    
+    Accents are stripped, the name is lowercased and every run of
+    characters other than letters and digits becomes a single space, so
+    "José Aldo" and "jose-aldo" both normalize to "jose aldo".
+    """
+    decomposed = unicodedata.normalize('NFKD', str(name or ''))
+    stripped = ''.join(character for character in decomposed if not unicodedata.combining(character))
+    return _NON_ALPHANUMERIC.sub(' ', stripped.lower()).strip()
+
+def name_trigrams(normalized: str) -> List[str]:
+    """Return the distinct three-character substrings of a normalized name, in order of appearance."""
+    return list(dict.fromkeys(normalized[index:index + TRIGRAM_LENGTH]
+                              for index in range(len(normalized) - TRIGRAM_LENGTH + 1)))
+
+def name_prefixes(normalized: str) -> List[str]:
+    """Return the distinct one- and two-character prefixes of the words of a normalized name."""
+    return list(dict.fromkeys(word[:length] for word in normalized.split()
+                              for length in range(1, TRIGRAM_LENGTH) if len(word) >= length))
+
+def _base36(value: int) -> str:
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = ''
+    while True:
+        value, remainder = divmod(value, 36)
+        text = digits[remainder] + text
+        if not value:
+            return text
+
+def encode_postings(rows: Iterable[int]) -> str:
+    """
+    Encode a sorted list of row indexes as a compact string.
+    
+    Each row is stored as the base-36 gap from the previous one, separated
+    by '.', so "0.5.1c" is rows 0, 5 and 53. Strings cost one byte per
+    character in Firestore, much less than an 8-byte integer per row.
+    """
+    previous = 0
+    gaps = []
+    for row in rows:
+        gaps.append(_base36(row - previous))
+        previous = row
+    return '.'.join(gaps)
+
+def decode_postings(text: str) -> List[int]:
+    """Decode a string built by encode_postings back into row indexes."""
+    rows = []
+    row = 0
+    for gap in text.split('.') if text else ():
+        row += int(gap, 36)
+        rows.append(row)
+    return rows
+
+def _display_value(value: Any) -> str:
+    value = '' if value is None else str(value).strip()
+    return '' if value in MISSING_VALUES else value
+
+def _minutes(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value != value:
+        return 0
+    return value
+
+class FighterSearchIndexAggregator:
+    """
+    Collect fighter names during an upload and build the search index.
+    
+    Only the display fields are kept per fighter: document ID, name,
+    fighterCode, weight class, minutes tracked and the collection the
+    fighter's page reads. Fighters without data are added from the no-data
+    exports unless a fighterData document already has the same name.
+    """
+    
+    def __init__(self, collection_name: str = SNAPSHOT_COLLECTION, document_id: str = FIGHTER_SEARCH_DOCUMENT,
+                 source_collection: str = 'fighterData', no_data_csv_paths: Sequence[Tuple[str, str]] = ()):
+        """
+        Create an aggregator.
+        
+        Args:
+            collection_name: Collection the index is published to
+            document_id: ID of the index document
+            source_collection: Collection the fighter documents are uploaded to
+            no_data_csv_paths: (CSV path, collection) pairs listing fighters without data
+        """
+        self.collection_name = collection_name
+        self.document_id = document_id
+        self.source_collection = source_collection
+        self.no_data_csv_paths = list(no_data_csv_paths)
+        self.fighters = {}
+    
+    def add(self, document_id: str, data: Dict[str, Any]):
+        """Record the display fields of one fighter document."""
+        self.fighters[document_id] = (
+            _display_value(data.get('fighterName') or data.get('name')),
+            _display_value(data.get('fighterCode')),
+            _display_value(data.get('weightClass')),
+            _minutes(data.get('MinutesTracked')),
+        )
+    
+    def no_data_entries(self, known_names: set) -> List[Tuple[str, str, str, str, float, str]]:
+        """Read the fighters without data whose names are not already indexed."""
+        from upload_fighter_data_batch import iter_csv_rows
+        
+        entries = []
+        for csv_file_path, collection_name in self.no_data_csv_paths:
+            if not os.path.exists(csv_file_path):
+                continue
+            for row_number, row, _ in iter_csv_rows(csv_file_path):
+                name = _display_value(row.get('fighterName'))
+                normalized = normalize_name(name)
+                if not normalized or normalized in known_names:
+                    continue
+                known_names.add(normalized)
+                document_id = _display_value(row.get('_id')) or f"row_{row_number}"
+                entries.append((document_id, name, '', _display_value(row.get('weightClass')), 0, collection_name))
+        return entries
+    
+    def index(self) -> Dict[str, Any]:
+        """
+        Build the index contents.
+        
+        Rows are stored column by column (documentIds, names, fighterCodes,
+        weightClasses, minutes, sources): fighterData documents in document ID
+        order, then the fighters without data in file order. trigrams maps
+        every three-character substring of a normalized name or fighterCode,
+        and prefixes every one- or two-character word prefix, to the rows
+        holding it, encoded with encode_postings.
+        
+        Returns:
+            Index dictionary
+        """
+        entries = [(document_id, *self.fighters[document_id][:3], self.fighters[document_id][3], self.source_collection)
+                   for document_id in sorted(self.fighters)]
+        entries += self.no_data_entries({normalize_name(entry[1]) for entry in entries})
+        
+        sources = list(dict.fromkeys(entry[5] for entry in entries))
+        normalized_names = [normalize_name(entry[1]) for entry in entries]
+        normalized_codes = [normalize_name(entry[2]) for entry in entries]
+        trigrams, prefixes = {}, {}
+        for row, keys in enumerate(zip(normalized_names, normalized_codes)):
+            for trigram in dict.fromkeys(trigram for key in keys for trigram in name_trigrams(key)):
+                trigrams.setdefault(trigram, []).append(row)
+            for prefix in dict.fromkeys(prefix for key in keys for prefix in name_prefixes(key)):
+                prefixes.setdefault(prefix, []).append(row)
+        
+        # Like the search bars: fighters with minutes tracked, most first, ties in document order
+        ranked = sorted((row for row, entry in enumerate(entries) if entry[4] > 0), key=lambda row: -entries[row][4])
+        
+        columns = {
+            'documentIds': [entry[0] for entry in entries],
+            'names': [entry[1] for entry in entries],
+            'normalizedNames': normalized_names,
+            'normalizedCodes': normalized_codes,
+            'fighterCodes': [entry[2] for entry in entries],
+            'weightClasses': [entry[3] for entry in entries],
+            'minutes': [entry[4] for entry in entries],
+            'sources': [sources.index(entry[5]) for entry in entries],
+        }
+        content_hash = hashlib.blake2b(json.dumps(columns, separators=(',', ':')).encode('utf-8'),
+                                       digest_size=8).hexdigest()
+        return {
+            'version': FIGHTER_SEARCH_VERSION,
+            'generatedAt': datetime.datetime.now(datetime.timezone.utc),
+            'contentHash': content_hash,
+            'count': len(entries),
+            'sourceCollections': sources,
+            **columns,
+            'topByMinutes': ranked[:TOP_FIGHTERS],
+            'trigrams': {trigram: encode_postings(rows) for trigram, rows in sorted(trigrams.items())},
+            'prefixes': {prefix: encode_postings(rows) for prefix, rows in sorted(prefixes.items())},
+        }
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Return the index as documents to publish.
+        
+        An index that fits in one document is returned as is. A larger one
+        keeps the postings in the main document and moves the row columns
+        into shard documents `<id>_<n>`, split by row.
+        
+        Returns:
+            List of (collection, document_id, data) tuples
+        """
+        if not self.fighters:
+            return []
+        
+        index = self.index()
+        if estimate_document_size(self.collection_name, self.document_id, index) <= SNAPSHOT_SHARD_BYTES:
+            index['shards'] = 0
+            return [(self.collection_name, self.document_id, index)]
+        
+        row_fields = ('documentIds', 'names', 'normalizedNames', 'normalizedCodes', 'fighterCodes', 'weightClasses', 'minutes', 'sources')
+        rows = {field: index.pop(field) for field in row_fields}
+        row_bytes = estimate_document_size(self.collection_name, self.document_id, rows) / max(index['count'], 1)
+        rows_per_shard = max(1, int(SNAPSHOT_SHARD_BYTES / row_bytes))
+        
+        documents = []
+        for shard, start in enumerate(range(0, index['count'], rows_per_shard)):
+            shard_data = {field: values[start:start + rows_per_shard] for field, values in rows.items()}
+            shard_data.update({'version': index['version'], 'contentHash': index['contentHash'],
+                               'shard': shard, 'firstRow': start})
+            documents.append((self.collection_name, f"{self.document_id}_{shard}", shard_data))
+        
+        index['shards'] = len(documents)
+        return [(self.collection_name, self.document_id, index)] + documents
+
+def fighter_search_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                              source_collection: str = 'fighterData', state_prefix: str = '') -> FighterSearchIndexAggregator:
+    """Return a search index aggregator that also indexes the no-data exports in data_dir (it keeps no state)."""
+    return FighterSearchIndexAggregator(
+        source_collection=source_collection,
+        no_data_csv_paths=[(os.path.join(data_dir, file_name), collection_name)
+                           for file_name, collection_name in NO_DATA_SOURCES])
+
+def search(index: Dict[str, Any], query: str, limit: int = TOP_FIGHTERS) -> List[int]:
+    """
+    Look up a query in an index, the way a client would.
+    
+    Queries of three or more characters intersect the trigram postings and
+    return the fighters whose normalized name or fighterCode contains the
+    normalized query; shorter ones return those with a word starting with it. Names with a word starting with
+    the query rank first, then by minutes tracked.
+    
+    Args:
+        index: Index built by FighterSearchIndexAggregator.index()
+        query: Search text
+        limit: Maximum number of rows to return
+    
+    Returns:
+        Matching row indexes
+    """
+    normalized = normalize_name(query)
+    if not normalized:
+        return index['topByMinutes'][:limit]
+    
+    if len(normalized) < TRIGRAM_LENGTH:
+        candidates = decode_postings(index['prefixes'].get(normalized, ''))
+    else:
+        candidates = None
+        for trigram in name_trigrams(normalized):
+            rows = set(decode_postings(index['trigrams'].get(trigram, '')))
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                return []
+        candidates = sorted(candidates)
+    
+    keys = list(zip(index['normalizedNames'], index['normalizedCodes']))
+    matches = [row for row in candidates if any(normalized in key for key in keys[row])]
+    word_start = lambda row: any(key.startswith(normalized) or f" {normalized}" in key for key in keys[row])
+    matches.sort(key=lambda row: (not word_start(row), -index['minutes'][row]))
+    return matches[:limit]
+
+def build_fighter_search_from_csv(csv_file_path: str, fighter_names: Optional[Dict[str, str]] = None,
+                                  data_dir: Optional[str] = None) -> FighterSearchIndexAggregator:
+    """
+    Build the search index directly from a FighterData CSV file.
+    
+    Args:
+        csv_file_path: Path to the FighterData CSV file
+        fighter_names: Dictionary mapping fighterCode to fighterName
+        data_dir: Directory holding the no-data exports (defaults to the CSV's directory)
+    
+    Returns:
+        Aggregator holding every fighter in the file
+    """
+    from upload_fighter_data_batch import build_fighter_document, iter_processed_rows
+    
+    aggregator = fighter_search_aggregator(data_dir if data_dir is not None else os.path.dirname(csv_file_path))
+    for row_number, processed_data in iter_processed_rows(csv_file_path):
+        document_id, data = build_fighter_document(processed_data, row_number, fighter_names or {})
+        aggregator.add(document_id, data)
+    return aggregator
+
+def main():
+    """Build the fighter search index from the CSV and publish it, write it as JSON, or try a query."""
+    from firestore_client import firestore_client
+    from upload_fighter_data_batch import load_fighter_names, publish_derived_documents
+    
+    parser = argparse.ArgumentParser(description="Publish the fighter search index document.")
+    parser.add_argument('csv_file_path', nargs='?', default="oldData/FighterData.csv", help="FighterData CSV file")
+    parser.add_argument('--names', default="oldData/FighterNames.csv", help="FighterNames CSV file")
+    parser.add_argument('--output', help="Write the index to this JSON file (e.g. a static website asset) instead of Firestore")
+    parser.add_argument('--query', help="Print the matches for a search query instead of publishing")
+    parser.add_argument('--dry-run', action='store_true', help="Print a summary instead of writing to Firestore")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.csv_file_path):
+        print(f"❌ CSV file not found: {args.csv_file_path}")
+        sys.exit(1)
+    
+    aggregator = build_fighter_search_from_csv(args.csv_file_path, load_fighter_names(args.names))
+    if args.query is not None:
+        index = aggregator.index()
+        for row in search(index, args.query):
+            print(f"🔎 {index['names'][row] or index['fighterCodes'][row]} ({index['weightClasses'][row] or 'no weight class'}, "
+                  f"{index['sourceCollections'][index['sources'][row]]}/{index['documentIds'][row]})")
+        return
+    
+    if args.output:
+        index = aggregator.index()
+        index['generatedAt'] = index['generatedAt'].isoformat()
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(index, output_file, separators=(',', ':'))
+        print(f"💾 Wrote {index['count']} fighters to {args.output} ({os.path.getsize(args.output)} bytes)")
+        return
+    
+    documents = aggregator.documents()
+    for collection_name, document_id, data in documents:
+        size = estimate_document_size(collection_name, document_id, data)
+        print(f"🔎 {collection_name}/{document_id}: {size} bytes")
+    
+    if args.dry_run:
+        return
+    
+    published, errors = publish_derived_documents(firestore_client(), [aggregator])
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Materialized fighter totals and leaderboards.
+Computes the FighterTotal figures the website hooks (hooks/useFighterTotals.ts) read
+(accuracies, per-minute rates, takedown and submission rates) for every fighter
+at ingest time with NumPy, and publishes them as one compact, versioned
+snapshot document so a page load costs one read instead of one per fighter.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from document_size import estimate_document_size
+from parallel_transform import TransformError
+
+# Collection and document the snapshot is published to
+SNAPSHOT_COLLECTION = 'snapshots'
+FIGHTER_TOTALS_DOCUMENT = 'fighterTotals'
+
+# Bump when the snapshot layout changes so readers can detect old snapshots
+FIGHTER_TOTALS_VERSION = 1
+
+# Leaderboards only rank fighters with at least this many minutes tracked,
+# matching the cutoff in useStrikeEfficiency/usePunchEfficiency/useKickEfficiency
+LEADERBOARD_MIN_MINUTES = 20
+
+# Snapshot documents are split into shards above this estimated size
+SNAPSHOT_SHARD_BYTES = 900 * 1024
+
+# FighterTotal fields read straight from the fighter document: (field, category, source fields summed)
+SOURCE_COLUMNS = [
+    ('minutesTracked', None, ('MinutesTracked',)),
+    ('fightsTracked', None, ('FightsTracked',)),
+    ('roundsTracked', None, ('RoundsTracked',)),
+    ('totalPunchesLanded', 'total_stats', ('TotalPunchesLanded',)),
+    ('totalPunchesThrown', 'total_stats', ('TotalPunchesThrown',)),
+    ('totalKicksLanded', 'total_stats', ('TotalKicksLanded',)),
+    ('totalKicksThrown', 'total_stats', ('TotalKicksThrown',)),
+    ('totalJabsThrown', 'total_stats', ('TotalJabsThrown',)),
+    ('totalHooksThrown', 'total_stats', ('TotalHooksThrown',)),
+    ('totalStraightsThrown', 'total_stats', ('TotalStraightsThrown',)),
+    ('totalUppercutsThrown', 'total_stats', ('TotalUppercutsThrown',)),
+    ('totalBodyKicksThrown', 'total_stats', ('TotalBodyKicksThrown',)),
+    ('totalLegKicksThrown', 'total_stats', ('TotalLegKicksThrown',)),
+    ('totalHighKicksThrown', 'total_stats', ('TotalHighKicksThrown',)),
+    ('totalElbowsThrown', 'total_stats', ('TotalElbowsThrown',)),
+    ('wins', 'fight_outcome_stats', ('FighterWins',)),
+    ('losses', 'fight_outcome_stats', ('FighterLoss',)),
+    ('titleFightWins', 'fight_outcome_stats', ('WinsInTitleFights',)),
+    ('titleFightLosses', 'fight_outcome_stats', ('LossesInTitleFights',)),
+    ('clinchStrikesLanded', 'clinch_stats', ('TotalClinchStrikesMade',)),
+    ('clinchStrikesThrown', 'clinch_stats', ('TotalClinchStrikesThrown',)),
+    ('groundStrikesLanded', 'ground_stats', ('TotalGroundStrikesMade',)),
+    ('groundStrikesThrown', 'ground_stats', ('TotalGroundStrikesThrown',)),
+    ('takedownAttempts', 'takedown_stats', ('BodyLockTakedownAttempts', 'DoubleLegTakedownAttempts',
+                                            'SingleLegTakedownAttempts', 'TripTakedownAttempts')),
+    ('takedownSuccess', 'takedown_stats', ('BodyLockTakedownSuccess', 'DoubleLegTakedownSuccess',
+                                           'SingleLegTakedownSuccess', 'TripTakedownSuccess')),
+    ('submissionAttempts', 'submission_stats', ('SubAttempts',)),
+    ('submissionWins', 'submission_stats', ('SUBRNCWin', 'SubGuillotineWin', 'SubKimuraWin',
+                                            'SubTriangleWin', 'SubArmTriangleWin')),
+    ('centerOctagon', None, ('CenterOctagon',)),
+    ('pushedBackToCage', None, ('PushedBackToCage',)),
+    ('pushingAgainstCage', None, ('PushingAgainstCage',)),
+]
+
+# Leaderboards published with the snapshot: name -> column ranked highest first
+LEADERBOARDS = {
+    'strikeAccuracy': 'strikeAccuracyPercentage',
+    'punchAccuracy': 'punchAccuracyPercentage',
+    'kickAccuracy': 'kickAccuracyPercentage',
+    'strikesLanded': 'totalStrikesLanded',
+    'strikesLandedPerMinute': 'strikesLandedPerMinute',
+}
+
+def _number(value: Any) -> float:
+    """Return value as a float, treating missing and non-numeric values as 0 like the website's `|| 0`."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0.0
+    return float(value)
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Round to 2 decimals the way JavaScript's Math.round(x * 100) / 100 does (half up)."""
+    return np.floor(values * 100 + 0.5) / 100
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Return numerator / denominator * scale, or 0 where the denominator is not positive."""
+    result = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result * scale
+
+class FighterTotalsAggregator:
+    """
+    Collect fighter documents during an upload and build the totals snapshot.
+    
+    Only the handful of source fields are kept per fighter, so memory stays
+    small no matter how wide the fighter documents are.
+    """
+    
+    def __init__(self, collection_name: str = SNAPSHOT_COLLECTION, document_id: str = FIGHTER_TOTALS_DOCUMENT,
+                 source_collection: str = 'fighterData'):
+        """
+        Create an aggregator.
+        
+        Args:
+            collection_name: Collection the snapshot is published to
+            document_id: ID of the snapshot document
+            source_collection: Collection the fighter documents are uploaded to
+        """
+        self.collection_name = collection_name
+        self.document_id = document_id
+        self.source_collection = source_collection
+        self.fighters = {}
+    
+    def add(self, document_id: str, data: Dict[str, Any], values: Optional[List[float]] = None):
+        """
+        Record the source fields of one fighter document.
+        
+        Args:
+            document_id: ID of the fighter document
+            data: Fighter document
+            values: SOURCE_COLUMNS of the document already read from the parse
+                cache (see table_source_values), instead of from data
+        """
+        if values is None:
+            values = []
+            for _, category, fields in SOURCE_COLUMNS:
+                source = (data.get(category) or {}) if category else data
+                values.append(sum(_number(source.get(field)) for field in fields))
+        
+        fighter_code = data.get('fighterCode') or document_id
+        fighter_name = data.get('fighterName') or data.get('name') or 'Unknown Fighter'
+        self.fighters[document_id] = (str(fighter_code), str(fighter_name), values)
+    
+    def compute(self) -> Tuple[List[str], List[str], List[str], Dict[str, np.ndarray]]:
+        """
+        Compute every FighterTotal column.
+        
+        Returns:
+            Tuple of (document_ids, fighter_codes, fighter_names, columns) with
+            fighters in document ID order, the order getDocs returns them in
+        """
+        document_ids = sorted(self.fighters)
+        fighter_codes = [self.fighters[document_id][0] for document_id in document_ids]
+        fighter_names = [self.fighters[document_id][1] for document_id in document_ids]
+        matrix = np.array([self.fighters[document_id][2] for document_id in document_ids], dtype=np.float64)
+        matrix = matrix.reshape(len(document_ids), len(SOURCE_COLUMNS))
+        
+        columns = {name: matrix[:, index] for index, (name, _, _) in enumerate(SOURCE_COLUMNS)}
+        minutes = columns['minutesTracked']
+        columns['totalStrikesLanded'] = columns['totalPunchesLanded'] + columns['totalKicksLanded']
+        columns['totalStrikesThrown'] = columns['totalPunchesThrown'] + columns['totalKicksThrown']
+        columns['strikeAccuracyPercentage'] = _round2(_ratio(columns['totalStrikesLanded'], columns['totalStrikesThrown'], 100))
+        columns['punchAccuracyPercentage'] = _round2(_ratio(columns['totalPunchesLanded'], columns['totalPunchesThrown'], 100))
+        columns['kickAccuracyPercentage'] = _round2(_ratio(columns['totalKicksLanded'], columns['totalKicksThrown'], 100))
+        columns['strikesLandedPerMinute'] = _ratio(columns['totalStrikesLanded'], minutes)
+        columns['punchesLandedPerMinute'] = _ratio(columns['totalPunchesLanded'], minutes)
+        columns['kicksLandedPerMinute'] = _ratio(columns['totalKicksLanded'], minutes)
+        columns['winPercentage'] = _round2(_ratio(columns['wins'], columns['wins'] + columns['losses'], 100))
+        columns['clinchStrikesPerMinute'] = _ratio(columns['clinchStrikesLanded'], minutes)
+        columns['groundStrikesPerMinute'] = _ratio(columns['groundStrikesLanded'], minutes)
+        columns['takedownSuccessRate'] = _ratio(columns['takedownSuccess'], columns['takedownAttempts'], 100)
+        columns['submissionSuccessRate'] = _ratio(columns['submissionWins'], columns['submissionAttempts'], 100)
+        return document_ids, fighter_codes, fighter_names, columns
+    
+    def leaderboards(self, columns: Dict[str, np.ndarray]) -> Dict[str, List[int]]:
+        """Return row indexes of qualifying fighters, ranked highest first, for each leaderboard."""
+        eligible = np.flatnonzero(columns['minutesTracked'] >= LEADERBOARD_MIN_MINUTES)
+        boards = {}
+        for name, column in LEADERBOARDS.items():
+            # Stable sort keeps document ID order for ties, like Array.prototype.sort
+            order = np.argsort(-columns[column][eligible], kind='stable')
+            boards[name] = eligible[order].tolist()
+        return boards
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Build the snapshot contents.
+        
+        The layout is columnar: field names are stored once and each column
+        is an array with one value per fighter, so row i of the FighterTotal
+        table is {field: columns[field][i]} plus fighterCodes[i] and fighterNames[i].
+        
+        Returns:
+            Snapshot dictionary
+        """
+        document_ids, fighter_codes, fighter_names, columns = self.compute()
+        encoded = {}
+        for name, values in columns.items():
+            # Whole-number columns are stored as integers, which keeps the snapshot compact
+            if np.all(values == np.floor(values)):
+                encoded[name] = values.astype(np.int64).tolist()
+            else:
+                encoded[name] = values.tolist()
+        
+        content_hash = hashlib.blake2b(
+            json.dumps([document_ids, fighter_names, encoded], separators=(',', ':')).encode('utf-8'), digest_size=8
+        ).hexdigest()
+        
+        return {
+            'version': FIGHTER_TOTALS_VERSION,
+            'generatedAt': datetime.datetime.now(datetime.timezone.utc),
+            'contentHash': content_hash,
+            'sourceCollection': self.source_collection,
+            'count': len(document_ids),
+            'minMinutesForLeaderboards': LEADERBOARD_MIN_MINUTES,
+            'fields': list(encoded),
+            'documentIds': document_ids,
+            'fighterCodes': fighter_codes,
+            'fighterNames': fighter_names,
+            'columns': encoded,
+            'leaderboards': self.leaderboards(columns),
+        }
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Return the snapshot as documents to publish.
+        
+        A snapshot that fits in one document is returned as is. A larger
+        one is split by fighter into shard documents `<id>_<n>`, each with
+        its own columns, and the main document keeps the header, the
+        leaderboards and the shard count.
+        
+        Returns:
+            List of (collection, document_id, data) tuples
+        """
+        if not self.fighters:
+            return []
+        
+        snapshot = self.snapshot()
+        if estimate_document_size(self.collection_name, self.document_id, snapshot) <= SNAPSHOT_SHARD_BYTES:
+            snapshot['shards'] = 0
+            return [(self.collection_name, self.document_id, snapshot)]
+        
+        row_fields = ('documentIds', 'fighterCodes', 'fighterNames')
+        row_bytes = estimate_document_size(self.collection_name, self.document_id, snapshot) / max(snapshot['count'], 1)
+        rows_per_shard = max(1, int(SNAPSHOT_SHARD_BYTES / row_bytes))
+        
+        documents = []
+        for shard, start in enumerate(range(0, snapshot['count'], rows_per_shard)):
+            end = start + rows_per_shard
+            shard_data = {field: snapshot[field][start:end] for field in row_fields}
+            shard_data['columns'] = {name: values[start:end] for name, values in snapshot['columns'].items()}
+            shard_data.update({'version': snapshot['version'], 'contentHash': snapshot['contentHash'],
+                               'shard': shard, 'firstRow': start})
+            documents.append((self.collection_name, f"{self.document_id}_{shard}", shard_data))
+        
+        header = {key: value for key, value in snapshot.items() if key not in row_fields and key != 'columns'}
+        header['shards'] = len(documents)
+        return [(self.collection_name, self.document_id, header)] + documents
+    
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return the totals as FighterTotal-shaped dictionaries, one per fighter."""
+        document_ids, fighter_codes, fighter_names, columns = self.compute()
+        return [
+            {'fighterCode': fighter_codes[index], 'fighterName': fighter_names[index],
+             **{name: values[index].item() for name, values in columns.items()}}
+            for index in range(len(document_ids))
+        ]
+
+def fighter_totals_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                              state_prefix: str = '') -> FighterTotalsAggregator:
+    """Return a totals aggregator for an ingest spec (the totals only need the uploaded documents; no state)."""
+    return FighterTotalsAggregator()
+
+def table_source_values(table, plan) -> np.ndarray:
+    """
+    Read the SOURCE_COLUMNS of every row of a cached FighterData CSV file from its typed columns.
+    
+    Args:
+        table: CachedTable of the CSV file
+        plan: ColumnPlan the documents are built with
+    
+    Returns:
+        float64 matrix with one row per CSV row and one column per SOURCE_COLUMNS
+        entry, missing fields counting as 0 like FighterTotalsAggregator.add
+    """
+    matrix = np.zeros((len(table), len(SOURCE_COLUMNS)))
+    for column, (_, category, fields) in enumerate(SOURCE_COLUMNS):
+        for field in fields:
+            matrix[:, column] += table.field_numbers(plan, field, category)[0]
+    return matrix
+
+def build_fighter_totals_from_csv(csv_file_path: str, fighter_names: Optional[Dict[str, str]] = None) -> FighterTotalsAggregator:
+    """
+    Build the fighter totals directly from a FighterData CSV file.
+    
+    Rows go through the same column plan and document build as the upload,
+    so the totals match what upload_fighter_data_batch writes. The source
+    fields are read from the parse cache's typed columns.
+    
+    Args:
+        csv_file_path: Path to the FighterData CSV file
+        fighter_names: Dictionary mapping fighterCode to fighterName
+    
+    Returns:
+        Aggregator holding every fighter in the file
+    """
+    from parse_cache import load_table
+    from upload_fighter_data_batch import build_fighter_document, iter_processed_rows
+    
+    aggregator = FighterTotalsAggregator()
+    try:
+        table = load_table(csv_file_path)
+    except OSError as e:
+        print(f"⚠️  Parse cache unavailable for {csv_file_path} ({e}); reading the totals from the documents")
+        for row_number, processed_data in iter_processed_rows(csv_file_path, cache_dir=None):
+            aggregator.add(*build_fighter_document(processed_data, row_number, fighter_names or {}))
+        return aggregator
+    
+    plan = table.plan()
+    rows = table.iter_processed(plan)
+    for (row_number, processed_data, _), values in zip(rows, table_source_values(table, plan).tolist()):
+        if isinstance(processed_data, TransformError):
+            raise processed_data
+        document_id, data = build_fighter_document(processed_data, row_number, fighter_names or {})
+        aggregator.add(document_id, data, values)
+    return aggregator
+
+def main():
+    """Build the fighter totals snapshot from the CSV and publish it (or print it with --dry-run)."""
+    from firestore_client import firestore_client
+    from upload_fighter_data_batch import load_fighter_names, publish_derived_documents
+    
+    parser = argparse.ArgumentParser(description="Publish the fighter totals snapshot document.")
+    parser.add_argument('csv_file_path', nargs='?', default="oldData/FighterData.csv", help="FighterData CSV file")
+    parser.add_argument('--names', default="oldData/FighterNames.csv", help="FighterNames CSV file")
+    parser.add_argument('--dry-run', action='store_true', help="Print a summary instead of writing to Firestore")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.csv_file_path):
+        print(f"❌ CSV file not found: {args.csv_file_path}")
+        sys.exit(1)
+    
+    aggregator = build_fighter_totals_from_csv(args.csv_file_path, load_fighter_names(args.names))
+    documents = aggregator.documents()
+    for collection_name, document_id, data in documents:
+        size = estimate_document_size(collection_name, document_id, data)
+        print(f"🧮 {collection_name}/{document_id}: {size} bytes")
+    print(f"📊 {len(aggregator.fighters)} fighters in the snapshot")
+    
+    if args.dry_run:
+        return
+    
+    published, errors = publish_derived_documents(firestore_client(), [aggregator])
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
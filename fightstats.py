@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Single command-line entry point for the fight stats data pipeline.
+Subcommands:
+  validate  parse, transform and build every document and check IDs and sizes
+  dry-run   run the full ingest, derived documents included, into memory
+  upload    ingest every CSV into Firestore
+  export    write static bundles without connecting to Firestore
+  stats     summarize the CSV sources and their last recorded runs
+Only upload imports the Firestore client libraries, so the other commands
+cost little more than the CSV work itself. Every collection of an upload
+shares one Firestore client and gRPC channel.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from document_size import estimate_document_size
+from fake_firestore import FakeFirestore
+from incremental_aggregates import clear_state
+from ingest_all import (
+    OFFLINE_WRITE_RATE,
+    IngestSpec,
+    add_export_arguments,
+    add_ingest_arguments,
+    add_selection_arguments,
+    export_settings,
+    ingest_all,
+    make_document_builder,
+    print_ingest_summary,
+    select_specs,
+    upload_options,
+)
+from parse_cache import load_table
+from static_export import collection_group
+from upload_fighter_data_batch import UploadError, iter_size_checked_records, iter_upload_records, plan_cached_csv
+from upload_metrics import default_metrics_path
+from value_formats import resolve_formats
+from write_scheduler import WriteScheduler
+
+# State file prefixes of the in-memory runs, so Firestore manifests, journals and aggregate state are left alone
+DRY_RUN_PREFIX = 'dry-run-'
+OFFLINE_PREFIX = 'offline-'
+
+# Errors listed per spec by validate (the rest are only counted)
+MAX_LISTED_ERRORS = 10
+
+class ValidationResult(NamedTuple):
+    """Outcome of validating one spec."""
+    name: str
+    status: str
+    rows: int
+    documents: int
+    errors: List[str]
+    duplicates: int
+    largest_bytes: int
+    seconds: float
+    report_lines: List[str] = []
+
+def validate_spec(spec: IngestSpec, data_dir: str, log: Callable[[str], None] = print) -> ValidationResult:
+    """
+    Build every document of a spec the way the upload would, without writing anything.
+    
+    Rows that fail to transform or build, documents over the size limit and
+    document IDs produced by more than one row (the later row would overwrite
+    the earlier one) are reported.
+    
+    Args:
+        spec: Collection spec
+        data_dir: Directory holding the CSV files
+        log: Function used to print progress messages
+    
+    Returns:
+        ValidationResult with status 'ok', 'errors' or 'skipped'
+    """
+    started = time.perf_counter()
+    csv_file_path = os.path.join(data_dir, spec.source)
+    if not os.path.exists(csv_file_path):
+        return ValidationResult(spec.name, 'skipped', 0, 0, [f"{spec.source} not found"], 0, 0, 0.0)
+    
+    build_document = make_document_builder(spec, data_dir, log)
+    fan_out = spec.fan_out(data_dir, log) if spec.fan_out else None
+    plan, csv_records = plan_cached_csv(csv_file_path, categorize=spec.categorize, formats=resolve_formats(spec.formats))
+    records = iter_size_checked_records(iter_upload_records(csv_records, plan, build_document, fan_out=fan_out),
+                                        spec.collection)
+    
+    rows = set()
+    seen = {}
+    errors = []
+    duplicates = 0
+    largest = 0
+    for record in records:
+        # Fanned-out documents of the first row carry row 0
+        if record.row_number:
+            rows.add(record.row_number)
+        if record.error is not None:
+            errors.append(f"Row {record.row_number}: {record.error}")
+            continue
+        if record.document_id in seen:
+            duplicates += 1
+            if duplicates <= MAX_LISTED_ERRORS:
+                log(f"⚠️  {spec.name}: document {record.document_id} comes from rows {seen[record.document_id]} "
+                    f"and {record.row_number}; the later row wins")
+        seen[record.document_id] = record.row_number
+        largest = max(largest, record.size)
+    
+    report_lines = plan.report.lines() if plan.report is not None else []
+    status = 'errors' if errors else 'ok'
+    return ValidationResult(spec.name, status, len(rows), len(seen), errors, duplicates, largest,
+                            time.perf_counter() - started, report_lines)
+
+def print_validation_summary(results: Sequence[ValidationResult]):
+    """Print one line per spec, followed by the errors and normalization notes."""
+    status_icons = {'ok': '✅', 'errors': '❌', 'skipped': '⏭️ '}
+    print(f"{'':3}{'spec':<20}{'rows':>8}{'documents':>11}{'errors':>8}{'dupes':>7}{'largest':>10}{'seconds':>9}")
+    for result in results:
+        print(f"{status_icons.get(result.status, '  ')} {result.name:<20}{result.rows:>8}{result.documents:>11}"
+              f"{len(result.errors) if result.status != 'skipped' else 0:>8}{result.duplicates:>7}"
+              f"{result.largest_bytes:>10}{result.seconds:>9.2f}"
+              + (f"  {result.errors[0]}" if result.status == 'skipped' else ''))
+    for result in results:
+        if result.status == 'errors':
+            print(f"❌ {result.name}: {len(result.errors)} rows cannot be uploaded")
+            for error in result.errors[:MAX_LISTED_ERRORS]:
+                print(f"   - {error}")
+        for line in result.report_lines:
+            print(f"   {result.name}: {line}")
+
+def summarize_documents(db: FakeFirestore) -> Dict[str, Dict[str, int]]:
+    """
+    Count the documents an in-memory run wrote, per collection or subcollection group.
+    
+    Args:
+        db: FakeFirestore the run wrote into
+    
+    Returns:
+        Dictionary mapping collection group to {'documents': n, 'bytes': estimated size}
+    """
+    summary = defaultdict(lambda: {'documents': 0, 'bytes': 0})
+    for path, data in db.documents.items():
+        collection_name, _, document_id = path.partition('/')
+        group = summary[collection_group(collection_name, document_id)]
+        group['documents'] += 1
+        group['bytes'] += estimate_document_size(collection_name, document_id, data)
+    return dict(sorted(summary.items()))
+
+def last_run(state_names: Sequence[str]) -> Optional[Dict[str, Any]]:
+    """
+    Return the most recent metrics record among several state names.
+    
+    Args:
+        state_names: Names whose default NDJSON metrics files are read
+    
+    Returns:
+        The newest metrics record, or None if no run was recorded
+    """
+    newest = None
+    for state_name in state_names:
+        metrics_path = default_metrics_path(state_name)
+        if not os.path.exists(metrics_path):
+            continue
+        with open(metrics_path, 'r', encoding='utf-8') as metrics_file:
+            lines = [line for line in metrics_file if line.strip()]
+        if not lines:
+            continue
+        record = json.loads(lines[-1])
+        record['state_name'] = state_name
+        if newest is None or (record.get('started_at') or 0) > (newest.get('started_at') or 0):
+            newest = record
+    return newest
+
+def print_stats(specs: Sequence[IngestSpec], data_dir: str):
+    """Print each spec's source size, rows and columns, and its last recorded run."""
+    print(f"{'spec':<20}{'source':<24}{'MiB':>7}{'rows':>8}{'cols':>6}  last run")
+    for spec in specs:
+        csv_file_path = os.path.join(data_dir, spec.source)
+        if not os.path.exists(csv_file_path):
+            print(f"{spec.name:<20}{spec.source:<24}{'-':>7}{'-':>8}{'-':>6}  source missing")
+            continue
+        
+        table = load_table(csv_file_path)
+        size = os.path.getsize(csv_file_path) / 1024 / 1024
+        run = last_run([spec.name, OFFLINE_PREFIX + spec.name, DRY_RUN_PREFIX + spec.name])
+        if run is None:
+            described = "never"
+        else:
+            age_hours = (time.time() - (run.get('started_at') or time.time())) / 3600
+            counters = run.get('counters', {})
+            described = (f"{run['state_name']} {age_hours:.1f}h ago: {counters.get('writes', 0)} writes, "
+                         f"{counters.get('errors', 0)} errors, {run.get('rows_per_second') or 0:.0f} rows/s")
+        print(f"{spec.name:<20}{spec.source:<24}{size:>7.2f}{len(table.rows):>8}{len(table.header):>6}  {described}")
+
+def run_in_memory(args: argparse.Namespace, specs: Sequence[IngestSpec], state_prefix: str):
+    """Ingest into a FakeFirestore at full speed and return (results, db)."""
+    # The client starts empty, so the aggregate state of earlier in-memory runs is dropped with it
+    clear_state(state_prefix)
+    db = FakeFirestore()
+    results = ingest_all(
+        specs,
+        db=db,
+        data_dir=args.data_dir,
+        max_workers=args.max_workers,
+        scheduler=WriteScheduler(OFFLINE_WRITE_RATE),
+        export=export_settings(args),
+        state_prefix=state_prefix,
+        **upload_options(args, offline=True),
+    )
+    return results, db
+
+def main():
+    """Parse the subcommand and run it."""
+    parser = argparse.ArgumentParser(description="Validate, upload and export the fight stats CSV data.")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    
+    validate_parser = subcommands.add_parser('validate', help="Build every document and check IDs and sizes (no writes)")
+    add_selection_arguments(validate_parser)
+    
+    dry_run_parser = subcommands.add_parser('dry-run', help="Run the full ingest into memory and count what would be written")
+    add_selection_arguments(dry_run_parser)
+    add_ingest_arguments(dry_run_parser, network=False)
+    
+    upload_parser = subcommands.add_parser('upload', help="Ingest every CSV into Firestore")
+    add_selection_arguments(upload_parser)
+    add_ingest_arguments(upload_parser)
+    add_export_arguments(upload_parser)
+    
+    export_parser = subcommands.add_parser('export', help="Write static bundles without connecting to Firestore")
+    add_selection_arguments(export_parser)
+    add_ingest_arguments(export_parser, network=False)
+    add_export_arguments(export_parser, required=True)
+    
+    stats_parser = subcommands.add_parser('stats', help="Summarize the CSV sources and their last recorded runs")
+    add_selection_arguments(stats_parser)
+    
+    args = parser.parse_args()
+    
+    try:
+        specs = select_specs(args.only, args.skip)
+    except UploadError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    if args.command == 'validate':
+        print(f"🔍 Validating {len(specs)} specs from {args.data_dir}...")
+        results = [validate_spec(spec, args.data_dir) for spec in specs]
+        print("=" * 60)
+        print_validation_summary(results)
+        if any(result.status == 'errors' for result in results):
+            sys.exit(1)
+        return
+    
+    if args.command == 'stats':
+        print_stats(specs, args.data_dir)
+        return
+    
+    if args.command == 'upload':
+        # Imported here so the other commands never load the client libraries
+        from firestore_client import firestore_client
+        export = export_settings(args)
+        print(f"🚀 Ingesting {len(specs)} collections from {args.data_dir} ({args.max_workers} at a time)...")
+        if export is not None:
+            print(f"📦 Exporting {', '.join(export.formats)} bundles ({export.compression}) to {export.output_dir}")
+        print("=" * 60)
+        results = ingest_all(
+            specs,
+            db=firestore_client(),
+            data_dir=args.data_dir,
+            max_workers=args.max_workers,
+            scheduler=WriteScheduler(args.write_rate, args.max_write_rate),
+            export=export,
+            **upload_options(args),
+        )
+        print("=" * 60)
+        print_ingest_summary(results)
+    else:
+        dry_run = args.command == 'dry-run'
+        if dry_run:
+            print(f"🧪 Dry run of {len(specs)} collections from {args.data_dir}: nothing leaves this process")
+        else:
+            export = export_settings(args)
+            print(f"📦 Exporting {len(specs)} collections from {args.data_dir} as {', '.join(export.formats)} "
+                  f"bundles ({export.compression}) to {export.output_dir}")
+        print("=" * 60)
+        results, db = run_in_memory(args, specs, DRY_RUN_PREFIX if dry_run else OFFLINE_PREFIX)
+        print("=" * 60)
+        print_ingest_summary(results)
+        if dry_run:
+            print(f"\n{'collection':<40}{'documents':>11}{'KiB':>10}")
+            for group, counts in summarize_documents(db).items():
+                print(f"{group:<40}{counts['documents']:>11}{counts['bytes'] / 1024:>10.1f}")
+    
+    print("✨ Done!")
+    if any(result.status == 'failed' for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
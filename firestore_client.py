@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Lazily imported Firestore client shared by every upload.
+firebase_admin and google.cloud.firestore take about half a second to import
+(they pull in gRPC and protobuf), so they are only imported once a command
+actually writes to Firestore. Validation, dry runs, exports and the offline
+benchmarks never load them. The client, and with it the gRPC channel, is
+created once per process and reused for every collection.
+"""
+
+import os
+import sys
+import threading
+
+# Service account key looked up in the working directory before default credentials
+SERVICE_ACCOUNT_PATH = "fightstats-30352-firebase-adminsdk-fbsvc-f8205199b1.json"
+
+_client = None
+_client_lock = threading.Lock()
+
+def initialize_firebase():
+    """Initialize Firebase Admin SDK with service account credentials."""
+    import firebase_admin
+    from firebase_admin import credentials
+    
+    # Check if Firebase is already initialized
+    try:
+        firebase_admin.get_app()
+        print("✅ Firebase already initialized")
+        return
+    except ValueError:
+        pass  # Not initialized yet, continue with initialization
+    
+    # Try to initialize with service account file first (more reliable)
+    if os.path.exists(SERVICE_ACCOUNT_PATH):
+        try:
+            cred = credentials.Certificate(SERVICE_ACCOUNT_PATH)
+            firebase_admin.initialize_app(cred)
+            print(f"✅ Firebase initialized with service account: {SERVICE_ACCOUNT_PATH}")
+            return
+        except Exception as e:
+            print(f"❌ Failed to initialize with service account: {e}")
+    
+    # Try to initialize with default credentials (if running on GCP)
+    try:
+        firebase_admin.initialize_app()
+        print("✅ Firebase initialized with default credentials")
+        return
+    except Exception as e:
+        print(f"❌ Failed to initialize with default credentials: {e}")
+    
+    # If we get here, both methods failed
+    print("❌ Firebase initialization failed. Please ensure you have proper credentials.")
+    print("   You can either:")
+    print("   1. Place the service account JSON file in the current directory")
+    print("   2. Set GOOGLE_APPLICATION_CREDENTIALS environment variable")
+    print("   3. Run this on Google Cloud Platform with proper permissions")
+    sys.exit(1)
+
+def get_firestore_client():
+    """Get Firestore client instance."""
+    from firebase_admin import firestore
+    
+    try:
+        db = firestore.client()
+        return db
+    except Exception as e:
+        print(f"❌ Failed to get Firestore client: {e}")
+        sys.exit(1)
+
+def firestore_client():
+    """
+    Return the process-wide Firestore client, initializing Firebase on first use.
+    
+    Returns:
+        Firestore client shared by every caller
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            initialize_firebase()
+            _client = get_firestore_client()
+        return _client
+
+def delete_field():
+    """Return Firestore's DELETE_FIELD sentinel."""
+    from google.cloud import firestore as gc_firestore
+    return gc_firestore.DELETE_FIELD
+
+def field_path(field: str):
+    """
+    Build a FieldPath for a top-level field name.
+    
+    Args:
+        field: Field name, taken literally (dots are not path separators)
+    
+    Returns:
+        FieldPath for merge writes
+    """
+    from google.cloud.firestore_v1.field_path import FieldPath
+    return FieldPath(field)
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Incremental gym and weight-class aggregates.
+Gyms.csv, WeightClasses.csv and WCAV.csv were recomputed offline from scratch,
+so adding one event meant regenerating and re-uploading every aggregate. The
+aggregators here keep running sums and counts per group in a local state file,
+together with each source row's last contribution. A run applies only the
+rows whose contribution changed (new fights, updated fighter totals) and
+publishes only the group documents whose totals moved. The weight-class
+fighter totals are published to the weightClass collection in the WCAV.csv
+layout, so the CSV files are no longer uploaded.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Default directory for aggregate state, one file per aggregate
+AGGREGATE_STATE_DIR = ".upload_aggregates"
+
+# Bump when the aggregate document layout changes so readers can detect old documents
+AGGREGATE_VERSION = 2
+
+# Relative tolerance of the consistency check (running float sums drift by rounding only)
+CHECK_TOLERANCE = 1e-9
+
+# Fighter stats totalled per weight class and gym: the WCAV.csv columns, which the
+# website reads as a WeightClass (types/firestore.ts). Grades, ratings, rates and
+# identifiers are not totals and are left out.
+FIGHTER_TOTAL_FIELDS = (
+    'AmericanaAttempts', 'AnacondaAttempt', 'AttemptedThrowTD', 'BodyKicksAbsorbed',
+    'BodyLockTakedownAttempts', 'BulldogAttempt', 'CalfSlicerAttempts', 'ClinchStrikeHiMake',
+    'ClinchStrikeLoMake', 'DoubleLegTakedownAttempts', 'EzekielAttempt', 'GogoplataAttempts',
+    'GroundStrikeHiMake', 'GroundStrikeLoMake', 'HeadKicksAbsorbed', 'HooksAbsorbed', 'JabsAbsorbed',
+    'KneebarAttempt', 'LeftBodyKickMake', 'LeftElbowMake', 'LeftHighKickMake', 'LeftHookHiMake',
+    'LeftHookLoMake', 'LeftJabHiMake', 'LeftJabLoMake', 'LeftLegKickMake', 'LeftOverhandMake',
+    'LeftSpinBackFistMake', 'LeftStraightHiMake', 'LeftStraightLoMake', 'LeftUppercutHiMake',
+    'LeftUppercutLoMake', 'LegKicksAbsorbed', 'LeglockAttempt', 'LossesVsOrthodox', 'LossesVsSouthpaw',
+    'LossesVsSwitch', 'NeckCrankAttempt', 'OmoplataAttempt', 'OtherSubAttempt', 'OverhandsAbsorbed',
+    'RightBodyKickMake', 'RightElbowMake', 'RightHighKickMake', 'RightHookHiMake', 'RightHookLoMake',
+    'RightJabHiMake', 'RightJabLoMake', 'RightLegKickMake', 'RightOverhandMake', 'RightSpinBackFistMake',
+    'RightStraightHiMake', 'RightStraightLoMake', 'RightUppercutHiMake', 'RightUppercutLoMake',
+    'SUBRNCAttempt', 'SingleLegTakedownAttempts', 'StraightsAbsorbed', 'SubArmTriangleAttempt', 'SubAttempts',
+    'SubDarceAttempt', 'SubGuillotineAttempt', 'SubHeelHookAttempt', 'SubKimuraAttempt',
+    'SubNeckCrankAttempt', 'SubStraightArmLockAttempt', 'SubSulovStretchAttempt', 'SubTriangleArmbarAttempt',
+    'SubTriangleAttempt', 'TotalBodyKicksMade', 'TotalBodyKicksMake', 'TotalBodyKicksThrown',
+    'TotalClinchStrikesMade', 'TotalClinchStrikesThrown', 'TotalElbowsMade', 'TotalElbowsThrown',
+    'TotalGroundStrikesMade', 'TotalGroundStrikesThrown', 'TotalHighKicksMade', 'TotalHighKicksThrown',
+    'TotalHooksMade', 'TotalHooksThrown', 'TotalJabsMade', 'TotalJabsThrown', 'TotalKicksLanded',
+    'TotalKicksThrown', 'TotalLegKicksMade', 'TotalLegKicksThrown', 'TotalOverhandsMade',
+    'TotalOverhandsThrown', 'TotalPunchesLanded', 'TotalPunchesThrown', 'TotalSpinBackFistsMade',
+    'TotalSpinBackFistsThrown', 'TotalStraightsMade', 'TotalStraightsThrown', 'TotalStrikesLanded',
+    'TotalUppercutsMade', 'TotalUppercutsThrown', 'TripTakedownAttempts', 'TwisterAttempts',
+    'UppercutsAbsorbed', 'VonFlueAttempt', 'WinsVsOrthodox', 'WinsVsSouthpaw', 'WinsVsSwitch', 'decloss',
+    'decwin', 'fights', 'koloss', 'kowins', 'minutes', 'numberofknockdowns', 'numberofstuns', 'rounds',
+    'subattempt', 'subloss', 'subwin', 'timesknockeddown', 'timesstunned', 'tkoloss', 'tkowins',
+)
+
+# Weight class code -> (weightclassname, weight limit in pounds) of the weightClass documents
+WEIGHT_CLASSES = {
+    'Strawweight': ('Strawweight', 115),
+    'Flyweight': ('Flyweight', 125),
+    'Bantamweight': ('Bantamweight', 135),
+    'Featherweight': ('Featherweight', 145),
+    'Lightweight': ('Lightweight', 155),
+    'Welterweight': ('Welterweight', 170),
+    'Middleweight': ('Middleweight', 185),
+    'LightHeavyweight': ('Light Heavyweight', 205),
+    'Heavyweight': ('Heavyweight', 265),
+    'WomensStrawweight': ("Women's Strawweight", 115),
+    'WomensFlyweight': ("Women's Flyweight", 125),
+    'WomensBantamweight': ("Women's Bantamweight", 135),
+    'WomensFeatherweight': ("Women's Featherweight", 145),
+}
+
+# WEBFightData methodOfFinish -> win-method counter, following the Gyms.csv/WeightClasses.csv columns
+FINISH_METHODS = {
+    'KO': 'KO',
+    'TKO': 'TKO',
+    'Doctor Stoppage': 'TKO',
+    'SUB': 'SUB',
+    'UD': 'DEC',
+    'SD': 'DEC',
+    'Maj Dec': 'DEC',
+}
+
+# WEBFightData per-side columns summed over both fighters: output field -> column suffix
+FIGHT_SIDE_FIELDS = {
+    'TotalJabMake': 'jabs',
+    'TotalHookMake': 'hooks',
+    'TotalStraightMake': 'straights',
+    'TotalUppercutMake': 'uppercuts',
+    'TotalOverhandMake': 'overhands',
+    'TotalBodyKickMake': 'bodykick',
+    'TotalHeadKickMake': 'headkick',
+    'TotalLegKickMake': 'legkick',
+    'TotalKnockDowns': 'numofknockdowns',
+    'TotalStuns': 'numofstuns',
+    'TotalTDAttempt': 'tdattempt',
+    'TotalTDMake': 'tdmake',
+    'SubAttempts': 'subattempt',
+}
+
+Contribution = List[Tuple[str, Dict[str, float]]]
+
+class AggregateDefinition(NamedTuple):
+    """One incrementally maintained aggregate: where it is published, how a row contributes to it and the document layout."""
+    name: str
+    collection: str
+    contributions: Callable[[Dict[str, Any]], Contribution]
+    document: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None
+
+def default_state_path(name: str) -> str:
+    """Return the default state path for an aggregate."""
+    return os.path.join(AGGREGATE_STATE_DIR, f"{name}.json")
+
+def clear_state(state_prefix: str) -> List[str]:
+    """
+    Delete the aggregate state files saved under a run prefix.
+    
+    In-memory runs start from an empty client, so they must also start from
+    empty state; otherwise a second dry run would skip every derived
+    document the first one already "published".
+    
+    Args:
+        state_prefix: Prefix of the state file names, such as 'dry-run-' (never empty)
+    
+    Returns:
+        Paths of the deleted files
+    """
+    if not state_prefix:
+        raise ValueError("Refusing to clear the aggregate state of real runs")
+    if not os.path.isdir(AGGREGATE_STATE_DIR):
+        return []
+    removed = []
+    for name in sorted(os.listdir(AGGREGATE_STATE_DIR)):
+        if name.startswith(state_prefix) and name.endswith('.json'):
+            path = os.path.join(AGGREGATE_STATE_DIR, name)
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+def group_code(value: Any) -> str:
+    """Group key for a display name: 'Light Heavyweight' and "Women's Flyweight" become 'LightHeavyweight' and 'WomensFlyweight'."""
+    return re.sub(r'[^0-9A-Za-z]', '', str(value or ''))
+
+def _number(value: Any) -> Optional[float]:
+    """Return value if it is a number (not a bool), else None."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+def _clock_minutes(value: Any) -> float:
+    """Minutes on a m:ss clock, 0 if the value is not a clock."""
+    minutes, _, seconds = str(value).partition(':')
+    try:
+        return int(minutes) + int(seconds) / 60
+    except ValueError:
+        return 0.0
+
+def fight_contributions(data: Dict[str, Any]) -> Contribution:
+    """
+    Contribution of a WEBFightData row to its weight class.
+    
+    Args:
+        data: fightData document
+    
+    Returns:
+        [(weight class code, {field: value})], or [] if the fight has no weight class
+    """
+    code = group_code(data.get('weightClass'))
+    if not code:
+        return []
+    
+    rounds = _number(data.get('Rounds')) or 0
+    values = {'FightsTracked': 1, 'RoundsTracked': rounds}
+    if rounds:
+        # Completed rounds are five minutes; Time is the clock in the final round
+        values['MinutesTracked'] = (rounds - 1) * 5 + _clock_minutes(data.get('Time', ''))
+    method = FINISH_METHODS.get(str(data.get('methodOfFinish', '')))
+    if method:
+        values[method] = 1
+    if str(data.get('isTitleFight', '')).lower() in ('yes', 'true'):
+        values['TitleFights'] = 1
+    
+    for field, suffix in FIGHT_SIDE_FIELDS.items():
+        total = (_number(data.get(f"a{suffix}")) or 0) + (_number(data.get(f"b{suffix}")) or 0)
+        if total:
+            values[field] = total
+    for round_number in range(1, 6):
+        total = ((_number(data.get(f"Around{round_number}StrikesLanded")) or 0)
+                 + (_number(data.get(f"Bround{round_number}StrikesLanded")) or 0))
+        if total:
+            values[f"round{round_number}StrikesLanded"] = total
+    
+    return [(code, values)]
+
+def fighter_stat_values(data: Dict[str, Any], fields: Iterable[str]) -> Dict[str, float]:
+    """
+    Numeric values of the listed fighter stats.
+    
+    Args:
+        data: fighterData document
+        fields: Stat names, looked up at the top level and then in the *_stats category maps
+    
+    Returns:
+        {field: value} for every listed stat the fighter has a number for
+    """
+    categories = [value for key, value in data.items() if key.endswith('_stats') and isinstance(value, dict)]
+    values = {}
+    for field in fields:
+        number = _number(data.get(field))
+        for stats in categories:
+            if number is not None:
+                break
+            number = _number(stats.get(field))
+        if number is not None:
+            values[field] = number
+    return values
+
+def fighter_contributions(group_field: str) -> Callable[[Dict[str, Any]], Contribution]:
+    """Return the contribution function totalling FIGHTER_TOTAL_FIELDS of fighter documents grouped by group_field."""
+    def contributions(data: Dict[str, Any]) -> Contribution:
+        code = group_code(data.get(group_field))
+        if not code:
+            return []
+        return [(code, fighter_stat_values(data, FIGHTER_TOTAL_FIELDS))]
+    return contributions
+
+def weight_class_document(code: str, group: Dict[str, Any]) -> Dict[str, Any]:
+    """weightClass document for one group, in the WCAV.csv layout: one flat total per FIGHTER_TOTAL_FIELDS stat."""
+    name, weight = WEIGHT_CLASSES.get(code, (code, None))
+    sums = group['sums']
+    document = {field: round(sums.get(field, 0), 6) for field in FIGHTER_TOTAL_FIELDS}
+    document.update({'weightclassname': name, 'weight': weight, 'fighterCount': group['count'],
+                     'aggregateVersion': AGGREGATE_VERSION})
+    return document
+
+# Aggregates maintained at ingest
+WEIGHT_CLASS_FIGHTS = AggregateDefinition('weightClassFights', 'weightClassFightTotals', fight_contributions)
+WEIGHT_CLASS_FIGHTERS = AggregateDefinition('weightClassFighters', 'weightClass', fighter_contributions('weightClass'),
+                                            weight_class_document)
+GYM_FIGHTERS = AggregateDefinition('gymFighters', 'gymFighterTotals', fighter_contributions('gymCode'))
+
+def load_state(state_path: str) -> Dict[str, Any]:
+    """
+    Load aggregate state from disk.
+    
+    Args:
+        state_path: Path to the state file
+    
+    Returns:
+        State with 'members', 'groups' and 'published'; empty if the file does not exist
+    """
+    state = {'members': {}, 'groups': {}, 'published': {}}
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as state_file:
+            saved = json.load(state_file)
+        if saved.get('version') == AGGREGATE_VERSION:
+            state.update({key: saved.get(key, {}) for key in state})
+    return state
+
+def save_state(state_path: str, state: Dict[str, Any]):
+    """Write aggregate state atomically, like the delta manifest."""
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    temp_path = f"{state_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as state_file:
+        json.dump({'version': AGGREGATE_VERSION, **state}, state_file, separators=(',', ':'))
+        state_file.flush()
+        os.fsync(state_file.fileno())
+    os.replace(temp_path, state_path)
+
+def _apply(groups: Dict[str, Dict[str, Any]], contribution: Contribution, sign: int) -> Set[str]:
+    """Add (sign=1) or remove (sign=-1) a contribution from the running sums; return the groups touched."""
+    touched = set()
+    for code, values in contribution:
+        group = groups.setdefault(code, {'count': 0, 'sums': {}})
+        group['count'] += sign
+        sums = group['sums']
+        for field, value in values.items():
+            total = sums.get(field, 0) + sign * value
+            if total:
+                sums[field] = total
+            else:
+                sums.pop(field, None)
+        touched.add(code)
+    return touched
+
+def recompute_groups(members: Dict[str, Contribution]) -> Dict[str, Dict[str, Any]]:
+    """Rebuild the per-group sums from scratch from every member's contribution."""
+    groups = {}
+    for contribution in members.values():
+        _apply(groups, contribution, 1)
+    return groups
+
+def compare_groups(expected: Dict[str, Dict[str, Any]], actual: Dict[str, Dict[str, Any]],
+                   tolerance: float = CHECK_TOLERANCE) -> List[str]:
+    """
+    Compare two sets of group sums.
+    
+    Args:
+        expected: Groups from a full recompute
+        actual: Groups maintained incrementally
+        tolerance: Relative tolerance for float sums
+    
+    Returns:
+        Descriptions of every mismatch (empty if consistent)
+    """
+    mismatches = []
+    for code in sorted(set(expected) | set(actual)):
+        left = expected.get(code, {'count': 0, 'sums': {}})
+        right = actual.get(code, {'count': 0, 'sums': {}})
+        if left['count'] != right['count']:
+            mismatches.append(f"{code}: count {left['count']} != {right['count']}")
+        for field in sorted(set(left['sums']) | set(right['sums'])):
+            a = left['sums'].get(field, 0)
+            b = right['sums'].get(field, 0)
+            if abs(a - b) > tolerance * max(1.0, abs(a), abs(b)):
+                mismatches.append(f"{code}.{field}: {a} != {b}")
+    return mismatches
+
+def group_document(code: str, group: Dict[str, Any]) -> Dict[str, Any]:
+    """Aggregate document for one group: totals and per-member averages."""
+    count = group['count']
+    totals = {field: round(value, 6) for field, value in sorted(group['sums'].items())}
+    averages = {field: round(value / count, 6) for field, value in totals.items()} if count > 0 else {}
+    return {'group': code, 'count': count, 'totals': totals, 'averages': averages,
+            'aggregateVersion': AGGREGATE_VERSION}
+
+def _document_hash(document: Dict[str, Any]) -> str:
+    encoded = json.dumps(document, sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).hexdigest()
+
+class IncrementalAggregator:
+    """
+    Maintain one aggregate across uploads.
+    
+    Every document of a full upload is passed to add(); only rows whose
+    contribution differs from the stored one touch the running sums. Rows
+    that disappeared are removed when documents() is called. Group documents
+    are published when they differ from the last published version, and the
+    state is saved once the publish has been attempted.
+    """
+    
+    def __init__(self, definition: AggregateDefinition, state_path: Optional[str] = None,
+                 log: Callable[[str], None] = print, remove_missing: bool = True):
+        """
+        Create an aggregator.
+        
+        Args:
+            definition: Aggregate to maintain
+            state_path: State file (defaults to one per aggregate name)
+            log: Function used to print progress messages
+            remove_missing: Remove rows not seen in this run (the run must see every row)
+        """
+        self.definition = definition
+        self.state_path = state_path or default_state_path(definition.name)
+        self.log = log
+        self.remove_missing = remove_missing
+        self.state = load_state(self.state_path)
+        self.seen = set()
+        self.applied = 0
+        self.removed = 0
+        self.pending = {}
+    
+    def add(self, document_id: str, data: Dict[str, Any]):
+        """Apply one document's contribution if it changed since the last run."""
+        self.seen.add(document_id)
+        contribution = [[code, values] for code, values in self.definition.contributions(data)]
+        members = self.state['members']
+        previous = members.get(document_id)
+        if previous == contribution:
+            return
+        
+        groups = self.state['groups']
+        if previous:
+            _apply(groups, previous, -1)
+        _apply(groups, contribution, 1)
+        if contribution:
+            members[document_id] = contribution
+        else:
+            members.pop(document_id, None)
+        self.applied += 1
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Return the (collection, document_id, data) of every group whose document changed."""
+        members = self.state['members']
+        groups = self.state['groups']
+        if self.remove_missing:
+            for document_id in [document_id for document_id in members if document_id not in self.seen]:
+                _apply(groups, members.pop(document_id), -1)
+                self.removed += 1
+        
+        published = self.state['published']
+        self.pending = {}
+        documents = []
+        build_document = self.definition.document or group_document
+        for code in sorted(set(groups) | set(published)):
+            document = build_document(code, groups.get(code, {'count': 0, 'sums': {}}))
+            digest = _document_hash(document)
+            if published.get(code) != digest:
+                self.pending[code] = digest
+                documents.append((self.definition.collection, code, document))
+        
+        self.log(f"🧮 {self.definition.name}: {self.applied} rows applied, {self.removed} removed, "
+                 f"{len(documents)} of {len(groups)} groups changed")
+        return documents
+    
+    def published(self, failed: Set[Tuple[str, str]]):
+        """Record the groups whose documents were written and save the state."""
+        groups = self.state['groups']
+        for code, digest in self.pending.items():
+            if (self.definition.collection, code) in failed:
+                continue
+            self.state['published'][code] = digest
+            if groups.get(code, {'count': 0})['count'] == 0:
+                # Emptied groups are published once with count 0, then forgotten
+                groups.pop(code, None)
+                self.state['published'].pop(code, None)
+        self.pending = {}
+        save_state(self.state_path, self.state)
+    
+    def check(self) -> List[str]:
+        """Compare the running sums with a full recompute from the stored contributions."""
+        return compare_groups(recompute_groups(self.state['members']), self.state['groups'])
+
+def weight_class_fight_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                                  state_prefix: str = '') -> IncrementalAggregator:
+    """Incremental per-weight-class fight totals for the fightData spec."""
+    return IncrementalAggregator(WEIGHT_CLASS_FIGHTS, default_state_path(state_prefix + WEIGHT_CLASS_FIGHTS.name), log=log)
+
+def weight_class_fighter_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                                    state_prefix: str = '') -> IncrementalAggregator:
+    """Incremental weightClass documents (per-weight-class fighter totals) for the fighterData spec."""
+    return IncrementalAggregator(WEIGHT_CLASS_FIGHTERS, default_state_path(state_prefix + WEIGHT_CLASS_FIGHTERS.name), log=log)
+
+def gym_fighter_aggregator(data_dir: str, log: Callable[[str], None] = print,
+                           state_prefix: str = '') -> IncrementalAggregator:
+    """Incremental per-gym fighter totals for the fighterData spec (rows without gymCode are skipped)."""
+    return IncrementalAggregator(GYM_FIGHTERS, default_state_path(state_prefix + GYM_FIGHTERS.name), log=log)
+
+# Aggregate name -> (definition, source CSV, categorize)
+AGGREGATE_SOURCES = {
+    WEIGHT_CLASS_FIGHTS.name: (WEIGHT_CLASS_FIGHTS, 'WEBFightData.csv', False),
+    WEIGHT_CLASS_FIGHTERS.name: (WEIGHT_CLASS_FIGHTERS, 'FighterData.csv', True),
+    GYM_FIGHTERS.name: (GYM_FIGHTERS, 'FighterData.csv', True),
+}
+
+def iter_source_documents(csv_file_path: str, categorize: bool) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    """Yield (document_id, data) for a source CSV, with the IDs and fields the upload writes."""
+    from upload_fighter_data_batch import build_fighter_document, iter_processed_rows
+    
+    for row_number, processed_data in iter_processed_rows(csv_file_path, categorize):
+        yield build_fighter_document(processed_data, row_number, {})
+
+def full_recompute(definition: AggregateDefinition, csv_file_path: str, categorize: bool) -> Dict[str, Dict[str, Any]]:
+    """Compute an aggregate's groups from scratch from its source CSV."""
+    groups = {}
+    for _, data in iter_source_documents(csv_file_path, categorize):
+        _apply(groups, definition.contributions(data), 1)
+    return groups
+
+def main():
+    """Apply a source CSV to the aggregate state offline, or check the state against a full recompute."""
+    parser = argparse.ArgumentParser(description='Maintain and check the incremental gym and weight-class aggregates')
+    parser.add_argument('--data-dir', default='oldData', help='Directory holding the source CSV files')
+    parser.add_argument('--aggregates', nargs='+', default=list(AGGREGATE_SOURCES), choices=list(AGGREGATE_SOURCES),
+                        help='Aggregates to process (default: all)')
+    parser.add_argument('--apply', action='store_true',
+                        help='Apply the CSV files to the state as an upload would, without publishing')
+    parser.add_argument('--check', action='store_true',
+                        help='Compare the state with a full recompute from the CSV files')
+    args = parser.parse_args()
+    
+    failures = 0
+    for name in args.aggregates:
+        definition, source, categorize = AGGREGATE_SOURCES[name]
+        csv_file_path = os.path.join(args.data_dir, source)
+        if not os.path.exists(csv_file_path):
+            print(f"⚠️  Skipping {name}: {csv_file_path} not found")
+            continue
+        
+        aggregator = IncrementalAggregator(definition)
+        if args.apply:
+            for document_id, data in iter_source_documents(csv_file_path, categorize):
+                aggregator.add(document_id, data)
+            aggregator.documents()
+            save_state(aggregator.state_path, aggregator.state)
+        
+        if args.check or not args.apply:
+            mismatches = compare_groups(full_recompute(definition, csv_file_path, categorize), aggregator.state['groups'])
+            mismatches += [f"running sums: {mismatch}" for mismatch in aggregator.check()]
+            if mismatches:
+                failures += 1
+                print(f"❌ {name}: {len(mismatches)} mismatches between {aggregator.state_path} and {csv_file_path}")
+                for mismatch in mismatches[:20]:
+                    print(f"   - {mismatch}")
+            else:
+                print(f"✅ {name}: {len(aggregator.state['groups'])} groups match a full recompute of {csv_file_path}")
+    
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
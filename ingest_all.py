@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Ingest every oldData CSV into Firestore with one command.
+Each collection is described by a declarative IngestSpec (source file, ID
+columns, joins, transforms, optional parent document), and independent
+collections are uploaded concurrently through one shared Firestore client.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from upload_fighter_data_batch import (
+    UploadError,
+    UploadSummary,
+    build_fighter_document,
+    iter_csv_rows,
+    iter_processed_rows,
+    upload_csv_batch,
+)
+from event_bouts import event_bouts_fan_out
+from fake_firestore import FakeFirestore
+from firestore_client import firestore_client
+from fighter_combinations import combo_vocabulary_aggregator, sparse_combinations_enricher
+from fighter_history import fighter_history_aggregator
+from fighter_matchups import fighter_matchups_aggregator
+from fighter_percentiles import fighter_percentiles_enricher, stat_distributions_aggregator
+from fighter_ratings import fight_difficulty_enricher, fighter_ratings_enricher
+from fighter_search import fighter_search_aggregator
+from fighter_totals import fighter_totals_aggregator
+from incremental_aggregates import clear_state, gym_fighter_aggregator, weight_class_fight_aggregator, weight_class_fighter_aggregator
+from static_export import COMPRESSION_SUFFIXES, EXPORT_FORMATS, ExportSettings
+from write_scheduler import WriteScheduler
+from value_formats import DATE_FORMATS, DISPLAY_FORMATS, resolve_formats
+
+# Directory holding the exported CSV files
+DATA_DIR = "oldData"
+
+# Write rate of offline runs: the in-memory client needs no pacing
+OFFLINE_WRITE_RATE = 1e9
+
+class LookupJoin(NamedTuple):
+    """Copy a value from another CSV onto each row, matched by a key column."""
+    source: str
+    key_column: str
+    value_column: str
+    target_field: str
+
+class ParentLink(NamedTuple):
+    """Store rows as a subcollection under documents of a parent collection."""
+    collection: str
+    subcollection: str
+    key_column: str
+    source: str
+    source_key_column: str
+
+class IngestSpec(NamedTuple):
+    """Declarative description of how one CSV becomes one Firestore collection."""
+    name: str
+    source: str
+    collection: str
+    id_columns: Tuple[str, ...] = ('_id',)
+    joins: Tuple[LookupJoin, ...] = ()
+    transforms: Tuple[Callable[[Dict[str, Any]], Dict[str, Any]], ...] = ()
+    categorize: bool = False
+    parent: Optional[ParentLink] = None
+    aggregators: Tuple[Callable[..., Any], ...] = ()
+    enrichers: Tuple[Callable[[str, Callable[[str], None]], Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]], ...] = ()
+    formats: Tuple[str, ...] = ()
+    fan_out: Optional[Callable[[str, Callable[[str], None]], Optional[Callable[[str, Dict[str, Any]], List[Tuple[str, Dict[str, Any]]]]]]] = None
+
+# Every CSV exported from the old database and the collection it feeds.
+# Only fighterData nests stats into category maps; the WEB* files are read
+# by the website as flat documents. Display-formatted values are typed in
+# the WEB* stat files; events, fights and fightData only type their M/D/YYYY
+# dates, as the website still compares their 'Yes' and '16.7%' strings
+# directly. WCAV.csv, WeightClasses.csv and Gyms.csv are not uploaded: the
+# incremental aggregates maintain weightClass (in the WCAV.csv layout),
+# weightClassFightTotals and gymFighterTotals instead.
+COLLECTION_SPECS = [
+    IngestSpec('fighterData', 'FighterData.csv', 'fighterData', ('_id', 'fighterCode'),
+               joins=(LookupJoin('FighterNames.csv', 'fighterCode', 'fighterName', 'fighterName'),),
+               categorize=True, aggregators=(fighter_totals_aggregator, fighter_search_aggregator,
+                                             weight_class_fighter_aggregator, gym_fighter_aggregator,
+                                             stat_distributions_aggregator),
+               enrichers=(fighter_ratings_enricher, fighter_percentiles_enricher)),
+    IngestSpec('events', 'Events.csv', 'events', formats=DATE_FORMATS),
+    IngestSpec('fights', 'Fights.csv', 'fights', ('fightCode', '_id'), enrichers=(fight_difficulty_enricher,),
+               aggregators=(fighter_history_aggregator,), formats=DATE_FORMATS),
+    IngestSpec('fightData', 'WEBFightData.csv', 'fightData', aggregators=(weight_class_fight_aggregator,),
+               formats=DATE_FORMATS),
+    IngestSpec('combinations', 'Combinations.csv', 'fighterData',
+               parent=ParentLink('fighterData', 'combinations', 'fighterCode', 'FighterData.csv', 'fighterCode'),
+               aggregators=(combo_vocabulary_aggregator,), enrichers=(sparse_combinations_enricher,)),
+    IngestSpec('webEventData', 'WEBEventData.csv', 'webEventData', fan_out=event_bouts_fan_out),
+    IngestSpec('webFighterData', 'WEBFighterData.csv', 'webFighterData', formats=DISPLAY_FORMATS,
+               aggregators=(fighter_matchups_aggregator,)),
+    IngestSpec('webFighterMatchup', 'WEBFighterMatchup.csv', 'webFighterMatchup', formats=DISPLAY_FORMATS),
+    IngestSpec('webFighterNoData', 'WEBFighterNoData.csv', 'webFighterNoData', formats=DISPLAY_FORMATS),
+    IngestSpec('webGymData', 'WEBGymData.csv', 'webGymData', formats=DISPLAY_FORMATS),
+    IngestSpec('webNoDataDisplay', 'WEBNoDataDisplay.csv', 'webNoDataDisplay', formats=DISPLAY_FORMATS),
+    IngestSpec('webNoDataFights', 'WEBNoDataFights.csv', 'webNoDataFights', formats=DISPLAY_FORMATS),
+]
+
+def load_lookup(csv_file_path: str, key_column: str, value_column: str,
+                log: Callable[[str], None] = print) -> Optional[Dict[str, str]]:
+    """
+    Load a key -> value mapping from two columns of a CSV file.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        key_column: Column holding the lookup key
+        value_column: Column holding the value
+        log: Function used to print progress messages
+    
+    Returns:
+        Dictionary mapping key to value, or None if the file does not exist
+    """
+    if not os.path.exists(csv_file_path):
+        log(f"⚠️  Lookup CSV not found: {csv_file_path}")
+        return None
+    
+    lookup = {}
+    for _, row, _ in iter_csv_rows(csv_file_path):
+        key = (row.get(key_column) or '').strip()
+        value = (row.get(value_column) or '').strip()
+        if key and value:
+            lookup[key] = value
+    
+    log(f"📋 Loaded {len(lookup)} {value_column} values from {csv_file_path}")
+    return lookup
+
+def load_parent_ids(parent: ParentLink, data_dir: str = DATA_DIR,
+                    log: Callable[[str], None] = print) -> Optional[Dict[str, str]]:
+    """
+    Map parent keys to the document IDs the parent collection is uploaded with.
+    
+    The parent file is run through the same column plan and ID selection as
+    the fighterData upload, so the IDs match the uploaded documents exactly.
+    
+    Args:
+        parent: Parent collection link
+        data_dir: Directory holding the CSV files
+        log: Function used to print progress messages
+    
+    Returns:
+        Dictionary mapping parent key to document ID, or None if the parent file does not exist
+    """
+    csv_file_path = os.path.join(data_dir, parent.source)
+    if not os.path.exists(csv_file_path):
+        log(f"⚠️  Parent CSV not found: {csv_file_path}; using {parent.key_column} as the parent document ID")
+        return None
+    
+    parent_ids = {}
+    for row_number, processed_data in iter_processed_rows(csv_file_path):
+        key = processed_data.get(parent.source_key_column)
+        if key in (None, ''):
+            continue
+        document_id, _ = build_fighter_document(processed_data, row_number, {})
+        parent_ids.setdefault(str(key), document_id)
+    
+    log(f"📋 Loaded {len(parent_ids)} {parent.collection} document IDs from {csv_file_path}")
+    return parent_ids
+
+def make_document_builder(spec: IngestSpec, data_dir: str = DATA_DIR,
+                          log: Callable[[str], None] = print) -> Callable[[Dict[str, Any], int], Tuple[str, Dict[str, Any]]]:
+    """
+    Build the build_document callable for a spec.
+    
+    Joins, enrichers and the parent lookup are loaded once here; the returned
+    callable applies them to each processed row, runs the spec's transforms
+    and enrichers and picks the document ID from the first non-empty ID column.
+    
+    Args:
+        spec: Collection spec
+        data_dir: Directory holding the CSV files
+        log: Function used to print progress messages
+    
+    Returns:
+        Callable turning (processed_data, row_number) into (document_id, data)
+    """
+    joins = []
+    for join in spec.joins:
+        lookup = load_lookup(os.path.join(data_dir, join.source), join.key_column, join.value_column, log)
+        if lookup:
+            joins.append((join, lookup))
+    
+    # Enrichers compute their data up front and return a transform, or None when their inputs are missing
+    transforms = list(spec.transforms)
+    for enricher in spec.enrichers:
+        transform = enricher(data_dir, log)
+        if transform is not None:
+            transforms.append(transform)
+    
+    parent_ids = load_parent_ids(spec.parent, data_dir, log) if spec.parent else None
+    
+    def build_document(processed_data: Dict[str, Any], row_number: int) -> Tuple[str, Dict[str, Any]]:
+        for join, lookup in joins:
+            key = processed_data.get(join.key_column)
+            if key is not None and str(key) in lookup:
+                processed_data[join.target_field] = lookup[str(key)]
+        
+        for transform in transforms:
+            processed_data = transform(processed_data)
+        
+        document_id = None
+        for column in spec.id_columns:
+            if processed_data.get(column) not in (None, ''):
+                document_id = str(processed_data[column])
+                break
+        if document_id is None:
+            document_id = f"{spec.name}_{row_number}"
+        
+        # Remove _id from data since it's used as document ID
+        if '_id' in processed_data:
+            del processed_data['_id']
+        
+        if spec.parent:
+            parent_key = processed_data.get(spec.parent.key_column)
+            if parent_key in (None, ''):
+                raise ValueError(f"Missing {spec.parent.key_column} for {spec.parent.collection} parent")
+            if parent_ids is None:
+                parent_id = str(parent_key)
+            elif str(parent_key) in parent_ids:
+                parent_id = parent_ids[str(parent_key)]
+            else:
+                raise ValueError(f"No {spec.parent.collection} document for {spec.parent.key_column}={parent_key}")
+            document_id = f"{parent_id}/{spec.parent.subcollection}/{document_id}"
+        
+        return document_id, processed_data
+    
+    return build_document
+
+class IngestResult(NamedTuple):
+    """Outcome of ingesting one spec."""
+    name: str
+    collection: str
+    status: str
+    summary: Optional[UploadSummary]
+    seconds: float
+    message: Optional[str] = None
+
+def ingest_spec(db, spec: IngestSpec, data_dir: str = DATA_DIR, log: Callable[[str], None] = print,
+                export: Optional[ExportSettings] = None, state_prefix: str = '', **upload_options) -> IngestResult:
+    """
+    Ingest one CSV file according to its spec.
+    
+    Args:
+        db: Firestore client
+        spec: Collection spec
+        data_dir: Directory holding the CSV files
+        log: Function used to print progress messages
+        export: Also write the collection's documents to static bundles
+        state_prefix: Prefix of the manifest, journal, metrics, dead-letter and aggregate state file names
+        **upload_options: Extra keyword arguments for upload_csv_batch
+    
+    Returns:
+        IngestResult with status 'ok', 'errors', 'skipped' or 'failed'
+    """
+    started = time.perf_counter()
+    csv_file_path = os.path.join(data_dir, spec.source)
+    if not os.path.exists(csv_file_path):
+        log(f"⚠️  Skipping {spec.name}: {csv_file_path} not found")
+        return IngestResult(spec.name, spec.collection, 'skipped', None, 0.0, f"{spec.source} not found")
+    
+    try:
+        build_document = make_document_builder(spec, data_dir, log)
+        aggregators = [aggregator for aggregator in (factory(data_dir, log, state_prefix=state_prefix)
+                                                     for factory in spec.aggregators)
+                       if aggregator is not None]
+        if export is not None:
+            aggregators.append(export.exporter(spec.collection, log))
+        summary = upload_csv_batch(
+            db,
+            csv_file_path,
+            spec.collection,
+            build_document,
+            categorize=spec.categorize,
+            state_name=state_prefix + spec.name,
+            aggregators=aggregators,
+            formats=resolve_formats(spec.formats),
+            fan_out=spec.fan_out(data_dir, log) if spec.fan_out else None,
+            log=log,
+            **upload_options,
+        )
+    except Exception as e:
+        log(f"❌ {e}")
+        return IngestResult(spec.name, spec.collection, 'failed', None, time.perf_counter() - started, str(e))
+    
+    status = 'errors' if summary.error_count else 'ok'
+    return IngestResult(spec.name, spec.collection, status, summary, time.perf_counter() - started)
+
+def select_specs(names: Optional[Sequence[str]] = None, skip: Sequence[str] = ()) -> List[IngestSpec]:
+    """
+    Pick specs by name, keeping the declared order.
+    
+    Args:
+        names: Spec names to include (all specs if empty)
+        skip: Spec names to exclude
+    
+    Returns:
+        List of selected specs
+    
+    Raises:
+        UploadError: If a name does not match any spec
+    """
+    known = {spec.name for spec in COLLECTION_SPECS}
+    unknown = [name for name in list(names or ()) + list(skip) if name not in known]
+    if unknown:
+        raise UploadError(f"Unknown collection spec(s): {', '.join(unknown)}. Known: {', '.join(sorted(known))}")
+    
+    return [spec for spec in COLLECTION_SPECS
+            if (not names or spec.name in names) and spec.name not in skip]
+
+def ingest_all(specs: Sequence[IngestSpec], db=None, data_dir: str = DATA_DIR, max_workers: int = 4,
+               scheduler: Optional[WriteScheduler] = None, export: Optional[ExportSettings] = None,
+               state_prefix: str = '', **upload_options) -> List[IngestResult]:
+    """
+    Ingest several collections concurrently with one shared Firestore client.
+    
+    Each collection runs its own pipeline (and its own batches in flight)
+    on a worker thread; progress lines are prefixed with the spec name.
+    All collections draw from one write scheduler, so together they stay
+    within the write rate.
+    
+    Args:
+        specs: Collection specs to ingest
+        db: Firestore client (initialized from the service account if None)
+        data_dir: Directory holding the CSV files
+        max_workers: Number of collections ingested at the same time
+        scheduler: Write scheduler shared by every collection (default settings if None)
+        export: Also write every collection's documents to static bundles
+        state_prefix: Prefix of the manifest, journal, metrics, dead-letter and aggregate state file names
+        **upload_options: Extra keyword arguments for upload_csv_batch
+    
+    Returns:
+        List of IngestResult in spec order
+    """
+    if db is None:
+        db = firestore_client()
+    
+    scheduler = scheduler or WriteScheduler()
+    print_lock = threading.Lock()
+    
+    def prefixed_log(name: str) -> Callable[[str], None]:
+        def log(message: str):
+            with print_lock:
+                for line in str(message).splitlines() or ['']:
+                    print(f"[{name}] {line}")
+        return log
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(ingest_spec, db, spec, data_dir, prefixed_log(spec.name), export, state_prefix,
+                            scheduler=scheduler, **upload_options): spec
+            for spec in specs
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.name] = result
+    
+    return [results[spec.name] for spec in specs]
+
+def print_ingest_summary(results: Sequence[IngestResult]):
+    """Print a one-line-per-collection summary table."""
+    status_icons = {'ok': '✅', 'errors': '⚠️ ', 'skipped': '⏭️ ', 'failed': '❌'}
+    print(f"{'':3}{'spec':<20}{'collection':<20}{'written':>9}{'errors':>8}{'batches':>9}{'seconds':>9}{'rows/s':>9}")
+    for result in results:
+        summary = result.summary or UploadSummary(result.collection, 0, 0, 0, 0)
+        rows_per_second = (summary.metrics or {}).get('rows_per_second') or 0
+        print(f"{status_icons.get(result.status, '  ')} {result.name:<20}{result.collection:<20}"
+              f"{summary.success_count:>9}{summary.error_count:>8}{summary.batch_count:>9}{result.seconds:>9.1f}"
+              f"{rows_per_second:>9.0f}" + (f"  {result.message}" if result.message else ''))
+
+def add_selection_arguments(parser: argparse.ArgumentParser):
+    """Add the data directory and spec selection options shared by ingest_all.py and fightstats.py."""
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directory holding the CSV files")
+    parser.add_argument('--only', nargs='+', metavar='SPEC', help="Only ingest these specs")
+    parser.add_argument('--skip', nargs='+', metavar='SPEC', default=[], help="Skip these specs")
+
+def add_ingest_arguments(parser: argparse.ArgumentParser, network: bool = True):
+    """
+    Add the upload options shared by ingest_all.py and fightstats.py.
+    
+    Args:
+        parser: Parser (or subcommand parser) to extend
+        network: Also add the options that only matter when writing to Firestore
+    """
+    parser.add_argument('--max-workers', type=int, default=4, help="Collections ingested concurrently")
+    parser.add_argument('--quiet', action='store_true', help="Only print warnings, errors and the final summaries")
+    parser.add_argument('--transform-workers', type=int, default=1,
+                        help="Processes parsing and transforming each CSV (1 to transform in-process)")
+    if not network:
+        return
+    parser.add_argument('--batch-size', type=int, default=500, help="Maximum documents per batch")
+    parser.add_argument('--max-in-flight', type=int, default=4, help="Batches committed concurrently per collection")
+    parser.add_argument('--delta', action='store_true', help="Only write documents that changed since the last run")
+    parser.add_argument('--delete-missing', action='store_true', help="With --delta, delete documents whose rows disappeared")
+    parser.add_argument('--resume', action='store_true', help="Resume interrupted uploads from their checkpoint journals")
+    parser.add_argument('--write-rate', type=float, default=500.0, help="Initial writes per second, shared by all collections")
+    parser.add_argument('--max-write-rate', type=float, help="Upper bound for the write rate ramp")
+
+def add_export_arguments(parser: argparse.ArgumentParser, required: bool = False):
+    """
+    Add the static bundle options.
+    
+    Args:
+        parser: Parser (or subcommand parser) to extend
+        required: Make --export-dir mandatory
+    """
+    parser.add_argument('--export-dir', required=required,
+                        help="Also write every collection to compressed static bundles in this directory"
+                        if not required else "Directory receiving the compressed static bundles")
+    parser.add_argument('--export-format', nargs='+', choices=EXPORT_FORMATS, default=['ndjson'],
+                        help="Bundle layouts to write")
+    parser.add_argument('--compression', choices=list(COMPRESSION_SUFFIXES), default='gzip', help="Bundle compression")
+
+def export_settings(args: argparse.Namespace) -> Optional[ExportSettings]:
+    """Return the ExportSettings selected by the export arguments, or None without --export-dir."""
+    if not getattr(args, 'export_dir', None):
+        return None
+    return ExportSettings(args.export_dir, tuple(args.export_format), args.compression)
+
+def upload_options(args: argparse.Namespace, offline: bool = False) -> Dict[str, Any]:
+    """
+    Map parsed ingest arguments to upload_csv_batch keyword arguments.
+    
+    Args:
+        args: Arguments added by add_ingest_arguments
+        offline: Writes go to an in-memory client: delta and resume are turned off
+    
+    Returns:
+        Keyword arguments for ingest_all
+    """
+    options = {'quiet': args.quiet, 'transform_workers': args.transform_workers}
+    if hasattr(args, 'batch_size'):
+        options.update({'batch_size': args.batch_size, 'max_in_flight': args.max_in_flight})
+    if not offline and hasattr(args, 'delta'):
+        options.update({'delta': args.delta, 'delete_missing': args.delete_missing, 'resume': args.resume})
+    return options
+
+def main():
+    """Main function to ingest every oldData CSV."""
+    parser = argparse.ArgumentParser(description="Upload every oldData CSV to its Firestore collection.")
+    add_selection_arguments(parser)
+    add_ingest_arguments(parser)
+    parser.add_argument('--list', action='store_true', help="List the collection specs and exit")
+    add_export_arguments(parser)
+    parser.add_argument('--offline', action='store_true',
+                        help="With --export-dir, only write the bundles: no Firestore connection, no delta or resume")
+    args = parser.parse_args()
+    
+    if args.list:
+        for spec in COLLECTION_SPECS:
+            target = f"{spec.parent.collection}/*/{spec.parent.subcollection}" if spec.parent else spec.collection
+            print(f"{spec.name:<20} {spec.source:<24} -> {target} (ID: {', '.join(spec.id_columns)})")
+        return
+    
+    try:
+        specs = select_specs(args.only, args.skip)
+    except UploadError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    export = export_settings(args)
+    
+    # Offline runs write into an in-memory client, with their own state files so
+    # the Firestore manifests and journals are left alone; like the client, the
+    # aggregate state starts empty on every run
+    db = None
+    scheduler = WriteScheduler(args.write_rate, args.max_write_rate)
+    state_prefix = ''
+    if args.offline:
+        if export is None:
+            print("❌ --offline needs --export-dir")
+            sys.exit(1)
+        db = FakeFirestore()
+        scheduler = WriteScheduler(OFFLINE_WRITE_RATE)
+        state_prefix = 'offline-'
+        clear_state(state_prefix)
+        if args.delta or args.resume:
+            print("⚠️  Ignoring --delta and --resume: offline runs always export every row")
+    
+    print(f"🚀 Ingesting {len(specs)} collections from {args.data_dir} ({args.max_workers} at a time)...")
+    if export is not None:
+        print(f"📦 Exporting {', '.join(export.formats)} bundles ({export.compression}) to {export.output_dir}"
+              + (" without writing to Firestore" if args.offline else ""))
+    print("=" * 60)
+    
+    results = ingest_all(
+        specs,
+        db=db,
+        data_dir=args.data_dir,
+        max_workers=args.max_workers,
+        scheduler=scheduler,
+        export=export,
+        state_prefix=state_prefix,
+        **upload_options(args, args.offline),
+    )
+    
+    print("=" * 60)
+    print_ingest_summary(results)
+    print("✨ Script completed!")
+    
+    if any(result.status == 'failed' for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Multi-process parse and transform stage for large CSV uploads.
+The file is split into byte ranges that end on record boundaries (a quote
+parity scan, so newlines inside quoted fields never split a record). Worker
+processes parse and transform their ranges with a ColumnPlan compiled once per
+worker from the header and plan sample, and the processed rows stream back to
+the uploader in file order, at most a few chunks ahead of the committer.
+Document building (name joins, enrichers, IDs) stays in the uploading process,
+so its lookup tables are never sent to the workers.
+"""
+
+import argparse
+import csv
+import io
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from value_formats import DISPLAY_FORMATS, NormalizationReport, ValueFormat, resolve_formats
+
+# Target size of the byte range one worker parses and transforms at a time
+CHUNK_BYTES = 1024 * 1024
+
+# Chunks submitted ahead of the one being consumed, per worker; bounds the
+# processed rows buffered when the committer is the slower side
+CHUNKS_AHEAD = 2
+
+# Workers are spawned rather than forked: uploads run next to gRPC and
+# ingest_all threads, which are not safe to fork
+START_METHOD = 'spawn'
+
+# Compiled plan of this worker process, set by _init_worker
+_worker_plan = None
+_worker_path = None
+
+class TransformError(Exception):
+    """A row that failed to transform in a worker process."""
+
+def split_record_ranges(csv_file_path: str, start_offset: int, chunk_bytes: int = CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """
+    Split a CSV file into byte ranges that start and end on record boundaries.
+    
+    A newline ends a record when the number of quote characters since the
+    start of the range is even, which holds for RFC 4180 quoting (escaped
+    quotes are doubled). Only chunk ends are scanned for, so the cost is a
+    quote count over the file plus a few newline searches per chunk.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        start_offset: Byte offset of the first record (after the header)
+        chunk_bytes: Target size of each range
+    
+    Returns:
+        List of (start, stop) byte offsets covering the file from start_offset
+    """
+    size = os.path.getsize(csv_file_path)
+    if size <= start_offset:
+        return []
+    
+    ranges = []
+    with open(csv_file_path, 'rb') as csvfile, mmap.mmap(csvfile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = start_offset
+        while start < size:
+            stop = start + max(1, chunk_bytes)
+            if stop >= size:
+                ranges.append((start, size))
+                break
+            
+            # Move stop to the first newline outside a quoted field
+            open_quote = data[start:stop].count(b'"') % 2 == 1
+            while True:
+                newline = data.find(b'\n', stop)
+                if newline == -1:
+                    stop = size
+                    break
+                open_quote ^= data[stop:newline].count(b'"') % 2 == 1
+                stop = newline + 1
+                if not open_quote:
+                    break
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+def _init_worker(csv_file_path: str, header: List[str], sample: List[List[str]], categorize: bool,
+                 formats: Sequence[ValueFormat]):
+    """Compile the worker's ColumnPlan once; the same sample yields the same plan as the parent's."""
+    global _worker_plan, _worker_path
+    from upload_fighter_data_batch import ColumnPlan
+    _worker_plan = ColumnPlan(header, sample, categorize, formats)
+    _worker_path = csv_file_path
+
+def _transform_range(start: int, stop: int) -> Tuple[List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]],
+                                                     Optional[NormalizationReport]]:
+    """
+    Parse and transform one byte range in a worker process.
+    
+    Args:
+        start: Offset of the range's first record
+        stop: Offset just past the range's last record
+    
+    Returns:
+        Tuple of (rows, report) where rows holds (offset, processed_data, error)
+        per non-blank record and report the normalization counts of the range
+    """
+    with open(_worker_path, 'rb') as csvfile:
+        csvfile.seek(start)
+        data = csvfile.read(stop - start)
+    
+    consumed = start
+    
+    def counted_lines():
+        nonlocal consumed
+        for raw_line in io.BytesIO(data):
+            consumed += len(raw_line)
+            yield raw_line.decode('utf-8')
+    
+    transform = _worker_plan.transform
+    rows = []
+    for values in csv.reader(counted_lines()):
+        if not values:
+            continue
+        try:
+            rows.append((consumed, transform(values), None))
+        except Exception as e:
+            rows.append((consumed, None, str(e)))
+    
+    report = _worker_plan.report.take() if _worker_plan.report is not None else None
+    return rows, report
+
+class ParallelTransform:
+    """
+    Process-pool replacement for plan_csv's plan and record stream.
+    
+    records() yields (row_number, processed_data, offset) in file order, and
+    transform() passes the processed data through (raising TransformError
+    for failed rows), so the object stands in for the ColumnPlan in
+    iter_upload_records. Normalization counts from the workers are merged
+    into report as their chunks are consumed.
+    """
+    
+    def __init__(self, csv_file_path: str, workers: int, start_row: int = 0, start_offset: int = 0,
+                 categorize: bool = True, formats: Sequence[ValueFormat] = (), chunk_bytes: int = CHUNK_BYTES):
+        """
+        Compile the plan from the header and sample, and split the file.
+        
+        Args:
+            csv_file_path: Path to the CSV file
+            workers: Number of worker processes
+            start_row: Row number of the last row before start_offset
+            start_offset: Byte offset of the first record to read (0 to read from the start)
+            categorize: Nest known stat fields into category maps
+            formats: Display formats to normalize into typed values
+            chunk_bytes: Target size of the byte range each worker task covers
+        """
+        from upload_fighter_data_batch import PLAN_SAMPLE_SIZE, ColumnPlan, iter_csv_records
+        
+        records = iter_csv_records(csv_file_path, start_row, start_offset)
+        try:
+            _, self.header, header_offset = next(records, (0, [], 0))
+            self.sample = [values for _, values, _ in islice(records, PLAN_SAMPLE_SIZE)]
+        finally:
+            records.close()
+        
+        self.csv_file_path = csv_file_path
+        self.workers = max(1, workers)
+        self.categorize = categorize
+        self.formats = tuple(formats)
+        self.plan = ColumnPlan(self.header, self.sample, categorize, self.formats)
+        self.report = self.plan.report
+        
+        # Same numbering as iter_csv_records: a resumed stream continues after start_row
+        resumed = start_offset > header_offset
+        self.first_row = start_row + 1 if resumed else 1
+        self.ranges = split_record_ranges(csv_file_path, start_offset if resumed else header_offset,
+                                          chunk_bytes) if self.header else []
+    
+    def transform(self, processed_data):
+        """Return a row processed by a worker, raising the worker's error for failed rows."""
+        if isinstance(processed_data, TransformError):
+            raise processed_data
+        return processed_data
+    
+    def records(self) -> Iterator[Tuple[int, Any, int]]:
+        """
+        Transform the file in the worker pool and stream the rows back in order.
+        
+        Yields:
+            Tuples of (row_number, processed_data, offset); processed_data is a
+            TransformError for rows that failed
+        """
+        if not self.ranges:
+            return
+        
+        # A single chunk is not worth starting the pool for
+        if len(self.ranges) == 1 or self.workers == 1:
+            from upload_fighter_data_batch import iter_csv_records
+            records = iter_csv_records(self.csv_file_path, self.first_row - 1, self.ranges[0][0])
+            next(records, None)
+            for row_number, values, offset in records:
+                try:
+                    yield row_number, self.plan.transform(values), offset
+                except Exception as e:
+                    yield row_number, TransformError(str(e)), offset
+            return
+        
+        context = multiprocessing.get_context(START_METHOD)
+        workers = min(self.workers, len(self.ranges))
+        initargs = (self.csv_file_path, self.header, self.sample, self.categorize, self.formats)
+        executor = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=initargs)
+        try:
+            ranges = iter(self.ranges)
+            pending = deque(executor.submit(_transform_range, start, stop)
+                            for start, stop in islice(ranges, workers * CHUNKS_AHEAD))
+            row_number = self.first_row
+            while pending:
+                rows, report = pending.popleft().result()
+                next_range = next(ranges, None)
+                if next_range is not None:
+                    pending.append(executor.submit(_transform_range, *next_range))
+                if report is not None:
+                    self.report.merge(report)
+                
+                for offset, processed_data, error in rows:
+                    yield row_number, (processed_data if error is None else TransformError(error)), offset
+                    row_number += 1
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def compare_transform(csv_file_path: str, workers: int, categorize: bool = True,
+                      formats: Sequence[ValueFormat] = (), chunk_bytes: int = CHUNK_BYTES) -> Dict[str, Any]:
+    """
+    Transform a file in-process and with the worker pool, and check the results match.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        workers: Number of worker processes
+        categorize: Nest known stat fields into category maps
+        formats: Display formats to normalize into typed values
+        chunk_bytes: Target size of each worker chunk
+    
+    Returns:
+        Dictionary with rows, chunks, serial_seconds, parallel_seconds,
+        matching (bool) and the first mismatching row number, if any
+    """
+    from upload_fighter_data_batch import plan_csv
+    
+    started = time.perf_counter()
+    plan, records = plan_csv(csv_file_path, categorize=categorize, formats=formats)
+    serial = []
+    for row_number, values, offset in records:
+        try:
+            serial.append((row_number, plan.transform(values), offset))
+        except Exception as e:
+            serial.append((row_number, str(e), offset))
+    serial_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    parallel_transform = ParallelTransform(csv_file_path, workers, categorize=categorize, formats=formats,
+                                           chunk_bytes=chunk_bytes)
+    parallel = [(row_number, str(processed_data) if isinstance(processed_data, TransformError) else processed_data, offset)
+                for row_number, processed_data, offset in parallel_transform.records()]
+    parallel_seconds = time.perf_counter() - started
+    
+    mismatch = next((left[0] for left, right in zip(serial, parallel) if left != right), None)
+    if mismatch is None and len(serial) != len(parallel):
+        mismatch = min(len(serial), len(parallel)) + 1
+    serial_report = plan.report.as_dict() if plan.report is not None else None
+    parallel_report = parallel_transform.report.as_dict() if parallel_transform.report is not None else None
+    return {
+        'rows': len(serial),
+        'chunks': len(parallel_transform.ranges),
+        'serial_seconds': round(serial_seconds, 3),
+        'parallel_seconds': round(parallel_seconds, 3),
+        'matching': mismatch is None and serial_report == parallel_report,
+        'first_mismatch': mismatch,
+    }
+
+def main():
+    """Compare the in-process and multi-process transform of CSV files."""
+    parser = argparse.ArgumentParser(description="Check and time the multi-process CSV transform against the in-process one.")
+    parser.add_argument('csv_file_paths', nargs='+', help="CSV files to transform")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--chunk-bytes', type=int, default=CHUNK_BYTES, help="Target bytes per worker chunk")
+    parser.add_argument('--formats', nargs='*', default=list(DISPLAY_FORMATS),
+                        help="Display formats to normalize (none for the raw plan)")
+    parser.add_argument('--no-categorize', action='store_true', help="Keep stat fields at the top level")
+    args = parser.parse_args()
+    
+    formats = resolve_formats(args.formats)
+    failed = False
+    for csv_file_path in args.csv_file_paths:
+        result = compare_transform(csv_file_path, args.workers, not args.no_categorize, formats, args.chunk_bytes)
+        icon = '✅' if result['matching'] else '❌'
+        print(f"{icon} {csv_file_path}: {result['rows']} rows in {result['chunks']} chunks - "
+              f"in-process {result['serial_seconds']:.3f}s, {args.workers} workers {result['parallel_seconds']:.3f}s"
+              + (f" (first mismatch at row {result['first_mismatch']})" if result['first_mismatch'] else ''))
+        failed = failed or not result['matching']
+    
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,747 @@
+#!/usr/bin/env python3
+"""
+Local columnar parse cache for the oldData CSVs.
+Each CSV is parsed and type-converted once into NumPy matrices (an int64 and a
+float64 matrix with a presence mask, and text columns as one UTF-8 buffer plus
+offsets) stored as .npy files. Later runs memory-map them instead of parsing
+and converting the text again: analytics read typed columns zero-copy, and
+row-wise readers get the processed dictionaries the upload's column plan builds.
+Entries are keyed by the source file's path, size, mtime and content hash and
+are rebuilt automatically when the source changes; old entries are evicted
+least-recently-used once the cache grows past its size limit.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from itertools import compress
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from parallel_transform import TransformError
+from upload_journal import file_fingerprint, same_contents
+
+# Default cache directory, one subdirectory per source file
+CACHE_DIR = ".upload_cache"
+
+# Bump when the entry layout changes; entries with another version are rebuilt
+CACHE_VERSION = 2
+
+# Entries are evicted, least recently used first, above this total size
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+META_FILE = 'meta.json'
+
+# Types of text cells: empty, number text as the upload converts it, other text
+TEXT_EMPTY, TEXT_INT, TEXT_FLOAT, TEXT_STRING = 0, 1, 2, 3
+
+# Rows converted at a time when streaming processed rows; bounds the cells held in memory
+CHUNK_ROWS = 1024
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# Serializes entry builds, so concurrent ingests of one file build it once
+_build_lock = threading.Lock()
+
+def _column_kind(values: List[str]) -> str:
+    """
+    Type of a column: 'int' or 'float' if every non-empty value is in canonical
+    form (str() of the parsed number gives back the same text), else 'text'.
+    
+    Canonical form is required so the cached column reproduces the CSV text
+    exactly and converts to the same values the upload's column plan produces.
+    """
+    kind = 'int'
+    for value in values:
+        if not value:
+            continue
+        if kind == 'int':
+            try:
+                number = int(value)
+                if str(number) == value and _INT64_MIN <= number <= _INT64_MAX:
+                    continue
+            except ValueError:
+                pass
+            kind = 'float'
+        try:
+            number = float(value)
+        except ValueError:
+            return 'text'
+        if repr(number) != value or number != number or number in (float('inf'), float('-inf')):
+            return 'text'
+    return kind
+
+def _text_cell_numbers(values: List[str]) -> Tuple[List[int], List[int], List[float]]:
+    """
+    Classify the cells of a text column as empty, int, float or other text.
+    
+    Cells whose first character can start a number convert the same under
+    every column converter of the upload (convert_value_to_proper_type), so
+    their numbers are stored; other cells are left to the plan's converter.
+    
+    Returns:
+        Tuple of (types, ints, floats) lists, one entry per cell
+    """
+    from upload_fighter_data_batch import _NUMERIC_LEADS, convert_value_to_proper_type
+    
+    types, ints, floats = [], [], []
+    for value in values:
+        kind, integer, number = TEXT_STRING, 0, 0.0
+        if not value:
+            kind = TEXT_EMPTY
+        elif value[0] in _NUMERIC_LEADS:
+            converted = convert_value_to_proper_type(value)
+            if isinstance(converted, int) and _INT64_MIN <= converted <= _INT64_MAX:
+                kind, integer = TEXT_INT, converted
+            elif isinstance(converted, float):
+                kind, number = TEXT_FLOAT, converted
+        types.append(kind)
+        ints.append(integer)
+        floats.append(number)
+    return types, ints, floats
+
+def entry_directory(csv_file_path: str, cache_dir: str = CACHE_DIR) -> str:
+    """Return the cache entry directory for a source file (one per absolute path)."""
+    absolute_path = os.path.abspath(csv_file_path)
+    path_hash = hashlib.blake2b(absolute_path.encode('utf-8'), digest_size=6).hexdigest()
+    return os.path.join(cache_dir, f"{os.path.basename(csv_file_path)}-{path_hash}")
+
+class CachedTable:
+    """A CSV file as memory-mapped typed columns."""
+    
+    def __init__(self, directory: str, meta: Dict[str, Any]):
+        """
+        Open a cache entry.
+        
+        Args:
+            directory: Entry directory
+            meta: Entry metadata (header, column kinds and positions, source fingerprint)
+        """
+        self.directory = directory
+        self.meta = meta
+        self.header = meta['header']
+        self.kinds = meta['kinds']
+        self.positions = meta['positions']
+        self.rows = self._load('rows')
+        self.ints = self._load('ints')
+        self.floats = self._load('floats')
+        self.present = self._load('present')
+        self.text_data = self._load('text_data')
+        self.text_offsets = self._load('text_offsets')
+        self.text_types = self._load('text_types')
+        self.text_ints = self._load('text_ints')
+        self.text_floats = self._load('text_floats')
+        self._index = {}
+        for index, name in enumerate(self.header):
+            self._index.setdefault(name, index)
+    
+    def _load(self, name: str) -> np.ndarray:
+        # A plain view of the memory map: slicing np.memmap objects is several times slower
+        return np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode='r').view(np.ndarray)
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def numeric(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zero-copy access to a numeric column.
+        
+        Args:
+            name: Column name
+        
+        Returns:
+            Tuple of (values, present): int64 or float64 values (0 where the cell
+            is empty) and a boolean mask of non-empty cells
+        
+        Raises:
+            KeyError: If the column does not exist
+            TypeError: If the column is text
+        """
+        index = self._index[name]
+        if self.kinds[index] == 'text':
+            raise TypeError(f"Column {name} holds text")
+        return self._numeric_at(index)
+    
+    def _numeric_at(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """numeric() for a column by position (headers may repeat a name)."""
+        kind = self.kinds[index]
+        matrix = self.ints if kind == 'int' else self.floats
+        offset = 0 if kind == 'int' else self.ints.shape[1]
+        position = self.positions[index]
+        return matrix[:, position], self.present[:, offset + position]
+    
+    def text(self, name: str) -> List[str]:
+        """Return any column as a list of its CSV strings ('' for empty cells)."""
+        return self._column_strings(self._index[name])
+    
+    def _column_strings(self, index: int, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """CSV strings of rows start:stop of a column ('' for empty cells)."""
+        kind = self.kinds[index]
+        position = self.positions[index]
+        if kind == 'text':
+            bounds = self.text_offsets[position, start:(len(self) if stop is None else stop) + 1].tolist()
+            if not bounds:
+                return []
+            data = self.text_data[bounds[0]:bounds[-1]].tobytes()
+            base = bounds[0]
+            text = data.decode('utf-8')
+            if len(text) == len(data):
+                # ASCII: byte offsets are character offsets, so slice the decoded column
+                return [text[low - base:high - base] for low, high in zip(bounds, bounds[1:])]
+            return [data[low - base:high - base].decode('utf-8') for low, high in zip(bounds, bounds[1:])]
+        values, present = self._numeric_at(index)
+        strings = [str(value) if kind == 'int' else repr(value) for value in values[start:stop].tolist()]
+        return [string if flag else '' for string, flag in zip(strings, present[start:stop].tolist())]
+    
+    def first_row_after(self, offset: int) -> int:
+        """Position of the first row that starts at or after a byte offset (a journal watermark)."""
+        if offset <= self.meta['header_offset']:
+            return 0
+        return int(np.searchsorted(self.rows[:, 1], offset, side='right'))
+    
+    def plan(self, categorize: bool = True, formats: Sequence[Any] = (), start: int = 0,
+             sample_size: Optional[int] = None):
+        """
+        Compile the ColumnPlan plan_csv would compile for the rows from position start.
+        
+        Only text columns are sampled. Numeric columns hold canonical number
+        text, which no display format matches and every converter turns into
+        the stored number, so iter_processed uses them as stored.
+        
+        Args:
+            categorize: Nest known stat fields into category maps
+            formats: Display formats to normalize into typed values
+            start: Position of the first row (the plan samples the rows that follow it)
+            sample_size: Number of rows used for type inference (defaults to PLAN_SAMPLE_SIZE)
+        
+        Returns:
+            ColumnPlan for the file's header
+        """
+        from upload_fighter_data_batch import PLAN_SAMPLE_SIZE, ColumnPlan
+        
+        stop = min(len(self), start + (PLAN_SAMPLE_SIZE if sample_size is None else sample_size))
+        samples = [self._column_strings(index, start, stop) if kind == 'text' else []
+                   for index, kind in enumerate(self.kinds)]
+        return ColumnPlan(self.header, categorize=categorize, formats=formats, sample_columns=samples)
+    
+    def _converted_chunk(self, plan, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray, Dict[int, str]]:
+        """
+        Convert rows start:stop column by column, as plan.transform would convert their cells.
+        
+        Numeric columns are used as stored: their cells are canonical int or
+        float text, which every column converter turns into the stored number.
+        In a text column without a detected display format, the converters
+        also keep number cells as stored numbers and other text as it is (null
+        sentinels aside), so only formatted columns call the plan's converter.
+        
+        Returns:
+            Tuple of (cells, present, errors): an object matrix of converted
+            values, a mask of the cells the row keeps, and the first conversion
+            error of each failed row by position in the chunk
+        """
+        from value_formats import NULL_VALUES
+        
+        row_count = stop - start
+        report = plan.report
+        formatted = report.formats if report is not None else {}
+        cells = np.empty((row_count, len(self.header)), dtype=object)
+        present = np.zeros((row_count, len(self.header)), dtype=bool)
+        errors = {}
+        for index, (key, converter, _) in enumerate(plan.columns):
+            if converter is None:
+                continue
+            if self.kinds[index] != 'text':
+                values, flags = self._numeric_at(index)
+                cells[:, index] = values[start:stop].tolist()
+                present[:, index] = flags[start:stop]
+                continue
+            
+            position = self.positions[index]
+            types = self.text_types[start:stop, position]
+            kept = types != TEXT_EMPTY
+            column = np.empty(row_count, dtype=object)
+            if key in formatted:
+                values = self._column_strings(index, start, stop)
+                for row in np.flatnonzero(kept).tolist():
+                    try:
+                        value = converter(values[row])
+                    except Exception as e:
+                        errors.setdefault(row, str(e))
+                        value = None
+                    column[row] = value
+                    if value is None:
+                        kept[row] = False
+            else:
+                numbers = types == TEXT_INT
+                column[numbers] = self.text_ints[start:stop, position][numbers].astype(object)
+                numbers = types == TEXT_FLOAT
+                column[numbers] = self.text_floats[start:stop, position][numbers].astype(object)
+                strings = np.flatnonzero(types == TEXT_STRING)
+                if len(strings):
+                    values = self._column_strings(index, start, stop)
+                    texts = [values[row] for row in strings.tolist()]
+                    column[strings] = np.array(texts, dtype=object)
+                    if report is not None:
+                        # Null sentinels of normalized files are dropped and counted, as the converter does
+                        nulls = [row for row, text in zip(strings.tolist(), texts) if text in NULL_VALUES]
+                        if nulls:
+                            kept[nulls] = False
+                            column[nulls] = None
+                            report.nulls[key] += len(nulls)
+            cells[:, index] = column
+            present[:, index] = kept
+        return cells, present, errors
+    
+    def iter_processed(self, plan, start: int = 0, chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[int, Any, int]]:
+        """
+        Yield (row_number, processed_data, offset) equal to plan.transform on each row from position start.
+        
+        Rows are converted a chunk at a time, column by column, and each row's
+        dictionary is assembled from the cells it keeps, so no per-cell work
+        is done in Python for empty cells, numbers or plain text.
+        
+        Args:
+            plan: ColumnPlan compiled for the file (see plan())
+            start: Position of the first row
+            chunk_rows: Rows converted at a time (bounds the cells held in memory)
+        
+        Yields:
+            One tuple per row; processed_data is a TransformError for rows that failed
+        """
+        groups = [(None, [index for index, (_, converter, category) in enumerate(plan.columns)
+                          if converter is not None and category is None])]
+        for category_name in plan.category_order:
+            groups.append((category_name, [index for index, (_, converter, category) in enumerate(plan.columns)
+                                           if converter is not None and category == category_name]))
+        group_keys = [(category_name, columns, [plan.columns[index][0] for index in columns])
+                      for category_name, columns in groups]
+        
+        for chunk_start in range(start, len(self), chunk_rows):
+            chunk_stop = min(len(self), chunk_start + chunk_rows)
+            cells, present, errors = self._converted_chunk(plan, chunk_start, chunk_stop)
+            group_rows = [(category_name, keys, cells[:, columns].tolist(), present[:, columns].tolist())
+                          for category_name, columns, keys in group_keys]
+            plain_keys, plain_values, plain_flags = group_rows[0][1:]
+            categories = group_rows[1:]
+            for row, (row_number, offset, _) in enumerate(self.rows[chunk_start:chunk_stop].tolist()):
+                if row in errors:
+                    yield row_number, TransformError(errors[row]), offset
+                    continue
+                processed_row = dict(compress(zip(plain_keys, plain_values[row]), plain_flags[row]))
+                for category_name, keys, values, flags in categories:
+                    if any(flags[row]):
+                        processed_row[category_name] = dict(compress(zip(keys, values[row]), flags[row]))
+                yield row_number, processed_row, offset
+    
+    def processed_rows(self, categorize: bool = True) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (row_number, processed_data) equal to ColumnPlan.transform on each row.
+        
+        Args:
+            categorize: Nest known stat fields into category maps
+        
+        Yields:
+            One tuple per data row
+        
+        Raises:
+            TransformError: If a row fails to transform
+        """
+        for row_number, processed_data, _ in self.iter_processed(self.plan(categorize)):
+            if isinstance(processed_data, TransformError):
+                raise processed_data
+            yield row_number, processed_data
+    
+    def numbers(self, name: str, plan=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        A column as float64 values and a mask of the rows holding a number.
+        
+        Numeric columns are read straight from the memory-mapped matrices, and
+        so are the number cells of text columns, which were converted when the
+        entry was built. Only a text column with a display format detected by
+        the plan runs the plan's converter, and only numbers (not bools) count.
+        
+        Args:
+            name: Column name
+            plan: ColumnPlan whose converters the documents were built with
+        
+        Returns:
+            Tuple of (values, present) with 0 where present is False
+        """
+        return self.numbers_at(self._index[name], plan)
+    
+    def numbers_at(self, index: int, plan=None) -> Tuple[np.ndarray, np.ndarray]:
+        """numbers() for a column by position (headers may repeat a name)."""
+        if plan is not None and plan.columns[index][1] is None:
+            return np.zeros(len(self), dtype=np.float64), np.zeros(len(self), dtype=bool)
+        if self.kinds[index] != 'text':
+            values, present = self._numeric_at(index)
+            return values.astype(np.float64, copy=False), present
+        
+        key, converter, _ = plan.columns[index] if plan is not None else (None, None, None)
+        if plan is not None and plan.report is not None and key in plan.report.formats:
+            values = np.zeros(len(self), dtype=np.float64)
+            present = np.zeros(len(self), dtype=bool)
+            for row, value in enumerate(self._column_strings(index)):
+                if value:
+                    number = converter(value)
+                    if isinstance(number, (int, float)) and not isinstance(number, bool):
+                        values[row] = number
+                        present[row] = True
+            return values, present
+        
+        position = self.positions[index]
+        types = self.text_types[:, position]
+        values = np.where(types == TEXT_INT, self.text_ints[:, position].astype(np.float64), self.text_floats[:, position])
+        present = (types == TEXT_INT) | (types == TEXT_FLOAT)
+        return np.where(present, values, 0.0), present
+    
+    def field_numbers(self, plan, key: str, category: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        A field of the processed rows as float64 values and a mask of the rows holding a number.
+        
+        Args:
+            plan: ColumnPlan the rows are processed with
+            key: Field name
+            category: Category map holding the field (None for a top-level field)
+        
+        Returns:
+            Tuple of (values, present) with 0 where present is False; when the
+            header repeats the column, later cells win, as in the row's dictionary
+        """
+        values = np.zeros(len(self), dtype=np.float64)
+        present = np.zeros(len(self), dtype=bool)
+        for index, (column_key, converter, column_category) in enumerate(plan.columns):
+            if column_key == key and column_category == category and converter is not None:
+                column_values, column_present = self.numbers_at(index, plan)
+                values[column_present] = column_values[column_present]
+                present |= column_present
+        return values, present
+    
+    def records(self) -> Iterator[Tuple[int, List[str], int]]:
+        """
+        Yield the same (row_number, values, offset) records as iter_csv_records.
+        
+        Values beyond the header width are not cached, so rows longer than the
+        header come back truncated to it (the column plan ignores them anyway).
+        """
+        yield 0, list(self.header), self.meta['header_offset']
+        columns = [self._column_strings(index) for index in range(len(self.header))]
+        for position, (row_number, offset, length) in enumerate(self.rows.tolist()):
+            yield row_number, [column[position] for column in columns[:length]], offset
+
+class CachedTransform:
+    """
+    Parse-cache replacement for plan_csv's plan and record stream.
+    
+    Like ParallelTransform, records() yields (row_number, processed_data,
+    offset) and transform() passes the processed data through (raising
+    TransformError for failed rows), so the object stands in for the
+    ColumnPlan in iter_upload_records. The rows come from the file's cache
+    entry instead of its text; report holds the plan's normalization counts.
+    """
+    
+    def __init__(self, table: CachedTable, categorize: bool = True, formats: Sequence[Any] = (),
+                 start_offset: int = 0, sample_size: Optional[int] = None):
+        """
+        Compile the plan for the rows after start_offset.
+        
+        Args:
+            table: Cached columns of the CSV file
+            categorize: Nest known stat fields into category maps
+            formats: Display formats to normalize into typed values
+            start_offset: Byte offset of the first record to read (0 to read from the start)
+            sample_size: Number of rows used for type inference (defaults to PLAN_SAMPLE_SIZE)
+        """
+        self.table = table
+        self.start = table.first_row_after(start_offset)
+        self.plan = table.plan(categorize, formats, self.start, sample_size)
+        self.report = self.plan.report
+    
+    def transform(self, processed_data):
+        """Return a row processed from the cache, raising its error for failed rows."""
+        if isinstance(processed_data, TransformError):
+            raise processed_data
+        return processed_data
+    
+    def records(self) -> Iterator[Tuple[int, Any, int]]:
+        """
+        Yield (row_number, processed_data, offset) for every row after start_offset.
+        
+        processed_data is a TransformError for rows that failed.
+        """
+        return self.table.iter_processed(self.plan, self.start)
+
+def build_entry(csv_file_path: str, directory: str, fingerprint: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse a CSV file into a new cache entry.
+    
+    The entry is written to a temporary directory and renamed into place, so
+    readers never see a half-written entry.
+    
+    Args:
+        csv_file_path: Source CSV file
+        directory: Entry directory to create (replaced if it exists)
+        fingerprint: Fingerprint of the source taken before parsing
+    
+    Returns:
+        The entry's metadata
+    """
+    from upload_fighter_data_batch import iter_csv_records
+    
+    records = iter_csv_records(csv_file_path)
+    _, header, header_offset = next(records, (0, [], 0))
+    width = len(header)
+    columns = [[] for _ in header]
+    rows = []
+    for row_number, values, offset in records:
+        rows.append((row_number, offset, min(len(values), width)))
+        for index in range(width):
+            columns[index].append(values[index] if index < len(values) else '')
+    
+    kinds = [_column_kind(values) for values in columns]
+    positions = []
+    counters = {'int': 0, 'float': 0, 'text': 0}
+    for kind in kinds:
+        positions.append(counters[kind])
+        counters[kind] += 1
+    
+    row_count = len(rows)
+    ints = np.zeros((row_count, counters['int']), dtype=np.int64)
+    floats = np.zeros((row_count, counters['float']), dtype=np.float64)
+    present = np.zeros((row_count, counters['int'] + counters['float']), dtype=bool)
+    text_offsets = np.zeros((counters['text'], row_count + 1), dtype=np.int64)
+    text_types = np.zeros((row_count, counters['text']), dtype=np.uint8)
+    text_ints = np.zeros((row_count, counters['text']), dtype=np.int64)
+    text_floats = np.zeros((row_count, counters['text']), dtype=np.float64)
+    text_chunks = []
+    text_size = 0
+    for values, kind, position in zip(columns, kinds, positions):
+        if kind == 'text':
+            encoded = [value.encode('utf-8') for value in values]
+            text_offsets[position, 0] = text_size
+            text_offsets[position, 1:] = text_size + np.cumsum([len(value) for value in encoded], dtype=np.int64)
+            text_size = int(text_offsets[position, -1])
+            text_chunks.extend(encoded)
+            text_types[:, position], text_ints[:, position], text_floats[:, position] = _text_cell_numbers(values)
+            continue
+        mask = [bool(value) for value in values]
+        if kind == 'int':
+            ints[:, position] = [int(value) if value else 0 for value in values]
+            present[:, position] = mask
+        else:
+            floats[:, position] = [float(value) if value else 0.0 for value in values]
+            present[:, counters['int'] + position] = mask
+    
+    temp_directory = f"{directory}.tmp-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+    arrays = {
+        'rows': np.array(rows, dtype=np.int64).reshape(row_count, 3),
+        'ints': ints,
+        'floats': floats,
+        'present': present,
+        'text_data': np.frombuffer(b''.join(text_chunks), dtype=np.uint8),
+        'text_offsets': text_offsets,
+        'text_types': text_types,
+        'text_ints': text_ints,
+        'text_floats': text_floats,
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(temp_directory, f"{name}.npy"), array)
+    
+    meta = {
+        'version': CACHE_VERSION,
+        'source': fingerprint,
+        'header': header,
+        'header_offset': header_offset,
+        'kinds': kinds,
+        'positions': positions,
+        'rows': row_count,
+    }
+    with open(os.path.join(temp_directory, META_FILE), 'w', encoding='utf-8') as meta_file:
+        json.dump(meta, meta_file)
+    
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temp_directory, directory)
+    return meta
+
+def _read_meta(directory: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as meta_file:
+            return json.load(meta_file)
+    except (OSError, ValueError):
+        return None
+
+def _cached_meta(csv_file_path: str, directory: str) -> Optional[Dict[str, Any]]:
+    """Return the entry's metadata if it still describes the source file, else None."""
+    meta = _read_meta(directory)
+    if meta is None or meta.get('version') != CACHE_VERSION:
+        return None
+    
+    source = meta['source']
+    stat = os.stat(csv_file_path)
+    if source['size'] == stat.st_size and source['mtime_ns'] == stat.st_mtime_ns:
+        os.utime(os.path.join(directory, META_FILE))
+        return meta
+    
+    fingerprint = file_fingerprint(csv_file_path)
+    if not same_contents(source, fingerprint):
+        return None
+    # Touched but unchanged: keep the entry and record the new mtime
+    meta['source'] = fingerprint
+    with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as meta_file:
+        json.dump(meta, meta_file)
+    return meta
+
+def load_table(csv_file_path: str, cache_dir: str = CACHE_DIR, max_cache_bytes: int = MAX_CACHE_BYTES,
+               log: Optional[Callable[[str], None]] = None) -> CachedTable:
+    """
+    Open the cached columns of a CSV file, building or rebuilding the entry if needed.
+    
+    An entry is reused when the source's size and mtime match; if only the
+    mtime changed, the content hash decides. Building an entry prunes the
+    cache back under max_cache_bytes.
+    
+    Args:
+        csv_file_path: Source CSV file
+        cache_dir: Cache directory
+        max_cache_bytes: Total size the cache is pruned to after a build
+        log: Optional function used to report cache builds
+    
+    Returns:
+        CachedTable for the file's current contents
+    """
+    directory = entry_directory(csv_file_path, cache_dir)
+    meta = _cached_meta(csv_file_path, directory)
+    if meta is not None:
+        return CachedTable(directory, meta)
+    
+    with _build_lock:
+        meta = _cached_meta(csv_file_path, directory)
+        if meta is None:
+            started = time.perf_counter()
+            meta = build_entry(csv_file_path, directory, file_fingerprint(csv_file_path))
+            if log is not None:
+                log(f"🗃️  Cached {csv_file_path} as {len(meta['kinds'])} typed columns in {time.perf_counter() - started:.2f}s")
+            prune_cache(cache_dir, max_cache_bytes, keep=directory)
+    return CachedTable(directory, meta)
+
+def _entry_size(directory: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+def prune_cache(cache_dir: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES, keep: Optional[str] = None) -> List[str]:
+    """
+    Evict stale entries, then the least recently used ones until the cache fits.
+    
+    Entries are stale when their layout version is old or their source file is gone.
+    
+    Args:
+        cache_dir: Cache directory
+        max_bytes: Maximum total size to keep
+        keep: Entry directory that is never evicted (the one just built)
+    
+    Returns:
+        List of evicted entry directories
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+    
+    evicted = []
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if not entry.is_dir() or '.tmp-' in entry.name:
+            continue
+        meta = _read_meta(entry.path)
+        if meta is None or meta.get('version') != CACHE_VERSION or not os.path.exists(meta['source']['path']):
+            shutil.rmtree(entry.path, ignore_errors=True)
+            evicted.append(entry.path)
+            continue
+        last_used = os.stat(os.path.join(entry.path, META_FILE)).st_mtime
+        entries.append((last_used, entry.path, _entry_size(entry.path)))
+    
+    total = sum(size for _, _, size in entries)
+    for _, path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if keep is not None and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        evicted.append(path)
+        total -= size
+    return evicted
+
+def main():
+    """Build, inspect, verify or prune the parse cache."""
+    from upload_fighter_data_batch import iter_csv_records, plan_csv
+    
+    parser = argparse.ArgumentParser(description='Manage the columnar parse cache of the oldData CSV files')
+    parser.add_argument('command', choices=['build', 'info', 'verify', 'prune'],
+                        help='verify compares the cached records and processed rows with a parse of the CSV text')
+    parser.add_argument('csv_files', nargs='*', help='CSV files (build/verify; default: every CSV in --data-dir)')
+    parser.add_argument('--data-dir', default='oldData', help='Directory searched when no CSV files are given')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Cache directory')
+    parser.add_argument('--max-mb', type=float, default=MAX_CACHE_BYTES / 1024 / 1024, help='Cache size limit for prune')
+    args = parser.parse_args()
+    
+    if args.command == 'prune':
+        evicted = prune_cache(args.cache_dir, int(args.max_mb * 1024 * 1024))
+        print(f"🧹 Evicted {len(evicted)} cache entries")
+        return
+    
+    if args.command == 'info':
+        entries = sorted(os.scandir(args.cache_dir), key=lambda entry: entry.name) if os.path.isdir(args.cache_dir) else []
+        for entry in entries:
+            meta = _read_meta(entry.path) if entry.is_dir() else None
+            if meta is None:
+                continue
+            kinds = {kind: meta['kinds'].count(kind) for kind in ('int', 'float', 'text')}
+            print(f"🗃️  {entry.name}: {meta['rows']} rows, {kinds['int']} int / {kinds['float']} float / "
+                  f"{kinds['text']} text columns, {_entry_size(entry.path) / 1024:.0f} KiB")
+        if not entries:
+            print(f"🗃️  {args.cache_dir} is empty")
+        return
+    
+    csv_files = args.csv_files or sorted(os.path.join(args.data_dir, name) for name in os.listdir(args.data_dir)
+                                         if name.endswith('.csv'))
+    failures = 0
+    for csv_file_path in csv_files:
+        started = time.perf_counter()
+        table = load_table(csv_file_path, args.cache_dir)
+        load_seconds = time.perf_counter() - started
+        if args.command == 'build':
+            print(f"🗃️  {csv_file_path}: {len(table)} rows ({load_seconds:.3f}s)")
+            continue
+        
+        expected_records = list(iter_csv_records(csv_file_path))
+        width = len(expected_records[0][1]) if expected_records else 0
+        expected_records = [(row_number, values[:width], offset) for row_number, values, offset in expected_records]
+        
+        started = time.perf_counter()
+        plan, records = plan_csv(csv_file_path)
+        expected_rows = [(row_number, plan.transform(values)) for row_number, values, _ in records]
+        parse_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        actual_rows = list(load_table(csv_file_path, args.cache_dir).processed_rows())
+        cached_seconds = time.perf_counter() - started
+        
+        if list(table.records()) != expected_records:
+            failures += 1
+            print(f"❌ {csv_file_path}: cached records differ from the CSV text")
+        elif actual_rows != expected_rows:
+            failures += 1
+            print(f"❌ {csv_file_path}: cached rows differ from the column plan's output")
+        else:
+            print(f"✅ {csv_file_path}: {len(table)} rows match (parse + convert {parse_seconds:.3f}s, "
+                  f"cache {cached_seconds:.3f}s)")
+    
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Offline export of processed documents to compressed static bundles.
+The exporter plugs into the upload pipeline like the aggregators: it sees
+every document the run builds (after the name joins and enrichers, before
+delta filtering) and, once the run has finished, writes each collection as
+sorted, sharded NDJSON and/or JSON files, gzip or brotli compressed, with a
+manifest.json describing every shard. The bundles can be served from a CDN
+or loaded by the site directly for read-heavy collections that rarely change.
+"""
+
+import argparse
+import datetime
+import gzip
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # Optional: only needed for --compression brotli
+    brotli = None
+
+# Bundle layouts: one document per line, or one {document_id: data} object per shard
+EXPORT_FORMATS = ('ndjson', 'json')
+
+# Compression -> file suffix
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'brotli': '.br', 'none': ''}
+
+# Target uncompressed size of one shard
+SHARD_BYTES = 1024 * 1024
+
+MANIFEST_FILE = 'manifest.json'
+
+# Serializes manifest updates from collections exported concurrently
+_manifest_lock = threading.Lock()
+
+def _json_ready(value: Any) -> Any:
+    """Convert a Firestore field value into plain JSON (datetimes as ISO 8601, NaN/inf as null)."""
+    if isinstance(value, dict):
+        return {key: _json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_ready(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def encode_fields(data: Dict[str, Any]) -> str:
+    """Encode a document's fields as compact JSON, keeping the field order."""
+    return json.dumps(_json_ready(data), ensure_ascii=False, separators=(',', ':'))
+
+def collection_group(collection_name: str, document_id: str) -> str:
+    """
+    Bundle a document belongs to: its collection, or collection/subcollection for nested IDs.
+    
+    Subcollection documents of every parent share one bundle (like a collection
+    group query); their full '/'-separated ID is kept in _id.
+    """
+    segments = document_id.split('/')
+    return '/'.join([collection_name] + segments[1:-1:2])
+
+def compress(data: bytes, compression: str) -> bytes:
+    """
+    Compress a shard deterministically, so unchanged shards keep their content hash.
+    
+    Raises:
+        ValueError: If the compression is unknown or brotli is not installed
+    """
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if compression == 'brotli':
+        if brotli is None:
+            raise ValueError("brotli compression requires the 'brotli' package (pip install brotli)")
+        return brotli.compress(data)
+    if compression == 'none':
+        return data
+    raise ValueError(f"Unknown compression '{compression}'. Known: {', '.join(COMPRESSION_SUFFIXES)}")
+
+def decompress(data: bytes, compression: str) -> bytes:
+    """Undo compress()."""
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'brotli':
+        if brotli is None:
+            raise ValueError("brotli compression requires the 'brotli' package (pip install brotli)")
+        return brotli.decompress(data)
+    return data
+
+def _shard_bodies(documents: List[Tuple[str, str]], export_format: str) -> bytes:
+    """Serialize (document_id, fields_json) pairs as one NDJSON or JSON shard."""
+    if export_format == 'ndjson':
+        lines = []
+        for document_id, fields in documents:
+            rest = fields[1:] if fields == '{}' else ',' + fields[1:]
+            lines.append('{"_id":' + json.dumps(document_id, ensure_ascii=False) + rest)
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+    body = ','.join(json.dumps(document_id, ensure_ascii=False) + ':' + fields for document_id, fields in documents)
+    return ('{' + body + '}').encode('utf-8')
+
+def split_shards(documents: List[Tuple[str, str]], shard_bytes: int = SHARD_BYTES) -> List[List[Tuple[str, str]]]:
+    """Split sorted documents into shards of about shard_bytes of encoded fields each."""
+    shards = []
+    current = []
+    size = 0
+    for document_id, fields in documents:
+        document_size = len(document_id) + len(fields)
+        if current and size + document_size > shard_bytes:
+            shards.append(current)
+            current = []
+            size = 0
+        current.append((document_id, fields))
+        size += document_size
+    if current:
+        shards.append(current)
+    return shards
+
+def _write_file(path: str, data: bytes):
+    """Write a file atomically."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as output_file:
+        output_file.write(data)
+    os.replace(temp_path, path)
+
+def load_export_manifest(output_dir: str) -> Dict[str, Any]:
+    """Load an export directory's manifest ({'version': 1, 'collections': {}} if there is none)."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {'version': 1, 'collections': {}}
+    with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+def write_collection_bundle(output_dir: str, group: str, documents: Dict[str, str],
+                            formats: Sequence[str] = ('ndjson',), compression: str = 'gzip',
+                            shard_bytes: int = SHARD_BYTES) -> Dict[str, Any]:
+    """
+    Write one collection's shards and record them in the export manifest.
+    
+    Shard files are named after their content hash, so a CDN can cache them
+    indefinitely; files of the collection's previous export that are no longer
+    referenced are removed once the new manifest is in place.
+    
+    Args:
+        output_dir: Export directory
+        group: Collection (or collection/subcollection) name
+        documents: Dictionary mapping document ID to encoded fields
+        formats: Layouts to write, from EXPORT_FORMATS
+        compression: 'gzip', 'brotli' or 'none'
+        shard_bytes: Target uncompressed size of one shard
+    
+    Returns:
+        The collection's manifest entry
+    
+    Raises:
+        ValueError: If a format or the compression is unknown
+    """
+    unknown = [export_format for export_format in formats if export_format not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(unknown)}. Known: {', '.join(EXPORT_FORMATS)}")
+    
+    directory = os.path.join(output_dir, *group.split('/'))
+    os.makedirs(directory, exist_ok=True)
+    suffix = COMPRESSION_SUFFIXES.get(compression, '')
+    
+    shards = []
+    written = set()
+    for number, shard in enumerate(split_shards(sorted(documents.items()), shard_bytes)):
+        files = {}
+        for export_format in formats:
+            body = _shard_bodies(shard, export_format)
+            content = compress(body, compression)
+            digest = hashlib.sha256(content).hexdigest()
+            file_name = f"part-{number:05d}-{digest[:12]}.{export_format}{suffix}"
+            file_path = os.path.join(directory, file_name)
+            if not os.path.exists(file_path):
+                _write_file(file_path, content)
+            relative_path = f"{group}/{file_name}"
+            written.add(relative_path)
+            files[export_format] = {'path': relative_path, 'bytes': len(body),
+                                    'compressedBytes': len(content), 'sha256': digest}
+        shards.append({'documents': len(shard), 'firstId': shard[0][0], 'lastId': shard[-1][0], 'files': files})
+    
+    entry = {
+        'collection': group,
+        'documents': len(documents),
+        'compression': compression,
+        'formats': list(formats),
+        'exportedAt': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'shards': shards,
+    }
+    
+    with _manifest_lock:
+        manifest = load_export_manifest(output_dir)
+        previous = manifest['collections'].get(group)
+        manifest['collections'][group] = entry
+        manifest['collections'] = dict(sorted(manifest['collections'].items()))
+        _write_file(os.path.join(output_dir, MANIFEST_FILE),
+                    json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
+    
+    for shard in (previous or {}).get('shards', []):
+        for file_entry in shard['files'].values():
+            if file_entry['path'] not in written:
+                try:
+                    os.remove(os.path.join(output_dir, *file_entry['path'].split('/')))
+                except FileNotFoundError:
+                    pass
+    return entry
+
+def iter_bundle_documents(output_dir: str, group: str, export_format: Optional[str] = None,
+                          verify: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Read a collection back from its bundle.
+    
+    Args:
+        output_dir: Export directory
+        group: Collection name as listed in the manifest
+        export_format: Layout to read (the first one exported if None)
+        verify: Check each shard's sha256 against the manifest
+    
+    Yields:
+        Tuple of (document_id, data) in document ID order
+    
+    Raises:
+        KeyError: If the collection is not in the manifest
+        ValueError: If verify is set and a shard does not match its hash
+    """
+    entry = load_export_manifest(output_dir)['collections'][group]
+    export_format = export_format or entry['formats'][0]
+    for shard in entry['shards']:
+        file_entry = shard['files'][export_format]
+        with open(os.path.join(output_dir, *file_entry['path'].split('/')), 'rb') as shard_file:
+            content = shard_file.read()
+        if verify and hashlib.sha256(content).hexdigest() != file_entry['sha256']:
+            raise ValueError(f"{file_entry['path']} does not match its manifest hash")
+        body = decompress(content, entry['compression']).decode('utf-8')
+        if export_format == 'json':
+            yield from json.loads(body).items()
+            continue
+        for line in body.splitlines():
+            data = json.loads(line)
+            yield data.pop('_id'), data
+
+class ExportSettings(NamedTuple):
+    """Where and how a run exports its documents."""
+    output_dir: str
+    formats: Tuple[str, ...] = ('ndjson',)
+    compression: str = 'gzip'
+    shard_bytes: int = SHARD_BYTES
+    
+    def exporter(self, collection_name: str, log: Callable[[str], None] = print) -> 'BundleExporter':
+        """Return an exporter for one collection's upload."""
+        return BundleExporter(collection_name, self, log)
+
+class BundleExporter:
+    """
+    Aggregator that writes every document of an upload to static bundles.
+    
+    It publishes no Firestore documents; its bundles are written when the
+    upload publishes its derived documents, i.e. after a complete run (resumed
+    runs skip it, since they do not see every row). The bundle holds the
+    processed data whether or not its Firestore write succeeded.
+    """
+    
+    def __init__(self, collection_name: str, settings: ExportSettings, log: Callable[[str], None] = print):
+        """
+        Create an exporter.
+        
+        Args:
+            collection_name: Collection the upload writes to
+            settings: Export directory, formats and compression
+            log: Function used to print progress messages
+        
+        Raises:
+            ValueError: If brotli compression is requested but not installed
+        """
+        if settings.compression == 'brotli' and brotli is None:
+            raise ValueError("brotli compression requires the 'brotli' package (pip install brotli)")
+        self.collection_name = collection_name
+        self.settings = settings
+        self.log = log
+        self.groups: Dict[str, Dict[str, str]] = {}
+    
+    def add(self, document_id: str, data: Dict[str, Any]):
+        """Encode a document into its collection's bundle."""
+        group = collection_group(self.collection_name, document_id)
+        self.groups.setdefault(group, {})[document_id] = encode_fields(data)
+    
+    def documents(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Bundles are files, not Firestore documents."""
+        return []
+    
+    def published(self, failed_documents) -> List[Dict[str, Any]]:
+        """Write the bundles once the run is complete."""
+        return self.write()
+    
+    def write(self) -> List[Dict[str, Any]]:
+        """
+        Write every collection seen so far.
+        
+        Returns:
+            The collections' manifest entries
+        """
+        settings = self.settings
+        entries = []
+        for group, documents in sorted(self.groups.items()):
+            entry = write_collection_bundle(settings.output_dir, group, documents, settings.formats,
+                                            settings.compression, settings.shard_bytes)
+            compressed = sum(file_entry['compressedBytes'] for shard in entry['shards']
+                             for file_entry in shard['files'].values())
+            self.log(f"📦 Exported {entry['documents']} {group} documents to {len(entry['shards'])} shards "
+                     f"in {settings.output_dir} ({compressed / 1024:.0f} KiB {settings.compression})")
+            entries.append(entry)
+        return entries
+
+def main():
+    """Inspect or verify an export directory."""
+    parser = argparse.ArgumentParser(description='Inspect static export bundles written by ingest_all.py --export-dir')
+    parser.add_argument('command', choices=['info', 'verify', 'cat'],
+                        help='verify re-reads every shard and checks its hash and document count')
+    parser.add_argument('output_dir', help='Export directory')
+    parser.add_argument('collection', nargs='?', help='Collection to print (cat) or check (verify)')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help='Layout to read (default: the first exported)')
+    args = parser.parse_args()
+    
+    manifest = load_export_manifest(args.output_dir)
+    collections = manifest['collections']
+    if args.collection is not None and args.collection not in collections:
+        print(f"❌ {args.collection} is not in {args.output_dir}/{MANIFEST_FILE}")
+        sys.exit(1)
+    
+    if args.command == 'cat':
+        if args.collection is None:
+            parser.error('cat needs a collection')
+        for document_id, data in iter_bundle_documents(args.output_dir, args.collection, args.format):
+            print(json.dumps({'_id': document_id, **data}, ensure_ascii=False))
+        return
+    
+    failures = 0
+    for group, entry in collections.items():
+        if args.collection is not None and group != args.collection:
+            continue
+        compressed = sum(file_entry['compressedBytes'] for shard in entry['shards'] for file_entry in shard['files'].values())
+        raw = sum(file_entry['bytes'] for shard in entry['shards'] for file_entry in shard['files'].values())
+        if args.command == 'info':
+            print(f"📦 {group}: {entry['documents']} documents, {len(entry['shards'])} shards, "
+                  f"{raw / 1024:.0f} KiB -> {compressed / 1024:.0f} KiB {entry['compression']} "
+                  f"({', '.join(entry['formats'])}, exported {entry['exportedAt']})")
+            continue
+        for export_format in entry['formats']:
+            try:
+                count = sum(1 for _ in iter_bundle_documents(args.output_dir, group, export_format, verify=True))
+            except (OSError, ValueError) as e:
+                failures += 1
+                print(f"❌ {group} ({export_format}): {e}")
+                continue
+            if count != entry['documents']:
+                failures += 1
+                print(f"❌ {group} ({export_format}): {count} documents, manifest lists {entry['documents']}")
+            else:
+                print(f"✅ {group} ({export_format}): {count} documents")
+    
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
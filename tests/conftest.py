@@ -0,0 +1,21 @@
+"""Shared pytest setup: the pipeline modules live at the repository root."""
+
+import os
+import sys
+
+import pytest
+
+# Repository root, holding the pipeline modules and oldData/
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Source CSV files the integration tests ingest
+DATA_DIR = os.path.join(REPO_ROOT, 'oldData')
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    """Run in an empty directory, so manifests, journals and aggregate state start fresh."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
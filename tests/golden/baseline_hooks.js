@@ -0,0 +1,126 @@
+// Run the website's rating hooks (useOverallRating, useDifficultyScore,
+// useFightDifficultyScores) outside React so their results can be compared
+// with fighter_ratings.py.
+//
+// Usage: node baseline_hooks.js <hooks dir> < cases.json > results.json
+//
+// The hooks are plain computations wrapped in useMemo/useCallback, so React is
+// replaced by a stub that evaluates them immediately (one render), and the
+// TypeScript annotations they use are stripped before evaluation.
+
+const fs = require('fs');
+const path = require('path');
+
+const react = {
+  useMemo: (compute) => compute(),
+  useCallback: (callback) => callback,
+};
+react.default = react;
+
+const silentConsole = { log: () => {}, warn: () => {}, error: () => {} };
+
+// Remove `interface Name { ... }` blocks, matching nested braces
+function stripInterfaces(source) {
+  const pattern = /^(export )?interface \w+[^{]*\{/m;
+  let match;
+  while ((match = pattern.exec(source))) {
+    let depth = 0;
+    let end = match.index + match[0].length - 1;
+    for (; end < source.length; end++) {
+      if (source[end] === '{') depth++;
+      if (source[end] === '}' && --depth === 0) break;
+    }
+    source = source.slice(0, match.index) + source.slice(end + 1);
+  }
+  return source;
+}
+
+function stripTypes(source) {
+  const exported = [];
+  source = stripInterfaces(source)
+    .replace(/^import React from 'react';?$/gm, 'const React = __react;')
+    .replace(/^import \{([^}]*)\} from 'react';?$/gm, 'const {$1} = __react;')
+    .replace(/^import \{([^}]*)\} from '([^']*types[^']*)';?$/gm, '')
+    .replace(/^import \{([^}]*)\} from '([^']*)';?$/gm, "const {$1} = __load('$2');")
+    .replace(/\}: \w+\): \w+(\[\])? =>/g, '}) =>')
+    .replace(/\): [\w |"]+(\[\])? =>/g, ') =>')
+    .replace(/(\w+)\??: (Fighter|Fight|any|number|string|boolean)(\[\])?(?=\s*[,)])/g, '$1')
+    .replace(/const (\w+): \{[^}]*\}\[\] =/g, 'const $1 =')
+    .replace(/ as keyof typeof \w+/g, '')
+    .replace(/new Map<[^>]*>/g, 'new Map')
+    .replace(/^export const (\w+)/gm, (_, name) => {
+      exported.push(name);
+      return `const ${name}`;
+    })
+    .replace(/^export \{([^}]*)\};?/gm, 'Object.assign(exports, {$1});');
+  return source + '\n' + exported.map((name) => `exports.${name} = ${name};`).join('\n') + '\n';
+}
+
+function loadHooks(hooksDir) {
+  const modules = {};
+  const load = (file) => {
+    const resolved = path.resolve(file.endsWith('.ts') ? file : `${file}.ts`);
+    if (!modules[resolved]) {
+      const exports = (modules[resolved] = {});
+      const code = stripTypes(fs.readFileSync(resolved, 'utf8'));
+      const run = new Function('__react', '__load', 'exports', 'console', code);
+      run(react, (request) => load(path.join(path.dirname(resolved), request)), exports, silentConsole);
+    }
+    return modules[resolved];
+  };
+  return {
+    ...load(path.join(hooksDir, 'stats', 'useOverallRating')),
+    ...load(path.join(hooksDir, 'useDifficultyScore')),
+    ...load(path.join(hooksDir, 'useFightDifficultyScores')),
+  };
+}
+
+// cases: {fighters, weightClasses, fights, overall: [[fighter, class]],
+//         combined: [[fighterCode, [fight...], class]],
+//         sides: [[fight, viewerCode, opponent, class, isWinner]]}
+// (fighter, opponent and class are indexes, class may be null)
+function run(hooks, cases) {
+  const { fighters, weightClasses, fights } = cases;
+  const weightClass = (index) => (index === null ? null : weightClasses[index]);
+  const opponents = fighters.filter(
+    (fighter, index) => fighters.findIndex((other) => other.fighterCode === fighter.fighterCode) === index
+  );
+  return {
+    overall: cases.overall.map(([fighter, classIndex]) =>
+      hooks.useOverallRating(fighters[fighter], weightClass(classIndex))
+    ),
+    combined: cases.combined.map(([fighterCode, fightIndexes, classIndex]) =>
+      hooks.useFighterCombinedDifficultyScore({
+        fights: fightIndexes.map((index) => fights[index]),
+        opponents,
+        fighterCode,
+        weightClassData: weightClass(classIndex),
+      })
+    ),
+    sides: cases.sides.map(([fightIndex, viewerCode, opponent, classIndex, isWinner]) => {
+      const fight = fights[fightIndex];
+      const result = hooks.useDifficultyScore({
+        opponent: fighters[opponent],
+        weightClassData: weightClass(classIndex),
+        methodOfFinish: fight.methodOfFinish,
+        actualRounds: fight.actualRounds,
+        isWinner,
+      });
+      const [history] = hooks.useFightDifficultyScores({
+        fights: [fight],
+        opponents: [fighters[opponent]],
+        fighterCode: viewerCode,
+        weightClassData: weightClass(classIndex),
+      });
+      return { ...result, historyScore: history ? history.difficultyScore : null };
+    }),
+  };
+}
+
+if (require.main === module) {
+  const hooks = loadHooks(process.argv[2]);
+  const cases = JSON.parse(fs.readFileSync(0, 'utf8'));
+  process.stdout.write(JSON.stringify(run(hooks, cases)));
+}
+
+module.exports = { stripTypes, loadHooks, run };
@@ -0,0 +1,19 @@
+from conftest import DATA_DIR
+from fake_firestore import FakeFirestore
+from ingest_all import ingest_all, select_specs
+
+def test_vocabulary_is_published_before_the_sparse_documents(state_dir):
+    db = FakeFirestore()
+    results = ingest_all(select_specs(['combinations']), db=db, data_dir=DATA_DIR, quiet=True)
+    
+    assert [result.status for result in results] == ['ok']
+    paths = list(db.documents)
+    combination_paths = [path for path in paths if '/combinations/' in path]
+    assert combination_paths
+    # Writes land in order, so no reader sees a sparse document before its vocabulary
+    assert paths.index('snapshots/comboVocabulary') < paths.index(combination_paths[0])
+    vocabulary = db.collection_documents('snapshots')['comboVocabulary']
+    assert {db.documents[path]['comboVocabulary'] for path in combination_paths} == {vocabulary['contentHash']}
+    # The usage counts follow once every row has been seen
+    assert vocabulary['fighters'] == len(combination_paths)
+    assert len(vocabulary['fighterCounts']) == len(vocabulary['columns'])
@@ -0,0 +1,66 @@
+from conftest import DATA_DIR
+from fighter_history import FighterHistoryAggregator, fighter_history_aggregator
+from incremental_aggregates import default_state_path
+
+def fight(fight_code, fighter_a, fighter_b, method='KO'):
+    return {'fightCode': fight_code, 'eventCode': 'EVENT1', 'fighterA': fighter_a, 'fighterB': fighter_b,
+            'methodOfFinish': method, 'actualRounds': 1}
+
+def aggregator(state_path, fights=(), fight_stats=None):
+    history = FighterHistoryAggregator({'EVENT1': {'eventId': 'e1', 'eventName': 'Event 1', 'date': '2020-01-02'}},
+                                       fight_stats or {}, {}, state_path=str(state_path), log=lambda message: None)
+    for data in fights:
+        history.add(data['fightCode'], data)
+    return history
+
+def results(history, fighter_code):
+    return {entry['fightCode']: entry['result'] for entry in history.history(fighter_code)['fights']}
+
+def test_bouts_are_oriented_from_each_fighter(tmp_path):
+    stats = {'FIGHT1': {'A': {'strikesLanded': 30}, 'B': {'strikesLanded': 12}, 'names': ('Ann', 'Bea'), 'date': None}}
+    history = aggregator(tmp_path / 'state.json', [
+        fight('FIGHT1', 'ann', 'bea'),
+        fight('FIGHT2', 'bea', 'cat', 'Split Draw'),
+        fight('FIGHT3', 'cat', 'ann', 'No Contest'),
+        fight('FIGHT4', 'cat', 'bea', 'SUB'),
+    ], stats)
+    
+    assert results(history, 'ann') == {'FIGHT1': 'win', 'FIGHT3': 'nc'}
+    assert results(history, 'bea') == {'FIGHT1': 'loss', 'FIGHT2': 'draw', 'FIGHT4': 'loss'}
+    assert results(history, 'cat') == {'FIGHT2': 'draw', 'FIGHT3': 'nc', 'FIGHT4': 'win'}
+    assert history.history('bea')['record'] == {'wins': 0, 'losses': 2, 'draws': 1, 'noContests': 0}
+    assert history.history('cat')['record'] == {'wins': 1, 'losses': 0, 'draws': 1, 'noContests': 1}
+    
+    [ann_entry] = [entry for entry in history.history('ann')['fights'] if entry['fightCode'] == 'FIGHT1']
+    [bea_entry] = [entry for entry in history.history('bea')['fights'] if entry['fightCode'] == 'FIGHT1']
+    assert (ann_entry['corner'], ann_entry['opponentCode'], ann_entry['opponentName']) == ('A', 'bea', 'Bea')
+    assert (bea_entry['corner'], bea_entry['opponentCode'], bea_entry['opponentName']) == ('B', 'ann', 'Ann')
+    assert ann_entry['fighterStats'] == bea_entry['opponentStats'] == {'strikesLanded': 30}
+    assert bea_entry['fighterStats'] == ann_entry['opponentStats'] == {'strikesLanded': 12}
+
+def test_only_changed_histories_are_rewritten(tmp_path):
+    state_path = tmp_path / 'state.json'
+    fights = [fight('FIGHT1', 'ann', 'bea'), fight('FIGHT2', 'cat', 'dot')]
+    
+    first = aggregator(state_path, fights)
+    assert sorted(document_id for _, document_id, _ in first.documents()) == ['ann', 'bea', 'cat', 'dot']
+    first.published(set())
+    
+    unchanged = aggregator(state_path, fights)
+    assert unchanged.documents() == []
+    
+    added = aggregator(state_path, fights + [fight('FIGHT3', 'ann', 'eve')])
+    assert sorted(document_id for _, document_id, _ in added.documents()) == ['ann', 'eve']
+    added.published({('fighterHistory', 'eve')})
+    
+    # A failed write is retried on the next run; a fighter whose fights disappeared is emptied once
+    removed = aggregator(state_path, [fight('FIGHT1', 'ann', 'bea'), fight('FIGHT3', 'ann', 'eve')])
+    documents = {document_id: document for _, document_id, document in removed.documents()}
+    assert sorted(documents) == ['cat', 'dot', 'eve']
+    assert documents['cat']['fights'] == [] and documents['cat']['fightCount'] == 0
+    removed.published(set())
+    assert aggregator(state_path, [fight('FIGHT1', 'ann', 'bea'), fight('FIGHT3', 'ann', 'eve')]).documents() == []
+
+def test_factory_keeps_state_under_the_run_prefix(state_dir):
+    assert fighter_history_aggregator(DATA_DIR, state_prefix='dry-run-').state_path == default_state_path('dry-run-fighterHistory')
+    assert fighter_history_aggregator(DATA_DIR).state_path == default_state_path('fighterHistory')
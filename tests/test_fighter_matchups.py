@@ -0,0 +1,47 @@
+from fighter_matchups import DIVISIONS_COLLECTION, MATCHUPS_COLLECTION, FighterMatchupsAggregator, fighter_matchups_aggregator
+from incremental_aggregates import default_state_path
+
+def fighter(code, weight, grade, stance='Orthodox'):
+    return {'fighterCode': code, 'fighterName': code.title(), 'weight': weight, 'FighterGrade': grade,
+            '1Stance': stance, 'RecordAgainstOrthodox': '2-1'}
+
+def aggregator(state_path, fighters):
+    matchups = FighterMatchupsAggregator(state_path=str(state_path), log=lambda message: None)
+    for data in fighters:
+        matchups.add(data['fighterCode'], data)
+    return matchups
+
+def written(matchups):
+    return sorted((collection, document_id) for collection, document_id, _ in matchups.documents())
+
+def test_only_changed_divisions_are_rewritten(tmp_path):
+    state_path = tmp_path / 'state.json'
+    fighters = [fighter('ann', 'Flyweight', 80), fighter('bea', 'Flyweight', 70), fighter('cat', 'Catch/Open', 60)]
+    
+    first = aggregator(state_path, fighters)
+    assert written(first) == [(DIVISIONS_COLLECTION, 'Catch-Open'), (DIVISIONS_COLLECTION, 'Flyweight'),
+                              (MATCHUPS_COLLECTION, 'ann'), (MATCHUPS_COLLECTION, 'bea'), (MATCHUPS_COLLECTION, 'cat')]
+    first.published(set())
+    
+    assert written(aggregator(state_path, fighters)) == []
+    
+    # A new grade for Bea changes both Flyweight rows but not the roster or the other division
+    changed = aggregator(state_path, [fighters[0], fighter('bea', 'Flyweight', 75), fighters[2]])
+    assert written(changed) == [(MATCHUPS_COLLECTION, 'ann'), (MATCHUPS_COLLECTION, 'bea')]
+    changed.published({(MATCHUPS_COLLECTION, 'bea')})
+    
+    # A failed write is retried on the next run
+    retried = aggregator(state_path, [fighters[0], fighter('bea', 'Flyweight', 75), fighters[2]])
+    assert written(retried) == [(MATCHUPS_COLLECTION, 'bea')]
+
+def test_slashes_in_fighter_codes_are_escaped(tmp_path):
+    matchups = aggregator(tmp_path / 'state.json', [fighter('a/b', 'Flyweight', 80), fighter('cd', 'Flyweight', 70)])
+    
+    documents = {document_id: data for collection, document_id, data in matchups.documents()
+                 if collection == MATCHUPS_COLLECTION}
+    assert sorted(documents) == ['a-b', 'cd']
+    assert documents['a-b']['fighterCode'] == 'a/b'
+
+def test_factory_keeps_state_under_the_run_prefix(state_dir):
+    assert fighter_matchups_aggregator('oldData', state_prefix='dry-run-').state_path == default_state_path('dry-run-fighterMatchups')
+    assert fighter_matchups_aggregator('oldData').state_path == default_state_path('fighterMatchups')
@@ -0,0 +1,200 @@
+"""
+Parity of fighter_ratings.py with the website hooks it replaced.
+
+The golden file holds the results of the hooks as they were at the baseline
+commit (useOverallRating, useDifficultyScore, useFighterCombinedDifficultyScore
+and useFightDifficultyScores), run by golden/baseline_hooks.js on two inputs:
+
+- oldData: the real Fights.csv and WCAV.csv. oldData has no FighterData.csv,
+  so every fighter in Fights.csv gets seeded random stats, and every tenth
+  one is left out so some fights have an unknown opponent.
+- synthetic: fighter_ratings.synthetic_dataset(), for the edge cases.
+
+Regenerate the golden file (needs node and the git history) with:
+    python tests/test_fighter_ratings_baseline.py
+"""
+
+import gzip
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fighter_ratings import (FIGHTER_CATEGORIES, FIGHTER_FIELDS, FighterRatings, _same, load_documents,
+                             synthetic_dataset)
+
+# Repository root and source CSV files
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, 'oldData')
+
+# Commit holding the website hooks before the ratings moved to ingest
+BASELINE_COMMIT = '3fde0b2'
+
+# Hook sources run by the harness, relative to the repository root
+HOOK_FILES = ('website/src/hooks/stats/useOverallRating.ts', 'website/src/hooks/useDifficultyScore.ts',
+              'website/src/hooks/useFightDifficultyScores.ts')
+
+# Harness running the hooks, and the results it produced at the baseline commit
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+HARNESS = os.path.join(GOLDEN_DIR, 'baseline_hooks.js')
+GOLDEN_FILE = os.path.join(GOLDEN_DIR, 'baseline_ratings.json.gz')
+
+def old_data_ratings(seed: int = 12) -> FighterRatings:
+    """Rate the real oldData fights and weight classes, with seeded stats for their fighters."""
+    generator = random.Random(seed)
+    fights = [data for _, data in load_documents(os.path.join(DATA_DIR, 'Fights.csv'))]
+    weight_classes = load_documents(os.path.join(DATA_DIR, 'WCAV.csv'))
+    
+    fighter_classes = {}
+    for fight in fights:
+        for side in ('fighterA', 'fighterB'):
+            fighter_classes.setdefault(fight.get(side), fight.get('weightClass'))
+    
+    fighters = []
+    for index, (code, weight_class) in enumerate(fighter_classes.items()):
+        if index % 10 == 9:
+            continue
+        data = {'fighterCode': code, 'weightClass': weight_class}
+        for category, field in FIGHTER_FIELDS:
+            roll = generator.random()
+            if roll < 0.05:
+                continue
+            if field == 'FightsTracked':
+                value = generator.randint(0, 12)
+            elif roll < 0.12:
+                value = 0
+            else:
+                value = generator.randint(1, 400) if roll < 0.85 else round(generator.uniform(0.1, 40), 2)
+            if category is None:
+                data[field] = value
+            else:
+                data.setdefault(category, {})[field] = value
+        for category in FIGHTER_CATEGORIES:
+            if generator.random() < 0.03:
+                data.pop(category, None)
+        fighters.append(data)
+    return FighterRatings(fighters, fights, weight_classes)
+
+def datasets():
+    """Return the rated inputs the golden file covers, by name."""
+    return {'oldData': old_data_ratings(), 'synthetic': synthetic_dataset()}
+
+def hook_cases(ratings: FighterRatings):
+    """
+    Describe every rating check_parity compares, as inputs for the harness.
+    
+    Returns:
+        Tuple of the harness cases and, per fight side, (fight number, field,
+        has opponent) in the order of cases['sides']
+    """
+    class_index = {str(data.get('weightclassname')): index for index, data in enumerate(ratings.weight_classes)}
+    
+    def viewer_class(code):
+        number = ratings.fighter_index.get(code)
+        fighter = ratings.fighters[number] if number is not None else {}
+        return class_index.get(str(fighter.get('weightClass') or 'Unknown'))
+    
+    fights_by_fighter = {}
+    for number, fight in enumerate(ratings.fights):
+        for code in {str(fight.get('fighterA')), str(fight.get('fighterB'))}:
+            fights_by_fighter.setdefault(code, []).append(number)
+    
+    cases = {'fighters': ratings.fighters, 'weightClasses': ratings.weight_classes, 'fights': ratings.fights,
+             'overall': [], 'combined': [], 'sides': []}
+    for number, fighter in enumerate(ratings.fighters):
+        code = str(fighter.get('fighterCode'))
+        cases['overall'].append([number, class_index.get(str(fighter.get('weightClass') or 'Unknown'))])
+        if ratings.fighter_index.get(code) == number:
+            cases['combined'].append([code, fights_by_fighter.get(code, []), viewer_class(code)])
+    
+    sides = []
+    for number, fight in enumerate(ratings.fights):
+        for field, viewer, opponent, is_winner in (('fighterADifficulty', fight.get('fighterA'), fight.get('fighterB'), True),
+                                                   ('fighterBDifficulty', fight.get('fighterB'), fight.get('fighterA'), False)):
+            if not is_winner and str(viewer) == str(opponent):
+                continue
+            opponent_number = ratings.fighter_index.get(str(opponent))
+            sides.append((number, field, opponent_number is not None))
+            if opponent_number is not None:
+                cases['sides'].append([number, str(viewer), opponent_number, viewer_class(str(viewer)), is_winner])
+    return cases, sides
+
+def run_baseline_hooks(cases, hooks_dir: str):
+    """Run the harness on the hook sources in hooks_dir and return its results."""
+    result = subprocess.run(['node', HARNESS, hooks_dir], input=json.dumps(cases), capture_output=True,
+                            text=True, check=True)
+    return json.loads(result.stdout)
+
+def baseline_results():
+    """Run the baseline commit's hooks on every dataset, or return None without node or the git history."""
+    if shutil.which('node') is None:
+        return None
+    with tempfile.TemporaryDirectory() as checkout:
+        for hook_file in HOOK_FILES:
+            source = subprocess.run(['git', 'show', f"{BASELINE_COMMIT}:{hook_file}"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True)
+            if source.returncode != 0:
+                return None
+            path = os.path.join(checkout, hook_file)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(source.stdout)
+        hooks_dir = os.path.join(checkout, 'website', 'src', 'hooks')
+        return {name: run_baseline_hooks(hook_cases(ratings)[0], hooks_dir) for name, ratings in datasets().items()}
+
+def load_golden():
+    """Return the captured hook results, by dataset name."""
+    with gzip.open(GOLDEN_FILE, 'rt', encoding='utf-8') as file:
+        return json.load(file)
+
+def mismatches(ratings: FighterRatings, expected) -> list:
+    """Compare the engine with the hook results for one dataset."""
+    cases, sides = hook_cases(ratings)
+    found = []
+    for (number, _), rating in zip(cases['overall'], expected['overall']):
+        if not _same(rating, ratings.overall_rating(number)):
+            found.append(f"overallRating {number}: expected {rating}, got {ratings.overall_rating(number)}")
+    for (code, _, _), difficulty in zip(cases['combined'], expected['combined']):
+        actual = ratings.combined_difficulty(ratings.fighter_index[code])
+        if not _same(difficulty, actual):
+            found.append(f"combinedDifficulty {code}: expected {difficulty}, got {actual}")
+    results = iter(expected['sides'])
+    for number, field, has_opponent in sides:
+        difficulty = next(results) if has_opponent else None
+        actual = ratings.fight_fields(ratings.fights[number]).get(field)
+        if not _same(difficulty, actual):
+            found.append(f"{field} {number}: expected {difficulty}, got {actual}")
+    return found
+
+@pytest.mark.parametrize('name', ['oldData', 'synthetic'])
+def test_engine_matches_baseline_hooks(name):
+    expected = load_golden()[name]
+    ratings = datasets()[name]
+    cases, sides = hook_cases(ratings)
+    
+    assert len(expected['overall']) == len(cases['overall']) == len(ratings.fighters)
+    assert len(expected['sides']) == len(cases['sides'])
+    assert any(not has_opponent for _, _, has_opponent in sides)
+    assert mismatches(ratings, expected) == []
+
+def test_golden_file_matches_baseline_hooks():
+    results = baseline_results()
+    if results is None:
+        pytest.skip("needs node and the baseline commit")
+    assert results == load_golden()
+
+if __name__ == "__main__":
+    results = baseline_results()
+    if results is None:
+        sys.exit("❌ Capturing the baseline results needs node and the git history")
+    with gzip.open(GOLDEN_FILE, 'wt', encoding='utf-8') as file:
+        json.dump(results, file, sort_keys=True)
+    print(f"✅ Wrote {GOLDEN_FILE}")
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import fightstats
+from conftest import DATA_DIR
+from fake_firestore import FakeFirestore
+from incremental_aggregates import AGGREGATE_STATE_DIR
+from ingest_all import ingest_all, select_specs
+
+def dry_run(monkeypatch, *collections):
+    """Run the dry-run subcommand and return the in-memory client it wrote to."""
+    clients = []
+    run_in_memory = fightstats.run_in_memory
+    
+    def recording_run(*args):
+        results, db = run_in_memory(*args)
+        clients.append(db)
+        return results, db
+    
+    monkeypatch.setattr(fightstats, 'run_in_memory', recording_run)
+    monkeypatch.setattr(sys, 'argv', ['fightstats.py', 'dry-run', '--data-dir', DATA_DIR, '--only', *collections, '--quiet'])
+    fightstats.main()
+    return clients[0]
+
+def test_dry_run_does_not_mark_derived_documents_published(state_dir, monkeypatch):
+    dry_run(monkeypatch, 'fights', 'fightData')
+    
+    assert sorted(os.listdir(AGGREGATE_STATE_DIR)) == ['dry-run-fighterHistory.json', 'dry-run-weightClassFights.json']
+    
+    # The next real run still publishes every derived document
+    db = FakeFirestore()
+    results = ingest_all(select_specs(['fights', 'fightData']), db=db, data_dir=DATA_DIR, quiet=True)
+    
+    assert [result.status for result in results] == ['ok', 'ok']
+    assert db.collection_documents('weightClassFightTotals')
+    assert db.collection_documents('fighterHistory')
+
+def test_repeated_dry_runs_write_the_same_documents(state_dir, monkeypatch):
+    first = dry_run(monkeypatch, 'fights', 'fightData')
+    second = dry_run(monkeypatch, 'fights', 'fightData')
+    
+    assert first.collection_documents('fighterHistory')
+    assert first.collection_documents('weightClassFightTotals')
+    assert sorted(second.documents) == sorted(first.documents)
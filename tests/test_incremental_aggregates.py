@@ -0,0 +1,42 @@
+from fighter_percentiles import FighterPercentiles
+from incremental_aggregates import FIGHTER_TOTAL_FIELDS, WEIGHT_CLASS_FIGHTERS, IncrementalAggregator, fighter_stat_values
+from ingest_all import COLLECTION_SPECS
+
+def fighter(code, weight_class, fights):
+    return {'fighterCode': code, 'weightClass': weight_class, 'fighterId': 9000 + fights, 'fights': fights,
+            'CardioGrade': 80, 'overallRating': {'rating': 71}, 'clinch_stats': {'TotalClinchStrikesMade': fights * 10}}
+
+def test_only_declared_stats_are_totalled():
+    values = fighter_stat_values(fighter('ann', 'Flyweight', 3), FIGHTER_TOTAL_FIELDS)
+    
+    assert values == {'fights': 3, 'TotalClinchStrikesMade': 30}
+
+def test_weight_class_documents_keep_the_wcav_layout(tmp_path):
+    state_path = str(tmp_path / 'state.json')
+    fighters = [fighter('ann', 'Light Heavyweight', 3), fighter('bea', 'LightHeavyweight', 4), fighter('cat', 'Flyweight', 5)]
+    
+    first = IncrementalAggregator(WEIGHT_CLASS_FIGHTERS, state_path, log=lambda message: None)
+    for data in fighters:
+        first.add(data['fighterCode'], data)
+    documents = {(collection, document_id): document for collection, document_id, document in first.documents()}
+    first.published(set())
+    
+    assert sorted(documents) == [('weightClass', 'Flyweight'), ('weightClass', 'LightHeavyweight')]
+    document = documents['weightClass', 'LightHeavyweight']
+    assert set(document) == set(FIGHTER_TOTAL_FIELDS) | {'weightclassname', 'weight', 'fighterCount', 'aggregateVersion'}
+    assert (document['weightclassname'], document['weight'], document['fighterCount']) == ('Light Heavyweight', 205, 2)
+    assert (document['fights'], document['TotalClinchStrikesMade'], document['kowins']) == (7, 70, 0)
+    
+    # A changed fighter republishes only its own weight class
+    second = IncrementalAggregator(WEIGHT_CLASS_FIGHTERS, state_path, log=lambda message: None)
+    for data in fighters[:2] + [fighter('cat', 'Flyweight', 6)]:
+        second.add(data['fighterCode'], data)
+    assert [document_id for _, document_id, _ in second.documents()] == ['Flyweight']
+
+def test_wcav_weight_class_and_gym_files_are_not_uploaded():
+    assert not {spec.source for spec in COLLECTION_SPECS} & {'WCAV.csv', 'WeightClasses.csv', 'Gyms.csv'}
+
+def test_percentiles_rank_only_declared_stats():
+    percentiles = FighterPercentiles([fighter('ann', 'Flyweight', 3), fighter('cat', 'Flyweight', 5)])
+    
+    assert sorted(percentiles.fighter_fields('ann')['percentiles']) == ['CardioGrade', 'TotalClinchStrikesMade', 'fights']
@@ -0,0 +1,35 @@
+import datetime
+import os
+
+from conftest import DATA_DIR
+from fake_firestore import FakeFirestore
+from incremental_aggregates import default_state_path
+from ingest_all import ingest_all, select_specs
+
+def test_offline_run_keeps_aggregate_state_apart(state_dir):
+    ingest_all(select_specs(['fightData']), db=FakeFirestore(), data_dir=DATA_DIR, state_prefix='offline-', quiet=True)
+    
+    assert os.path.exists(default_state_path('offline-weightClassFights'))
+    assert not os.path.exists(default_state_path('weightClassFights'))
+    
+    db = FakeFirestore()
+    results = ingest_all(select_specs(['fightData']), db=db, data_dir=DATA_DIR, quiet=True)
+    
+    assert [result.status for result in results] == ['ok']
+    assert db.collection_documents('weightClassFightTotals')
+    assert os.path.exists(default_state_path('weightClassFights'))
+
+def test_event_and_fight_dates_are_timestamps(state_dir):
+    db = FakeFirestore()
+    ingest_all(select_specs(['events', 'fightData', 'webNoDataFights']), db=db, data_dir=DATA_DIR, quiet=True)
+    
+    events = db.collection_documents('events').values()
+    fights = db.collection_documents('fightData').values()
+    no_data_fights = db.collection_documents('webNoDataFights').values()
+    assert all(isinstance(data['Date'], datetime.datetime) for data in events)
+    assert all(isinstance(data['fightDate'], datetime.datetime) for data in fights)
+    # Two-digit years ('6/5/02') parse like the rest of the column instead of staying text
+    assert all(isinstance(data['Date'], datetime.datetime) for data in no_data_fights if 'Date' in data)
+    assert min(data['Date'] for data in no_data_fights if 'Date' in data).year == 2002
+    # Only dates are typed: the website still compares the 'Yes'/'No' strings
+    assert {data['isTitleFight'] for data in fights} <= {'Yes', 'No'}
@@ -0,0 +1,56 @@
+import csv
+import io
+
+import pytest
+
+from parallel_transform import ParallelTransform, compare_transform, split_record_ranges
+from upload_fighter_data_batch import iter_csv_records, plan_csv
+from value_formats import DISPLAY_FORMATS, resolve_formats
+
+def write_quoted_rows(path, count=60):
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['_id', 'notes', 'Height', 'Accuracy', 'wins'])
+        for index in range(count):
+            # Quoted fields with embedded newlines and doubled quotes, some long enough to span several chunks
+            notes = f'line one\nsaid "hi"\n{"x" * (index % 7) * 10}\nend' if index % 3 else f'plain {index}'
+            writer.writerow([f"doc{index:03d}", notes, f"{5 + index % 2}'{index % 12}\"", f"{index}%", str(index)])
+
+def test_ranges_end_on_record_boundaries(tmp_path):
+    path = tmp_path / 'quoted.csv'
+    write_quoted_rows(path)
+    data = path.read_bytes()
+    _, header, header_offset = next(iter_csv_records(str(path)))
+    
+    ranges = split_record_ranges(str(path), header_offset, chunk_bytes=16)
+    
+    assert len(ranges) > 10
+    assert ranges[0][0] == header_offset and ranges[-1][1] == len(data)
+    assert all(stop == next_start for (_, stop), (next_start, _) in zip(ranges, ranges[1:]))
+    # Each range parses on its own into whole records, and together they are the file's records
+    records = [values for start, stop in ranges
+               for values in csv.reader(io.StringIO(data[start:stop].decode('utf-8'), newline=''))]
+    assert records == [values for row_number, values, _ in iter_csv_records(str(path)) if row_number]
+
+@pytest.mark.parametrize('formats', [(), DISPLAY_FORMATS])
+def test_worker_pool_matches_the_serial_transform(tmp_path, formats):
+    path = tmp_path / 'quoted.csv'
+    write_quoted_rows(path)
+    
+    result = compare_transform(str(path), workers=2, categorize=False, formats=resolve_formats(formats), chunk_bytes=64)
+    
+    assert result['chunks'] > 10
+    assert result['rows'] == 60
+    assert result['matching'], result
+
+def test_resumed_worker_pool_continues_after_the_watermark(tmp_path):
+    path = tmp_path / 'quoted.csv'
+    write_quoted_rows(path)
+    row_number, _, offset = list(iter_csv_records(str(path)))[25]
+    
+    plan, records = plan_csv(str(path), start_row=row_number, start_offset=offset, categorize=False)
+    expected = [(number, plan.transform(values), end) for number, values, end in records]
+    parallel = ParallelTransform(str(path), 2, row_number, offset, categorize=False, chunk_bytes=64)
+    
+    assert list(parallel.records()) == expected
+    assert expected[0][0] == row_number + 1
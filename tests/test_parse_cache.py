@@ -0,0 +1,75 @@
+import csv
+import os
+import random
+
+import numpy as np
+import pytest
+
+from conftest import DATA_DIR
+from fighter_percentiles import FighterPercentiles, load_stat_matrix
+from fighter_ratings import FIGHTER_CATEGORIES, FIGHTER_FIELDS, _Columns, load_documents, load_fighter_matrix
+from fighter_totals import SOURCE_COLUMNS, FighterTotalsAggregator, build_fighter_totals_from_csv
+from upload_fighter_data_batch import iter_csv_records, plan_cached_csv, plan_csv
+from value_formats import DISPLAY_FORMATS, resolve_formats
+
+def write_fighters(path, count=120, seed=3):
+    generator = random.Random(seed)
+    stats = sorted({field for _, field in FIGHTER_FIELDS} | {field for _, _, fields in SOURCE_COLUMNS for field in fields})
+    header = ['_id', 'fighterCode', 'weightClass', 'Height', 'Reach'] + stats + ['MinutesTracked']
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(header)
+        for index in range(count):
+            row = [f"doc{index}", f"F{index:03d}", generator.choice(['Flyweight', 'Bantamweight', '']),
+                   generator.choice(['5\'11"', '6\'2"', 'N/A', '']), generator.choice(['72', '70.5', '', 'NA'])]
+            for _ in stats:
+                roll = generator.random()
+                row.append('' if roll < 0.1 else 'N/A' if roll < 0.15 else str(generator.randint(0, 300))
+                           if roll < 0.7 else f"{generator.uniform(0, 40):.2f}")
+            # A repeated column: its cells win over the first MinutesTracked where present
+            row.append(generator.choice(['', '12', '3.5']))
+            writer.writerow(row)
+
+def processed(plan, records):
+    return [(row_number, plan.transform(values), offset) for row_number, values, offset in records]
+
+@pytest.mark.parametrize('source', ['WEBNoDataDisplay.csv', 'Combinations.csv', 'WEBFighterNoData.csv', 'fighters'])
+@pytest.mark.parametrize('categorize, formats', [(True, ()), (False, DISPLAY_FORMATS)])
+def test_cached_plan_matches_text_parse(state_dir, source, categorize, formats):
+    if source == 'fighters':
+        csv_file_path = str(state_dir / 'FighterData.csv')
+        write_fighters(csv_file_path)
+    else:
+        csv_file_path = os.path.join(DATA_DIR, source)
+    records = list(iter_csv_records(csv_file_path))
+    resume_row, _, resume_offset = records[len(records) // 3]
+    
+    for start_row, start_offset in ((0, 0), (resume_row, resume_offset)):
+        expected_plan, expected_records = plan_csv(csv_file_path, start_row=start_row, start_offset=start_offset,
+                                                   categorize=categorize, formats=resolve_formats(formats))
+        expected = processed(expected_plan, expected_records)
+        cached_plan, cached_records = plan_cached_csv(csv_file_path, start_row, start_offset, categorize,
+                                                      resolve_formats(formats))
+        assert type(cached_plan).__name__ == 'CachedTransform'
+        assert processed(cached_plan, cached_records) == expected
+        assert (cached_plan.report.lines() if cached_plan.report else None) == \
+            (expected_plan.report.lines() if expected_plan.report else None)
+    assert os.path.isdir(state_dir / '.upload_cache')
+
+def test_numeric_stages_match_the_documents(state_dir):
+    csv_file_path = str(state_dir / 'FighterData.csv')
+    write_fighters(csv_file_path)
+    fighters = [data for _, data in load_documents(csv_file_path, categorize=True)]
+    
+    expected_matrix = _Columns(fighters, FIGHTER_FIELDS, FIGHTER_CATEGORIES).raw_matrix
+    np.testing.assert_array_equal(load_fighter_matrix(csv_file_path), expected_matrix)
+    
+    expected_percentiles = FighterPercentiles(fighters)
+    cached_percentiles = FighterPercentiles(fighters, stat_matrix=load_stat_matrix(csv_file_path))
+    assert cached_percentiles.fighter_index == expected_percentiles.fighter_index
+    assert cached_percentiles.documents() == expected_percentiles.documents()
+    
+    expected_totals = FighterTotalsAggregator()
+    for document_id, data in load_documents(csv_file_path, categorize=True):
+        expected_totals.add(document_id, data)
+    assert build_fighter_totals_from_csv(csv_file_path).fighters == expected_totals.fighters
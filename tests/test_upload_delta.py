@@ -0,0 +1,54 @@
+import csv
+
+from fake_firestore import FakeFirestore
+from upload_fighter_data_batch import upload_csv_batch
+
+HEADER = ['_id', 'name', 'wins', 'reach']
+
+ROWS = [
+    ['ann', 'Ann', '3', '70'],
+    ['bea', 'Bea', '5', '68'],
+    ['cat', 'Cat', '1', '72'],
+]
+
+def write_rows(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+def delta_upload(db, path):
+    before = db.writes
+    summary = upload_csv_batch(db, str(path), 'fighters', lambda data, row_number: (data.pop('_id'), data),
+                               categorize=False, delta=True, delete_missing=True, log=lambda message: None)
+    return db.writes - before, summary.metrics['delta']
+
+def test_delta_upload_writes_only_what_changed(state_dir):
+    path = state_dir / 'fighters.csv'
+    write_rows(path, ROWS)
+    db = FakeFirestore()
+    
+    writes, delta = delta_upload(db, path)
+    assert writes == 3
+    assert delta == {'new': 3, 'changed': 0, 'unchanged': 0, 'deleted': 0}
+    
+    writes, delta = delta_upload(db, path)
+    assert writes == 0
+    assert delta == {'new': 0, 'changed': 0, 'unchanged': 3, 'deleted': 0}
+    
+    # Changed documents are merged: a field written outside the CSV survives
+    db.documents['fighters/ann']['note'] = 'kept'
+    db.documents['fighters/bea']['note'] = 'kept'
+    
+    # Ann's wins change, Bea's reach is blanked and Cat's row is removed
+    write_rows(path, [['ann', 'Ann', '4', '70'], ['bea', 'Bea', '5', '']])
+    writes, delta = delta_upload(db, path)
+    assert writes == 3
+    assert delta == {'new': 0, 'changed': 2, 'unchanged': 0, 'deleted': 1}
+    assert db.collection_documents('fighters') == {
+        'ann': {'name': 'Ann', 'wins': 4, 'reach': 70, 'note': 'kept'},
+        'bea': {'name': 'Bea', 'wins': 5, 'note': 'kept'},
+    }
+    
+    writes, _ = delta_upload(db, path)
+    assert writes == 0
@@ -0,0 +1,68 @@
+import shutil
+
+import pytest
+
+from conftest import DATA_DIR
+from fake_firestore import FakeFirestore
+from ingest_all import ingest_spec, select_specs
+from upload_journal import default_journal_path, load_journal
+from write_scheduler import WriteScheduler
+
+class CrashingFirestore(FakeFirestore):
+    """Fake client whose process dies after a number of commits."""
+    
+    def __init__(self, crash_after):
+        super().__init__()
+        self.crash_after = crash_after
+    
+    def _commit(self, writes):
+        if self.crash_after is not None and self.commits >= self.crash_after:
+            raise KeyboardInterrupt
+        super()._commit(writes)
+
+def ingest(db, spec, data_dir, **options):
+    # No pacing: the fake client accepts any write rate
+    return ingest_spec(db, spec, str(data_dir), log=lambda message: None, batch_size=100,
+                       scheduler=WriteScheduler(initial_rate=1e6), **options)
+
+def crashed_upload(data_dir, crash_after=12):
+    [spec] = select_specs(['webNoDataDisplay'])
+    db = CrashingFirestore(crash_after)
+    with pytest.raises(KeyboardInterrupt):
+        ingest(db, spec, data_dir)
+    db.crash_after = None
+    return spec, db
+
+def test_resume_finishes_an_interrupted_upload(state_dir):
+    shutil.copy(f"{DATA_DIR}/WEBNoDataDisplay.csv", state_dir)
+    spec, db = crashed_upload(state_dir)
+    journal = load_journal(default_journal_path(spec.name))
+    assert 0 < journal['committed_row'] < 2688
+    assert not journal.get('complete')
+    assert len(db.collection_documents(spec.collection)) < 2688
+    
+    writes = db.writes
+    result = ingest(db, spec, state_dir, resume=True)
+    
+    assert result.status == 'ok'
+    assert result.summary.metrics['resumed_from_row'] == journal['committed_row']
+    # The resumed run seeks past the committed rows instead of writing them again
+    assert db.writes - writes == 2688 - journal['committed_row']
+    expected = FakeFirestore()
+    ingest(expected, spec, state_dir, state_prefix='expected-')
+    assert len(expected.collection_documents(spec.collection)) == 2688
+    assert db.collection_documents(spec.collection) == expected.collection_documents(spec.collection)
+    assert load_journal(default_journal_path(spec.name))['complete']
+
+def test_resume_refuses_a_changed_file(state_dir):
+    shutil.copy(f"{DATA_DIR}/WEBNoDataDisplay.csv", state_dir)
+    spec, db = crashed_upload(state_dir)
+    with open(state_dir / 'WEBNoDataDisplay.csv', 'a', encoding='utf-8') as csv_file:
+        csv_file.write('\n')
+    
+    writes = db.writes
+    result = ingest(db, spec, state_dir, resume=True)
+    
+    assert result.status == 'failed'
+    assert 'Cannot resume' in result.message and 'has changed' in result.message
+    assert db.writes == writes
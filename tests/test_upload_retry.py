@@ -0,0 +1,46 @@
+from google.api_core import exceptions as api_exceptions
+
+from upload_retry import RetryPolicy, commit_with_bisect
+
+def test_always_throttled_batch_is_not_bisected():
+    commits = []
+    
+    def commit(group):
+        commits.append(len(group))
+        raise api_exceptions.ResourceExhausted("quota exceeded")
+    
+    policy = RetryPolicy(max_attempts=4)
+    outcome = commit_with_bisect(list(range(100)), commit, policy, sleep=lambda delay: None)
+    
+    assert len(commits) == policy.max_attempts
+    assert commits == [100] * policy.max_attempts
+    assert outcome.commits == policy.max_attempts
+    assert outcome.committed == []
+    assert [record for record, _ in outcome.failed] == list(range(100))
+    assert all(error.startswith('ResourceExhausted') for _, error in outcome.failed)
+
+def test_transient_error_is_retried_then_committed():
+    attempts = []
+    
+    def commit(group):
+        attempts.append(len(group))
+        if len(attempts) < 3:
+            raise api_exceptions.ServiceUnavailable("try again")
+    
+    outcome = commit_with_bisect(list(range(10)), commit, RetryPolicy(max_attempts=5), sleep=lambda delay: None)
+    
+    assert attempts == [10, 10, 10]
+    assert outcome.committed == list(range(10))
+    assert outcome.failed == []
+
+def test_permanent_error_isolates_the_bad_record():
+    def commit(group):
+        if 7 in group:
+            raise api_exceptions.InvalidArgument("document too large")
+    
+    outcome = commit_with_bisect(list(range(16)), commit, RetryPolicy(), sleep=lambda delay: None)
+    
+    assert sorted(outcome.committed) == [record for record in range(16) if record != 7]
+    assert [record for record, _ in outcome.failed] == [7]
+    # One commit per level of the bisection on the bad record's side, plus the clean halves
+    assert outcome.commits <= 2 * 4 + 1
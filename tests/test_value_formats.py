@@ -0,0 +1,13 @@
+import datetime
+
+from value_formats import VALUE_FORMATS
+
+def parse_date(value):
+    date_format = VALUE_FORMATS['date']
+    return date_format.parse(date_format.pattern.fullmatch(value))
+
+def test_two_digit_years_follow_the_posix_century_rule():
+    assert parse_date('6/5/02') == parse_date('6/5/2002') == datetime.datetime(2002, 6, 5, tzinfo=datetime.timezone.utc)
+    assert parse_date('1/2/68').year == 2068
+    assert parse_date('11/12/93').year == 1993
+    assert VALUE_FORMATS['date'].pattern.fullmatch('1/2/123') is None
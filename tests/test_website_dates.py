@@ -0,0 +1,59 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import REPO_ROOT
+from value_formats import VALUE_FORMATS
+
+# Date helper shared by useEvents and useFights
+DATES_SOURCE = os.path.join(REPO_ROOT, 'website', 'src', 'utils', 'dates.ts')
+
+# Runs utcCalendarDate on epoch milliseconds, or calendarDate on 'YYYY-MM-DD' strings, read from stdin
+# (annotations stripped)
+HARNESS = """
+const fs = require('fs');
+const source = fs.readFileSync(process.argv[1], 'utf8').replace(/^export /gm, '').replace(/: (Date|string)/g, '');
+const { utcCalendarDate, calendarDate } = new Function(source + '\\nreturn { utcCalendarDate, calendarDate };')();
+const options = { year: 'numeric', month: 'short', day: 'numeric' };
+const shown = JSON.parse(fs.readFileSync(0, 'utf8')).map((value) => typeof value === 'string' ? [
+  new Date(value).toLocaleDateString('en-US', options),
+  calendarDate(value).toLocaleDateString('en-US', options),
+] : [
+  new Date(value).toLocaleDateString('en-US', options),
+  utcCalendarDate(new Date(value)).toLocaleDateString('en-US', options),
+]);
+process.stdout.write(JSON.stringify(shown));
+"""
+
+def run_harness(time_zone, values):
+    result = subprocess.run(['node', '-e', HARNESS, DATES_SOURCE], input=json.dumps(values), capture_output=True,
+                            text=True, check=True, env={**os.environ, 'TZ': time_zone})
+    return json.loads(result.stdout)
+
+def shown_dates(time_zone, values):
+    date_format = VALUE_FORMATS['date']
+    return run_harness(time_zone, [date_format.parse(date_format.pattern.fullmatch(value)).timestamp() * 1000
+                                   for value in values])
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs node")
+@pytest.mark.parametrize('time_zone', ['America/New_York', 'UTC', 'Asia/Tokyo'])
+def test_ingested_dates_show_the_same_day_in_every_time_zone(time_zone):
+    shown = shown_dates(time_zone, ['11/2/2019', '1/1/20', '12/31/2005'])
+    
+    assert [calendar for _, calendar in shown] == ['Nov 2, 2019', 'Jan 1, 2020', 'Dec 31, 2005']
+    if time_zone == 'America/New_York':
+        # Formatting the midnight UTC timestamp directly shows the day before
+        assert [raw for raw, _ in shown] == ['Nov 1, 2019', 'Dec 31, 2019', 'Dec 30, 2005']
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="needs node")
+@pytest.mark.parametrize('time_zone', ['America/New_York', 'UTC', 'Asia/Tokyo'])
+def test_history_dates_show_the_same_day_in_every_time_zone(time_zone):
+    shown = run_harness(time_zone, ['2019-11-02', '2020-01-01', '2005-12-31'])
+    
+    assert [calendar for _, calendar in shown] == ['Nov 2, 2019', 'Jan 1, 2020', 'Dec 31, 2005']
+    if time_zone == 'America/New_York':
+        # new Date() reads ISO dates as midnight UTC
+        assert [raw for raw, _ in shown] == ['Nov 1, 2019', 'Dec 31, 2019', 'Dec 30, 2005']
@@ -0,0 +1,109 @@
+import csv
+
+import pytest
+
+from fake_firestore import FakeFirestore
+from upload_fighter_data_batch import upload_csv_batch
+from upload_retry import RetryPolicy
+from write_scheduler import WriteScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+def scheduler(clock, **settings):
+    return WriteScheduler(clock=clock, sleep=clock.sleep, **settings)
+
+def write_rows(path, count):
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['_id', 'value'])
+        writer.writerows([f"doc{index:04d}", index] for index in range(count))
+
+def test_rate_ramps_every_interval_up_to_the_maximum():
+    clock = FakeClock()
+    writes = scheduler(clock, initial_rate=100, max_rate=300, ramp_factor=1.5, ramp_interval=10)
+    
+    rates = []
+    for _ in range(5):
+        rates.append(writes.rate)
+        clock.now += 10
+    
+    assert rates == [100, 150, 225, 300, 300]
+
+def test_acquire_waits_for_the_tokens_the_rate_has_not_refilled():
+    clock = FakeClock()
+    writes = scheduler(clock, initial_rate=100, ramp_interval=1000)
+    depths = []
+    writes._sleep = lambda seconds: (depths.append(writes.queue_depth), clock.sleep(seconds))
+    
+    # A full bucket admits one second of writes at once; a 500-write batch then borrows ahead
+    assert writes.acquire(100) == 0.0
+    assert writes.acquire(500) == pytest.approx(5.0)
+    assert depths == [1]
+    assert writes.queue_depth == 0
+    
+    assert writes.acquire(50) == pytest.approx(0.5)
+    stats = writes.stats()
+    assert (stats['granted'], stats['queue_depth']) == (650, 0)
+    assert stats['waited_seconds'] == pytest.approx(5.5)
+
+def test_throttling_backs_off_once_per_cooldown_and_restarts_the_ramp():
+    clock = FakeClock()
+    writes = scheduler(clock, initial_rate=800, ramp_interval=10, backoff_factor=0.5, min_rate=150, backoff_cooldown=1)
+    
+    clock.now = 5
+    assert writes.record_throttle()
+    # In-flight commits failing in the same burst do not back off again
+    assert not writes.record_throttle()
+    assert writes.rate == 400
+    
+    clock.now = 7
+    assert writes.record_throttle()
+    clock.now = 9
+    assert writes.record_throttle()
+    assert writes.rate == 150
+    
+    # The ramp restarts from the last backoff rather than the scheduler's start
+    clock.now = 18.9
+    assert writes.rate == 150
+    clock.now = 19
+    assert writes.rate == 225
+    assert (writes.throttles, writes.backoffs) == (4, 3)
+    assert writes.describe() == '225 writes/s, 0 waiting, 3 backoffs'
+
+def test_upload_backs_off_to_the_backend_capacity(state_dir):
+    write_rows(state_dir / 'rows.csv', 900)
+    db = FakeFirestore(capacity=400)
+    writes = WriteScheduler(initial_rate=4000, ramp_interval=600)
+    lines = []
+    
+    summary = upload_csv_batch(db, str(state_dir / 'rows.csv'), 'rows',
+                               lambda data, row_number: (data.pop('_id'), data), categorize=False, batch_size=100,
+                               retry_policy=RetryPolicy(max_attempts=20, initial_delay=0.05, max_delay=0.5),
+                               scheduler=writes, log=lines.append)
+    
+    assert (summary.success_count, summary.error_count) == (900, 0)
+    assert len(db.collection_documents('rows')) == 900
+    # Every ResourceExhausted commit reached the scheduler, and each burst of them backed off once
+    assert db.throttled_commits > 0
+    assert writes.throttles == db.throttled_commits
+    assert 1 <= writes.backoffs <= writes.throttles
+    assert writes.rate <= 4000 * 0.5 ** writes.backoffs
+    
+    # The run reports the rate and queue depth it finished at
+    reported = summary.metrics['scheduler']
+    assert reported['rate'] == writes.rate
+    assert reported['queue_depth'] == 0
+    assert reported['backoffs'] == writes.backoffs
+    rate_lines = [line for line in lines if line.startswith('🚦 Write rate: ')]
+    assert rate_lines[0] == '🚦 Write rate: 4000 writes/s, 0 waiting, 0 backoffs'
+    assert rate_lines[-1] == f"🚦 Write rate: {writes.rate:.0f} writes/s, 0 waiting, {writes.backoffs} backoffs"
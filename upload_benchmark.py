@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the uploader.
+Runs the row conversion, the name lookup and the full fighter upload against
+the in-memory FakeFirestore (with configurable commit latency, throttling and
+injected failures) over the oldData files and synthetic copies scaled up
+10x-100x. Each scenario runs in its own process so peak memory is measured
+per scenario; results can be saved as a baseline and later runs compared
+against it to catch regressions without touching the real project.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from fake_firestore import FakeFirestore
+from parallel_transform import ParallelTransform
+from upload_fighter_data_batch import iter_csv_rows, load_fighter_names, plan_csv, process_csv_row, upload_fighter_data_batch
+from upload_metrics import peak_rss_bytes
+
+# Working directory for scaled data, run state and results (not tracked)
+BENCHMARK_DIR = ".upload_benchmark"
+
+# Baseline checked into the repository, so every checkout compares against the same numbers
+BASELINE_PATH = os.path.join("benchmarks", "upload_baseline.json")
+
+DATA_DIR = "oldData"
+
+# Default scale factors: the real files and a 10x synthetic copy
+DEFAULT_SCALES = (1, 10)
+
+# Change (in percent) beyond which a metric counts as a regression
+REGRESSION_THRESHOLD = 10.0
+
+# Metrics compared against the baseline, and whether higher values are better
+COMPARED_METRICS = {
+    'rows_per_second': True,
+    'commits_per_second': True,
+    'peak_rss_bytes': False,
+    'commit_p99_ms': False,
+}
+
+# Files the fighter upload reads next to its CSV for the ratings
+RATING_SOURCES = ('Fights.csv', 'WCAV.csv')
+
+def _source_paths(data_dir: str) -> Dict[str, str]:
+    """Pick the fighter and fighter name sources, falling back to WEBFighterData.csv if FighterData.csv is missing."""
+    fighters = os.path.join(data_dir, 'FighterData.csv')
+    if not os.path.exists(fighters):
+        fighters = os.path.join(data_dir, 'WEBFighterData.csv')
+    names = os.path.join(data_dir, 'FighterNames.csv')
+    return {'fighters': fighters, 'names': names if os.path.exists(names) else fighters}
+
+def scale_csv(source_path: str, output_path: str, factor: int, columns: Optional[Sequence[str]] = None):
+    """
+    Write a synthetic copy of a CSV file with every row repeated factor times.
+    
+    Copies after the first get '-N' appended to their _id and fighterCode, so
+    document IDs stay unique and the fighter name join still matches.
+    
+    Args:
+        source_path: CSV file to scale
+        output_path: Scaled CSV file to write
+        factor: Number of copies of each row
+        columns: Only keep these columns (all columns if None)
+    """
+    with open(source_path, 'r', encoding='utf-8-sig', newline='') as source_file:
+        reader = csv.DictReader(source_file)
+        fieldnames = list(columns) if columns is not None else reader.fieldnames
+        rows = [{name: row.get(name, '') for name in fieldnames} for row in reader]
+    
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='') as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=fieldnames)
+        writer.writeheader()
+        for copy in range(factor):
+            for row in rows:
+                if copy:
+                    row = dict(row)
+                    for key in ('_id', 'fighterCode'):
+                        if row.get(key):
+                            row[key] = f"{row[key]}-{copy}"
+                writer.writerow(row)
+    os.replace(temp_path, output_path)
+
+def prepare_data(scale: int, data_dir: str = DATA_DIR, work_dir: str = BENCHMARK_DIR) -> Dict[str, str]:
+    """
+    Create (or reuse) the benchmark input files for a scale factor.
+    
+    Args:
+        scale: Number of copies of each source row
+        data_dir: Directory holding the oldData CSV files
+        work_dir: Benchmark working directory
+    
+    Returns:
+        Dictionary with the 'fighters' and 'names' CSV paths
+    """
+    sources = _source_paths(data_dir)
+    scaled_dir = os.path.join(work_dir, 'data', f"x{scale}")
+    paths = {
+        'fighters': os.path.join(scaled_dir, 'FighterData.csv'),
+        'names': os.path.join(scaled_dir, 'FighterNames.csv'),
+    }
+    
+    def stale(output_path: str, source_path: str) -> bool:
+        return not os.path.exists(output_path) or os.path.getmtime(output_path) < os.path.getmtime(source_path)
+    
+    if stale(paths['fighters'], sources['fighters']):
+        scale_csv(sources['fighters'], paths['fighters'], scale)
+    if stale(paths['names'], sources['names']):
+        scale_csv(sources['names'], paths['names'], scale, columns=('fighterCode', 'fighterName'))
+    for name in RATING_SOURCES:
+        source_path = os.path.join(data_dir, name)
+        if os.path.exists(source_path) and stale(os.path.join(scaled_dir, name), source_path):
+            shutil.copyfile(source_path, os.path.join(scaled_dir, name))
+    return paths
+
+def bench_process_csv_row(paths: Dict[str, str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert every fighter row with process_csv_row (the per-cell path)."""
+    rows = 0
+    for _, row, _ in iter_csv_rows(paths['fighters']):
+        process_csv_row(row)
+        rows += 1
+    return {'rows': rows}
+
+def bench_column_plan(paths: Dict[str, str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert every fighter row with the compiled ColumnPlan the upload uses."""
+    plan, records = plan_csv(paths['fighters'])
+    rows = 0
+    for _, values, _ in records:
+        plan.transform(values)
+        rows += 1
+    return {'rows': rows}
+
+def bench_parallel_transform(paths: Dict[str, str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert every fighter row in transform worker processes (compare with column_plan)."""
+    workers = max(2, options['transform_workers'])
+    parallel_transform = ParallelTransform(paths['fighters'], workers)
+    rows = 0
+    for _ in parallel_transform.records():
+        rows += 1
+    return {'rows': rows, 'workers': workers, 'chunks': len(parallel_transform.ranges)}
+
+def bench_load_fighter_names(paths: Dict[str, str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the fighterCode -> fighterName lookup."""
+    return {'rows': len(load_fighter_names(paths['names']))}
+
+def bench_upload(paths: Dict[str, str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the full upload_fighter_data_batch path against a FakeFirestore."""
+    db = FakeFirestore(latency=options['latency'], capacity=options['capacity'], jitter=options['jitter'],
+                       failure_rate=options['failure_rate'], seed=options['seed'])
+    state_dir = os.path.join(options['work_dir'], 'state')
+    shutil.rmtree(state_dir, ignore_errors=True)
+    summary = upload_fighter_data_batch(
+        paths['fighters'],
+        batch_size=options['batch_size'],
+        max_in_flight=options['max_in_flight'],
+        manifest_path=os.path.join(state_dir, 'manifest.json'),
+        dead_letter_path=os.path.join(state_dir, 'deadletter.ndjson'),
+        journal_path=os.path.join(state_dir, 'journal.json'),
+        metrics_path=os.path.join(state_dir, 'metrics.json'),
+        write_rate=options['write_rate'],
+        quiet=True,
+        db=db,
+        fighter_names_csv_path=paths['names'],
+        transform_workers=options['transform_workers'],
+    )
+    commit_latency = summary.metrics['histograms'].get('commit', {})
+    return {
+        'rows': summary.metrics['counters'].get('rows', 0),
+        'written': summary.success_count,
+        'errors': summary.error_count,
+        'commits': db.commits,
+        'failed_commits': db.failed_commits,
+        'throttled_commits': db.throttled_commits,
+        'commit_p50_ms': commit_latency.get('p50_ms'),
+        'commit_p99_ms': commit_latency.get('p99_ms'),
+        'workers': options['transform_workers'] if options['transform_workers'] > 1 else 0,
+    }
+
+# Scenario name -> benchmark function returning at least {'rows': n}
+SCENARIOS: Dict[str, Callable[[Dict[str, str], Dict[str, Any]], Dict[str, Any]]] = {
+    'process_csv_row': bench_process_csv_row,
+    'column_plan': bench_column_plan,
+    'parallel_transform': bench_parallel_transform,
+    'load_fighter_names': bench_load_fighter_names,
+    'upload': bench_upload,
+}
+
+def run_scenario(name: str, scale: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one scenario in this process and return its measurements.
+    
+    Args:
+        name: Scenario name from SCENARIOS
+        scale: Scale factor of the input data
+        options: Fake backend and upload settings
+    
+    Returns:
+        Dictionary with rows, seconds, rows_per_second, commits_per_second,
+        peak_rss_bytes (this process plus its transform workers) and the
+        scenario's own counters
+    """
+    paths = prepare_data(scale, options['data_dir'], options['work_dir'])
+    started = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = SCENARIOS[name](paths, options)
+    seconds = time.perf_counter() - started
+    
+    # getrusage only reports the largest finished child, so workers that ran side by side
+    # count as that many copies of the largest one (an upper bound)
+    process_peak = peak_rss_bytes()
+    worker_peak = peak_rss_bytes(children=True) or 0
+    result.update({
+        'scenario': name,
+        'scale': scale,
+        'seconds': round(seconds, 4),
+        'rows_per_second': round(result['rows'] / seconds, 1) if seconds else None,
+        'process_peak_rss_bytes': process_peak,
+        'worker_peak_rss_bytes': worker_peak,
+        'peak_rss_bytes': process_peak + worker_peak * max(result.get('workers', 0), 1) if process_peak is not None else None,
+    })
+    if 'commits' in result:
+        result['commits_per_second'] = round(result['commits'] / seconds, 1) if seconds else None
+    return result
+
+def run_isolated(name: str, scale: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter, so its peak memory is its own."""
+    command = [sys.executable, os.path.abspath(__file__), '--worker', name, '--scale', str(scale),
+               '--options', json.dumps(options)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} x{scale} failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare_results(results: Sequence[Dict[str, Any]], baseline: Dict[str, Any],
+                    threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """
+    Compare results with a baseline.
+    
+    Args:
+        results: Scenario results of this run
+        baseline: Saved baseline ({'results': {'scenario@xN': result}})
+        threshold: Change in percent beyond which a metric counts as a regression
+    
+    Returns:
+        Report lines; regressions start with ❌
+    """
+    lines = []
+    for result in results:
+        key = f"{result['scenario']}@x{result['scale']}"
+        previous = baseline.get('results', {}).get(key)
+        if previous is None:
+            lines.append(f"➖ {key}: not in the baseline")
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            icon = '❌' if worse > threshold else ('✅' if -worse > threshold else '  ')
+            lines.append(f"{icon} {key} {metric}: {old:,.0f} -> {new:,.0f} ({change:+.1f}%)")
+    return lines
+
+def print_results(results: Sequence[Dict[str, Any]]):
+    """Print one line per scenario and scale."""
+    print(f"{'scenario':<20}{'scale':>6}{'rows':>9}{'seconds':>9}{'rows/s':>10}{'commits/s':>11}"
+          f"{'p50 ms':>8}{'p99 ms':>8}{'peak MiB':>10}")
+    for result in results:
+        def number(key, pattern):
+            value = result.get(key)
+            return format(value, pattern) if value is not None else '-'
+        print(f"{result['scenario']:<20}{result['scale']:>6}{result['rows']:>9}{result['seconds']:>9.3f}"
+              f"{number('rows_per_second', ',.0f'):>10}{number('commits_per_second', ',.0f'):>11}"
+              f"{number('commit_p50_ms', 'g'):>8}{number('commit_p99_ms', 'g'):>8}"
+              f"{(result['peak_rss_bytes'] or 0) / 1024 / 1024:>10.1f}")
+
+def main():
+    """Run the benchmark suite, record the results and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark the uploader offline against an in-memory Firestore.")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS), help="Scenarios to run")
+    parser.add_argument('--scales', nargs='+', type=int, default=list(DEFAULT_SCALES),
+                        help="Scale factors (copies of every row), e.g. 1 10 100")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directory holding the oldData CSV files")
+    parser.add_argument('--work-dir', default=BENCHMARK_DIR, help="Directory for scaled data, run state and results")
+    parser.add_argument('--latency', type=float, default=0.02, help="Seconds each fake commit takes")
+    parser.add_argument('--jitter', type=float, default=0.01, help="Random extra commit latency, up to this many seconds")
+    parser.add_argument('--capacity', type=float, help="Writes per second the fake backend accepts (unlimited if omitted)")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of commits that fail transiently")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the injected latency and failures")
+    parser.add_argument('--batch-size', type=int, default=500, help="Maximum documents per batch")
+    parser.add_argument('--max-in-flight', type=int, default=4, help="Batches committed concurrently")
+    parser.add_argument('--write-rate', type=float, default=1e9,
+                        help="Scheduler write rate (default: effectively unpaced, to measure the pipeline)")
+    parser.add_argument('--transform-workers', type=int, default=1,
+                        help="Transform processes of the upload (1: in-process); parallel_transform uses at least 2")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help=f"Baseline file (default: {BASELINE_PATH})")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help="Regression threshold in percent")
+    parser.add_argument('--fail-on-regression', action='store_true', help="Exit with status 1 if a metric regressed")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--scale', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--options', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(run_scenario(args.worker, args.scale, json.loads(args.options))))
+        return
+    
+    options = {
+        'data_dir': args.data_dir,
+        'work_dir': args.work_dir,
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'capacity': args.capacity,
+        'failure_rate': args.failure_rate,
+        'seed': args.seed,
+        'batch_size': args.batch_size,
+        'max_in_flight': args.max_in_flight,
+        'write_rate': args.write_rate,
+        'transform_workers': args.transform_workers,
+    }
+    sources = _source_paths(args.data_dir)
+    print(f"🏁 Benchmarking {', '.join(args.scenarios)} at x{', x'.join(map(str, args.scales))} "
+          f"on {sources['fighters']} (fake latency {args.latency * 1000:.0f}ms +{args.jitter * 1000:.0f}ms, "
+          f"capacity {args.capacity or 'unlimited'}, failure rate {args.failure_rate:.0%})")
+    
+    results = []
+    for scale in args.scales:
+        for name in args.scenarios:
+            try:
+                results.append(run_isolated(name, scale, options))
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+    print("=" * 60)
+    print_results(results)
+    
+    os.makedirs(args.work_dir, exist_ok=True)
+    run = {'started_at': time.time(), 'options': options, 'results': results}
+    with open(os.path.join(args.work_dir, 'results.ndjson'), 'a', encoding='utf-8') as results_file:
+        results_file.write(json.dumps(run) + '\n')
+    
+    baseline_path = args.baseline
+    regressions = []
+    if os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('options') != options:
+            print(f"⚠️  Baseline {baseline_path} was recorded with different settings")
+        print(f"📊 Compared with {baseline_path} (threshold {args.threshold:.0f}%):")
+        lines = compare_results(results, baseline, args.threshold)
+        for line in lines:
+            print(line)
+        regressions = [line for line in lines if line.startswith('❌')]
+    
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(baseline_path) or '.', exist_ok=True)
+        temp_path = f"{baseline_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as baseline_file:
+            json.dump({'started_at': run['started_at'], 'options': options,
+                       'results': {f"{result['scenario']}@x{result['scale']}": result for result in results}},
+                      baseline_file, indent=2)
+        os.replace(temp_path, baseline_path)
+        print(f"💾 Saved baseline to {baseline_path}")
+    
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
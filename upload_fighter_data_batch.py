@@ -4,60 +4,37 @@ Optimized batch upload script for FighterData CSV to Firestore database.
 This script uses batch operations for better performance with large datasets.
 """
 
+import argparse
 import csv
 import json
 import os
 import sys
-from typing import Dict, Any, List
-import firebase_admin
-from firebase_admin import credentials, firestore
-from google.cloud import firestore as gc_firestore
-
-def initialize_firebase():
-    """Initialize Firebase Admin SDK with service account credentials."""
-    # Check if Firebase is already initialized
-    try:
-        firebase_admin.get_app()
-        print("✅ Firebase already initialized")
-        return
-    except ValueError:
-        pass  # Not initialized yet, continue with initialization
-    
-    # Try to initialize with service account file first (more reliable)
-    service_account_path = "fightstats-30352-firebase-adminsdk-fbsvc-f8205199b1.json"
-    
-    if os.path.exists(service_account_path):
-        try:
-            cred = credentials.Certificate(service_account_path)
-            firebase_admin.initialize_app(cred)
-            print(f"✅ Firebase initialized with service account: {service_account_path}")
-            return
-        except Exception as e:
-            print(f"❌ Failed to initialize with service account: {e}")
-    
-    # Try to initialize with default credentials (if running on GCP)
-    try:
-        firebase_admin.initialize_app()
-        print("✅ Firebase initialized with default credentials")
-    except Exception as e:
-        print(f"❌ Failed to initialize with default credentials: {e}")
-    
-    # If we get here, both methods failed
-    print("❌ Firebase initialization failed. Please ensure you have proper credentials.")
-    print("   You can either:")
-    print("   1. Place the service account JSON file in the current directory")
-    print("   2. Set GOOGLE_APPLICATION_CREDENTIALS environment variable")
-    print("   3. Run this on Google Cloud Platform with proper permissions")
-    sys.exit(1)
-
-def get_firestore_client():
-    """Get Firestore client instance."""
-    try:
-        db = firestore.client()
-        return db
-    except Exception as e:
-        print(f"❌ Failed to get Firestore client: {e}")
-        sys.exit(1)
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from itertools import chain, islice
+from typing import Callable, Dict, Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from firestore_client import delete_field, field_path, firestore_client
+from fighter_ratings import load_fighter_ratings
+from fighter_search import fighter_search_aggregator
+from fighter_totals import FighterTotalsAggregator
+from document_size import MAX_BATCH_BYTES, MAX_BATCH_OPERATIONS, MAX_DOCUMENT_BYTES, estimate_document_name_size, estimate_document_size
+from upload_manifest import default_manifest_path, diff_fields, hash_document_fields, load_manifest, save_manifest
+from upload_metrics import RunMetrics, default_metrics_path
+from parallel_transform import ParallelTransform
+from parse_cache import CACHE_DIR, CachedTransform, load_table
+from upload_journal import BatchWatermark, default_journal_path, file_fingerprint, load_journal, new_journal, same_contents, save_journal
+from value_formats import NULL_VALUES, NormalizationReport, ValueFormat, compile_column_normalizer
+from upload_retry import (
+    RetryPolicy,
+    commit_with_bisect,
+    default_dead_letter_path,
+    is_throttling_error,
+    throttling_status_codes,
+    write_dead_letters,
+)
+from write_scheduler import WriteScheduler
 
 def convert_value_to_proper_type(value: str) -> Any:
     """
@@ -87,171 +64,315 @@ def convert_value_to_proper_type(value: str) -> Any:
     # Return as string if no numeric conversion works
     return value
 
-def process_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+# Categories used to organize related stats into nested maps for easier traversal
+FIELD_CATEGORIES = {
+    'submission_stats': [
+        'AmericanaAttempts', 'AmericanaLosses', 'AmericanaWins',
+        'AnacondaAttempt', 'AnacondaLoss', 'AnacondaWin',
+        'BulldogAttempt', 'BulldogLoss', 'BulldogWin',
+        'CalfSlicerAttempts', 'CalfSlicerLosses', 'CalfSlicerWins',
+        'EzekielAttempt', 'EzekielLoss', 'EzekielWin',
+        'GogoplataAttempts', 'GogoplataLosses', 'GogoplataWins',
+        'KneebarAttempt', 'KneebarLoss', 'KneebarWin',
+        'LeglockAttempt', 'LeglockLoss', 'LeglockWin',
+        'NeckCrankAttempt', 'OmoplataAttempt', 'OmoplataAttempts', 'OmoplataLoss', 'OmoplataLosses', 'OmoplataWin', 'OmoplataWins',
+        'OtherSubAttempt', 'OtherSubLoss', 'OtherSubWin',
+        'SUBRNCAttempt', 'SUBRNCLoss', 'SUBRNCWin',
+        'SubArmTriangleAttempt', 'SubArmTriangleLoss', 'SubArmTriangleWin',
+        'SubAttempts', 'SubDarceAttempt', 'SubDarceLoss', 'SubDarceWin',
+        'SubGuillotineAttempt', 'SubGuillotineLoss', 'SubGuillotineWin',
+        'SubHeelHookAttempt', 'SubHeelHookLoss', 'SubHeelHookWin',
+        'SubKimuraAttempt', 'SubKimuraLoss', 'SubKimuraWin',
+        'SubNeckCrankAttempt', 'SubNeckCrankWin',
+        'SubStraightArmLockAttempt', 'SubStraightArmLockLoss', 'SubStraightArmLockWin',
+        'SubSulovStretchAttempt', 'SubSulovStretchLoss', 'SubSulovStretchWin',
+        'SubTriangleArmbarAttempt', 'SubTriangleArmbarLoss', 'SubTriangleArmbarWin',
+        'SubTriangleAttempt', 'SubTriangleLoss', 'SubTriangleWin',
+        'TwisterAttempts', 'TwisterLosses', 'TwisterWins',
+        'VonFlueAttempt', 'VonFlueLoss', 'VonFlueWin'
+    ],
+    'takedown_stats': [
+        'AnklePickDefends', 'AttemptedAnklePickTD', 'FailedAnklePickTD', 'SuccessfulAnklePickTD',
+        'AttemptedImanariTD', 'FailedImanariTD', 'ImanariDefends', 'SuccessfulImanariTD',
+        'AttemptedThrowTD', 'FailedThrowTD', 'SuccessfulThrowTD',
+        'BodyLockDefends', 'BodyLockTakedownAttempts', 'BodyLockTakedownFail', 'BodyLockTakedownSuccess',
+        'DoubleLegDefends', 'DoubleLegTakedownAttempts', 'DoubleLegTakedownFail', 'DoubleLegTakedownSuccess',
+        'SingleLegDefends', 'SingleLegTakedownAttempts', 'SingleLegTakedownFail', 'SingleLegTakedownSuccess',
+        'TripDefends', 'TripTakedownAttempts', 'TripTakedownFail', 'TripTakedownSuccess',
+        'ThrowDefends', 'TakedownsAA'
+    ],
+    'striking_stats': [
+        'BodyKicksAA', 'BodyKicksAbsorbed', 'HeadKicksAA', 'HeadKicksAbsorbed',
+        'CrossesAA', 'CrossesAbsorbed', 'HooksAA', 'HooksAbsorbed',
+        'JabsAA', 'JabsAbsorbed', 'StraightsAA', 'StraightsAbsorbed',
+        'UppercutsAA', 'UppercutsAbsorbed', 'LegKicksAA', 'LegKicksAbsorbed',
+        'OverhandsAbsorbed', 'KnockdownsAA', 'StunsAA', 'TimesStunnedAA'
+    ],
+    'clinch_stats': [
+        'BeingClinched', 'InClinch', 'ClinchStrikeHiMake', 'ClinchStrikeHiMiss',
+        'ClinchStrikeLoMake', 'ClinchStrikeLoMiss', 'TotalClinchStrikesMade',
+        'TotalClinchStrikesMissed', 'TotalClinchStrikesThrown'
+    ],
+    'ground_stats': [
+        'GroundStrikeHiMake', 'GroundStrikeHiMiss', 'GroundStrikeLoMake', 'GroundStrikeLoMiss',
+        'OnBottomGround', 'OnTopGround', 'TotalGroundStrikesMade', 'TotalGroundStrikesMissed', 'TotalGroundStrikesThrown'
+    ],
+    'left_hand_stats': [
+        'LeftBodyKickMake', 'LeftBodyKickMiss', 'LeftCrossAttempts', 'LeftCrossMake', 'LeftCrossMissed',
+        'LeftElbowMake', 'LeftElbowMiss', 'LeftHighKickMake', 'LeftHighKickMiss',
+        'LeftHookHiMake', 'LeftHookHiMiss', 'LeftHookLoMake', 'LeftHookLoMiss',
+        'LeftJabHiMake', 'LeftJabHiMiss', 'LeftJabLoMake', 'LeftJabLoMiss',
+        'LeftLegKickMake', 'LeftLegKickMiss', 'LeftOverhandMake', 'LeftOverhandMiss',
+        'LeftSpinBackFistMake', 'LeftSpinBackFistMiss', 'LeftStraightHiMake', 'LeftStraightHiMiss',
+        'LeftStraightLoMake', 'LeftStraightLoMiss', 'LeftUppercutHiMake', 'LeftUppercutHiMiss',
+        'LeftUppercutLoMake', 'LeftUppercutLoMiss'
+    ],
+    'right_hand_stats': [
+        'RightBodyKickMake', 'RightBodyKickMiss', 'RightCrossAttempts', 'RightCrossMake', 'RightCrossMissed',
+        'RightElbowMake', 'RightElbowMiss', 'RightHighKickMake', 'RightHighKickMiss',
+        'RightHookHiMake', 'RightHookHiMiss', 'RightHookLoMake', 'RightHookLoMiss',
+        'RightJabHiMake', 'RightJabHiMiss', 'RightJabLoMake', 'RightJabLoMiss',
+        'RightLegKickMake', 'RightLegKickMiss', 'RightOverhandMake', 'RightOverhandMiss',
+        'RightSpinBackFistMake', 'RightSpinBackFistMiss', 'RightStraightHiMake', 'RightStraightHiMiss',
+        'RightStraightLoMake', 'RightStraightLoMiss', 'RightUppercutHiMake', 'RightUppercutHiMiss',
+        'RightUppercutLoMake', 'RightUppercutLoMiss'
+    ],
+    'round_stats': [
+        'Round1StrikesLanded', 'Round1StrikesThrown', 'Round2StrikesLanded', 'Round2StrikesThrown',
+        'Round3StrikesLanded', 'Round3StrikesThrown', 'Round4StrikesLanded', 'Round4StrikesThrown',
+        'Round5StrikesLanded', 'Round5StrikesThrown'
+    ],
+    'knockout_stats': [
+        'KnockoutLossviaBodyKick', 'KnockoutLossviaBodyShot', 'KnockoutLossviaHeadKick',
+        'KnockoutLossviaHook', 'KnockoutLossviaJab', 'KnockoutLossviaLegKick',
+        'KnockoutLossviaStraight', 'KnockoutLossviaUppercut', 'KnockoutWinviaLeftElbow',
+        'KnockoutWinviaLeftFoot', 'KnockoutWinviaLeftHand', 'KnockoutWinviaLeftKnee',
+        'KnockoutWinviaRightElbow', 'KnockoutWinviaRightFoot', 'KnockoutWinviaRightHand',
+        'KnockoutWinviaRightKnee'
+    ],
+    'fight_outcome_stats': [
+        'FighterWins', 'FighterLoss', 'FighterDraw', 'FighterNC',
+        'FighterKOWins', 'FighterKOLoss', 'FighterTKOWins', 'FighterTKOLoss',
+        'FighterSUBWin', 'FighterSUBLoss', 'FighterUDWins', 'FighterUDLoss',
+        'FighterMajDecWin', 'FighterMajDecLoss', 'FighterSplitDecWin', 'FighterSplitDecLoss',
+        'WinsInThe4thRd', 'WinsInThe5thRd', 'WinsInTitleFights',
+        'LossesInThe4thRd', 'LossesInThe5thRd', 'LossesInTitleFights'
+    ],
+    'stance_matchup_stats': [
+        'WinsVsOrthodox', 'WinsVsSouthpaw', 'WinsVsSwitch',
+        'LossesVsOrthodox', 'LossesVsSouthpaw', 'LossesVsSwitch',
+        'OrthodoxWins', 'OrthodoxLosses', 'SouthpawWins', 'SouthpawLosses', 'SwitchWins', 'SwitchLosses'
+    ],
+    'total_stats': [
+        'TotalBodyKicksMade', 'TotalBodyKicksMissed', 'TotalBodyKicksThrown',
+        'TotalCrossAttempts', 'TotalCrossMake', 'TotalCrossMissed',
+        'TotalElbowsMade', 'TotalElbowsMissed', 'TotalElbowsThrown',
+        'TotalHighKicksMade', 'TotalHighKicksMissed', 'TotalHighKicksThrown',
+        'TotalHooksMade', 'TotalHooksMissed', 'TotalHooksThrown',
+        'TotalJabsMade', 'TotalJabsMissed', 'TotalJabsThrown',
+        'TotalKicksLanded', 'TotalKicksThrown',
+        'TotalLegKicksMade', 'TotalLegKicksMissed', 'TotalLegKicksThrown',
+        'TotalOverhandsMade', 'TotalOverhandsMissed', 'TotalOverhandsThrown',
+        'TotalPunchesLanded', 'TotalPunchesThrown',
+        'TotalSpinBackFistsMade', 'TotalSpinBackFistsMissed', 'TotalSpinBackFistsThrown',
+        'TotalStraightsMade', 'TotalStraightsMissed', 'TotalStraightsThrown',
+        'TotalStrikesLanded', 'TotalUppercutsMade', 'TotalUppercutsMissed', 'TotalUppercutsThrown'
+    ],
+    'gameplan_stats': [
+        'GrapplingGameplans', 'GrapplingGameplanWins', 'GrapplingGameplanLoss',
+        'StrikingGameplans', 'StrikingGameplanWins', 'StrikingGameplanLoss'
+    ],
+    'defensive_stats': [
+        'TimesAnklePicked', 'TimesBodyLocked', 'TimesDoubleLegged', 'TimesImanaried',
+        'TimesKnockedDown', 'TimesSingleLegged', 'TimesStunned', 'TimesThrown', 'TimesTripped'
+    ]
+}
+
+# Reverse lookup of field name -> category name; the first category listing a field wins
+FIELD_CATEGORY = {}
+for _category_name, _field_list in FIELD_CATEGORIES.items():
+    for _field in _field_list:
+        FIELD_CATEGORY.setdefault(_field, _category_name)
+
+def process_csv_row(row: Dict[str, str], categorize: bool = True) -> Dict[str, Any]:
     """
     Process a CSV row and convert values to appropriate types.
     Also categorizes related stats into arrays for easier traversal.
     
+    This is the per-row reference path; bulk uploads compile a ColumnPlan
+    once per file instead.
+    
     Args:
         row: Dictionary representing a CSV row
+        categorize: Nest known stat fields into category maps
         
     Returns:
         Processed dictionary with proper data types and categorized arrays
     """
     processed_row = {}
+    category_stats = {}
     
-    # Define categories for better organization
-    categories = {
-        'submission_stats': [
-            'AmericanaAttempts', 'AmericanaLosses', 'AmericanaWins',
-            'AnacondaAttempt', 'AnacondaLoss', 'AnacondaWin',
-            'BulldogAttempt', 'BulldogLoss', 'BulldogWin',
-            'CalfSlicerAttempts', 'CalfSlicerLosses', 'CalfSlicerWins',
-            'EzekielAttempt', 'EzekielLoss', 'EzekielWin',
-            'GogoplataAttempts', 'GogoplataLosses', 'GogoplataWins',
-            'KneebarAttempt', 'KneebarLoss', 'KneebarWin',
-            'LeglockAttempt', 'LeglockLoss', 'LeglockWin',
-            'NeckCrankAttempt', 'OmoplataAttempt', 'OmoplataAttempts', 'OmoplataLoss', 'OmoplataLosses', 'OmoplataWin', 'OmoplataWins',
-            'OtherSubAttempt', 'OtherSubLoss', 'OtherSubWin',
-            'SUBRNCAttempt', 'SUBRNCLoss', 'SUBRNCWin',
-            'SubArmTriangleAttempt', 'SubArmTriangleLoss', 'SubArmTriangleWin',
-            'SubAttempts', 'SubDarceAttempt', 'SubDarceLoss', 'SubDarceWin',
-            'SubGuillotineAttempt', 'SubGuillotineLoss', 'SubGuillotineWin',
-            'SubHeelHookAttempt', 'SubHeelHookLoss', 'SubHeelHookWin',
-            'SubKimuraAttempt', 'SubKimuraLoss', 'SubKimuraWin',
-            'SubNeckCrankAttempt', 'SubNeckCrankWin',
-            'SubStraightArmLockAttempt', 'SubStraightArmLockLoss', 'SubStraightArmLockWin',
-            'SubSulovStretchAttempt', 'SubSulovStretchLoss', 'SubSulovStretchWin',
-            'SubTriangleArmbarAttempt', 'SubTriangleArmbarLoss', 'SubTriangleArmbarWin',
-            'SubTriangleAttempt', 'SubTriangleLoss', 'SubTriangleWin',
-            'TwisterAttempts', 'TwisterLosses', 'TwisterWins',
-            'VonFlueAttempt', 'VonFlueLoss', 'VonFlueWin'
-        ],
-        'takedown_stats': [
-            'AnklePickDefends', 'AttemptedAnklePickTD', 'FailedAnklePickTD', 'SuccessfulAnklePickTD',
-            'AttemptedImanariTD', 'FailedImanariTD', 'ImanariDefends', 'SuccessfulImanariTD',
-            'AttemptedThrowTD', 'FailedThrowTD', 'SuccessfulThrowTD',
-            'BodyLockDefends', 'BodyLockTakedownAttempts', 'BodyLockTakedownFail', 'BodyLockTakedownSuccess',
-            'DoubleLegDefends', 'DoubleLegTakedownAttempts', 'DoubleLegTakedownFail', 'DoubleLegTakedownSuccess',
-            'SingleLegDefends', 'SingleLegTakedownAttempts', 'SingleLegTakedownFail', 'SingleLegTakedownSuccess',
-            'TripDefends', 'TripTakedownAttempts', 'TripTakedownFail', 'TripTakedownSuccess',
-            'ThrowDefends', 'TakedownsAA'
-        ],
-        'striking_stats': [
-            'BodyKicksAA', 'BodyKicksAbsorbed', 'HeadKicksAA', 'HeadKicksAbsorbed',
-            'CrossesAA', 'CrossesAbsorbed', 'HooksAA', 'HooksAbsorbed',
-            'JabsAA', 'JabsAbsorbed', 'StraightsAA', 'StraightsAbsorbed',
-            'UppercutsAA', 'UppercutsAbsorbed', 'LegKicksAA', 'LegKicksAbsorbed',
-            'OverhandsAbsorbed', 'KnockdownsAA', 'StunsAA', 'TimesStunnedAA'
-        ],
-        'clinch_stats': [
-            'BeingClinched', 'InClinch', 'ClinchStrikeHiMake', 'ClinchStrikeHiMiss',
-            'ClinchStrikeLoMake', 'ClinchStrikeLoMiss', 'TotalClinchStrikesMade',
-            'TotalClinchStrikesMissed', 'TotalClinchStrikesThrown'
-        ],
-        'ground_stats': [
-            'GroundStrikeHiMake', 'GroundStrikeHiMiss', 'GroundStrikeLoMake', 'GroundStrikeLoMiss',
-            'OnBottomGround', 'OnTopGround', 'TotalGroundStrikesMade', 'TotalGroundStrikesMissed', 'TotalGroundStrikesThrown'
-        ],
-        'left_hand_stats': [
-            'LeftBodyKickMake', 'LeftBodyKickMiss', 'LeftCrossAttempts', 'LeftCrossMake', 'LeftCrossMissed',
-            'LeftElbowMake', 'LeftElbowMiss', 'LeftHighKickMake', 'LeftHighKickMiss',
-            'LeftHookHiMake', 'LeftHookHiMiss', 'LeftHookLoMake', 'LeftHookLoMiss',
-            'LeftJabHiMake', 'LeftJabHiMiss', 'LeftJabLoMake', 'LeftJabLoMiss',
-            'LeftLegKickMake', 'LeftLegKickMiss', 'LeftOverhandMake', 'LeftOverhandMiss',
-            'LeftSpinBackFistMake', 'LeftSpinBackFistMiss', 'LeftStraightHiMake', 'LeftStraightHiMiss',
-            'LeftStraightLoMake', 'LeftStraightLoMiss', 'LeftUppercutHiMake', 'LeftUppercutHiMiss',
-            'LeftUppercutLoMake', 'LeftUppercutLoMiss'
-        ],
-        'right_hand_stats': [
-            'RightBodyKickMake', 'RightBodyKickMiss', 'RightCrossAttempts', 'RightCrossMake', 'RightCrossMissed',
-            'RightElbowMake', 'RightElbowMiss', 'RightHighKickMake', 'RightHighKickMiss',
-            'RightHookHiMake', 'RightHookHiMiss', 'RightHookLoMake', 'RightHookLoMiss',
-            'RightJabHiMake', 'RightJabHiMiss', 'RightJabLoMake', 'RightJabLoMiss',
-            'RightLegKickMake', 'RightLegKickMiss', 'RightOverhandMake', 'RightOverhandMiss',
-            'RightSpinBackFistMake', 'RightSpinBackFistMiss', 'RightStraightHiMake', 'RightStraightHiMiss',
-            'RightStraightLoMake', 'RightStraightLoMiss', 'RightUppercutHiMake', 'RightUppercutHiMiss',
-            'RightUppercutLoMake', 'RightUppercutLoMiss'
-        ],
-        'round_stats': [
-            'Round1StrikesLanded', 'Round1StrikesThrown', 'Round2StrikesLanded', 'Round2StrikesThrown',
-            'Round3StrikesLanded', 'Round3StrikesThrown', 'Round4StrikesLanded', 'Round4StrikesThrown',
-            'Round5StrikesLanded', 'Round5StrikesThrown'
-        ],
-        'knockout_stats': [
-            'KnockoutLossviaBodyKick', 'KnockoutLossviaBodyShot', 'KnockoutLossviaHeadKick',
-            'KnockoutLossviaHook', 'KnockoutLossviaJab', 'KnockoutLossviaLegKick',
-            'KnockoutLossviaStraight', 'KnockoutLossviaUppercut', 'KnockoutWinviaLeftElbow',
-            'KnockoutWinviaLeftFoot', 'KnockoutWinviaLeftHand', 'KnockoutWinviaLeftKnee',
-            'KnockoutWinviaRightElbow', 'KnockoutWinviaRightFoot', 'KnockoutWinviaRightHand',
-            'KnockoutWinviaRightKnee'
-        ],
-        'fight_outcome_stats': [
-            'FighterWins', 'FighterLoss', 'FighterDraw', 'FighterNC',
-            'FighterKOWins', 'FighterKOLoss', 'FighterTKOWins', 'FighterTKOLoss',
-            'FighterSUBWin', 'FighterSUBLoss', 'FighterUDWins', 'FighterUDLoss',
-            'FighterMajDecWin', 'FighterMajDecLoss', 'FighterSplitDecWin', 'FighterSplitDecLoss',
-            'WinsInThe4thRd', 'WinsInThe5thRd', 'WinsInTitleFights',
-            'LossesInThe4thRd', 'LossesInThe5thRd', 'LossesInTitleFights'
-        ],
-        'stance_matchup_stats': [
-            'WinsVsOrthodox', 'WinsVsSouthpaw', 'WinsVsSwitch',
-            'LossesVsOrthodox', 'LossesVsSouthpaw', 'LossesVsSwitch',
-            'OrthodoxWins', 'OrthodoxLosses', 'SouthpawWins', 'SouthpawLosses', 'SwitchWins', 'SwitchLosses'
-        ],
-        'total_stats': [
-            'TotalBodyKicksMade', 'TotalBodyKicksMissed', 'TotalBodyKicksThrown',
-            'TotalCrossAttempts', 'TotalCrossMake', 'TotalCrossMissed',
-            'TotalElbowsMade', 'TotalElbowsMissed', 'TotalElbowsThrown',
-            'TotalHighKicksMade', 'TotalHighKicksMissed', 'TotalHighKicksThrown',
-            'TotalHooksMade', 'TotalHooksMissed', 'TotalHooksThrown',
-            'TotalJabsMade', 'TotalJabsMissed', 'TotalJabsThrown',
-            'TotalKicksLanded', 'TotalKicksThrown',
-            'TotalLegKicksMade', 'TotalLegKicksMissed', 'TotalLegKicksThrown',
-            'TotalOverhandsMade', 'TotalOverhandsMissed', 'TotalOverhandsThrown',
-            'TotalPunchesLanded', 'TotalPunchesThrown',
-            'TotalSpinBackFistsMade', 'TotalSpinBackFistsMissed', 'TotalSpinBackFistsThrown',
-            'TotalStraightsMade', 'TotalStraightsMissed', 'TotalStraightsThrown',
-            'TotalStrikesLanded', 'TotalUppercutsMade', 'TotalUppercutsMissed', 'TotalUppercutsThrown'
-        ],
-        'gameplan_stats': [
-            'GrapplingGameplans', 'GrapplingGameplanWins', 'GrapplingGameplanLoss',
-            'StrikingGameplans', 'StrikingGameplanWins', 'StrikingGameplanLoss'
-        ],
-        'defensive_stats': [
-            'TimesAnklePicked', 'TimesBodyLocked', 'TimesDoubleLegged', 'TimesImanaried',
-            'TimesKnockedDown', 'TimesSingleLegged', 'TimesStunned', 'TimesThrown', 'TimesTripped'
-        ]
-    }
-    
-    # Process regular fields first
     for key, value in row.items():
         # Skip empty keys
         if not key or key.strip() == '':
             continue
-            
+        
         # Convert value to proper type
         processed_value = convert_value_to_proper_type(value)
         
         # Only add non-None values to reduce document size
-        if processed_value is not None:
+        if processed_value is None:
+            continue
+        
+        category_name = FIELD_CATEGORY.get(key) if categorize else None
+        if category_name is None:
             processed_row[key] = processed_value
+        else:
+            category_stats.setdefault(category_name, {})[key] = processed_value
     
-    # Organize stats into categories
-    for category_name, field_list in categories.items():
-        category_stats = {}
-        for field in field_list:
-            if field in processed_row:
-                category_stats[field] = processed_row[field]
-                # Remove from main row to avoid duplication
-                del processed_row[field]
-        
-        # Only add category if it has data
-        if category_stats:
-            processed_row[category_name] = category_stats
+    # Only add categories that have data, in their declared order
+    for category_name in FIELD_CATEGORIES:
+        if category_name in category_stats:
+            processed_row[category_name] = category_stats[category_name]
     
     return processed_row
 
+# Leading characters of strings that int() or float() might accept
+_NUMERIC_LEADS = frozenset('0123456789+-. \t\n\r\f\viInN')
+
+# Number of rows used to infer column types when compiling a plan
+PLAN_SAMPLE_SIZE = 256
+
+def _convert_int_column(value: str) -> Any:
+    """Converter for columns whose sampled values were all integers."""
+    try:
+        return int(value)
+    except ValueError:
+        return convert_value_to_proper_type(value)
+
+def _convert_float_column(value: str) -> Any:
+    """Converter for columns whose sampled values were decimals."""
+    # int() never accepts a '.', so go straight to float for decimals
+    if '.' in value:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return convert_value_to_proper_type(value)
+
+def _convert_text_column(value: str) -> Any:
+    """Converter for columns whose sampled values were text."""
+    if value[0] in _NUMERIC_LEADS:
+        return convert_value_to_proper_type(value)
+    return value
+
+def _infer_column_converter(values: Iterable[str]):
+    """
+    Pick the cheapest converter for a column from a sample of its values.
+    
+    The converters fall back to convert_value_to_proper_type for values that
+    do not match the inferred type, so inference only affects speed.
+    """
+    converter = _convert_int_column
+    for value in values:
+        if not value:
+            continue
+        try:
+            if '.' in value:
+                float(value)
+                converter = _convert_float_column
+            else:
+                int(value)
+        except ValueError:
+            return _convert_text_column
+    return converter
+
+class ColumnPlan:
+    """
+    Per-file transform compiled once from the CSV header.
+    
+    Maps every column index to a converter and target category so rows
+    are transformed by a flat loop instead of per-cell type sniffing and
+    a category pass over every known field.
+    """
+    
+    def __init__(self, header: List[str], sample_rows: Iterable[List[str]] = (), categorize: bool = True,
+                 formats: Sequence[ValueFormat] = (), sample_columns: Optional[Sequence[Sequence[str]]] = None):
+        """
+        Compile the plan.
+        
+        Args:
+            header: CSV header row
+            sample_rows: Rows (as value lists) used to infer column types
+            categorize: Nest known stat fields into category maps
+            formats: Display formats to normalize into typed values (see value_formats);
+                null sentinels such as 'N/A' are also dropped when any are given
+            sample_columns: Sampled values per column, used instead of sample_rows
+        """
+        if sample_columns is not None:
+            samples = [list(values) for values in sample_columns]
+        else:
+            samples = [[] for _ in header]
+            for values in sample_rows:
+                for index, value in enumerate(values[:len(header)]):
+                    samples[index].append(value)
+        
+        self.header = list(header)
+        self.report = NormalizationReport() if formats else None
+        self.columns = []
+        for key, sample in zip(header, samples):
+            if not key or key.strip() == '':
+                # Skip empty keys
+                self.columns.append((key, None, None))
+                continue
+            
+            category_name = FIELD_CATEGORY.get(key) if categorize else None
+            if formats:
+                sample = [value for value in sample if value not in NULL_VALUES]
+                converter = compile_column_normalizer(key, sample, formats, _infer_column_converter(sample), self.report)
+            else:
+                converter = _infer_column_converter(sample)
+            self.columns.append((key, converter, category_name))
+        
+        present = {category for _, _, category in self.columns if category is not None}
+        self.category_order = [name for name in FIELD_CATEGORIES if name in present]
+    
+    def transform(self, values: List[str]) -> Dict[str, Any]:
+        """
+        Transform one row of values, equivalent to process_csv_row on the same row.
+        
+        Args:
+            values: Row values in header order
+            
+        Returns:
+            Processed dictionary with proper data types and categorized arrays
+        """
+        processed_row = {}
+        category_stats = {}
+        
+        for (key, converter, category_name), value in zip(self.columns, values):
+            # Empty values and skipped columns are dropped
+            if not value or converter is None:
+                continue
+            
+            processed_value = converter(value)
+            if processed_value is None:
+                # Null sentinels of normalized files
+                continue
+            if category_name is None:
+                processed_row[key] = processed_value
+            else:
+                stats = category_stats.get(category_name)
+                if stats is None:
+                    stats = category_stats[category_name] = {}
+                stats[key] = processed_value
+        
+        for category_name in self.category_order:
+            if category_name in category_stats:
+                processed_row[category_name] = category_stats[category_name]
+        
+        return processed_row
+
 def load_fighter_names(fighter_names_csv_path: str) -> Dict[str, str]:
     """
     Load fighter names from FighterNames CSV file.
@@ -285,162 +406,1171 @@ def load_fighter_names(fighter_names_csv_path: str) -> Dict[str, str]:
         print(f"❌ Error loading fighter names: {e}")
         return fighter_names
 
-def upload_fighter_data_batch(csv_file_path: str, collection_name: str = 'fighterData', batch_size: int = 500):
+class UploadRecord(NamedTuple):
+    """A transformed CSV row ready to be written to Firestore."""
+    row_number: int
+    offset: int
+    document_id: Optional[str]
+    data: Optional[Dict[str, Any]]
+    error: Optional[str]
+    # 'set' or 'delete'; merge_fields limits a set to the listed top-level fields
+    operation: str = 'set'
+    merge_fields: Optional[List[str]] = None
+    # Field hashes recorded in the manifest once the write is committed
+    hashes: Optional[Dict[str, str]] = None
+    # Estimated encoded size of the write in bytes
+    size: int = 0
+
+def stage_record_write(writer, doc_ref, record: UploadRecord):
     """
-    Upload fighter data from CSV to Firestore using batch operations.
+    Add a record's write to a WriteBatch or BulkWriter.
+    
+    Args:
+        writer: WriteBatch or BulkWriter
+        doc_ref: Target document reference
+        record: Record to write
+    """
+    if record.operation == 'delete':
+        writer.delete(doc_ref)
+    elif record.merge_fields is not None:
+        writer.set(doc_ref, record.data, merge=[field_path(field) for field in record.merge_fields])
+    else:
+        writer.set(doc_ref, record.data)
+
+def iter_csv_records(csv_file_path: str, start_row: int = 0, start_offset: int = 0) -> Iterator[Tuple[int, List[str], int]]:
+    """
+    Stream raw records from a CSV file without loading the whole file into memory.
+    
+    The header is yielded first with row number 0. Blank lines are skipped,
+    matching csv.DictReader. When start_offset is given, the file is seeked
+    straight to that record boundary after the header instead of parsing
+    the rows before it.
     
     Args:
         csv_file_path: Path to the CSV file
+        start_row: Row number of the last row before start_offset
+        start_offset: Byte offset of the first record to read (0 to read from the start)
+        
+    Yields:
+        Tuples of (row_number, values, offset) where offset is the number of
+        bytes consumed from the file once the record has been parsed
+    """
+    consumed = 0
+    
+    def counted_lines(binary_file):
+        nonlocal consumed
+        for raw_line in binary_file:
+            consumed += len(raw_line)
+            yield raw_line.decode('utf-8')
+    
+    with open(csv_file_path, 'rb') as csvfile:
+        reader = csv.reader(counted_lines(csvfile))
+        header = next((values for values in reader if values), None)
+        if header is None:
+            return
+        yield 0, header, consumed
+        
+        row_number = 1
+        if start_offset > consumed:
+            csvfile.seek(start_offset)
+            consumed = start_offset
+            row_number = start_row + 1
+        
+        for values in reader:
+            if not values:
+                continue
+            yield row_number, values, consumed
+            row_number += 1
+
+def iter_csv_rows(csv_file_path: str) -> Iterator[Tuple[int, Dict[str, str], int]]:
+    """
+    Stream rows from a CSV file as dictionaries keyed by the header.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        
+    Yields:
+        Tuples of (row_number, row, offset) where offset is the number of
+        bytes consumed from the file once the row has been parsed
+    """
+    records = iter_csv_records(csv_file_path)
+    for _, header, _ in records:
+        for row_number, values, offset in records:
+            yield row_number, dict(zip(header, values)), offset
+
+def plan_csv(csv_file_path: str, sample_size: int = PLAN_SAMPLE_SIZE, start_row: int = 0, start_offset: int = 0,
+             categorize: bool = True, formats: Sequence[ValueFormat] = ()) -> Tuple[ColumnPlan, Iterator[Tuple[int, List[str], int]]]:
+    """
+    Compile a ColumnPlan for a CSV file and return it with the record stream.
+    
+    The first sample_size records are buffered to infer column types and
+    are replayed at the front of the returned stream.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        sample_size: Number of records used for type inference
+        start_row: Row number of the last row before start_offset
+        start_offset: Byte offset of the first record to read (0 to read from the start)
+        categorize: Nest known stat fields into category maps
+        formats: Display formats to normalize into typed values
+        
+    Returns:
+        Tuple of (plan, records) where records yields (row_number, values, offset)
+    """
+    records = iter_csv_records(csv_file_path, start_row, start_offset)
+    _, header, _ = next(records, (0, [], 0))
+    sample = list(islice(records, sample_size))
+    plan = ColumnPlan(header, (values for _, values, _ in sample), categorize, formats)
+    return plan, chain(sample, records)
+
+def plan_cached_csv(csv_file_path: str, start_row: int = 0, start_offset: int = 0, categorize: bool = True,
+                    formats: Sequence[ValueFormat] = (), cache_dir: Optional[str] = CACHE_DIR
+                    ) -> Tuple[Any, Iterator[Tuple[int, Any, int]]]:
+    """
+    Return the plan and record stream of plan_csv, read through the local parse cache.
+    
+    The plan is a CachedTransform whose records are already processed, so
+    repeated runs over an unchanged file skip parsing and type conversion.
+    If the cache cannot be read or written, or cache_dir is None, the CSV
+    text is parsed by plan_csv instead. Either way the result is passed to
+    iter_upload_records unchanged.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        start_row: Row number of the last row before start_offset
+        start_offset: Byte offset of the first record to read (0 to read from the start)
+        categorize: Nest known stat fields into category maps
+        formats: Display formats to normalize into typed values
+        cache_dir: Parse cache directory (None to parse the CSV text directly)
+        
+    Returns:
+        Tuple of (plan, records) where records yields (row_number, values, offset)
+    """
+    if cache_dir is not None:
+        try:
+            plan = CachedTransform(load_table(csv_file_path, cache_dir), categorize, formats, start_offset)
+        except OSError as e:
+            print(f"⚠️  Parse cache unavailable for {csv_file_path} ({e}); parsing the CSV text")
+        else:
+            return plan, plan.records()
+    return plan_csv(csv_file_path, start_row=start_row, start_offset=start_offset,
+                    categorize=categorize, formats=formats)
+
+def iter_processed_rows(csv_file_path: str, categorize: bool = True,
+                        cache_dir: Optional[str] = CACHE_DIR) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield every row of a CSV file as processed by its ColumnPlan.
+    
+    Reads through the local parse cache, so repeated runs over an unchanged
+    file skip parsing and numeric conversion.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        categorize: Nest known stat fields into category maps
+        cache_dir: Parse cache directory (None to parse the CSV text directly)
+        
+    Yields:
+        Tuple of (row_number, processed_data)
+    
+    Raises:
+        TransformError: If a row fails to transform
+    """
+    plan, records = plan_cached_csv(csv_file_path, categorize=categorize, cache_dir=cache_dir)
+    for row_number, values, _ in records:
+        yield row_number, plan.transform(values)
+
+def build_fighter_document(processed_data: Dict[str, Any], row_number: int, fighter_names: Dict[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Join the fighter name onto a processed row and pick its document ID.
+    
+    Args:
+        processed_data: Output of process_csv_row or ColumnPlan.transform
+        row_number: 1-based position of the row in the CSV file
+        fighter_names: Dictionary mapping fighterCode to fighterName
+        
+    Returns:
+        Tuple of (document_id, processed_data)
+    """
+    # Add fighter name if available
+    fighter_code = processed_data.get('fighterCode')
+    if fighter_code and fighter_code in fighter_names:
+        processed_data['fighterName'] = fighter_names[fighter_code]
+    
+    # Use the _id field as document ID if available, otherwise auto-generate
+    document_id = processed_data.get('_id')
+    if not document_id:
+        # If no _id, use fighterCode or auto-generate
+        document_id = processed_data.get('fighterCode', f"fighter_{row_number}")
+    
+    # Remove _id from data since it's used as document ID
+    if '_id' in processed_data:
+        del processed_data['_id']
+    
+    return str(document_id), processed_data
+
+def iter_upload_records(records: Iterable[Tuple[int, List[str], int]], plan: ColumnPlan,
+                        build_document: Callable[[Dict[str, Any], int], Tuple[str, Dict[str, Any]]],
+                        metrics: Optional[RunMetrics] = None,
+                        fan_out: Optional[Callable[[str, Dict[str, Any]], List[Tuple[str, Dict[str, Any]]]]] = None
+                        ) -> Iterator[UploadRecord]:
+    """
+    Transform streamed CSV records into upload records.
+    
+    Rows that fail to transform are yielded with the error set so the
+    caller can account for them in the batch they belong to.
+    
+    Args:
+        records: Iterable of (row_number, values, offset) tuples
+        plan: Column plan compiled for the file's header
+        build_document: Callable turning (processed_data, row_number) into (document_id, data)
+        metrics: Run metrics receiving 'transform', 'build_document' and 'fan_out' stage times
+        fan_out: Callable turning (document_id, data) into extra (document_id, data) pairs
+            written alongside the row's document; it may also trim the row's document
+        
+    Yields:
+        UploadRecord for every input row, preceded by its fanned-out documents
+    """
+    previous_row, previous_offset = 0, 0
+    for row_number, values, offset in records:
+        try:
+            if metrics is None:
+                document_id, processed_data = build_document(plan.transform(values), row_number)
+                children = fan_out(document_id, processed_data) if fan_out is not None else ()
+            else:
+                metrics.count('rows')
+                with metrics.stage('transform'):
+                    processed_data = plan.transform(values)
+                with metrics.stage('build_document'):
+                    document_id, processed_data = build_document(processed_data, row_number)
+                children = ()
+                if fan_out is not None:
+                    with metrics.stage('fan_out'):
+                        children = fan_out(document_id, processed_data)
+        except Exception as e:
+            yield UploadRecord(row_number, offset, None, None, str(e))
+        else:
+            # Fanned-out documents carry the previous row's position, so the checkpoint
+            # only passes this row once the batch holding the row's own document commits
+            for child_id, child_data in children:
+                yield UploadRecord(previous_row, previous_offset, child_id, child_data, None)
+            yield UploadRecord(row_number, offset, document_id, processed_data, None)
+        previous_row, previous_offset = row_number, offset
+
+def iter_delta_records(records: Iterable[UploadRecord], manifest: Dict[str, Dict[str, str]],
+                       delete_missing: bool = False, stats: Optional[Dict[str, int]] = None) -> Iterator[UploadRecord]:
+    """
+    Filter upload records down to the writes needed to bring Firestore in line with the CSV.
+    
+    New documents are written in full, changed documents only have their
+    changed top-level fields written (removed fields are deleted), and
+    unchanged documents are skipped. With delete_missing, documents in the
+    manifest that no longer have a row are deleted once the input is exhausted.
+    
+    Args:
+        records: Iterable of upload records
+        manifest: Dictionary mapping document ID to {field: hash} from the last run
+        delete_missing: Delete documents whose rows disappeared
+        stats: Optional dictionary updated with new/changed/unchanged/deleted counts
+        
+    Yields:
+        Records that need to be written
+    """
+    if stats is None:
+        stats = {}
+    for key in ('new', 'changed', 'unchanged', 'deleted'):
+        stats.setdefault(key, 0)
+    
+    seen = set()
+    last_offset = 0
+    
+    for record in records:
+        last_offset = record.offset
+        if record.error is not None:
+            yield record
+            continue
+        
+        seen.add(record.document_id)
+        hashes = hash_document_fields(record.data)
+        previous = manifest.get(record.document_id)
+        
+        if previous is None:
+            stats['new'] += 1
+            yield record._replace(hashes=hashes)
+            continue
+        
+        changed_fields = diff_fields(previous, hashes)
+        if not changed_fields:
+            stats['unchanged'] += 1
+            continue
+        
+        stats['changed'] += 1
+        deleted = delete_field()
+        partial_data = {field: record.data.get(field, deleted) for field in sorted(changed_fields)}
+        yield record._replace(data=partial_data, merge_fields=sorted(changed_fields), hashes=hashes)
+    
+    if delete_missing:
+        for document_id in sorted(set(manifest) - seen):
+            stats['deleted'] += 1
+            yield UploadRecord(0, last_offset, document_id, None, None, operation='delete')
+
+def apply_committed_record(manifest: Dict[str, Dict[str, str]], record: UploadRecord):
+    """Update the manifest for a record whose write has been committed."""
+    if record.operation == 'delete':
+        manifest.pop(record.document_id, None)
+    elif record.hashes is not None:
+        manifest[record.document_id] = record.hashes
+
+def iter_aggregated_records(records: Iterable[UploadRecord], aggregators: Sequence[Any]) -> Iterator[UploadRecord]:
+    """
+    Feed every built document to aggregators, passing the records through unchanged.
+    
+    Aggregators see full documents, so this runs before delta filtering.
+    
+    Args:
+        records: Iterable of upload records
+        aggregators: Objects with add(document_id, data) and documents() methods
+        
+    Yields:
+        The input records
+    """
+    for record in records:
+        if record.error is None and record.operation == 'set':
+            for aggregator in aggregators:
+                aggregator.add(record.document_id, record.data)
+        yield record
+
+def iter_size_checked_records(records: Iterable[UploadRecord], collection_name: str,
+                               max_document_bytes: int = MAX_DOCUMENT_BYTES) -> Iterator[UploadRecord]:
+    """
+    Attach an encoded-size estimate to each record and reject oversized documents.
+    
+    Documents over the per-document limit would fail the whole batch they
+    are in, so they are turned into error records before batching.
+    
+    Args:
+        records: Iterable of upload records
         collection_name: Name of the Firestore collection
-        batch_size: Number of documents to upload in each batch
+        max_document_bytes: Per-document size limit
+        
+    Yields:
+        Records with size set
+    """
+    for record in records:
+        if record.error is not None:
+            yield record
+        elif record.operation == 'delete':
+            yield record._replace(size=estimate_document_name_size(collection_name, record.document_id))
+        else:
+            size = estimate_document_size(collection_name, record.document_id, record.data)
+            if size > max_document_bytes:
+                yield record._replace(error=f"document {record.document_id} is {size} bytes, over the {max_document_bytes} byte limit")
+            else:
+                yield record._replace(size=size)
+
+def iter_batches(records: Iterable[UploadRecord], batch_size: int = MAX_BATCH_OPERATIONS,
+                 max_batch_bytes: int = MAX_BATCH_BYTES) -> Iterator[List[UploadRecord]]:
     """
-    # Initialize Firebase
-    initialize_firebase()
+    Pack upload records into batches bounded by operation count and encoded size.
     
-    # Get Firestore client
-    db = get_firestore_client()
-    collection_ref = db.collection(collection_name)
+    Only one batch is held in memory at a time, so memory use stays flat
+    regardless of the size of the source file. Records without a size
+    estimate count as zero bytes.
     
-    # Load fighter names
-    fighter_names_csv_path = "oldData/FighterNames.csv"
-    fighter_names = load_fighter_names(fighter_names_csv_path)
+    Args:
+        records: Iterable of upload records
+        batch_size: Maximum number of write operations per batch
+        max_batch_bytes: Maximum estimated payload bytes per batch
+        
+    Yields:
+        Lists of records
+    """
+    batch_size = min(batch_size, MAX_BATCH_OPERATIONS)
+    chunk = []
+    operations = 0
+    payload_bytes = 0
     
-    # Check if CSV file exists
-    if not os.path.exists(csv_file_path):
-        print(f"❌ CSV file not found: {csv_file_path}")
-        sys.exit(1)
+    for record in records:
+        if record.error is None:
+            if chunk and (operations + 1 > batch_size or payload_bytes + record.size > max_batch_bytes):
+                yield chunk
+                chunk = []
+                operations = 0
+                payload_bytes = 0
+            operations += 1
+            payload_bytes += record.size
+        chunk.append(record)
+    
+    if chunk:
+        yield chunk
+
+def preflight_document_sizes(csv_file_path: str, collection_name: str = 'fighterData', top: int = 10,
+                             max_document_bytes: int = MAX_DOCUMENT_BYTES, max_batch_bytes: int = MAX_BATCH_BYTES):
+    """
+    Report encoded document sizes for a CSV without connecting to Firestore.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        collection_name: Name of the Firestore collection
+        top: Number of largest documents to list
+        max_document_bytes: Per-document size limit
+        max_batch_bytes: Maximum estimated payload bytes per batch
+    """
+    fighter_names = load_fighter_names("oldData/FighterNames.csv")
+    plan, csv_records = plan_cached_csv(csv_file_path)
+    build_document = lambda processed_data, row_number: build_fighter_document(processed_data, row_number, fighter_names)
+    records = iter_size_checked_records(iter_upload_records(csv_records, plan, build_document), collection_name, max_document_bytes)
+    
+    sizes = []
+    oversized = []
+    batch_count = 0
+    for batch_records in iter_batches(records, MAX_BATCH_OPERATIONS, max_batch_bytes):
+        batch_count += 1
+        for record in batch_records:
+            if record.error is None:
+                sizes.append((record.size, record.document_id))
+            else:
+                oversized.append(f"Row {record.row_number}: {record.error}")
+    
+    sizes.sort(reverse=True)
+    total_bytes = sum(size for size, _ in sizes)
+    print(f"📏 {len(sizes)} documents, {total_bytes} bytes total, {batch_count} batches")
+    if sizes:
+        print(f"   Average: {total_bytes // len(sizes)} bytes, largest: {sizes[0][0]} bytes")
+        for size, document_id in sizes[:top]:
+            print(f"   - {document_id}: {size} bytes ({size / max_document_bytes * 100:.1f}% of limit)")
+    if oversized:
+        print(f"❌ {len(oversized)} rows cannot be uploaded:")
+        for error in oversized:
+            print(f"   - {error}")
+
+class BatchResult(NamedTuple):
+    """Outcome of committing one batch of upload records."""
+    batch_number: int
+    first_row: int
+    last_row: int
+    offset: int
+    success_count: int
+    errors: List[str]
+    commit_error: Optional[str]
+    committed: List[UploadRecord]
+    failed: List[Tuple[UploadRecord, str]]
+    commits: int
+
+def commit_records(db, collection_ref, records: Sequence[UploadRecord], scheduler: Optional[WriteScheduler] = None,
+                   metrics: Optional[RunMetrics] = None):
+    """
+    Commit a group of records in a single batch request.
+    
+    Args:
+        db: Firestore client
+        collection_ref: Target collection reference
+        records: Records to write
+        scheduler: Write scheduler that paces the commit and is told about throttling
+        metrics: Run metrics receiving commit latency, rate-limit waits and write counts
+    """
+    batch = db.batch()
+    for record in records:
+        stage_record_write(batch, collection_ref.document(record.document_id), record)
     
-    print(f"📁 Reading CSV file: {csv_file_path}")
-    print(f"⚡ Using batch size: {batch_size}")
+    if scheduler is not None:
+        waited = scheduler.acquire(len(records))
+        if metrics is not None and waited:
+            metrics.count('rate_waits')
+            metrics.observe('rate_wait', waited)
     
+    started = time.perf_counter()
     try:
-        with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
-            # Read CSV with DictReader to get column names
-            reader = csv.DictReader(csvfile)
-            
-            # Get total number of rows for progress tracking
-            rows = list(reader)
-            total_rows = len(rows)
-            
-            print(f"📊 Found {total_rows} rows to upload")
+        batch.commit()
+    except Exception as e:
+        if scheduler is not None and is_throttling_error(e):
+            scheduler.record_throttle()
+        if metrics is not None:
+            metrics.count('commit_errors')
+            metrics.count('throttled_commits', int(is_throttling_error(e)))
+            metrics.observe('commit', time.perf_counter() - started)
+        raise
+    
+    if metrics is not None:
+        metrics.count('commits')
+        metrics.count('writes', len(records))
+        metrics.observe('commit', time.perf_counter() - started)
+
+def commit_batch(db, collection_ref, batch_number: int, batch_records: List[UploadRecord],
+                 retry_policy: RetryPolicy = RetryPolicy(), scheduler: Optional[WriteScheduler] = None,
+                 metrics: Optional[RunMetrics] = None) -> BatchResult:
+    """
+    Commit one batch of upload records, retrying and bisecting on failure.
+    
+    Transient errors are retried with jittered exponential backoff; batches
+    that fail permanently are split to isolate the bad documents, reusing
+    the already transformed payloads.
+    
+    Safe to call from worker threads; the Firestore client is shared.
+    
+    Args:
+        db: Firestore client
+        collection_ref: Target collection reference
+        batch_number: 1-based batch sequence number
+        batch_records: Records to write in this batch
+        retry_policy: Backoff settings
+        scheduler: Write scheduler shared by all commits of the upload
+        metrics: Run metrics receiving commit latency and counts
+        
+    Returns:
+        BatchResult with per-batch success and error accounting
+    """
+    failed = []
+    batch_writes = []
+    
+    for record in batch_records:
+        if record.error is not None:
+            failed.append((record, record.error))
+        else:
+            batch_writes.append(record)
+    
+    outcome = commit_with_bisect(batch_writes, lambda group: commit_records(db, collection_ref, group, scheduler, metrics),
+                                 retry_policy)
+    failed.extend(outcome.failed)
+    batch_errors = [f"Row {record.row_number}: {error}" for record, error in failed]
+    
+    return BatchResult(
+        batch_number,
+        batch_records[0].row_number,
+        batch_records[-1].row_number,
+        batch_records[-1].offset,
+        len(outcome.committed),
+        batch_errors,
+        outcome.first_error,
+        outcome.committed,
+        failed,
+        outcome.commits,
+    )
+
+def iter_committed_batches(db, collection_ref, batches: Iterable[List[UploadRecord]], max_in_flight: int = 4,
+                           retry_policy: RetryPolicy = RetryPolicy(), scheduler: Optional[WriteScheduler] = None,
+                           metrics: Optional[RunMetrics] = None) -> Iterator[BatchResult]:
+    """
+    Commit batches on a thread pool, keeping at most max_in_flight batches outstanding.
+    
+    The source iterator is only advanced when a slot is free, so reading
+    and transforming the CSV is throttled by commit throughput and memory
+    stays bounded to max_in_flight batches.
+    
+    Args:
+        db: Firestore client
+        collection_ref: Target collection reference
+        batches: Iterable of record batches
+        max_in_flight: Maximum number of concurrent batch commits
+        retry_policy: Backoff settings for failed commits
+        scheduler: Write scheduler shared by all commits of the upload
+        metrics: Run metrics receiving commit latency and counts
+        
+    Yields:
+        BatchResult for each batch, in completion order
+    """
+    max_in_flight = max(1, max_in_flight)
+    
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        in_flight = set()
+        
+        for batch_number, batch_records in enumerate(batches, 1):
+            # Backpressure: wait for a free slot before reading more rows
+            while len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
             
-            # Process rows in batches
-            success_count = 0
-            error_count = 0
-            batch_count = 0
+            in_flight.add(executor.submit(commit_batch, db, collection_ref, batch_number, batch_records,
+                                          retry_policy, scheduler, metrics))
+        
+        for future in as_completed(in_flight):
+            yield future.result()
+
+def upload_with_bulk_writer(db, collection_ref, records: Iterable[UploadRecord], max_attempts: int = 5,
+                            on_committed: Optional[Callable[[UploadRecord], None]] = None,
+                            scheduler: Optional[WriteScheduler] = None,
+                            metrics: Optional[RunMetrics] = None) -> Tuple[int, List[Tuple[UploadRecord, str]]]:
+    """
+    Upload records using Firestore's BulkWriter.
+    
+    BulkWriter batches, parallelizes and rate-limits writes internally and
+    retries failed operations, so this mode needs no explicit batching.
+    
+    Args:
+        db: Firestore client
+        collection_ref: Target collection reference
+        records: Iterable of upload records
+        max_attempts: Attempts per document before it is reported as failed
+        on_committed: Called with each record once its write succeeds
+        scheduler: Write scheduler that paces enqueued writes and is told about throttling
+        metrics: Run metrics receiving 'enqueue' and 'flush' stage times and write counts
+        
+    Returns:
+        Tuple of (success_count, failed) where failed lists (record, error) pairs
+    """
+    lock = threading.Lock()
+    success_count = 0
+    failed = []
+    pending = {}
+    
+    def on_write_result(reference, write_result, bulk_writer):
+        nonlocal success_count
+        with lock:
+            success_count += 1
+            record = pending.pop(reference.path, None)
+            if on_committed is not None and record is not None:
+                on_committed(record)
+    
+    def on_write_error(failure, bulk_writer) -> bool:
+        if scheduler is not None and failure.code in throttling_status_codes():
+            scheduler.record_throttle()
+        if failure.attempts < max_attempts:
+            return True
+        reference = failure.operation.reference
+        with lock:
+            record = pending.pop(reference.path, None)
+            if record is None:
+                record = UploadRecord(0, 0, reference.id, None, None)
+            failed.append((record, f"code {failure.code}: {failure.message}"))
+        return False
+    
+    writer = db.bulk_writer()
+    writer.on_write_result(on_write_result)
+    writer.on_write_error(on_write_error)
+    
+    for record in records:
+        if record.error is not None:
+            failed.append((record, record.error))
+            continue
+        doc_ref = collection_ref.document(record.document_id)
+        with lock:
+            pending[doc_ref.path] = record
+        if scheduler is not None:
+            scheduler.acquire(1)
+        if metrics is None:
+            stage_record_write(writer, doc_ref, record)
+        else:
+            with metrics.stage('enqueue'):
+                stage_record_write(writer, doc_ref, record)
+    
+    if metrics is None:
+        writer.close()
+    else:
+        with metrics.stage('flush'):
+            writer.close()
+        metrics.count('writes', success_count)
+    return success_count, failed
+
+def publish_derived_documents(db, aggregators: Sequence[Any], retry_policy: RetryPolicy = RetryPolicy(),
+                              scheduler: Optional[WriteScheduler] = None, metrics: Optional[RunMetrics] = None,
+                              log: Callable[[str], None] = print, leading: bool = False) -> Tuple[int, List[str]]:
+    """
+    Write the documents built by aggregators, such as snapshots and indexes.
+    
+    Aggregators with a published(failed) method are told which of their
+    documents failed once the writes have been attempted, so they can
+    persist what was written. With leading set, the documents returned by
+    leading_documents() are written instead; these are documents the
+    uploaded rows refer to, such as a shared vocabulary, and go out before
+    the first row.
+    
+    Args:
+        db: Firestore client
+        aggregators: Objects whose documents() method returns (collection, document_id, data) tuples
+        retry_policy: Backoff settings for failed commits
+        scheduler: Write scheduler shared with the upload
+        metrics: Run metrics receiving commit latency and counts
+        log: Function used to print progress messages
+        leading: Publish the leading_documents() of the aggregators that have that method
+        
+    Returns:
+        Tuple of (published_count, errors)
+    """
+    documents_by_collection = {}
+    for aggregator in aggregators:
+        build_documents = getattr(aggregator, 'leading_documents', None) if leading else aggregator.documents
+        for collection_name, document_id, data in (build_documents() if build_documents is not None else ()):
+            documents_by_collection.setdefault(collection_name, []).append((document_id, data))
+    
+    published = 0
+    errors = []
+    failed_documents = set()
+    for collection_name, documents in documents_by_collection.items():
+        records = (UploadRecord(0, 0, document_id, data, None) for document_id, data in documents)
+        batches = iter_batches(iter_size_checked_records(records, collection_name))
+        for batch_number, batch_records in enumerate(batches, 1):
+            result = commit_batch(db, db.collection(collection_name), batch_number, batch_records,
+                                  retry_policy, scheduler, metrics)
+            published += result.success_count
+            errors.extend(f"{collection_name}/{record.document_id}: {error}" for record, error in result.failed)
+            failed_documents.update((collection_name, record.document_id) for record, _ in result.failed)
+    
+    if leading and not published and not errors:
+        return published, errors
+    for aggregator in aggregators:
+        on_published = getattr(aggregator, 'published', None)
+        if on_published is not None and not leading:
+            on_published(failed_documents)
+    
+    log(f"🧮 Published {published} {'leading ' if leading else ''}derived documents" + (f", {len(errors)} failed" if errors else ''))
+    for error in errors:
+        log(f"   - {error}")
+    return published, errors
+
+def dead_letter_entry(collection_name: str, record: UploadRecord, error: str) -> Dict[str, Any]:
+    """Build the dead-letter file entry for a permanently failed record."""
+    return {
+        'collection': collection_name,
+        'row_number': record.row_number,
+        'document_id': record.document_id,
+        'operation': record.operation,
+        'error': error,
+        'data': record.data,
+    }
+
+def print_normalization_report(report: Optional[NormalizationReport], metrics: RunMetrics,
+                               log: Callable[[str], None] = print):
+    """Print the normalized columns and unparseable values of a run and add them to its metrics."""
+    if report is None:
+        return
+    metrics.info['normalization'] = report.as_dict()
+    for line in report.lines():
+        log(line)
+
+def print_delta_stats(delta_stats: Dict[str, int], log: Callable[[str], None] = print):
+    """Print the new/changed/unchanged/deleted counts from a delta run."""
+    log(f"🧾 Delta: {delta_stats.get('new', 0)} new, {delta_stats.get('changed', 0)} changed, "
+        f"{delta_stats.get('unchanged', 0)} unchanged, {delta_stats.get('deleted', 0)} deleted")
+
+def finish_run_metrics(metrics: RunMetrics, metrics_path: str, scheduler: WriteScheduler,
+                       delta_stats: Dict[str, int], log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """
+    Stop a run's metrics, add the scheduler and delta totals, write them and print a short summary.
+    
+    Returns:
+        The metrics that were written
+    """
+    metrics.finish()
+    metrics.info['scheduler'] = scheduler.stats()
+    if delta_stats:
+        metrics.info['delta'] = dict(delta_stats)
+    run_metrics = metrics.write(metrics_path)
+    
+    commit_latency = run_metrics['histograms'].get('commit')
+    log(f"⏱️  {run_metrics['elapsed_seconds']:.2f}s, {run_metrics['rows_per_second'] or 0:.0f} rows/s, "
+        f"{(run_metrics['bytes_per_second'] or 0) / 1024:.0f} KiB/s"
+        + (f", commit p50 {commit_latency['p50_ms']}ms p99 {commit_latency['p99_ms']}ms" if commit_latency else ''))
+    log(f"⏱️  Stages: {metrics.describe_stages()} (metrics in {metrics_path})")
+    return run_metrics
+
+class UploadError(Exception):
+    """Raised when an upload cannot start or continue."""
+
+class UploadSummary(NamedTuple):
+    """Totals for one CSV upload."""
+    collection: str
+    success_count: int
+    error_count: int
+    batch_count: int
+    commit_count: int
+    metrics: Optional[Dict[str, Any]] = None
+
+def upload_csv_batch(db, csv_file_path: str, collection_name: str,
+                     build_document: Callable[[Dict[str, Any], int], Tuple[str, Dict[str, Any]]],
+                     categorize: bool = True, batch_size: int = 500, max_in_flight: int = 4,
+                     use_bulk_writer: bool = False, delta: bool = False, delete_missing: bool = False,
+                     manifest_path: Optional[str] = None, max_batch_bytes: int = MAX_BATCH_BYTES,
+                     retry_policy: RetryPolicy = RetryPolicy(), dead_letter_path: Optional[str] = None,
+                     resume: bool = False, journal_path: Optional[str] = None, state_name: Optional[str] = None,
+                     scheduler: Optional[WriteScheduler] = None, quiet: bool = False,
+                     metrics_path: Optional[str] = None, profile_path: Optional[str] = None,
+                     trace_memory: bool = False, aggregators: Sequence[Any] = (),
+                     formats: Sequence[ValueFormat] = (),
+                     fan_out: Optional[Callable[[str, Dict[str, Any]], List[Tuple[str, Dict[str, Any]]]]] = None,
+                     transform_workers: int = 1, log: Callable[[str], None] = print) -> UploadSummary:
+    """
+    Upload a CSV file to a Firestore collection using batch operations.
+    
+    Rows are streamed through read -> transform -> build_document -> batch
+    assembly -> commit. Up to max_in_flight batches are committed
+    concurrently, so throughput scales with write quota rather than
+    round-trip latency.
+    
+    Args:
+        db: Firestore client
+        csv_file_path: Path to the CSV file
+        collection_name: Name of the Firestore collection
+        build_document: Callable turning (processed_data, row_number) into (document_id, data);
+            document IDs may contain '/' to address subcollection documents
+        categorize: Nest known stat fields into category maps
+        batch_size: Maximum number of documents to upload in each batch
+        max_in_flight: Number of batches committed concurrently
+        use_bulk_writer: Use Firestore's BulkWriter instead of explicit batches
+        delta: Only write documents that changed since the last successful run
+        delete_missing: In delta mode, delete documents whose rows disappeared
+        manifest_path: Manifest file for delta mode (defaults to one per state_name)
+        max_batch_bytes: Maximum estimated payload bytes per batch
+        retry_policy: Backoff settings for failed commits
+        dead_letter_path: NDJSON file for rows that fail permanently (defaults to one per state_name)
+        resume: Continue from the checkpoint journal of an interrupted run
+        journal_path: Checkpoint journal file (defaults to one per state_name)
+        state_name: Name used for the default manifest, journal and dead-letter files
+            (defaults to collection_name)
+        scheduler: Write scheduler pacing every commit; pass one scheduler to several
+            uploads to share a write budget (a new one with default settings if None)
+        quiet: Only print warnings, errors and the final summary
+        metrics_path: File receiving the run metrics (defaults to one NDJSON file per state_name);
+            paths ending in .json are overwritten instead of appended to
+        profile_path: If set, profile the pipeline thread with cProfile and write the stats here
+        trace_memory: Record the top allocation sites with tracemalloc
+        aggregators: Objects with add(document_id, data) and documents() methods; every
+            document is fed to them and the documents they build are published at the end
+            (skipped when resuming, since the resumed run does not see every row). The
+            documents of an optional leading_documents() method are published before the first row
+        formats: Display formats (percentages, heights, Yes/No, dates) to normalize into
+            typed values; values that do not parse are kept as text and reported
+        fan_out: Callable turning (document_id, data) into extra (document_id, data) pairs,
+            such as subcollection documents split out of a wide row
+        transform_workers: Processes parsing and transforming the CSV (1 to transform
+            in the pipeline thread); document building stays in this process
+        log: Function used to print progress messages
+        
+    Returns:
+        UploadSummary with the upload totals and run metrics
+        
+    Raises:
+        UploadError: If the CSV file is missing or the upload cannot be resumed
+    """
+    collection_ref = db.collection(collection_name)
+    state_name = state_name or collection_name
+    scheduler = scheduler or WriteScheduler()
+    
+    # Check if CSV file exists
+    if not os.path.exists(csv_file_path):
+        raise UploadError(f"CSV file not found: {csv_file_path}")
+    
+    # File size is used for a cheap byte-offset progress estimate
+    total_bytes = os.path.getsize(csv_file_path) or 1
+    dead_letter_path = dead_letter_path or default_dead_letter_path(state_name)
+    
+    # Checkpoint journal: record how far all batches have been committed
+    journal_path = journal_path or default_journal_path(state_name)
+    fingerprint = file_fingerprint(csv_file_path)
+    journal = load_journal(journal_path) if resume else None
+    if journal is not None:
+        if not same_contents(journal['source'], fingerprint):
+            raise UploadError(f"Cannot resume: {csv_file_path} has changed since journal {journal_path} was written")
+        if journal.get('complete'):
+            log(f"✅ Journal {journal_path} shows this file was already fully uploaded")
+            return UploadSummary(collection_name, 0, 0, 0, 0)
+        if use_bulk_writer:
+            raise UploadError("Cannot resume with BulkWriter: it does not commit in resumable order")
+        log(f"⏩ Resuming after row {journal['committed_row']} (byte {journal['committed_offset']})")
+        if delete_missing:
+            log("⚠️  Skipping deletion of missing documents: a resumed run does not see every row")
+            delete_missing = False
+    else:
+        if resume:
+            log(f"⚠️  No journal found at {journal_path}, starting from the beginning")
+        journal = new_journal(collection_name, fingerprint)
+    watermark = BatchWatermark(journal['committed_row'], journal['committed_offset'])
+    watermark_start_offset = watermark.offset
+    resumed_batches = journal['committed_batches']
+    
+    log(f"📁 Reading CSV file: {csv_file_path} ({total_bytes} bytes)")
+    if use_bulk_writer:
+        log("⚡ Using BulkWriter")
+    else:
+        log(f"⚡ Using batch size: {batch_size} (up to {max_batch_bytes} bytes), {max_in_flight} batches in flight")
+    log(f"🚦 Write rate: {scheduler.describe()}")
+    if transform_workers > 1:
+        log(f"🧵 Transforming rows in {transform_workers} worker processes")
+    
+    metrics_path = metrics_path or default_metrics_path(state_name)
+    metrics = RunMetrics(state_name, profile_path, trace_memory)
+    metrics.info.update({'collection': collection_name, 'source': csv_file_path, 'delta': delta,
+                         'bulk_writer': use_bulk_writer, 'resumed_from_row': watermark.row_number,
+                         'transform_workers': transform_workers})
+    metrics.start()
+    
+    with metrics.stage('plan'):
+        if transform_workers > 1:
+            # Workers return processed rows; the ParallelTransform passes them through in place of the plan
+            plan = ParallelTransform(csv_file_path, transform_workers, watermark.row_number, watermark.offset,
+                                     categorize, formats)
+            csv_records = plan.records()
+        else:
+            plan, csv_records = plan_cached_csv(csv_file_path, watermark.row_number, watermark.offset,
+                                                categorize, formats)
+    records = iter_upload_records(metrics.timed_iter('read', csv_records), plan, build_document, metrics, fan_out)
+    if aggregators:
+        records = metrics.timed_iter('aggregate', iter_aggregated_records(records, aggregators))
+    
+    if aggregators and not watermark_start_offset:
+        # Documents the rows refer to go out first, so readers never see a row without them
+        with metrics.stage('publish'):
+            publish_derived_documents(db, aggregators, retry_policy, scheduler, metrics, log, leading=True)
+    
+    manifest = None
+    delta_stats = {}
+    if delta:
+        manifest_path = manifest_path or default_manifest_path(state_name)
+        manifest = load_manifest(manifest_path)
+        log(f"🧾 Delta mode: {len(manifest)} documents in manifest {manifest_path}")
+        records = metrics.timed_iter('delta', iter_delta_records(records, manifest, delete_missing, delta_stats))
+    
+    # Documents over the per-document limit are reported instead of failing their batch
+    records = metrics.timed_iter('size_check', iter_size_checked_records(records, collection_name))
+    
+    if use_bulk_writer:
+        # BulkWriter commits in no particular order, so no journal is kept
+        on_committed = (lambda record: apply_committed_record(manifest, record)) if delta else None
+        success_count, failed = upload_with_bulk_writer(db, collection_ref, records, on_committed=on_committed,
+                                                         scheduler=scheduler, metrics=metrics)
+        with metrics.stage('checkpoint'):
+            if delta:
+                save_manifest(manifest_path, manifest)
+            write_dead_letters(dead_letter_path, [dead_letter_entry(collection_name, record, error) for record, error in failed])
+        if delta:
+            print_delta_stats(delta_stats, log)
+        if aggregators:
+            with metrics.stage('publish'):
+                publish_derived_documents(db, aggregators, retry_policy, scheduler, metrics, log)
+        metrics.count('bytes', total_bytes)
+        metrics.count('errors', len(failed))
+        print_normalization_report(plan.report, metrics, log)
+        run_metrics = finish_run_metrics(metrics, metrics_path, scheduler, delta_stats, log)
+        
+        log(f"\n🎉 Upload completed!")
+        log(f"✅ Successfully uploaded: {success_count} documents")
+        if failed:
+            log(f"❌ Failed uploads: {len(failed)} documents (written to {dead_letter_path})")
+            for record, error in failed:
+                log(f"   - Row {record.row_number}: {error}")
+        else:
+            log(f"🎯 All documents uploaded successfully!")
+        return UploadSummary(collection_name, success_count, len(failed), 0, 0, run_metrics)
+    
+    # Process rows in batches
+    success_count = 0
+    error_count = 0
+    batch_count = 0
+    commit_count = 0
+    retried_batches = 0
+    max_offset = watermark.offset
+    
+    batches = metrics.timed_iter('batch', iter_batches(records, batch_size, max_batch_bytes))
+    results = iter_committed_batches(db, collection_ref, batches, max_in_flight, retry_policy, scheduler, metrics)
+    for result in metrics.timed_iter('commit_wait', results):
+        batch_count += 1
+        commit_count += result.commits
+        success_count += result.success_count
+        error_count += len(result.errors)
+        max_offset = max(max_offset, result.offset)
+        
+        with metrics.stage('checkpoint'):
+            # Only committed writes are recorded, so an interrupted run never marks unwritten data as synced
+            if delta and result.committed:
+                for record in result.committed:
+                    apply_committed_record(manifest, record)
+                save_manifest(manifest_path, manifest)
             
-            for i in range(0, total_rows, batch_size):
-                batch_count += 1
-                batch_end = min(i + batch_size, total_rows)
-                batch_rows = rows[i:batch_end]
-                
-                print(f"\n🔄 Processing batch {batch_count} (rows {i+1}-{batch_end})")
-                
-                # Create a new batch
-                batch = db.batch()
-                batch_errors = []
-                
-                for j, row in enumerate(batch_rows):
-                    try:
-                        # Process the row
-                        processed_data = process_csv_row(row)
-                        
-                        # Add fighter name if available
-                        fighter_code = processed_data.get('fighterCode')
-                        if fighter_code and fighter_code in fighter_names:
-                            processed_data['fighterName'] = fighter_names[fighter_code]
-                        
-                        # Use the _id field as document ID if available, otherwise auto-generate
-                        document_id = processed_data.get('_id')
-                        if not document_id:
-                            # If no _id, use fighterCode or auto-generate
-                            document_id = processed_data.get('fighterCode', f"fighter_{i+j+1}")
-                        
-                        # Remove _id from data since it's used as document ID
-                        if '_id' in processed_data:
-                            del processed_data['_id']
-                        
-                        # Add to batch
-                        doc_ref = collection_ref.document(str(document_id))
-                        batch.set(doc_ref, processed_data)
-                        
-                    except Exception as e:
-                        error_count += 1
-                        batch_errors.append(f"Row {i+j+1}: {e}")
-                        continue
-                
-                # Commit the batch
-                try:
-                    batch.commit()
-                    batch_success = len(batch_rows) - len(batch_errors)
-                    success_count += batch_success
-                    
-                    print(f"✅ Batch {batch_count} committed: {batch_success} successful, {len(batch_errors)} errors")
-                    
-                    if batch_errors:
-                        print("   Errors in this batch:")
-                        for error in batch_errors:
-                            print(f"   - {error}")
-                    
-                except Exception as e:
-                    error_count += len(batch_rows)
-                    print(f"❌ Batch {batch_count} failed: {e}")
-                    print("   All rows in this batch will be retried individually")
-                    
-                    # Retry individual documents
-                    for j, row in enumerate(batch_rows):
-                        try:
-                            processed_data = process_csv_row(row)
-                            
-                            # Add fighter name if available
-                            fighter_code = processed_data.get('fighterCode')
-                            if fighter_code and fighter_code in fighter_names:
-                                processed_data['fighterName'] = fighter_names[fighter_code]
-                            
-                            document_id = processed_data.get('_id')
-                            if not document_id:
-                                document_id = processed_data.get('fighterCode', f"fighter_{i+j+1}")
-                            
-                            if '_id' in processed_data:
-                                del processed_data['_id']
-                            
-                            doc_ref = collection_ref.document(str(document_id))
-                            doc_ref.set(processed_data)
-                            success_count += 1
-                            error_count -= 1  # Adjust error count
-                            
-                        except Exception as retry_error:
-                            print(f"   ❌ Retry failed for row {i+j+1}: {retry_error}")
-                
-                # Print overall progress
-                progress = batch_end / total_rows * 100
-                print(f"📈 Overall Progress: {batch_end}/{total_rows} ({progress:.1f}%) - Success: {success_count}, Errors: {error_count}")
+            # Permanently failed rows are kept for inspection
+            write_dead_letters(dead_letter_path, [dead_letter_entry(collection_name, record, error) for record, error in result.failed])
             
-            print(f"\n🎉 Upload completed!")
-            print(f"✅ Successfully uploaded: {success_count} documents")
-            print(f"📦 Processed in {batch_count} batches")
-            if error_count > 0:
-                print(f"❌ Failed uploads: {error_count} documents")
-            else:
-                print(f"🎯 All documents uploaded successfully!")
-                
+            # Checkpoint once every batch up to this point has completed
+            if watermark.complete(result.batch_number, result.last_row, result.offset):
+                journal['committed_row'] = watermark.row_number
+                journal['committed_offset'] = watermark.offset
+                journal['committed_batches'] = resumed_batches + watermark.batches
+                save_journal(journal_path, journal)
+        
+        if result.commit_error is not None:
+            retried_batches += 1
+            log(f"⚠️  Batch {result.batch_number} (rows {result.first_row}-{result.last_row}) hit errors: {result.commit_error}")
+            log(f"   After {result.commits} commits with backoff/bisection: {result.success_count} successful, {len(result.errors)} errors")
+        elif not quiet:
+            log(f"✅ Batch {result.batch_number} (rows {result.first_row}-{result.last_row}) committed: {result.success_count} successful, {len(result.errors)} errors")
+        
+        if result.errors:
+            log("   Errors in this batch:")
+            for error in result.errors:
+                log(f"   - {error}")
+        
+        # Print overall progress, estimated from the bytes read so far
+        if quiet:
+            continue
+        progress = min(max_offset / total_bytes * 100, 100.0)
+        log(f"📈 Overall Progress: ~{progress:.1f}% - Success: {success_count}, Errors: {error_count} - Rate: {scheduler.describe()}")
+    
+    journal['complete'] = True
+    save_journal(journal_path, journal)
+    
+    if delta:
+        print_delta_stats(delta_stats, log)
+    if aggregators and watermark_start_offset:
+        log("⚠️  Skipping derived documents: a resumed run does not see every row")
+    elif aggregators:
+        with metrics.stage('publish'):
+            publish_derived_documents(db, aggregators, retry_policy, scheduler, metrics, log)
+    metrics.count('bytes', max_offset - watermark_start_offset)
+    metrics.count('batches', batch_count)
+    metrics.count('errors', error_count)
+    print_normalization_report(plan.report, metrics, log)
+    run_metrics = finish_run_metrics(metrics, metrics_path, scheduler, delta_stats, log)
+    
+    log(f"\n🎉 Upload completed!")
+    log(f"✅ Successfully uploaded: {success_count} documents")
+    log(f"📦 Processed in {batch_count} batches, {commit_count} commits ({retried_batches} batches needed retries)")
+    log(f"🚦 Write rate: {scheduler.describe()}")
+    if error_count > 0:
+        log(f"❌ Failed uploads: {error_count} documents (written to {dead_letter_path})")
+    else:
+        log(f"🎯 All documents uploaded successfully!")
+    
+    return UploadSummary(collection_name, success_count, error_count, batch_count, commit_count, run_metrics)
+
+def upload_fighter_data_batch(csv_file_path: str, collection_name: str = 'fighterData', batch_size: int = 500,
+                              max_in_flight: int = 4, use_bulk_writer: bool = False, delta: bool = False,
+                              delete_missing: bool = False, manifest_path: Optional[str] = None,
+                              max_batch_bytes: int = MAX_BATCH_BYTES, retry_policy: RetryPolicy = RetryPolicy(),
+                              dead_letter_path: Optional[str] = None, resume: bool = False,
+                              journal_path: Optional[str] = None, write_rate: float = 500.0,
+                              max_write_rate: Optional[float] = None, quiet: bool = False,
+                              metrics_path: Optional[str] = None, profile_path: Optional[str] = None,
+                              trace_memory: bool = False, db=None,
+                              fighter_names_csv_path: str = "oldData/FighterNames.csv",
+                              transform_workers: int = 1) -> UploadSummary:
+    """
+    Upload fighter data from CSV to Firestore using batch operations.
+    
+    Fighter names are joined onto each row by fighterCode, overall ratings
+    and combined difficulty scores are computed from the Fights.csv and
+    WCAV.csv files next to the CSV, and the fighter totals snapshot and the
+    search index are published at the end. See upload_csv_batch for the pipeline and the
+    remaining arguments.
+    
+    Args:
+        csv_file_path: Path to the CSV file
+        collection_name: Name of the Firestore collection
+        batch_size: Maximum number of documents to upload in each batch
+        max_in_flight: Number of batches committed concurrently
+        use_bulk_writer: Use Firestore's BulkWriter instead of explicit batches
+        delta: Only write documents that changed since the last successful run
+        delete_missing: In delta mode, delete documents whose rows disappeared
+        manifest_path: Manifest file for delta mode (defaults to one per collection)
+        max_batch_bytes: Maximum estimated payload bytes per batch
+        retry_policy: Backoff settings for failed commits
+        dead_letter_path: NDJSON file for rows that fail permanently (defaults to one per collection)
+        resume: Continue from the checkpoint journal of an interrupted run
+        journal_path: Checkpoint journal file (defaults to one per collection)
+        write_rate: Initial write rate in writes per second
+        max_write_rate: Upper bound for the write rate ramp (unbounded if None)
+        quiet: Only print warnings, errors and the final summary
+        metrics_path: File receiving the run metrics (defaults to one NDJSON file per collection)
+        profile_path: If set, profile the pipeline with cProfile and write the stats here
+        trace_memory: Record the top allocation sites with tracemalloc
+        db: Firestore client (initialized from the service account if None)
+        fighter_names_csv_path: FighterNames CSV file joined onto each row
+        transform_workers: Processes parsing and transforming the CSV (1 for in-process)
+    
+    Returns:
+        UploadSummary with the upload totals and run metrics
+    """
+    if db is None:
+        # Shared client; Firebase is initialized on first use
+        db = firestore_client()
+    
+    # Load fighter names
+    fighter_names = load_fighter_names(fighter_names_csv_path)
+    
+    # Compute ratings from the fights and weight class averages exported alongside the fighters
+    data_dir = os.path.dirname(csv_file_path)
+    ratings = load_fighter_ratings(csv_file_path, os.path.join(data_dir, 'Fights.csv'), os.path.join(data_dir, 'WCAV.csv'))
+    
+    def build_document(processed_data: Dict[str, Any], row_number: int) -> Tuple[str, Dict[str, Any]]:
+        if ratings is not None:
+            processed_data.update(ratings.fighter_fields(processed_data.get('fighterCode')))
+        return build_fighter_document(processed_data, row_number, fighter_names)
+    
+    try:
+        return upload_csv_batch(
+            db,
+            csv_file_path,
+            collection_name,
+            build_document,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            use_bulk_writer=use_bulk_writer,
+            delta=delta,
+            delete_missing=delete_missing,
+            manifest_path=manifest_path,
+            max_batch_bytes=max_batch_bytes,
+            retry_policy=retry_policy,
+            dead_letter_path=dead_letter_path,
+            resume=resume,
+            journal_path=journal_path,
+            scheduler=WriteScheduler(write_rate, max_write_rate),
+            quiet=quiet,
+            metrics_path=metrics_path,
+            profile_path=profile_path,
+            trace_memory=trace_memory,
+            aggregators=[FighterTotalsAggregator(source_collection=collection_name),
+                         fighter_search_aggregator(data_dir, source_collection=collection_name)],
+            transform_workers=transform_workers,
+        )
+    except UploadError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Error reading CSV file: {e}")
         sys.exit(1)
 
 def main():
     """Main function to run the batch upload script."""
+    parser = argparse.ArgumentParser(description="Upload FighterData CSV to Firestore using batch writes.")
+    parser.add_argument('csv_file_path', nargs='?', default="oldData/FighterData.csv", help="CSV file to upload")
+    parser.add_argument('--collection', default='fighterData', help="Firestore collection name")
+    parser.add_argument('--batch-size', type=int, default=500, help="Maximum documents per batch")
+    parser.add_argument('--max-in-flight', type=int, default=4, help="Batches committed concurrently")
+    parser.add_argument('--bulk-writer', action='store_true', help="Use Firestore's BulkWriter instead of explicit batches")
+    parser.add_argument('--delta', action='store_true', help="Only write documents that changed since the last run")
+    parser.add_argument('--delete-missing', action='store_true', help="With --delta, delete documents whose rows disappeared")
+    parser.add_argument('--resume', action='store_true', help="Resume an interrupted upload from its checkpoint journal")
+    parser.add_argument('--write-rate', type=float, default=500.0, help="Initial writes per second (ramps up 50%% every 5 minutes)")
+    parser.add_argument('--max-write-rate', type=float, help="Upper bound for the write rate ramp")
+    parser.add_argument('--quiet', action='store_true', help="Only print warnings, errors and the final summary")
+    parser.add_argument('--metrics', dest='metrics_path', help="Metrics file (.json to overwrite, .ndjson to append)")
+    parser.add_argument('--profile', dest='profile_path', help="Write cProfile stats for the run to this file")
+    parser.add_argument('--trace-memory', action='store_true', help="Record the top allocation sites with tracemalloc")
+    parser.add_argument('--transform-workers', type=int, default=1,
+                        help="Processes parsing and transforming the CSV (1 to transform in-process)")
+    args = parser.parse_args()
+    
     print("🚀 Starting FighterData CSV to Firestore batch upload...")
     print("=" * 60)
     
-    # CSV file path
-    csv_file_path = "oldData/FighterData.csv"
-    
     # Upload the data with batch processing
-    upload_fighter_data_batch(csv_file_path, batch_size=500)
+    upload_fighter_data_batch(
+        args.csv_file_path,
+        collection_name=args.collection,
+        batch_size=args.batch_size,
+        max_in_flight=args.max_in_flight,
+        use_bulk_writer=args.bulk_writer,
+        delta=args.delta,
+        delete_missing=args.delete_missing,
+        resume=args.resume,
+        write_rate=args.write_rate,
+        max_write_rate=args.max_write_rate,
+        quiet=args.quiet,
+        metrics_path=args.metrics_path,
+        profile_path=args.profile_path,
+        trace_memory=args.trace_memory,
+        transform_workers=args.transform_workers,
+    )
     
     print("=" * 60)
     print("✨ Script completed!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for resumable uploads.
+The journal records how far into the source CSV all batches have been committed,
+together with a fingerprint of the file, so an interrupted upload can resume by
+seeking straight to the first uncommitted row.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+# Default directory for journals, one file per collection
+JOURNAL_DIR = ".upload_journals"
+
+def default_journal_path(collection_name: str) -> str:
+    """Return the default journal path for a collection."""
+    return os.path.join(JOURNAL_DIR, f"{collection_name}.json")
+
+def file_fingerprint(file_path: str) -> Dict[str, Any]:
+    """
+    Fingerprint a file by path, size, modification time and content hash.
+    
+    Args:
+        file_path: Path to the file
+    
+    Returns:
+        Dictionary identifying the file's current contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as source_file:
+        for chunk in iter(lambda: source_file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    
+    stat = os.stat(file_path)
+    return {
+        'path': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'blake2b': digest.hexdigest(),
+    }
+
+def same_contents(fingerprint: Dict[str, Any], other: Dict[str, Any]) -> bool:
+    """Return True if two fingerprints describe the same file contents."""
+    return fingerprint.get('size') == other.get('size') and fingerprint.get('blake2b') == other.get('blake2b')
+
+def load_journal(journal_path: str) -> Optional[Dict[str, Any]]:
+    """Load a journal from disk, or return None if it does not exist."""
+    if not os.path.exists(journal_path):
+        return None
+    
+    with open(journal_path, 'r', encoding='utf-8') as journal_file:
+        return json.load(journal_file)
+
+def save_journal(journal_path: str, journal: Dict[str, Any]):
+    """
+    Write a journal atomically.
+    
+    Args:
+        journal_path: Path to the journal file
+        journal: Journal contents
+    """
+    directory = os.path.dirname(journal_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    temp_path = f"{journal_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as journal_file:
+        json.dump(journal, journal_file, indent=2)
+        journal_file.flush()
+        os.fsync(journal_file.fileno())
+    os.replace(temp_path, journal_path)
+
+def new_journal(collection_name: str, fingerprint: Dict[str, Any]) -> Dict[str, Any]:
+    """Create a journal for a fresh upload of a source file."""
+    return {
+        'version': 1,
+        'collection': collection_name,
+        'source': fingerprint,
+        'committed_row': 0,
+        'committed_offset': 0,
+        'committed_batches': 0,
+        'complete': False,
+    }
+
+class BatchWatermark:
+    """
+    Track the contiguous prefix of completed batches.
+    
+    Batches complete out of order when several are in flight, so the safe
+    resume point is the end of the last batch before the first one that has
+    not completed yet.
+    """
+    
+    def __init__(self, row_number: int = 0, offset: int = 0):
+        self.row_number = row_number
+        self.offset = offset
+        self.batches = 0
+        self._next_batch = 1
+        self._completed = {}
+    
+    def complete(self, batch_number: int, row_number: int, offset: int) -> bool:
+        """
+        Mark a batch as completed.
+        
+        Args:
+            batch_number: 1-based batch sequence number
+            row_number: Last row covered by the batch
+            offset: Byte offset just after that row
+        
+        Returns:
+            True if the watermark advanced
+        """
+        self._completed[batch_number] = (row_number, offset)
+        advanced = False
+        while self._next_batch in self._completed:
+            row_number, offset = self._completed.pop(self._next_batch)
+            self.row_number = max(self.row_number, row_number)
+            self.offset = max(self.offset, offset)
+            self.batches += 1
+            self._next_batch += 1
+            advanced = True
+        return advanced
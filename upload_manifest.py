@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Local content-hash manifest used for incremental (delta) uploads.
+The manifest records, per document ID, a hash of every top-level field as of the
+last successful commit, so later runs only write documents that changed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Set
+
+# Default directory for manifests, one file per collection
+MANIFEST_DIR = ".upload_manifests"
+
+def default_manifest_path(collection_name: str) -> str:
+    """Return the default manifest path for a collection."""
+    return os.path.join(MANIFEST_DIR, f"{collection_name}.json")
+
+def load_manifest(manifest_path: str) -> Dict[str, Dict[str, str]]:
+    """
+    Load a manifest from disk.
+    
+    Args:
+        manifest_path: Path to the manifest file
+    
+    Returns:
+        Dictionary mapping document ID to {field: hash}; empty if the file does not exist
+    """
+    if not os.path.exists(manifest_path):
+        return {}
+    
+    with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+        return json.load(manifest_file).get('documents', {})
+
+def save_manifest(manifest_path: str, manifest: Dict[str, Dict[str, str]]):
+    """
+    Write a manifest atomically.
+    
+    The manifest is written to a temporary file and renamed over the old one,
+    so an interrupted run leaves either the previous or the new manifest.
+    
+    Args:
+        manifest_path: Path to the manifest file
+        manifest: Dictionary mapping document ID to {field: hash}
+    """
+    directory = os.path.dirname(manifest_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump({'version': 1, 'documents': manifest}, manifest_file, separators=(',', ':'))
+        manifest_file.flush()
+        os.fsync(manifest_file.fileno())
+    os.replace(temp_path, manifest_path)
+
+def hash_value(value: Any) -> str:
+    """Return a stable hash of a field value, including its type."""
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=8).hexdigest()
+
+def hash_document_fields(data: Dict[str, Any]) -> Dict[str, str]:
+    """Return {field: hash} for every top-level field of a document."""
+    return {field: hash_value(value) for field, value in data.items()}
+
+def diff_fields(previous: Dict[str, str], current: Dict[str, str]) -> Set[str]:
+    """
+    Return the top-level fields that were added, changed or removed.
+    
+    Args:
+        previous: Field hashes from the manifest
+        current: Field hashes of the new document
+    
+    Returns:
+        Set of field names that need to be written
+    """
+    changed = {field for field, digest in current.items() if previous.get(field) != digest}
+    changed.update(field for field in previous if field not in current)
+    return changed
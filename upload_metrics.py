@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Run metrics for uploads.
+Collects per-stage timers and counters, a commit latency histogram, throughput
+and peak memory while an upload runs, and writes them to a JSON or NDJSON file
+at the end of the run.
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Default directory for metrics files, one file per collection
+METRICS_DIR = ".upload_metrics"
+
+# Upper bounds of the commit latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+T = TypeVar('T')
+
+def default_metrics_path(collection_name: str) -> str:
+    """Return the default metrics path for a collection."""
+    return os.path.join(METRICS_DIR, f"{collection_name}.ndjson")
+
+def peak_rss_bytes(children: bool = False) -> Optional[int]:
+    """
+    Return the peak resident set size of this process, or None if unavailable.
+    
+    With children=True, return the peak of its largest finished (waited-for)
+    child process instead, such as a transform worker.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+    
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def observe(self, seconds: float):
+        """Record one latency sample."""
+        self.counts[bisect_left(self.bounds_ms, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the upper bound (ms) of the bucket holding the given percentile."""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds_ms, self.counts):
+            seen += count
+            if seen >= target:
+                return float(bound)
+        return round(self.max * 1000, 3)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the histogram as a JSON-serializable dictionary."""
+        labels = [f"<={bound}ms" for bound in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p90_ms': self.percentile(0.9),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max * 1000, 3),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+class RunMetrics:
+    """
+    Thread-safe stage timers, counters and latency histograms for one run.
+    
+    Stage times are exclusive: time spent in a stage nested inside another
+    (for example the CSV reader pulled by the transform stage) is only
+    counted for the inner stage, so the stage times add up to the time
+    the pipeline actually spent.
+    """
+    
+    def __init__(self, name: str, profile_path: Optional[str] = None, trace_memory: bool = False):
+        """
+        Create the metrics for a run.
+        
+        Args:
+            name: Run name recorded in the metrics (usually the collection)
+            profile_path: If set, profile the calling thread with cProfile and write the stats here
+            trace_memory: Record the top allocation sites with tracemalloc
+        """
+        self.name = name
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.counters = {}
+        self.histograms = {}
+        self.info = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiler = None
+        self._started_at = None
+        self._started = None
+        self._elapsed = None
+    
+    def start(self):
+        """Start the run clock and the optional profilers."""
+        self._started_at = time.time()
+        self._started = time.perf_counter()
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+    
+    def finish(self):
+        """Stop the run clock and the optional profilers."""
+        if self._started is not None and self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._started
+        
+        if self._profiler is not None:
+            self._profiler.disable()
+            directory = os.path.dirname(self.profile_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._profiler.dump_stats(self.profile_path)
+            self.info['profile_path'] = self.profile_path
+            self._profiler = None
+        
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.info['traced_peak_bytes'] = peak
+            self.info['top_allocations'] = [
+                {'site': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count}
+                for stat in snapshot.statistics('lineno')[:10]
+            ]
+    
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def _record(self, name: str, started: float, calls: int = 1):
+        """Close a timed section opened with perf_counter() at started."""
+        elapsed = time.perf_counter() - started
+        stack = self._stack()
+        nested = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        with self._lock:
+            stage = self.stages.setdefault(name, [0.0, 0])
+            stage[0] += elapsed - nested
+            stage[1] += calls
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as part of a stage."""
+        self._stack().append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, started)
+    
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """Yield from iterable, timing each step as part of a stage."""
+        iterator = iter(iterable)
+        stack = self._stack()
+        while True:
+            stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self._record(name, started, 0)
+                return
+            except BaseException:
+                self._record(name, started)
+                raise
+            self._record(name, started)
+            yield item
+    
+    def count(self, name: str, value: int = 1):
+        """Add to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def observe(self, name: str, seconds: float):
+        """Record a latency sample in a histogram."""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the metrics as a JSON-serializable dictionary."""
+        elapsed = self._elapsed
+        if elapsed is None and self._started is not None:
+            elapsed = time.perf_counter() - self._started
+        elapsed = elapsed or 0.0
+        
+        with self._lock:
+            counters = dict(self.counters)
+            stages = {
+                name: {'seconds': round(seconds, 6), 'calls': calls}
+                for name, (seconds, calls) in sorted(self.stages.items(), key=lambda item: -item[1][0])
+            }
+            histograms = {name: histogram.to_dict() for name, histogram in self.histograms.items()}
+        
+        return {
+            'name': self.name,
+            'started_at': self._started_at,
+            'elapsed_seconds': round(elapsed, 6),
+            'rows_per_second': round(counters.get('rows', 0) / elapsed, 1) if elapsed else None,
+            'bytes_per_second': round(counters.get('bytes', 0) / elapsed, 1) if elapsed else None,
+            'writes_per_second': round(counters.get('writes', 0) / elapsed, 1) if elapsed else None,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'counters': counters,
+            'stages': stages,
+            'histograms': histograms,
+            **self.info,
+        }
+    
+    def write(self, metrics_path: str) -> Dict[str, Any]:
+        """
+        Write the metrics to a file.
+        
+        Paths ending in .ndjson get one line appended per run, so the file
+        keeps a history; any other path is overwritten with a JSON document.
+        
+        Args:
+            metrics_path: Path to the metrics file
+        
+        Returns:
+            The metrics that were written
+        """
+        metrics = self.to_dict()
+        directory = os.path.dirname(metrics_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        if metrics_path.endswith('.ndjson'):
+            with open(metrics_path, 'a', encoding='utf-8') as metrics_file:
+                metrics_file.write(json.dumps(metrics, default=str) + '\n')
+        else:
+            with open(metrics_path, 'w', encoding='utf-8') as metrics_file:
+                json.dump(metrics, metrics_file, indent=2, default=str)
+        return metrics
+    
+    def describe_stages(self, top: int = 5) -> str:
+        """Return a one-line summary of the slowest stages."""
+        stages = self.to_dict()['stages']
+        return ", ".join(f"{name} {stage['seconds']:.2f}s" for name, stage in list(stages.items())[:top])
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Retry helpers for Firestore batch commits.
+Failed batches are retried with jittered exponential backoff. Batches that
+fail permanently are bisected to isolate the bad documents; those documents,
+and batches whose transient errors outlast the retries, go to a dead-letter
+file.
+"""
+
+import functools
+import json
+import os
+import random
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+# google.api_core.exceptions loads gRPC, so the error classes are only looked up
+# once an error has to be classified (offline runs never need them)
+
+@functools.lru_cache(maxsize=None)
+def retryable_errors() -> Tuple[type, ...]:
+    """Errors worth retrying: throttling, contention and transient server/network failures."""
+    from google.api_core import exceptions as api_exceptions
+    return (
+        api_exceptions.Aborted,
+        api_exceptions.DeadlineExceeded,
+        api_exceptions.InternalServerError,
+        api_exceptions.ResourceExhausted,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.TooManyRequests,
+        api_exceptions.GatewayTimeout,
+        api_exceptions.Unknown,
+        ConnectionError,
+        TimeoutError,
+    )
+
+@functools.lru_cache(maxsize=None)
+def throttling_errors() -> Tuple[type, ...]:
+    """Errors that mean the backend wants the client to slow down."""
+    from google.api_core import exceptions as api_exceptions
+    return (
+        api_exceptions.ResourceExhausted,
+        api_exceptions.TooManyRequests,
+    )
+
+@functools.lru_cache(maxsize=None)
+def throttling_status_codes() -> Tuple[int, ...]:
+    """gRPC status codes reported by BulkWriter for the same condition."""
+    from google.api_core import exceptions as api_exceptions
+    return (api_exceptions.ResourceExhausted.grpc_status_code.value[0],)
+
+class RetryPolicy(NamedTuple):
+    """Backoff settings for retrying a commit."""
+    max_attempts: int = 5
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+
+class CommitOutcome(NamedTuple):
+    """Result of committing a group of records with retries and bisection."""
+    committed: List[Any]
+    failed: List[Tuple[Any, str]]
+    commits: int
+    first_error: Optional[str]
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Return True if an error is transient and the commit may succeed if retried."""
+    return isinstance(error, retryable_errors())
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Return True if an error asks the client to reduce its write rate."""
+    return isinstance(error, throttling_errors())
+
+def backoff_delay(attempt: int, policy: RetryPolicy) -> float:
+    """
+    Return a full-jitter exponential backoff delay.
+    
+    Args:
+        attempt: 1-based number of the attempt that just failed
+        policy: Backoff settings
+    
+    Returns:
+        Delay in seconds
+    """
+    ceiling = min(policy.max_delay, policy.initial_delay * policy.multiplier ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+def commit_with_bisect(records: Sequence[Any], commit: Callable[[Sequence[Any]], None],
+                       policy: RetryPolicy = RetryPolicy(), sleep: Callable[[float], None] = time.sleep) -> CommitOutcome:
+    """
+    Commit records, retrying transient errors and bisecting permanent failures.
+    
+    A group is retried with backoff while its errors are retryable. A group
+    that fails with a permanent error (invalid argument, document too large)
+    is split in half and each half is committed on its own, so a single bad
+    document is isolated in O(log n) commits. A group whose transient errors
+    outlast policy.max_attempts fails as a whole without splitting: the
+    backend is overloaded, and more, smaller commits would only add load.
+    Failed records are returned as failed.
+    
+    Args:
+        records: Records to commit together
+        commit: Callable that commits a group of records in one request
+        policy: Backoff settings
+        sleep: Sleep function, replaceable for testing
+    
+    Returns:
+        CommitOutcome with committed and failed records
+    """
+    committed = []
+    failed = []
+    commits = 0
+    first_error = None
+    pending = [list(records)]
+    
+    while pending:
+        group = pending.pop()
+        if not group:
+            continue
+        
+        attempt = 0
+        while True:
+            attempt += 1
+            commits += 1
+            try:
+                commit(group)
+                committed.extend(group)
+                break
+            except Exception as e:
+                if first_error is None:
+                    first_error = str(e)
+                retryable = is_retryable_error(e)
+                if retryable and attempt < policy.max_attempts:
+                    sleep(backoff_delay(attempt, policy))
+                    continue
+                if retryable or len(group) == 1:
+                    failed.extend((record, f"{type(e).__name__}: {e}") for record in group)
+                else:
+                    middle = len(group) // 2
+                    # Second half is pushed first so the first half is committed first
+                    pending.append(group[middle:])
+                    pending.append(group[:middle])
+                break
+    
+    return CommitOutcome(committed, failed, commits, first_error)
+
+def default_dead_letter_path(collection_name: str) -> str:
+    """Return the default dead-letter file for a collection."""
+    return os.path.join(".upload_deadletter", f"{collection_name}.ndjson")
+
+def write_dead_letters(dead_letter_path: str, entries: List[dict]):
+    """
+    Append permanently failed writes to an NDJSON dead-letter file.
+    
+    Args:
+        dead_letter_path: Path to the dead-letter file
+        entries: JSON-serializable dictionaries, one per failed write
+    """
+    if not entries:
+        return
+    
+    directory = os.path.dirname(dead_letter_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    with open(dead_letter_path, 'a', encoding='utf-8') as dead_letter_file:
+        for entry in entries:
+            dead_letter_file.write(json.dumps(entry, default=str) + '\n')
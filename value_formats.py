@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Normalization of display-formatted CSV values into typed Firestore values.
+Several exports store numbers the way the old site displayed them: percentages
+('16.7%'), heights ('6\'0"'), 'N/A' sentinels, 'Yes'/'No' flags and M/D/YYYY
+or M/D/YY dates. Each column's format is detected once from the plan sample, so rows
+are converted by a single compiled regex per cell instead of per-cell sniffing.
+"""
+
+import datetime
+import re
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+# Values that mean "no data"; they are dropped like empty cells
+NULL_VALUES = frozenset(['N/A', 'n/a', 'NA'])
+
+# Distinct unparseable values kept per column for the report
+REPORT_EXAMPLES = 5
+
+# Two-digit years below the pivot are 20YY, the rest 19YY (the POSIX %y rule)
+TWO_DIGIT_YEAR_PIVOT = 69
+
+class ValueFormat(NamedTuple):
+    """A display format: a full-match pattern and a parser for its match."""
+    name: str
+    pattern: re.Pattern
+    parse: Callable[[re.Match], Any]
+
+def _parse_percent(match: re.Match) -> float:
+    return float(match.group(1))
+
+def _parse_height(match: re.Match) -> int:
+    return int(match.group(1)) * 12 + int(match.group(2))
+
+def _parse_yes_no(match: re.Match) -> bool:
+    return match.group(1).lower() == 'yes'
+
+def _parse_date(match: re.Match) -> datetime.datetime:
+    month, day, year = (int(group) for group in match.groups())
+    if len(match.group(3)) == 2:
+        year += 2000 if year < TWO_DIGIT_YEAR_PIVOT else 1900
+    return datetime.datetime(year, month, day, tzinfo=datetime.timezone.utc)
+
+# Registered formats by name; percentages stay in percentage points and heights become inches
+VALUE_FORMATS: Dict[str, ValueFormat] = {}
+
+def register_format(value_format: ValueFormat) -> ValueFormat:
+    """
+    Add a format to the registry so specs can refer to it by name.
+    
+    Args:
+        value_format: Format to register (replaces a format with the same name)
+    
+    Returns:
+        The registered format
+    """
+    VALUE_FORMATS[value_format.name] = value_format
+    return value_format
+
+register_format(ValueFormat('percent', re.compile(r'(-?\d+(?:\.\d+)?)\s*%'), _parse_percent))
+register_format(ValueFormat('height', re.compile(r'(\d{1,2})\'\s*(\d{1,2})(?:"|\'\')?'), _parse_height))
+register_format(ValueFormat('yes_no', re.compile(r'(yes|no)', re.IGNORECASE), _parse_yes_no))
+register_format(ValueFormat('date', re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})'), _parse_date))
+
+# Every registered display format, in detection order
+DISPLAY_FORMATS = ('percent', 'height', 'yes_no', 'date')
+
+# Formats of the collections whose other display strings the website still compares directly
+DATE_FORMATS = ('date',)
+
+def resolve_formats(names: Iterable[str]) -> List[ValueFormat]:
+    """
+    Look up registered formats by name.
+    
+    Args:
+        names: Format names
+    
+    Returns:
+        List of formats in the given order
+    
+    Raises:
+        ValueError: If a name is not registered
+    """
+    formats = []
+    for name in names:
+        if name not in VALUE_FORMATS:
+            raise ValueError(f"Unknown value format '{name}'. Known: {', '.join(sorted(VALUE_FORMATS))}")
+        formats.append(VALUE_FORMATS[name])
+    return formats
+
+def detect_format(sample: Sequence[str], formats: Sequence[ValueFormat]) -> Optional[ValueFormat]:
+    """
+    Pick the format every non-empty, non-null sample value matches.
+    
+    Args:
+        sample: Sampled values of one column
+        formats: Candidate formats, tried in order
+    
+    Returns:
+        The matching format, or None if the column is not formatted
+    """
+    values = [value for value in sample if value and value not in NULL_VALUES]
+    if not values:
+        return None
+    for value_format in formats:
+        fullmatch = value_format.pattern.fullmatch
+        if all(fullmatch(value) for value in values):
+            return value_format
+    return None
+
+class NormalizationReport:
+    """Per-column record of detected formats, null sentinels and values that could not be parsed."""
+    
+    def __init__(self):
+        self.formats: Dict[str, str] = {}
+        self.nulls: Dict[str, int] = defaultdict(int)
+        self.unparsed: Dict[str, int] = defaultdict(int)
+        self.examples: Dict[str, List[str]] = defaultdict(list)
+    
+    def record_unparsed(self, column: str, value: str):
+        self.unparsed[column] += 1
+        examples = self.examples[column]
+        if len(examples) < REPORT_EXAMPLES and value not in examples:
+            examples.append(value)
+    
+    def take(self) -> 'NormalizationReport':
+        """
+        Move the null and unparsed counts recorded so far into a new report.
+        
+        The counters are cleared in place, since compiled converters hold
+        references to them; detected formats stay.
+        
+        Returns:
+            Report holding the counts taken
+        """
+        taken = NormalizationReport()
+        taken.nulls.update(self.nulls)
+        taken.unparsed.update(self.unparsed)
+        taken.examples.update(self.examples)
+        self.nulls.clear()
+        self.unparsed.clear()
+        self.examples.clear()
+        return taken
+    
+    def merge(self, other: 'NormalizationReport'):
+        """
+        Add another report's null and unparsed counts to this one.
+        
+        Args:
+            other: Report from a worker process (see take)
+        """
+        self.formats.update(other.formats)
+        for column, count in other.nulls.items():
+            self.nulls[column] += count
+        for column, count in other.unparsed.items():
+            self.unparsed[column] += count
+            examples = self.examples[column]
+            for value in other.examples[column]:
+                if len(examples) < REPORT_EXAMPLES and value not in examples:
+                    examples.append(value)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+        return {
+            'formats': dict(self.formats),
+            'nulls': dict(self.nulls),
+            'unparsed': {column: {'count': count, 'examples': self.examples[column]}
+                         for column, count in self.unparsed.items()},
+        }
+    
+    def lines(self) -> List[str]:
+        """Return human-readable report lines."""
+        lines = []
+        if self.formats:
+            by_format = defaultdict(list)
+            for column, name in self.formats.items():
+                by_format[name].append(column)
+            lines.append("🔣 Normalized columns: " + '; '.join(
+                f"{name}: {', '.join(columns)}" for name, columns in by_format.items()))
+        if self.nulls:
+            lines.append(f"🕳️  Null sentinels dropped: {sum(self.nulls.values())} values in {len(self.nulls)} columns")
+        for column, count in self.unparsed.items():
+            examples = ', '.join(repr(value) for value in self.examples[column])
+            lines.append(f"⚠️  {column} ({self.formats[column]}): {count} values kept as text, e.g. {examples}")
+        return lines
+
+def compile_column_normalizer(column: str, sample: Sequence[str], formats: Sequence[ValueFormat],
+                              fallback: Callable[[str], Any], report: NormalizationReport) -> Callable[[str], Any]:
+    """
+    Build the converter for one column of a normalized file.
+    
+    Null sentinels convert to None (the plan drops None like an empty cell).
+    Formatted columns parse each value with the detected format; values that
+    do not match are converted by fallback and recorded in the report.
+    
+    Args:
+        column: Column name
+        sample: Sampled values of the column
+        formats: Candidate formats
+        fallback: Converter for unformatted values
+        report: Report receiving the column's format, nulls and unparsed values
+    
+    Returns:
+        Converter taking a non-empty cell value
+    """
+    value_format = detect_format(sample, formats)
+    nulls = report.nulls
+    
+    if value_format is None:
+        def convert(value: str) -> Any:
+            if value in NULL_VALUES:
+                nulls[column] += 1
+                return None
+            return fallback(value)
+        return convert
+    
+    report.formats[column] = value_format.name
+    fullmatch = value_format.pattern.fullmatch
+    parse = value_format.parse
+    
+    def convert_formatted(value: str) -> Any:
+        match = fullmatch(value)
+        if match is not None:
+            try:
+                return parse(match)
+            except ValueError:
+                pass
+        elif value in NULL_VALUES:
+            nulls[column] += 1
+            return None
+        report.record_unparsed(column, value)
+        return fallback(value)
+    return convert_formatted
+
+def main():
+    """Report the formats detected in a CSV file and the values that would not parse."""
+    import argparse
+    from upload_fighter_data_batch import plan_csv
+    
+    parser = argparse.ArgumentParser(description='Show how display-formatted values in a CSV file would be normalized')
+    parser.add_argument('csv_file_path', help='Path to the CSV file')
+    parser.add_argument('--formats', nargs='+', default=list(DISPLAY_FORMATS),
+                        help=f"Formats to detect (default: {' '.join(DISPLAY_FORMATS)})")
+    args = parser.parse_args()
+    
+    plan, records = plan_csv(args.csv_file_path, categorize=False, formats=resolve_formats(args.formats))
+    rows = 0
+    for _, values, _ in records:
+        plan.transform(values)
+        rows += 1
+    
+    print(f"📁 {args.csv_file_path}: {rows} rows")
+    for line in plan.report.lines() or ["No formatted columns found"]:
+        print(line)
+
+if __name__ == "__main__":
+    main()
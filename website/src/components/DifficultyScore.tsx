@@ -2,7 +2,7 @@ import React from 'react';
 import { Box, Typography, Tooltip } from '@mui/material';
 import { Star as RatingIcon } from '@mui/icons-material';
 import { useDifficultyScore } from '../hooks/useDifficultyScore';
-import { Fighter } from '../types/firestore';
+import { Fighter, FightDifficulty } from '../types/firestore';
 
 interface DifficultyScoreProps {
   opponent: Fighter;
@@ -12,46 +12,26 @@ interface DifficultyScoreProps {
   isWinner: boolean;
 }
 
-const DifficultyScore: React.FC<DifficultyScoreProps> = ({
-  opponent,
-  weightClassData,
+interface DifficultyBadgeProps {
+  opponentName: string;
+  methodOfFinish: string;
+  actualRounds: number;
+  difficulty: Omit<FightDifficulty, 'historyScore'>;
+}
+
+// Score chip with the difficulty breakdown in its tooltip, for a difficulty computed here or at ingest
+export const DifficultyBadge: React.FC<DifficultyBadgeProps> = ({
+  opponentName,
   methodOfFinish,
   actualRounds,
-  isWinner
+  difficulty: { score, description, baseRating, methodMultiplier, roundMultiplier, archetype }
 }) => {
-  const {
-    score,
-    description,
-    baseRating,
-    methodMultiplier,
-    roundMultiplier,
-    archetype
-  } = useDifficultyScore({
-    opponent,
-    weightClassData,
-    methodOfFinish,
-    actualRounds,
-    isWinner
-  });
-
-  // Console logging for debugging
-  console.log(`DifficultyScore for ${opponent.fighterName || opponent.name}:`, {
-    opponent: opponent.fighterName || opponent.name,
-    baseRating,
-    methodOfFinish,
-    methodMultiplier,
-    actualRounds,
-    roundMultiplier,
-    finalScore: score,
-    archetype
-  });
-
   return (
     <Tooltip 
       title={
         <Box>
           <Typography variant="body2" sx={{ fontWeight: 600, mb: 0.5 }}>
-            {opponent.fighterName || opponent.name}: Difficulty Analysis
+            {opponentName}: Difficulty Analysis
           </Typography>
           <Typography variant="caption" sx={{ display: 'block', mb: 0.5 }}>
             Base Rating: {baseRating} ({archetype})
@@ -108,4 +88,49 @@ const DifficultyScore: React.FC<DifficultyScoreProps> = ({
   );
 };
 
+
+const DifficultyScore: React.FC<DifficultyScoreProps> = ({
+  opponent,
+  weightClassData,
+  methodOfFinish,
+  actualRounds,
+  isWinner
+}) => {
+  const {
+    score,
+    description,
+    baseRating,
+    methodMultiplier,
+    roundMultiplier,
+    archetype
+  } = useDifficultyScore({
+    opponent,
+    weightClassData,
+    methodOfFinish,
+    actualRounds,
+    isWinner
+  });
+
+  // Console logging for debugging
+  console.log(`DifficultyScore for ${opponent.fighterName || opponent.name}:`, {
+    opponent: opponent.fighterName || opponent.name,
+    baseRating,
+    methodOfFinish,
+    methodMultiplier,
+    actualRounds,
+    roundMultiplier,
+    finalScore: score,
+    archetype
+  });
+
+  return (
+    <DifficultyBadge
+      opponentName={opponent.fighterName || opponent.name || ''}
+      methodOfFinish={methodOfFinish}
+      actualRounds={actualRounds}
+      difficulty={{ score, description, baseRating, methodMultiplier, roundMultiplier, archetype }}
+    />
+  );
+};
+
 export default DifficultyScore; 
\ No newline at end of file
@@ -10,63 +10,21 @@ import {
   Paper,
   useTheme,
 } from '@mui/material';
-import { collection, getDocs } from 'firebase/firestore';
-import { db } from '../firebase';
-import { Fighter } from '../types/firestore';
+import { useFighterSearch } from '../hooks/useFighterSearch';
+import { FighterSearchResult } from '../types/firestore';
 
 interface SearchBarProps {
-  onFighterSelect?: (fighter: Fighter) => void;
+  onFighterSelect?: (fighter: FighterSearchResult) => void;
 }
 
 const SearchBar: React.FC<SearchBarProps> = ({ onFighterSelect }) => {
   const [searchTerm, setSearchTerm] = useState('');
-  const [fighters, setFighters] = useState<Fighter[]>([]);
-  const [filteredFighters, setFilteredFighters] = useState<Fighter[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
   const [showDropdown, setShowDropdown] = useState(true);
   const searchRef = useRef<HTMLDivElement>(null);
   const theme = useTheme();
 
-  useEffect(() => {
-    const fetchFighters = async () => {
-      try {
-        const fighterCollection = collection(db, 'fighterData');
-        const snapshot = await getDocs(fighterCollection);
-        
-        const fighterData: Fighter[] = snapshot.docs.map(doc => ({
-          id: doc.id,
-          ...doc.data()
-        } as Fighter));
-        
-        setFighters(fighterData);
-        setFilteredFighters(fighterData);
-        setShowDropdown(true);
-      } catch (error) {
-        console.error('Error fetching fighters:', error);
-      } finally {
-        setIsLoading(false);
-      }
-    };
-
-    fetchFighters();
-  }, []);
-
-  useEffect(() => {
-    if (searchTerm.trim() === '') {
-      // Show top 10 fighters by MinutesTracked when search is empty
-      const sortedFighters = [...fighters]
-        .filter(fighter => fighter.MinutesTracked && fighter.MinutesTracked > 0)
-        .sort((a, b) => (b.MinutesTracked || 0) - (a.MinutesTracked || 0))
-        .slice(0, 10);
-      setFilteredFighters(sortedFighters);
-    } else {
-      const filtered = fighters.filter(fighter =>
-        fighter.fighterName?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        fighter.name?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-      setFilteredFighters(filtered);
-    }
-  }, [searchTerm, fighters]);
+  // One more than the 10 shown, so the list knows whether there are further matches
+  const { results: filteredFighters, loading: isLoading } = useFighterSearch(searchTerm, 11);
 
   useEffect(() => {
     const handleClickOutside = (event: MouseEvent) => {
@@ -81,12 +39,12 @@ const SearchBar: React.FC<SearchBarProps> = ({ onFighterSelect }) => {
     };
   }, []);
 
-  const handleFighterClick = (fighter: Fighter) => {
+  const handleFighterClick = (fighter: FighterSearchResult) => {
     if (onFighterSelect) {
       onFighterSelect(fighter);
     }
     setShowDropdown(false);
-    setSearchTerm(fighter.fighterName || fighter.name || '');
+    setSearchTerm(fighter.fighterName);
   };
 
   return (
@@ -154,7 +112,7 @@ const SearchBar: React.FC<SearchBarProps> = ({ onFighterSelect }) => {
                 <ListItemText
                   primary={
                     <Typography variant="body1" sx={{ color: 'text.primary', fontWeight: 500 }}>
-                      {fighter.fighterName || fighter.name}
+                      {fighter.fighterName}
                     </Typography>
                   }
                   secondary={
@@ -16,9 +16,10 @@ import {
   MenuItem,
   Autocomplete,
 } from '@mui/material';
-import { collection, getDocs } from 'firebase/firestore';
+import { doc, getDoc } from 'firebase/firestore';
 import { db } from '../firebase';
-import { Fighter } from '../types/firestore';
+import { useFighterSearch } from '../hooks/useFighterSearch';
+import { Fighter, FighterSearchResult, COLLECTIONS } from '../types/firestore';
 import { getQuantifiableStats, StatOption } from '../utils/fighterStats';
 
 interface StatSearchBarProps {
@@ -35,54 +36,13 @@ const StatSearchBar: React.FC<StatSearchBarProps> = ({
   selectedStat 
 }) => {
   const [searchTerm, setSearchTerm] = useState('');
-  const [fighters, setFighters] = useState<Fighter[]>([]);
-  const [filteredFighters, setFilteredFighters] = useState<Fighter[]>([]);
-  const [isLoading, setIsLoading] = useState(true);
   const [showDropdown, setShowDropdown] = useState(false);
   const [availableStats, setAvailableStats] = useState<StatOption[]>([]);
   const searchRef = useRef<HTMLDivElement>(null);
   const theme = useTheme();
 
-  useEffect(() => {
-    const fetchFighters = async () => {
-      try {
-        const fighterCollection = collection(db, 'fighterData');
-        const snapshot = await getDocs(fighterCollection);
-        
-        const fighterData: Fighter[] = snapshot.docs.map(doc => ({
-          id: doc.id,
-          ...doc.data()
-        } as Fighter));
-        
-        setFighters(fighterData);
-        setFilteredFighters(fighterData);
-        setShowDropdown(true);
-      } catch (error) {
-        console.error('Error fetching fighters:', error);
-      } finally {
-        setIsLoading(false);
-      }
-    };
-
-    fetchFighters();
-  }, []);
-
-  useEffect(() => {
-    if (searchTerm.trim() === '') {
-      // Show top 10 fighters by MinutesTracked when search is empty
-      const sortedFighters = [...fighters]
-        .filter(fighter => fighter.MinutesTracked && fighter.MinutesTracked > 0)
-        .sort((a, b) => (b.MinutesTracked || 0) - (a.MinutesTracked || 0))
-        .slice(0, 10);
-      setFilteredFighters(sortedFighters);
-    } else {
-      const filtered = fighters.filter(fighter =>
-        fighter.fighterName?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        fighter.name?.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-      setFilteredFighters(filtered);
-    }
-  }, [searchTerm, fighters]);
+  // One more than the 10 shown, so the list knows whether there are further matches
+  const { results: filteredFighters, loading: isLoading } = useFighterSearch(searchTerm, 11);
 
   useEffect(() => {
     const handleClickOutside = (event: MouseEvent) => {
@@ -106,12 +66,20 @@ const StatSearchBar: React.FC<StatSearchBarProps> = ({
     }
   }, [selectedFighter]);
 
-  const handleFighterClick = (fighter: Fighter) => {
-    if (onFighterSelect) {
-      onFighterSelect(fighter);
-    }
+  const handleFighterClick = async (fighter: FighterSearchResult) => {
     setShowDropdown(false);
-    setSearchTerm(fighter.fighterName || fighter.name || '');
+    setSearchTerm(fighter.fighterName);
+    if (!onFighterSelect) return;
+
+    // The index only has display fields; the stat list needs the full fighter document
+    try {
+      const fighterSnapshot = await getDoc(doc(db, COLLECTIONS.FIGHTERS, fighter.id));
+      if (fighterSnapshot.exists()) {
+        onFighterSelect({ id: fighterSnapshot.id, ...fighterSnapshot.data() } as Fighter);
+      }
+    } catch (error) {
+      console.error('Error fetching fighter:', error);
+    }
   };
 
   const handleStatChange = (event: any, newValue: StatOption | null) => {
@@ -201,7 +169,7 @@ const StatSearchBar: React.FC<StatSearchBarProps> = ({
                     <ListItemText
                       primary={
                         <Typography variant="body1" sx={{ color: 'text.primary', fontWeight: 500 }}>
-                          {fighter.fighterName || fighter.name}
+                          {fighter.fighterName}
                         </Typography>
                       }
                       secondary={
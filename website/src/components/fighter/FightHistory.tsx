@@ -33,14 +33,10 @@ import {
   Star as RatingIcon,
   History as HistoryIcon,
 } from '@mui/icons-material';
-import { useFighterFights } from '../../hooks/useFights';
-import { useFightersByIds } from '../../hooks/useFighters';
-import { useEvents } from '../../hooks/useEvents';
-import { useWeightClass } from '../../hooks/useWeightClass';
-import { useFightDifficultyScores } from '../../hooks/useFightDifficultyScores';
-import { useFighterCombinedDifficultyScore } from '../../hooks/useDifficultyScore';
-import DifficultyScore from '../DifficultyScore';
-import { Fighter, Event } from '../../types/firestore';
+import { useFighterHistory } from '../../hooks/useFights';
+import { DifficultyBadge } from '../DifficultyScore';
+import { Fighter, FighterHistoryEntry } from '../../types/firestore';
+import { calendarDate } from '../../utils/dates';
 
 // Table styles matching BasicInfo principles
 const tableStyles = {
@@ -191,9 +187,16 @@ const tableStyles = {
 
 interface FightHistoryProps {
   fighter: Fighter;
-  weightClassAvgData?: any;
 }
 
+// Result chip label, icon and colors; draws and no contests are shown neutral
+const resultStyles: Record<FighterHistoryEntry['result'], { label: string; color: string; background: string; border: string }> = {
+  win: { label: 'Win', color: '#00ff00', background: 'rgba(0, 255, 0, 0.08)', border: 'rgba(0, 255, 0, 0.25)' },
+  loss: { label: 'Loss', color: '#ff0000', background: 'rgba(255, 0, 0, 0.08)', border: 'rgba(255, 0, 0, 0.25)' },
+  draw: { label: 'Draw', color: 'rgba(255, 255, 255, 0.8)', background: 'rgba(255, 255, 255, 0.06)', border: 'rgba(255, 255, 255, 0.2)' },
+  nc: { label: 'NC', color: 'rgba(255, 255, 255, 0.8)', background: 'rgba(255, 255, 255, 0.06)', border: 'rgba(255, 255, 255, 0.2)' },
+};
+
 const LoadingRow: React.FC = () => (
   <TableRow sx={tableStyles.loadingRow}>
     <TableCell>
@@ -223,99 +226,29 @@ const LoadingRow: React.FC = () => (
   </TableRow>
 );
 
-const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData }) => {
-  const { fights, loading: fightsLoading, error: fightsError } = useFighterFights(fighter.fighterCode);
-
-  // Get unique event codes from fights
-  const eventCodes = useMemo(() => {
-    if (!fights) return [];
-    return Array.from(new Set(fights.map(fight => fight.eventCode)));
-  }, [fights]);
-
-  // Fetch all events data at once
-  const { events: eventDataMap, loading: eventsLoading, error: eventsError } = useEvents(eventCodes);
-
-  // Get unique opponent codes from fights
-  const opponentCodes = useMemo(() => {
-    if (!fights) return [];
-    const opponentSet = new Set(fights.map(fight => 
-      fight.fighterA === fighter.fighterCode ? fight.fighterB : fight.fighterA
-    ));
-    return Array.from(opponentSet);
-  }, [fights, fighter.fighterCode]);
+const FightHistory: React.FC<FightHistoryProps> = ({ fighter }) => {
+  // One document with every fight, its event and opponent, and the difficulty computed at ingest
+  const { history, loading: isLoading, error } = useFighterHistory(fighter.fighterCode);
+  const fights = useMemo(() => history?.fights ?? [], [history]);
 
-  // Fetch all opponent data
-  const { fighters: opponents, loading: opponentsLoading, error: opponentsError } = useFightersByIds(opponentCodes);
-
-  // Use weight class data from props if available, otherwise fetch it
-  const { weightClass: fetchedWeightClassData, loading: weightClassLoading } = useWeightClass(
-    weightClassAvgData ? null : (fighter.weightClass || 'Unknown')
-  );
-  
-  // Use props data if available, otherwise use fetched data
-  const weightClassData = weightClassAvgData || fetchedWeightClassData;
-
-  // Create maps for quick lookup
-  const fighterMaps = useMemo(() => {
-    const nameMap = new Map<string, string>();
-    const idMap = new Map<string, string>();
-    opponents.forEach(opponent => {
-      if (opponent.fighterCode) {
-        nameMap.set(opponent.fighterCode, opponent.fighterName || opponent.name || 'Unknown Fighter');
-        if (opponent.id) {
-          idMap.set(opponent.fighterCode, opponent.id);
-        }
-      }
-    });
-    return { nameMap, idMap };
-  }, [opponents]);
+  // Combined difficulty is stored on the fighter document by the ratings enricher
+  const combinedDifficulty = fighter.combinedDifficulty;
 
-  // Calculate difficulty scores for all fights using the new hook
-  const fightsWithScores = useFightDifficultyScores({
-    fights,
-    opponents,
-    fighterCode: fighter.fighterCode,
-    weightClassData
-  });
-
-  // Calculate combined difficulty score for the fighter
-  const combinedDifficulty = useFighterCombinedDifficultyScore({
-    fights,
-    opponents,
-    fighterCode: fighter.fighterCode,
-    weightClassData
-  });
-
-  // Sort fights by date (most recent first), with title fights prioritized within same date
+  // The index is newest first; within the same date, title fights come first, then the harder fight
   const sortedFights = useMemo(() => {
-    if (!fightsWithScores.length) return [];
-    
-    return [...fightsWithScores].sort((a, b) => {
-      const dateA = eventDataMap.get(a.eventCode)?.Date || '';
-      const dateB = eventDataMap.get(b.eventCode)?.Date || '';
-      
-      // First sort by date (most recent first)
-      if (dateA && dateB) {
-        const dateComparison = new Date(dateB).getTime() - new Date(dateA).getTime();
-        if (dateComparison !== 0) {
-          return dateComparison;
-        }
+    return [...fights].sort((a, b) => {
+      const dateComparison = (b.date || '').localeCompare(a.date || '');
+      if (dateComparison !== 0) {
+        return dateComparison;
       }
       
-      // If same date, prioritize title fights
-      const aIsTitle = a.isTitleFight === 'Yes';
-      const bIsTitle = b.isTitleFight === 'Yes';
-      
-      if (aIsTitle && !bIsTitle) return -1;
-      if (!aIsTitle && bIsTitle) return 1;
+      if (a.isTitleFight !== b.isTitleFight) {
+        return a.isTitleFight ? -1 : 1;
+      }
       
-      // If both are title fights or both are regular fights, sort by difficulty score
-      return b.difficultyScore - a.difficultyScore;
+      return (b.difficulty?.historyScore ?? 0) - (a.difficulty?.historyScore ?? 0);
     });
-  }, [fightsWithScores, eventDataMap]);
-
-  const isLoading = fightsLoading || opponentsLoading || eventsLoading || weightClassLoading;
-  const error = fightsError || opponentsError || eventsError;
+  }, [fights]);
 
   const getMethodColor = (method: string) => {
     switch (method) {
@@ -353,7 +286,7 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
         </Typography>
 
                  {/* Overall Difficulty Score Section */}
-         {!isLoading && fights.length > 0 && (
+         {!isLoading && fights.length > 0 && combinedDifficulty && (
            <Box sx={tableStyles.resumeSection}>
              {/* Resume Rating Header */}
              <Box sx={{
@@ -596,11 +529,7 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
                    </TableRow>
                 ) : (
                   sortedFights.map((fight) => {
-                    const isWinner = fight.fighterA === fighter.fighterCode;
-                    const opponentCode = isWinner ? fight.fighterB : fight.fighterA;
-                    const opponentName = fighterMaps.nameMap.get(opponentCode) || 'Unknown Fighter';
-                    const opponentId = fighterMaps.idMap.get(opponentCode);
-                    const eventData = eventDataMap.get(fight.eventCode);
+                    const result = resultStyles[fight.result] || resultStyles.nc;
 
                                          return (
                        <TableRow key={fight.fightCode}>
@@ -612,8 +541,8 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
                              fontWeight: 500,
                              fontFamily: 'monospace',
                            }}>
-                             {eventData?.Date ? (
-                               new Date(eventData.Date).toLocaleDateString(undefined, {
+                             {fight.date ? (
+                               calendarDate(fight.date).toLocaleDateString(undefined, {
                                  year: 'numeric',
                                  month: 'short',
                                  day: 'numeric'
@@ -629,14 +558,20 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
                          {/* Event */}
                          <TableCell>
                            <Box sx={{ display: 'flex', alignItems: 'center', gap: 1 }}>
-                             <Link
-                               component={RouterLink}
-                               to={`/event/${eventData?.id}`}
-                               sx={tableStyles.link}
-                             >
-                               {eventData?.EventName || fight.eventCode}
-                             </Link>
-                             {fight.isTitleFight === 'Yes' && (
+                             {fight.eventId ? (
+                               <Link
+                                 component={RouterLink}
+                                 to={`/event/${fight.eventId}`}
+                                 sx={tableStyles.link}
+                               >
+                                 {fight.eventName || fight.eventCode}
+                               </Link>
+                             ) : (
+                               <Typography sx={{ color: 'rgba(255, 255, 255, 0.9)' }}>
+                                 {fight.eventName || fight.eventCode}
+                               </Typography>
+                             )}
+                             {fight.isTitleFight && (
                                <TitleIcon sx={{ 
                                  color: '#FFD700', 
                                  fontSize: 16,
@@ -648,17 +583,17 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
 
                         {/* Opponent */}
                         <TableCell>
-                          {opponentId ? (
+                          {fight.opponentId ? (
                             <Link
                               component={RouterLink}
-                              to={`/fighter/${opponentId}`}
+                              to={`/fighter/${fight.opponentId}`}
                               sx={tableStyles.link}
                             >
-                              {opponentName}
+                              {fight.opponentName}
                             </Link>
                           ) : (
                             <Typography sx={{ color: 'rgba(255, 255, 255, 0.9)' }}>
-                              {opponentName}
+                              {fight.opponentName}
                             </Typography>
                           )}
                         </TableCell>
@@ -666,14 +601,14 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
                         {/* Result */}
                         <TableCell>
                           <Chip
-                            icon={isWinner ? <WinIcon /> : <LossIcon />}
-                            label={isWinner ? 'Win' : 'Loss'}
+                            icon={fight.result === 'win' ? <WinIcon /> : fight.result === 'loss' ? <LossIcon /> : undefined}
+                            label={result.label}
                             size="small"
                             sx={{ 
                               ...tableStyles.chip,
-                              bgcolor: isWinner ? 'rgba(0, 255, 0, 0.08)' : 'rgba(255, 0, 0, 0.08)',
-                              color: isWinner ? '#00ff00' : '#ff0000',
-                              border: `1px solid ${isWinner ? 'rgba(0, 255, 0, 0.25)' : 'rgba(255, 0, 0, 0.25)'}`,
+                              bgcolor: result.background,
+                              color: result.color,
+                              border: `1px solid ${result.border}`,
                               '& .MuiChip-icon': {
                                 color: 'inherit'
                               }
@@ -684,14 +619,14 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
                         {/* Method */}
                         <TableCell>
                           <Typography sx={{ 
-                            color: getMethodColor(fight.methodOfFinish),
+                            color: getMethodColor(fight.method),
                             fontWeight: 600,
                             fontSize: '0.8rem',
                             letterSpacing: '0.05em',
                             textTransform: 'uppercase',
                             fontFamily: 'monospace',
                           }}>
-                            {fight.methodOfFinish}
+                            {fight.method}
                           </Typography>
                         </TableCell>
 
@@ -705,34 +640,27 @@ const FightHistory: React.FC<FightHistoryProps> = ({ fighter, weightClassAvgData
                               fontWeight: 600,
                               fontFamily: 'monospace',
                             }}>
-                              {`R${fight.actualRounds} ${fight.finalRoundTime}`}
+                              {`R${fight.round} ${fight.time}`}
                             </Typography>
                           </Box>
                         </TableCell>
 
                         {/* Performance Score */}
                         <TableCell>
-                          {(() => {
-                            const opponent = opponents.find(o => o.fighterCode === opponentCode);
-                            if (!opponent) return (
-                              <Box sx={tableStyles.scoreContainer}>
-                                <Typography sx={{ color: 'rgba(255, 255, 255, 0.5)', fontSize: '0.7rem' }}>
-                                  N/A
-                                </Typography>
-                              </Box>
-                            );
-                            return (
-                              <Box sx={tableStyles.scoreContainer}>
-                                <DifficultyScore 
-                                  opponent={opponent}
-                                  weightClassData={weightClassData}
-                                  methodOfFinish={fight.methodOfFinish}
-                                  actualRounds={fight.actualRounds}
-                                  isWinner={isWinner}
-                                />
-                              </Box>
-                            );
-                          })()}
+                          <Box sx={tableStyles.scoreContainer}>
+                            {fight.difficulty ? (
+                              <DifficultyBadge
+                                opponentName={fight.opponentName}
+                                methodOfFinish={fight.method}
+                                actualRounds={fight.round}
+                                difficulty={fight.difficulty}
+                              />
+                            ) : (
+                              <Typography sx={{ color: 'rgba(255, 255, 255, 0.5)', fontSize: '0.7rem' }}>
+                                N/A
+                              </Typography>
+                            )}
+                          </Box>
                         </TableCell>
 
                         {/* Actions */}
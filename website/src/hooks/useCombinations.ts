@@ -112,6 +112,53 @@ const convertToReadable = (fieldName: string): string => {
   return processedParts.join(' to ');
 };
 
+// Shared combo vocabulary published by the uploader (snapshots/comboVocabulary)
+interface ComboVocabulary {
+  contentHash: string;
+  labels: string[];
+  lengths: number[];
+}
+
+let vocabularyPromise: Promise<ComboVocabulary | null> | null = null;
+
+const fetchComboVocabulary = (): Promise<ComboVocabulary | null> => {
+  const promise = getDoc(doc(db, 'snapshots', 'comboVocabulary'))
+    .then(snapshot => (snapshot.exists() ? (snapshot.data() as ComboVocabulary) : null))
+    .catch(err => {
+      if (vocabularyPromise === promise) {
+        vocabularyPromise = null;
+      }
+      throw err;
+    });
+  vocabularyPromise = promise;
+  return promise;
+};
+
+// Reuse the loaded vocabulary while it matches the documents' hash; a re-upload with a new hash refetches it
+const loadComboVocabulary = async (contentHash: string): Promise<ComboVocabulary | null> => {
+  const cached = vocabularyPromise ? await vocabularyPromise.catch(() => null) : null;
+  if (cached && cached.contentHash === contentHash) {
+    return cached;
+  }
+  return fetchComboVocabulary();
+};
+
+// Expand one kind of a sparse combinations document: combos of 2+ strikes seen more than once
+const expandSparseCombos = (
+  combos: { comboIds?: number[]; counts?: number[] } | undefined,
+  vocabulary: ComboVocabulary
+): DocumentData => {
+  const fields: DocumentData = {};
+  const comboIds = combos?.comboIds || [];
+  const counts = combos?.counts || [];
+  comboIds.forEach((comboId, index) => {
+    if (counts[index] > 1 && vocabulary.lengths[comboId] >= 2) {
+      fields[vocabulary.labels[comboId]] = counts[index];
+    }
+  });
+  return fields;
+};
+
 // Hook to fetch combinations subcollection from a fighter document
 export const useCombinations = (fighterId: string | null) => {
   const [absorbed, setAbsorbed] = useState<DocumentData | null>(null);
@@ -162,10 +209,19 @@ export const useCombinations = (fighterId: string | null) => {
         });
 
         // Separate absorbed and thrown combinations
-        const absorbedFields: DocumentData = {};
-        const thrownFields: DocumentData = {};
+        let absorbedFields: DocumentData = {};
+        let thrownFields: DocumentData = {};
+        const comboDoc = firstComboDoc as DocumentData | null;
 
-        if (firstComboDoc) {
+        if (comboDoc && comboDoc.comboVersion) {
+          // Sparse layout: combo ids and counts, labelled through the shared vocabulary
+          const vocabulary = await loadComboVocabulary(comboDoc.comboVocabulary);
+          if (!vocabulary || vocabulary.contentHash !== comboDoc.comboVocabulary) {
+            throw new Error('Combination vocabulary is missing or out of date');
+          }
+          absorbedFields = expandSparseCombos(comboDoc.absorbed, vocabulary);
+          thrownFields = expandSparseCombos(comboDoc.thrown, vocabulary);
+        } else if (firstComboDoc) {
           Object.entries(firstComboDoc).forEach(([key, value]) => {
             // Only include fields with value greater than 1
             if (typeof value === 'number' && value > 1) {
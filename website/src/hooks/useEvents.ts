@@ -9,9 +9,15 @@ import {
   orderBy,
   DocumentData,
   QueryDocumentSnapshot,
+  Timestamp,
 } from 'firebase/firestore';
 import { db } from '../firebase';
 import { Event, COLLECTIONS } from '../types/firestore';
+import { utcCalendarDate } from '../utils/dates';
+
+// Event dates are ingested as Timestamps; documents uploaded before that hold M/D/YYYY strings
+const eventDate = (value: any): Date | string =>
+  value instanceof Timestamp ? utcCalendarDate(value.toDate()) : value;
 
 // Hook to fetch a single event by eventCode
 export const useEvent = (eventCode: string | null) => {
@@ -46,6 +52,7 @@ export const useEvent = (eventCode: string | null) => {
           setEvent({
             ...eventData,
             id: eventDoc.id,
+            Date: eventDate(eventData.Date),
           } as Event);
         } else {
           setEvent(null);
@@ -94,7 +101,8 @@ export const useEventById = (id: string | null) => {
             ...eventData,
             id: eventSnapshot.id,
             // Map the fields to match our Event type
-            date: eventData.Date,
+            Date: eventDate(eventData.Date),
+            date: eventDate(eventData.Date),
             eventCode: eventData.EventCode,
             eventName: eventData.EventName,
             fans: eventData.Fans,
@@ -160,7 +168,8 @@ export const useEvents = (eventCodes: string[]) => {
               ...eventData,
               id: doc.id,
               // Map the fields to match our Event type
-              date: eventData.Date,
+              Date: eventDate(eventData.Date),
+              date: eventDate(eventData.Date),
               eventCode: eventData.EventCode,
               eventName: eventData.EventName,
               fans: eventData.Fans,
@@ -211,8 +220,8 @@ export const useAllEvents = (options?: {
           constraints.push(where('ppv', '==', options.ppv));
         }
 
-        // Default sort by date descending to get newest events first
-        constraints.push(orderBy('date', 'desc'));
+        // Default sort by date descending to get newest events first (Date is a Timestamp)
+        constraints.push(orderBy('Date', 'desc'));
 
         // Execute query
         const querySnapshot = await getDocs(
@@ -225,6 +234,7 @@ export const useAllEvents = (options?: {
           eventsData.push({
             ...data,
             id: doc.id,
+            Date: eventDate(data.Date),
           } as Event);
         });
 
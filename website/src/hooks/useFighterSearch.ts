@@ -0,0 +1,112 @@
+import { useState, useEffect, useMemo } from 'react';
+import { doc, getDoc } from 'firebase/firestore';
+import { db } from '../firebase';
+import { COLLECTIONS, FighterSearchIndex, FighterSearchResult } from '../types/firestore';
+import { searchFighterIndex } from '../utils/fighterSearch';
+
+// Index document in the snapshots collection (FIGHTER_SEARCH_DOCUMENT in fighter_search.py)
+const FIGHTER_SEARCH_DOCUMENT = 'fighterSearch';
+
+// Row columns moved into the shard documents when the index is split
+const ROW_FIELDS = [
+  'documentIds',
+  'names',
+  'normalizedNames',
+  'normalizedCodes',
+  'fighterCodes',
+  'weightClasses',
+  'minutes',
+  'sources',
+] as const;
+
+// The index is shared by every search bar on the page and loaded once per session
+let indexPromise: Promise<FighterSearchIndex> | null = null;
+
+const fetchFighterSearchIndex = async (): Promise<FighterSearchIndex> => {
+  const indexSnapshot = await getDoc(doc(db, COLLECTIONS.SNAPSHOTS, FIGHTER_SEARCH_DOCUMENT));
+  if (!indexSnapshot.exists()) {
+    throw new Error('Fighter search index not found');
+  }
+
+  const index = indexSnapshot.data() as FighterSearchIndex;
+  if (!index.shards) {
+    return index;
+  }
+
+  const shardSnapshots = await Promise.all(
+    Array.from({ length: index.shards }, (_, shard) =>
+      getDoc(doc(db, COLLECTIONS.SNAPSHOTS, `${FIGHTER_SEARCH_DOCUMENT}_${shard}`))
+    )
+  );
+  const shards = shardSnapshots.map(shardSnapshot => shardSnapshot.data());
+  // A shard from another upload means the index is being republished
+  if (shards.some(shard => !shard || shard.contentHash !== index.contentHash)) {
+    throw new Error('Fighter search index is being updated, please try again');
+  }
+
+  for (const field of ROW_FIELDS) {
+    (index as any)[field] = shards.flatMap(shard => shard![field]);
+  }
+  return index;
+};
+
+export const loadFighterSearchIndex = (): Promise<FighterSearchIndex> => {
+  if (!indexPromise) {
+    indexPromise = fetchFighterSearchIndex().catch(err => {
+      indexPromise = null;
+      throw err;
+    });
+  }
+  return indexPromise;
+};
+
+// Hook to search fighters through the precomputed index (one document read, plus its shards,
+// instead of the whole fighterData collection). Only fighters with a fighterData page are returned.
+export const useFighterSearch = (searchTerm: string, limit: number) => {
+  const [index, setIndex] = useState<FighterSearchIndex | null>(null);
+  const [loading, setLoading] = useState<boolean>(true);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+
+    loadFighterSearchIndex()
+      .then(loadedIndex => {
+        if (!cancelled) {
+          setIndex(loadedIndex);
+        }
+      })
+      .catch(err => {
+        console.error('Error fetching fighter search index:', err);
+        if (!cancelled) {
+          setError(err instanceof Error ? err.message : 'Failed to fetch fighter search index');
+        }
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setLoading(false);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, []);
+
+  const results = useMemo<FighterSearchResult[]>(() => {
+    if (!index) return [];
+
+    const fighterSource = index.sourceCollections.indexOf(COLLECTIONS.FIGHTERS);
+    const rows = searchFighterIndex(index, searchTerm, limit, row => index.sources[row] === fighterSource);
+    return rows.map(row => ({
+      id: index.documentIds[row],
+      fighterName: index.names[row],
+      fighterCode: index.fighterCodes[row],
+      weightClass: index.weightClasses[row],
+      MinutesTracked: index.minutes[row],
+      collection: index.sourceCollections[index.sources[row]],
+    }));
+  }, [index, searchTerm, limit]);
+
+  return { results, loading, error };
+};
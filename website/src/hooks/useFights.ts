@@ -13,7 +13,8 @@ import {
   limit
 } from 'firebase/firestore';
 import { db } from '../firebase';
-import { Fight, COLLECTIONS } from '../types/firestore';
+import { Fight, FighterHistory, COLLECTIONS } from '../types/firestore';
+import { utcCalendarDate } from '../utils/dates';
 
 // Hook to fetch a single fight by fightCode
 export const useFight = (fightCode: string | null) => {
@@ -290,6 +291,50 @@ export const useFighterFights = (fighterCode: string | null) => {
   return { fights, loading, error };
 };
 
+// Hook to fetch a fighter's precomputed fight history (one document read instead
+// of the fighterA/fighterB queries plus the event and opponent lookups)
+export const useFighterHistory = (fighterCode: string | null) => {
+  const [history, setHistory] = useState<FighterHistory | null>(null);
+  const [loading, setLoading] = useState<boolean>(false);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    const fetchFighterHistory = async () => {
+      if (!fighterCode) {
+        setHistory(null);
+        setLoading(false);
+        setError(null);
+        return;
+      }
+
+      setLoading(true);
+      setError(null);
+
+      try {
+        const historyDoc = doc(db, COLLECTIONS.FIGHTER_HISTORY, fighterCode.replace(/\//g, '-'));
+        const historySnapshot = await getDoc(historyDoc);
+
+        if (historySnapshot.exists()) {
+          setHistory(historySnapshot.data() as FighterHistory);
+        } else {
+          setHistory(null);
+          setError('Fighter history not found');
+        }
+      } catch (err) {
+        console.error('Error fetching fighter history:', err);
+        setError(err instanceof Error ? err.message : 'Failed to fetch fighter history');
+        setHistory(null);
+      } finally {
+        setLoading(false);
+      }
+    };
+
+    fetchFighterHistory();
+  }, [fighterCode]);
+
+  return { history, loading, error };
+};
+
 // Hook to fetch all fights for a specific event
 export const useEventFights = (eventCode: string | null) => {
   const [fights, setFights] = useState<Fight[]>([]);
@@ -440,6 +485,7 @@ export const useFightStats = (fightCode: string | null) => {
           setFightStats({
             ...statsData,
             id: doc.id,
+            fightDate: statsData.fightDate instanceof Timestamp ? utcCalendarDate(statsData.fightDate.toDate()) : statsData.fightDate,
           });
         } else {
           setFightStats(null);
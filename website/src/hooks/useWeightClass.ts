@@ -1,11 +1,7 @@
 import { useState, useEffect } from 'react';
 import { 
-  collection, 
-  getDocs,
-  query,
-  where,
-  DocumentData,
-  QueryDocumentSnapshot
+  doc,
+  getDoc
 } from 'firebase/firestore';
 import { db } from '../firebase';
 import { WeightClass, COLLECTIONS } from '../types/firestore';
@@ -33,30 +29,13 @@ export const useWeightClass = (weightClassName: string | null) => {
       setError(null);
 
       try {
-        console.log('Creating query for weight class:', weightClassName);
-        // First get all documents to see what's available
-        const allDocsQuery = collection(db, COLLECTIONS.WEIGHT_CLASSES);
-        const allDocs = await getDocs(allDocsQuery);
-        console.log('All available weight classes:', 
-          allDocs.docs.map(doc => ({
-            id: doc.id,
-            name: doc.data().weightclassname,
-            weight: doc.data().weight
-          }))
-        );
+        // weightClass documents are keyed by group code ('Light Heavyweight' -> 'LightHeavyweight'),
+        // as incremental_aggregates.py publishes them
+        const weightClassCode = weightClassName.replace(/[^0-9A-Za-z]/g, '');
+        console.log('Fetching weight class document:', weightClassCode);
+        const weightClassDoc = await getDoc(doc(db, COLLECTIONS.WEIGHT_CLASSES, weightClassCode));
 
-        // Query for the specific weight class by name
-        const weightClassQuery = query(
-          collection(db, COLLECTIONS.WEIGHT_CLASSES),
-          where('weightclassname', '==', weightClassName)
-        );
-
-        console.log('Executing weight class query...');
-        const querySnapshot = await getDocs(weightClassQuery);
-        console.log('Query completed. Found documents:', querySnapshot.size);
-
-        if (!querySnapshot.empty) {
-          const weightClassDoc = querySnapshot.docs[0];
+        if (weightClassDoc.exists()) {
           const weightClassData = weightClassDoc.data();
           
           console.log('Found weight class document. Details:');
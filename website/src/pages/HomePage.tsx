@@ -18,14 +18,14 @@ import {
   Update as UpdateIcon,
 } from '@mui/icons-material';
 import SearchBar from '../components/SearchBar';
-import { Fighter } from '../types/firestore';
+import { FighterSearchResult } from '../types/firestore';
 
 const HomePage: React.FC = () => {
-  const [selectedFighter, setSelectedFighter] = useState<Fighter | null>(null);
+  const [selectedFighter, setSelectedFighter] = useState<FighterSearchResult | null>(null);
   const theme = useTheme();
   const navigate = useNavigate();
 
-  const handleFighterSelect = (fighter: Fighter) => {
+  const handleFighterSelect = (fighter: FighterSearchResult) => {
     setSelectedFighter(fighter);
     // Navigate to fighter detail page
     navigate(`/fighter/${fighter.id}`);
@@ -111,7 +111,7 @@ const HomePage: React.FC = () => {
                       fontWeight: 600
                     }}
                   >
-                    {selectedFighter.fighterName || selectedFighter.name}
+                    {selectedFighter.fighterName}
                   </Typography>
                   {selectedFighter.weightClass && (
                     <Chip 
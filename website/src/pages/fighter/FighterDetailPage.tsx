@@ -408,7 +408,7 @@ const FighterDetailPage: React.FC = () => {
       {
         icon: <HistoryIcon />,
         label: "Fight History",
-        component: <FightHistory fighter={fighter} weightClassAvgData={weightClassData} />
+        component: <FightHistory fighter={fighter} />
       }
     ];
   }, [fighter, weightClassData]);
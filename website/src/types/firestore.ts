@@ -89,6 +89,24 @@ export interface Fighter extends BaseDocument {
   submission_stats?: any;
   takedown_stats?: any;
   total_stats?: any;
+
+  // Resume rating computed at ingest (useFighterCombinedDifficultyScore)
+  combinedDifficulty?: CombinedDifficulty;
+}
+
+// Difficulty of a fighter's fights, averaged over wins and losses
+export interface CombinedDifficulty {
+  totalScore: number;
+  averageScore: number;
+  totalFights: number;
+  wins: number;
+  losses: number;
+  winRate: number;
+  description: string;
+  breakdown: {
+    wins: { count: number; averageScore: number };
+    losses: { count: number; averageScore: number };
+  };
 }
 
 // Fight data model
@@ -106,6 +124,62 @@ export interface Fight extends BaseDocument {
   weightClass: string;
 }
 
+// Headline stats of one corner of a bout in a fighter history
+export interface FighterHistoryStats {
+  strikesLanded: number;
+  highImpact: number;
+  knockdowns: number;
+  stuns: number;
+  takedowns: number;
+  takedownAttempts: number;
+  submissionAttempts: number;
+}
+
+// Difficulty of one side of a fight (useDifficultyScore), computed at ingest
+export interface FightDifficulty {
+  score: number;
+  description: string;
+  baseRating: number;
+  methodMultiplier: number;
+  roundMultiplier: number;
+  archetype: string;
+  historyScore: number | null; // useFightDifficultyScores, which the resume rating averages
+}
+
+// One bout in a fighter history, from the fighter's side
+export interface FighterHistoryEntry {
+  fightId: string;
+  fightCode: string;
+  eventCode: string;
+  eventId: string | null;
+  eventName: string;
+  date: string | null; // YYYY-MM-DD
+  weightClass: string;
+  method: string;
+  round: number;
+  time: string;
+  scheduledRounds: number;
+  isTitleFight: boolean;
+  corner: 'A' | 'B';
+  result: 'win' | 'loss' | 'draw' | 'nc';
+  opponentCode: string;
+  opponentId: string | null;
+  opponentName: string;
+  difficulty: FightDifficulty | null;
+  fighterStats: FighterHistoryStats | null;
+  opponentStats: FighterHistoryStats | null;
+}
+
+// Precomputed fight history of one fighter (fighterHistory/{fighterCode}), bouts newest first
+export interface FighterHistory {
+  version: number;
+  fighterCode: string;
+  fighterName: string;
+  fightCount: number;
+  record: { wins: number; losses: number; draws: number; noContests: number };
+  fights: FighterHistoryEntry[];
+}
+
 // Fight statistics data model
 export interface FightStats extends BaseDocument {
   fightId: string;
@@ -154,14 +228,14 @@ export interface FightStats extends BaseDocument {
 // Event data model
 export interface Event {
   id: string;
-  Date: string;
+  Date: Date | string;
   EventCode: string;
   EventName: string;
   Fans: 'Yes' | 'No';
   PPV: 'Yes' | 'No';
   numOfFights: number;
   // Keep lowercase versions for backward compatibility
-  date?: string;
+  date?: Date | string;
   eventCode?: string;
   eventName?: string;
   fans?: 'Yes' | 'No';
@@ -184,8 +258,11 @@ export interface UserProfile extends BaseDocument {
 
 export interface WeightClass {
   id: string;
-  weight: number;
+  weight: number | null;
   weightclassname: string;
+  // Fighters totalled at ingest (incremental_aggregates.py)
+  fighterCount?: number;
+  aggregateVersion?: number;
   // Submission attempts
   AmericanaAttempts: number;
   AnacondaAttempt: number;
@@ -329,14 +406,47 @@ export interface WeightClass {
   timesstunned: number;
 }
 
+// Fighter search index (snapshots/fighterSearch, built by fighter_search.py). Row columns are parallel
+// arrays; an index split into shards keeps them in fighterSearch_<n> documents instead.
+export interface FighterSearchIndex {
+  version: number;
+  contentHash: string;
+  count: number;
+  shards: number;
+  sourceCollections: string[];
+  documentIds: string[];
+  names: string[];
+  normalizedNames: string[];
+  normalizedCodes: string[];
+  fighterCodes: string[];
+  weightClasses: string[];
+  minutes: number[];
+  sources: number[]; // index into sourceCollections
+  topByMinutes: number[];
+  trigrams: Record<string, string>; // encoded postings, see decodePostings
+  prefixes: Record<string, string>;
+}
+
+// One fighter found in the search index
+export interface FighterSearchResult {
+  id: string;
+  fighterName: string;
+  fighterCode: string;
+  weightClass: string;
+  MinutesTracked: number;
+  collection: string;
+}
+
 // Collection names for type safety
 export const COLLECTIONS = {
   FIGHTERS: 'fighterData',
   FIGHTS: 'fights',
+  FIGHTER_HISTORY: 'fighterHistory',
   FIGHT_STATS: 'fightStats',
   EVENTS: 'events',
   USER_PROFILES: 'userProfiles',
   WEIGHT_CLASSES: 'weightClass',
+  SNAPSHOTS: 'snapshots',
 } as const;
 
 // Type for collection names
@@ -0,0 +1,11 @@
+// Ingest stores calendar dates (events, fights) as midnight UTC. Rebuild the same day at local
+// midnight so toLocaleDateString shows the uploaded date in every time zone, as the old strings did.
+export const utcCalendarDate = (date: Date): Date =>
+  new Date(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate());
+
+// Index documents (fighterHistory) store dates as 'YYYY-MM-DD' strings. new Date() would parse those as
+// UTC midnight and show the day before west of Greenwich, so build the local calendar date instead.
+export const calendarDate = (value: string): Date => {
+  const [year, month, day] = value.split('-').map(Number);
+  return new Date(year, month - 1, day);
+};
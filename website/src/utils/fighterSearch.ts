@@ -0,0 +1,70 @@
+import { FighterSearchIndex } from '../types/firestore';
+
+// Queries shorter than this use the word-prefix postings instead of trigrams (TRIGRAM_LENGTH in fighter_search.py)
+const TRIGRAM_LENGTH = 3;
+
+// Same normalization as fighter_search.normalize_name: accents stripped, lowercased, and every run of
+// characters other than letters and digits collapsed to one space
+export const normalizeName = (name: string): string =>
+  name
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/[^0-9a-z]+/g, ' ')
+    .trim();
+
+const nameTrigrams = (normalized: string): string[] => {
+  const trigrams = new Set<string>();
+  for (let index = 0; index + TRIGRAM_LENGTH <= normalized.length; index++) {
+    trigrams.add(normalized.slice(index, index + TRIGRAM_LENGTH));
+  }
+  return Array.from(trigrams);
+};
+
+// Postings are base-36 gaps between row indexes separated by '.', so "0.5.1c" is rows 0, 5 and 53
+export const decodePostings = (text: string | undefined): number[] => {
+  const rows: number[] = [];
+  let row = 0;
+  for (const gap of text ? text.split('.') : []) {
+    row += parseInt(gap, 36);
+    rows.push(row);
+  }
+  return rows;
+};
+
+// Look up a query the way fighter_search.search does: names or fighterCodes containing the query, those
+// with a word starting with it first, then by minutes tracked. An empty query returns the top fighters.
+// include, when given, drops rows before the limit is applied.
+export const searchFighterIndex = (
+  index: FighterSearchIndex,
+  query: string,
+  limit: number,
+  include: (row: number) => boolean = () => true
+): number[] => {
+  const normalized = normalizeName(query);
+  if (!normalized) {
+    return index.topByMinutes.filter(include).slice(0, limit);
+  }
+
+  let candidates: number[];
+  if (normalized.length < TRIGRAM_LENGTH) {
+    candidates = decodePostings(index.prefixes[normalized]);
+  } else {
+    let rows: Set<number> | null = null;
+    for (const trigram of nameTrigrams(normalized)) {
+      const postings = new Set(decodePostings(index.trigrams[trigram]));
+      rows = rows === null ? postings : new Set(Array.from(rows).filter(row => postings.has(row)));
+      if (!rows.size) {
+        return [];
+      }
+    }
+    candidates = Array.from(rows || []).sort((a, b) => a - b);
+  }
+
+  const keys = (row: number) => [index.normalizedNames[row], index.normalizedCodes[row]];
+  const wordStart = (row: number) => keys(row).some(key => key.startsWith(normalized) || key.includes(` ${normalized}`));
+  return candidates
+    .filter(row => include(row) && keys(row).some(key => key.includes(normalized)))
+    .sort((a, b) => Number(wordStart(b)) - Number(wordStart(a)) || index.minutes[b] - index.minutes[a])
+    .slice(0, limit);
+};
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Token-bucket write scheduler for Firestore uploads.
+Writes are paced to a target rate that starts low and ramps up on a schedule,
+following Firestore's 500/50/5 guidance for new or cold collections (start at
+500 operations per second and increase by at most 50% every 5 minutes), and is
+cut back whenever the backend reports throttling.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+class WriteScheduler:
+    """
+    Thread-safe token bucket shared by every writer of an upload.
+    
+    Each commit acquires one token per write before it is sent. Tokens refill
+    at the current rate; a request larger than the bucket (a 500-write batch)
+    is admitted by borrowing against future refills, so the caller sleeps for
+    exactly as long as the rate requires.
+    """
+    
+    def __init__(self, initial_rate: float = 500.0, max_rate: Optional[float] = None,
+                 ramp_factor: float = 1.5, ramp_interval: float = 300.0, backoff_factor: float = 0.5,
+                 min_rate: float = 10.0, backoff_cooldown: float = 1.0, burst_seconds: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Create a scheduler.
+        
+        Args:
+            initial_rate: Starting rate in writes per second
+            max_rate: Upper bound for the ramp (unbounded if None)
+            ramp_factor: Rate multiplier applied every ramp_interval without throttling
+            ramp_interval: Seconds between ramp steps
+            backoff_factor: Rate multiplier applied when throttling is reported
+            min_rate: Lower bound for backoff
+            backoff_cooldown: Seconds during which further throttling reports are ignored,
+                so one burst of failed in-flight commits only backs off once
+            burst_seconds: Bucket capacity, in seconds of writes at the current rate
+            clock: Monotonic clock, replaceable for testing
+            sleep: Sleep function, replaceable for testing
+        """
+        self.max_rate = max_rate
+        self.ramp_factor = ramp_factor
+        self.ramp_interval = ramp_interval
+        self.backoff_factor = backoff_factor
+        self.min_rate = min(min_rate, initial_rate)
+        self.backoff_cooldown = backoff_cooldown
+        self.burst_seconds = burst_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        
+        now = clock()
+        self._rate = float(initial_rate if max_rate is None else min(initial_rate, max_rate))
+        self._tokens = self._rate * burst_seconds
+        self._updated = now
+        self._ramp_started = now
+        self._last_backoff = None
+        self._waiting = 0
+        self.granted = 0
+        self.throttles = 0
+        self.backoffs = 0
+        self.waited_seconds = 0.0
+    
+    @property
+    def rate(self) -> float:
+        """Current target rate in writes per second."""
+        with self._lock:
+            self._advance(self._clock())
+            return self._rate
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers currently waiting for tokens."""
+        with self._lock:
+            return self._waiting
+    
+    def _advance(self, now: float):
+        """Apply due ramp steps and refill tokens up to now. Caller holds the lock."""
+        while now - self._ramp_started >= self.ramp_interval:
+            self._ramp_started += self.ramp_interval
+            if self.max_rate is None or self._rate < self.max_rate:
+                # Refill at the old rate up to the step, then continue at the new one
+                self._refill(self._ramp_started)
+                self._rate *= self.ramp_factor
+                if self.max_rate is not None:
+                    self._rate = min(self._rate, self.max_rate)
+        self._refill(now)
+    
+    def _refill(self, now: float):
+        """Add tokens earned since the last update. Caller holds the lock."""
+        if now > self._updated:
+            capacity = self._rate * self.burst_seconds
+            self._tokens = min(capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+    
+    def acquire(self, count: int = 1) -> float:
+        """
+        Wait until count writes may be sent.
+        
+        Args:
+            count: Number of writes in the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        if count <= 0:
+            return 0.0
+        
+        with self._lock:
+            self._advance(self._clock())
+            self._tokens -= count
+            self.granted += count
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+            if delay > 0:
+                self._waiting += 1
+                self.waited_seconds += delay
+        
+        if delay > 0:
+            try:
+                self._sleep(delay)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return delay
+    
+    def record_throttle(self) -> bool:
+        """
+        Report a throttling error (RESOURCE_EXHAUSTED) from the backend.
+        
+        The rate is multiplied by backoff_factor, the ramp schedule restarts
+        from the reduced rate and tokens borrowed at the old rate stay owed.
+        
+        Returns:
+            True if the rate was reduced, False if still in the cooldown of a previous backoff
+        """
+        with self._lock:
+            now = self._clock()
+            self._advance(now)
+            self.throttles += 1
+            if self._last_backoff is not None and now - self._last_backoff < self.backoff_cooldown:
+                return False
+            
+            self._last_backoff = now
+            self._ramp_started = now
+            self._rate = max(self.min_rate, self._rate * self.backoff_factor)
+            self._tokens = min(self._tokens, self._rate * self.burst_seconds)
+            self.backoffs += 1
+            return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the current rate, queue depth and counters."""
+        with self._lock:
+            self._advance(self._clock())
+            return {
+                'rate': self._rate,
+                'queue_depth': self._waiting,
+                'granted': self.granted,
+                'throttles': self.throttles,
+                'backoffs': self.backoffs,
+                'waited_seconds': self.waited_seconds,
+            }
+    
+    def describe(self) -> str:
+        """Return a short progress-line description of the scheduler state."""
+        stats = self.stats()
+        return f"{stats['rate']:.0f} writes/s, {stats['queue_depth']} waiting, {stats['backoffs']} backoffs"